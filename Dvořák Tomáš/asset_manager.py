@@ -0,0 +1,254 @@
+"""
+Načítání obrázků na pozadí a atlas na disku.
+
+  * Soubory PNG se dekódují a zmenšují ve vláknech (ThreadPoolExecutor),
+    hlavní vlákno mezitím kreslí obrazovku načítání a okno reaguje.
+  * Animace jsou líné — objekt Frames se chová jako seznam snímků, ale
+    na hotové snímky čeká až při prvním použití (většinou už jsou hotové).
+  * Když je všechno načtené, uloží se všechny snímky do jednoho atlasu
+    (cache/atlas.bin + atlas.json). Atlas je nekomprimovaný a ve formátu
+    pixelů obrazovky, takže se načte jedním čtením bez dekódování PNG.
+    Klíčem je mtime a velikost zdrojových souborů — dokud se žádný
+    nezmění, další spuštění načte jen atlas.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+ATLAS_DIR = "cache"
+ATLAS_VERSION = 2
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1  # mezera mezi snímky, ať se při škálování "neprolnou" sousedé
+
+
+def pixel_format(surface):
+    """Pořadí bajtů pixelu pro tobytes/frombuffer, ve kterém surface už data má
+    (atlas se pak načte bez převodu; jinak by convert_alpha stálo víc než čtení souboru)."""
+    if sys.byteorder == "little" and surface.get_masks() == (0xFF0000, 0xFF00, 0xFF, 0xFF000000):
+        return "BGRA"
+    return "RGBA"
+
+
+def decode(paths, size, optional):
+    """Běží ve vlákně: načte a případně zmenší obrázky. Vrací (surfaces, chybějící cesty)."""
+    surfaces, missing = [], []
+    for path in paths:
+        try:
+            img = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError):
+            if not optional:
+                raise
+            missing.append(path)
+            continue
+        if size is not None:
+            img = pygame.transform.scale(img, size)
+        surfaces.append(img)
+    return surfaces, missing
+
+
+def pack(sizes, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+    """Rozmístí obdélníky (w, h) do řádků ("shelf" packing) od nejvyšších.
+    Vrací (pozice [(x, y)] ve vstupním pořadí, výška atlasu)."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width and x > 0:
+            y += shelf_h + padding
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+    return positions, y + shelf_h
+
+
+class Frames:
+    """Snímky jedné animace. Chová se jako seznam; na načtení čeká až při prvním přístupu."""
+    __slots__ = ("manager", "name", "_frames")
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+        self._frames = None
+
+    def _get(self):
+        if self._frames is None:
+            self._frames = self.manager.frames(self.name)
+        return self._frames
+
+    def __getitem__(self, index):
+        frames = self._frames
+        if frames is None:
+            frames = self._get()
+        return frames[index]
+
+    def __len__(self):
+        return len(self._get())
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __bool__(self):
+        return bool(self._get())
+
+
+class AssetManager:
+    def __init__(self, atlas_dir=ATLAS_DIR, workers=4):
+        self.atlas_dir = atlas_dir
+        self.workers = workers
+        self.specs = {}    # jméno -> (cesty, velikost, optional) v pořadí registrace
+        self.loaded = {}   # jméno -> seznam hotových surface
+        self.futures = {}  # jméno -> Future z vlákna
+        self.executor = None
+        self.signature = None
+        self.source = None      # "atlas" nebo "soubory" — odkud se obrázky načetly
+        self.started_at = None
+        self.load_ms = None     # jak dlouho trvalo načíst všechno
+        self.atlas = None
+        self.atlas_saved = False
+
+    @property
+    def atlas_bin(self):
+        return os.path.join(self.atlas_dir, "atlas.bin")
+
+    @property
+    def atlas_index(self):
+        return os.path.join(self.atlas_dir, "atlas.json")
+
+    def add(self, name, paths, size=None, optional=False):
+        """Zaregistruje animaci (nebo jeden obrázek). Vrací líný seznam snímků."""
+        self.specs[name] = (list(paths), tuple(size) if size else None, optional)
+        return Frames(self, name)
+
+    def start(self):
+        """Načte atlas, pokud je aktuální; jinak pošle dekódování souborů do vláken."""
+        self.started_at = time.perf_counter()
+        self.signature = self._signature()
+        if self._load_atlas():
+            self.source = "atlas"
+            self.load_ms = (time.perf_counter() - self.started_at) * 1000
+            return
+        self.source = "soubory"
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        for name, (paths, size, optional) in self.specs.items():
+            self.futures[name] = self.executor.submit(decode, paths, size, optional)
+
+    # --- Použití ze hry ---
+
+    def frames(self, name):
+        """Snímky animace (počká na vlákno, pokud ještě nejsou hotové)."""
+        frames = self.loaded.get(name)
+        if frames is None:
+            frames = self._finish(name)
+        return frames
+
+    def image(self, name):
+        return self.frames(name)[0]
+
+    def poll(self):
+        """Převezme hotové výsledky z vláken (volá se z hlavní smyčky). Vrací (hotovo, celkem)."""
+        for name, future in list(self.futures.items()):
+            if future.done():
+                self._finish(name)
+        return len(self.loaded), len(self.specs)
+
+    def ready(self, names=None):
+        self.poll()
+        return all(name in self.loaded for name in (names or self.specs))
+
+    def wait_all(self):
+        for name in self.specs:
+            self.frames(name)
+
+    # --- Vnitřní část ---
+
+    def _finish(self, name):
+        surfaces, missing = self.futures.pop(name).result()
+        for path in missing:
+            print(f"Varování: Soubor {path} nebyl nalezen!")
+        if pygame.display.get_surface() is not None:
+            surfaces = [s.convert_alpha() for s in surfaces]
+        self.loaded[name] = surfaces
+        if len(self.loaded) == len(self.specs):
+            self.load_ms = (time.perf_counter() - self.started_at) * 1000
+            self.executor.shutdown(wait=False)
+            self._save_atlas()
+        return surfaces
+
+    def _signature(self):
+        h = hashlib.sha1(f"{ATLAS_VERSION}|{ATLAS_WIDTH}".encode())
+        for name, (paths, size, optional) in self.specs.items():
+            h.update(f"{name}|{size}|{optional}".encode())
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                    h.update(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode())
+                except OSError:
+                    h.update(f"{path}|chybí".encode())
+        return h.hexdigest()
+
+    def _load_atlas(self):
+        try:
+            with open(self.atlas_index, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("signature") != self.signature:
+                return False
+            with open(self.atlas_bin, "rb") as f:
+                data = f.read()
+            size, fmt = tuple(index["size"]), index["format"]
+            if pygame.display.get_surface() is not None:
+                # frombuffer data nekopíruje; formát už sedí, takže convert_alpha je jen jedna kopie
+                atlas = pygame.image.frombuffer(data, size, fmt).convert_alpha()
+            else:
+                atlas = pygame.image.frombytes(data, size, fmt)
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False
+        self.atlas = atlas
+        for name, rects in index["frames"].items():
+            self.loaded[name] = [atlas.subsurface(rect) for rect in rects]
+        return True
+
+    def _save_atlas(self):
+        """Složí všechny snímky do jednoho surface a zapíše ho na disk (zápis běží ve vlákně)."""
+        sizes = [s.get_size() for surfaces in self.loaded.values() for s in surfaces]
+        width = max([ATLAS_WIDTH] + [w for w, _ in sizes])
+        positions, height = pack(sizes, width)
+        atlas = pygame.Surface((width, max(1, height)), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        frames = {name: [] for name in self.loaded}
+        k = 0
+        for name, surfaces in self.loaded.items():
+            for s in surfaces:
+                x, y = positions[k]
+                # MAX do průhledného atlasu = přesná kopie pixelů i s alfou (bez míchání)
+                atlas.blit(s, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+                frames[name].append([x, y, *sizes[k]])
+                k += 1
+        fmt = pixel_format(atlas)
+        data = pygame.image.tobytes(atlas, fmt)
+        index = {"version": ATLAS_VERSION, "signature": self.signature,
+                 "size": list(atlas.get_size()), "format": fmt, "frames": frames}
+
+        def write():
+            os.makedirs(self.atlas_dir, exist_ok=True)
+            tmp_bin = self.atlas_bin + ".tmp"
+            with open(tmp_bin, "wb") as f:
+                f.write(data)
+            os.replace(tmp_bin, self.atlas_bin)
+            # Index až po datech — nedopsaný atlas se tak nikdy nenačte
+            tmp_index = self.atlas_index + ".tmp"
+            with open(tmp_index, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_index, self.atlas_index)
+            self.atlas_saved = True
+
+        self._writer = threading.Thread(target=write, name="atlas-writer")
+        self._writer.start()
@@ -0,0 +1,112 @@
+"""
+Benchmark načítání obrázků — původní sériové načítání vs. AssetManager.
+
+  původní   pygame.image.load + convert_alpha + scale jeden soubor po druhém
+  studený   AssetManager bez atlasu: dekódování ve vláknech, pak uložení atlasu
+  teplý     AssetManager s platným atlasem: jeden soubor, žádné PNG ani škálování
+
+U AssetManageru se měří zvlášť čas do prvního snímku (zdi, podlaha, střela)
+a čas do načtení všeho. Soubory jsou při měření v diskové cache systému,
+na pomalém disku je rozdíl mezi studeným a teplým startem větší.
+
+Spustit z kořene projektu: python benchmarks/bench_assets.py
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+os.chdir(PROJECT_DIR)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from asset_manager import AssetManager
+
+REPEATS = 10
+FIRST_FRAME = ["wall_top", "wall_bottom", "wall_left", "wall_right", "floor", "bullet"]
+
+# Stejné obrázky jako v main.py: jméno -> (cesty, velikost)
+SPECS = {
+    "wall_top": (["assets/map/walls/tile033.png"], None),
+    "wall_bottom": (["assets/map/walls/tile026.png"], None),
+    "wall_left": (["assets/map/walls/tile013.png"], None),
+    "wall_right": (["assets/map/walls/tile016.png"], None),
+    "floor": (["assets/map/walls/tile017.png"], None),
+    "bullet": (["assets/player/attack/tile000.png"], (30, 30)),
+    "player_walk": ([f"assets/player/tile{i:03d}.png" for i in range(6)], (160, 160)),
+    "player_hurt": ([f"assets/player/hurt/tile{i:03d}.png" for i in range(4)], (160, 160)),
+    "player_death": ([f"assets/player/death/tile{i:03d}.png" for i in range(8)], (160, 160)),
+    "aoe": ([f"assets/player/attack/ability/frame{i:04d}.png" for i in range(16)], None),
+    "enemy_melee": ([f"assets/enemies/melee/tile{i:03d}.png" for i in range(18, 24)], (120, 120)),
+    "enemy_range": ([f"assets/enemies/range/tile{i:03d}.png" for i in range(18, 24)], (120, 120)),
+    "enemy_tank": ([f"assets/enemies/tank/tile{i:03d}.png" for i in range(18, 24)], (140, 140)),
+    "enemy_range_attack": ([f"assets/enemies/range/attack/tile{i:03d}.png" for i in range(48)], (40, 40)),
+}
+
+
+def load_serial():
+    start = time.perf_counter()
+    for paths, size in SPECS.values():
+        for path in paths:
+            img = pygame.image.load(path).convert_alpha()
+            if size is not None:
+                img = pygame.transform.scale(img, size)
+    total = (time.perf_counter() - start) * 1000
+    return total, total
+
+
+def load_manager(atlas_dir):
+    manager = AssetManager(atlas_dir=atlas_dir)
+    for name, (paths, size) in SPECS.items():
+        manager.add(name, paths, size=size, optional=True)
+    start = time.perf_counter()
+    manager.start()
+    for name in FIRST_FRAME:
+        manager.frames(name)
+    first_frame = (time.perf_counter() - start) * 1000
+    manager.wait_all()
+    total = (time.perf_counter() - start) * 1000
+    writer = getattr(manager, "_writer", None)
+    if writer is not None:
+        writer.join()  # zápis atlasu běží ve vlákně — do měření se nepočítá, ale musí doběhnout
+    return first_frame, total, manager.source
+
+
+def report(name, samples):
+    first = statistics.median(s[0] for s in samples)
+    total = statistics.median(s[1] for s in samples)
+    print(f"{name:<10} | {first:>18.1f} | {total:>16.1f}")
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1920, 1080))
+    count = sum(len(paths) for paths, _ in SPECS.values())
+    print(f"{count} obrázků, medián z {REPEATS} opakování\n")
+    print(f"{'':<10} | {'první snímek [ms]':>18} | {'vše načteno [ms]':>16}")
+    print("-" * 52)
+
+    report("původní", [load_serial() for _ in range(REPEATS)])
+
+    cold, warm = [], []
+    for _ in range(REPEATS):
+        atlas_dir = tempfile.mkdtemp()
+        try:
+            first, total, source = load_manager(atlas_dir)
+            assert source == "soubory"
+            cold.append((first, total))
+            first, total, source = load_manager(atlas_dir)
+            assert source == "atlas"
+            warm.append((first, total))
+        finally:
+            shutil.rmtree(atlas_dir)
+    report("studený", cold)
+    report("teplý", warm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark kolizí — původní O(n²) smyčka vs. prostorová mřížka.
+Běží bez okna (headless), potřebuje jen pygame.Rect.
+
+Spustit z kořene projektu: python benchmarks/bench_collisions.py
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from spatial_grid import SpatialGrid
+
+WIDTH, HEIGHT = 1920, 1080
+BORDER_THICKNESS = 60
+ENEMY_COUNTS = [50, 100, 250, 500, 1000, 2000]
+PROJECTILES = 60
+
+
+class BenchEnemy:
+    def __init__(self, x, y, size, speed):
+        self.x, self.y = x, y
+        self.size, self.speed = size, speed
+        self.hp = 10 ** 9  # v benchmarku nikdo neumírá, aby počet zůstal stejný
+        self.rect = pygame.Rect(x, y, size, size)
+
+    def follow(self, px, py):
+        dx, dy = px - self.x, py - self.y
+        dist = math.hypot(dx, dy)
+        if dist != 0:
+            self.x += (dx / dist) * self.speed
+            self.y += (dy / dist) * self.speed
+            self.rect.x, self.rect.y = int(self.x), int(self.y)
+
+
+class BenchProjectile:
+    def __init__(self, rng):
+        self.x = rng.uniform(BORDER_THICKNESS, WIDTH - BORDER_THICKNESS)
+        self.y = rng.uniform(BORDER_THICKNESS, HEIGHT - BORDER_THICKNESS)
+        self.rect = pygame.Rect(0, 0, 30, 30)
+        self.rect.center = (int(self.x), int(self.y))
+
+
+def handle_collision(obj1, obj2, force=10):
+    dx = obj1.x - obj2.x
+    dy = obj1.y - obj2.y
+    dist = math.hypot(dx, dy)
+    if dist < (obj1.size/2 + obj2.size/2):
+        if dist == 0: dist = 0.1
+        push_x = (dx / dist) * force
+        push_y = (dy / dist) * force
+        obj1.x += push_x
+        obj1.y += push_y
+        obj2.x -= push_x
+        obj2.y -= push_y
+
+
+def make_world(count, seed=0):
+    rng = random.Random(seed)
+    enemies = [
+        BenchEnemy(rng.randint(BORDER_THICKNESS, WIDTH - 200), rng.randint(BORDER_THICKNESS, HEIGHT - 200),
+                   rng.choice([50, 50, 50, 70]), rng.choice([3.5, 2, 1.2]))
+        for _ in range(count)
+    ]
+    projectiles = [BenchProjectile(rng) for _ in range(PROJECTILES)]
+    return enemies, projectiles
+
+
+def frame_naive(enemies, projectiles):
+    for p in projectiles:
+        for e in enemies:
+            if p.rect.colliderect(e.rect):
+                e.hp -= 1
+                break
+    for e in enemies:
+        e.follow(WIDTH // 2, HEIGHT // 2)
+        for other_e in enemies:
+            if e != other_e and e.rect.colliderect(other_e.rect):
+                handle_collision(e, other_e, force=8)
+
+
+def frame_grid(enemies, projectiles, grid):
+    grid.rebuild(enemies)
+    for p in projectiles:
+        for e in grid.query_rect(p.rect):
+            if p.rect.colliderect(e.rect):
+                e.hp -= 1
+                break
+    for e in enemies:
+        e.follow(WIDTH // 2, HEIGHT // 2)
+    grid.rebuild(enemies)
+    for e in enemies:
+        for other_e in grid.query_rect(e.rect):
+            if e != other_e and e.rect.colliderect(other_e.rect):
+                handle_collision(e, other_e, force=8)
+
+
+def measure(frame_fn, count, budget_s=1.0, max_frames=60):
+    enemies, projectiles = make_world(count)
+    frames = 0
+    start = time.perf_counter()
+    while frames < max_frames:
+        frame_fn(enemies, projectiles)
+        frames += 1
+        if time.perf_counter() - start > budget_s and frames >= 3:
+            break
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    grid = SpatialGrid(cell_size=128)
+    print(f"{'nepřátel':>9} | {'O(n²) ms/frame':>15} | {'mřížka ms/frame':>16} | {'zrychlení':>9}")
+    print("-" * 60)
+    for count in ENEMY_COUNTS:
+        naive_ms = measure(frame_naive, count)
+        grid_ms = measure(lambda en, pr: frame_grid(en, pr, grid), count)
+        print(f"{count:>9} | {naive_ms:>15.2f} | {grid_ms:>16.2f} | {naive_ms / grid_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
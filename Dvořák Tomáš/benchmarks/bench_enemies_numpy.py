@@ -0,0 +1,138 @@
+"""
+Benchmark nepřátel — skalární follow() + mřížka vs. NumPy úložiště (--numpy).
+
+Jeden tick = pohyb všech nepřátel k hráči (ranged couvají a střílí)
+a vzájemné odstrkování. Rozpočet ticku při 60 FPS je 16.7 ms a musí
+se do něj vejít i kreslení, takže simulace by měla zabrat jen zlomek.
+
+Spustit z kořene projektu: python benchmarks/bench_enemies_numpy.py
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from enemy_soa import EnemyStore, MELEE, RANGED, TANK
+from spatial_grid import SpatialGrid
+
+WIDTH, HEIGHT = 1920, 1080
+BORDER_THICKNESS = 60
+ENEMY_COUNTS = [50, 100, 250, 500, 1000]
+TICKS = 120
+PLAYER_X, PLAYER_Y = WIDTH // 2, HEIGHT // 2
+
+
+def handle_collision(obj1, obj2, force=10):
+    dx = obj1.x - obj2.x
+    dy = obj1.y - obj2.y
+    dist = math.hypot(dx, dy)
+    if dist < (obj1.size/2 + obj2.size/2):
+        if dist == 0: dist = 0.1
+        push_x = (dx / dist) * force
+        push_y = (dy / dist) * force
+        obj1.x += push_x
+        obj1.y += push_y
+        obj2.x -= push_x
+        obj2.y -= push_y
+
+
+class ScalarEnemy:
+    """Zjednodušená kopie Enemy / RangedEnemy z main.py (bez kreslení)."""
+    def __init__(self, x, y, kind):
+        self.x, self.y, self.kind = x, y, kind
+        self.size, self.speed = {MELEE: (50, 3.5), RANGED: (40, 2), TANK: (70, 1.2)}[kind]
+        side = 70 if kind == TANK else 50
+        self.rect = pygame.Rect(x, y, side, side)
+        self.frame_index = 0
+        self.facing_right = True
+        self.shoot_delay = 0
+        self.range = 400
+
+    def approach(self, dx, dy, dist):
+        if dx > 5: self.facing_right = True
+        elif dx < -5: self.facing_right = False
+        self.x += (dx / dist) * self.speed
+        self.y += (dy / dist) * self.speed
+        self.rect.x, self.rect.y = int(self.x), int(self.y)
+        self.frame_index += 0.15
+        if self.frame_index >= 5:
+            self.frame_index = 0
+
+    def follow(self, px, py, shots):
+        dx, dy = px - self.x, py - self.y
+        dist = math.hypot(dx, dy)
+        if self.kind != RANGED:
+            if dist != 0:
+                self.approach(dx, dy, dist)
+            return
+        if dist > self.range:
+            self.approach(dx, dy, dist)
+        elif dist < self.range - 100 and dist != 0:
+            self.x -= (dx / dist) * self.speed
+            self.y -= (dy / dist) * self.speed
+            self.facing_right = dx > 0
+        self.frame_index += 0.15
+        if self.frame_index >= 6:
+            self.frame_index = 0
+        self.shoot_delay += 1
+        if self.shoot_delay >= 60:
+            shots.append((self.x + self.size / 2, self.y + self.size / 2))
+            self.shoot_delay = 0
+        self.rect.topleft = (int(self.x), int(self.y))
+
+
+def spawn_points(count, seed=0):
+    rng = random.Random(seed)
+    kinds = [MELEE] * 12 + [RANGED] * 5 + [TANK] * 3  # stejný poměr jako ve spawn_enemy
+    return [(rng.randint(BORDER_THICKNESS + 50, WIDTH - BORDER_THICKNESS - 100),
+             rng.randint(BORDER_THICKNESS + 50, HEIGHT - BORDER_THICKNESS - 100),
+             rng.choice(kinds)) for _ in range(count)]
+
+
+def run_scalar(count):
+    enemies = [ScalarEnemy(x, y, kind) for x, y, kind in spawn_points(count)]
+    grid = SpatialGrid(cell_size=128)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        shots = []
+        for e in enemies:
+            e.follow(PLAYER_X, PLAYER_Y, shots)
+        grid.rebuild(enemies)
+        for e in enemies:
+            for other_e in grid.query_rect(e.rect):
+                if e != other_e and e.rect.colliderect(other_e.rect):
+                    handle_collision(e, other_e, force=8)
+    return (time.perf_counter() - start) / TICKS * 1000
+
+
+def run_numpy(count):
+    store = EnemyStore()
+    for x, y, kind in spawn_points(count):
+        size, speed = {MELEE: (50, 3.5), RANGED: (40, 2), TANK: (70, 1.2)}[kind]
+        side = 70 if kind == TANK else 50
+        store.add(x, y, kind, size, speed, 1, (side, side), attack_range=400 if kind == RANGED else 0.0)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        store.snapshot()
+        store.follow(PLAYER_X, PLAYER_Y)
+        store.separate(force=8)
+    return (time.perf_counter() - start) / TICKS * 1000
+
+
+def main():
+    print(f"{TICKS} ticků, hráč stojí uprostřed (nepřátelé se na něm shluknou)\n")
+    print(f"{'nepřátel':>9} | {'skalárně ms/tick':>16} | {'NumPy ms/tick':>13} | {'zrychlení':>9}")
+    print("-" * 58)
+    for count in ENEMY_COUNTS:
+        scalar_ms = run_scalar(count)
+        numpy_ms = run_numpy(count)
+        print(f"{count:>9} | {scalar_ms:>16.2f} | {numpy_ms:>13.2f} | {scalar_ms / numpy_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark loggeru — kolik stojí jedna herní událost ve vlákně hry.
+
+Porovnává původní synchronní FileHandler s f-stringem a nový logger
+s frontou a zapisovacím vláknem. Události se posílají tempem 10 000/s
+v dávkách po framech (60 FPS, zbytek framu se spí jako v CLOCK.tick)
+a měří se, kolik hra za událost "zaplatí" ve svém vlákně.
+
+Spustit z kořene projektu: python benchmarks/bench_logger.py
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+os.chdir(tempfile.mkdtemp())  # logs/ se vytvoří v dočasné složce
+
+import logger as game_logger
+
+EVENTS_PER_SEC = 10_000
+FPS = 60
+DURATION_S = 2.0
+
+
+def make_old_logger():
+    """Původní konfigurace: FileHandler zapisuje a flushuje při každé události."""
+    old = logging.getLogger("SpeedHellOld")
+    old.setLevel(logging.DEBUG)
+    old.propagate = False
+    handler = logging.FileHandler(os.path.join("logs", "old.log"), encoding="utf-8")
+    handler.setFormatter(logging.Formatter(fmt="[%(asctime)s] [%(levelname)s] %(message)s", datefmt="%H:%M:%S"))
+    old.addHandler(handler)
+
+    def log_shot_fired(ammo_left):
+        old.debug(f"STŘELBA | zbývá nábojů={ammo_left}")
+    return log_shot_fired, handler
+
+
+def run_paced(log_fn):
+    """Volá log_fn tempem EVENTS_PER_SEC a vrací průměrnou cenu události v µs pro každý frame."""
+    per_frame = EVENTS_PER_SEC // FPS
+    frame_s = 1.0 / FPS
+    samples = []
+    for _ in range(int(DURATION_S * FPS)):
+        t0 = time.perf_counter()
+        for i in range(per_frame):
+            log_fn(i % 10)
+        spent = time.perf_counter() - t0
+        samples.append(spent / per_frame * 1e6)
+        time.sleep(max(0.0, frame_s - spent))
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"{name:<28} průměr {statistics.mean(samples):6.2f} µs/událost | p50 {p50:6.2f} | p99 {p99:6.2f} | nejhorší frame {samples[-1]:6.2f}")
+
+
+def main():
+    print(f"{int(EVENTS_PER_SEC * DURATION_S)} událostí tempem {EVENTS_PER_SEC}/s ({EVENTS_PER_SEC // FPS} za frame)\n")
+    game_logger.mute_console()
+
+    old_fn, old_handler = make_old_logger()
+    report("původní (FileHandler)", run_paced(old_fn))
+    old_handler.close()
+
+    report("nový (fronta + vlákno)", run_paced(game_logger.log_shot_fired))
+    t0 = time.perf_counter()
+    game_logger.shutdown_logging()
+    print(f"\nvyprázdnění fronty při ukončení: {(time.perf_counter() - t0) * 1000:.1f} ms")
+    size = os.path.getsize(game_logger.log_filename)
+    print(f"velikost JSON logu: {size / 1024:.0f} kB ({size / (EVENTS_PER_SEC * DURATION_S):.0f} B/událost)")
+
+
+if __name__ == "__main__":
+    main()
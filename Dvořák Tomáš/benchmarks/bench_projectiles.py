@@ -0,0 +1,134 @@
+"""
+Benchmark střel — původní alokace + list.remove vs. pool + compact().
+
+Simuluje bullet-hell: každý frame se vystřelí SPAWN_PER_FRAME střel
+náhodným směrem, střely letí, dokud neopustí obrazovku, a část z nich
+"zasáhne" cíl dřív. Po náběhu je naživu několik tisíc střel najednou.
+Měří se čas na frame a kolik objektů střel se celkem vytvořilo.
+
+Spustit z kořene projektu: python benchmarks/bench_projectiles.py
+"""
+import gc
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from entity_pool import ObjectPool, compact
+
+WIDTH, HEIGHT = 1920, 1080
+FRAMES = 600
+SPAWN_RATES = [10, 40, 100]  # střel za frame
+HIT_CHANCE = 0.01           # pravděpodobnost, že střela v daném framu něco trefí
+
+
+class OldProjectile:
+    """Původní podoba: nový objekt i nový Rect pro každou střelu, atributy v __dict__."""
+    created = 0
+
+    def __init__(self, x, y, target_x, target_y, speed):
+        OldProjectile.created += 1
+        self.x, self.y = x, y
+        self.prev_x, self.prev_y = x, y
+        dx, dy = target_x - x, target_y - y
+        distance = math.hypot(dx, dy)
+        self.dx = (dx / distance) * speed
+        self.dy = (dy / distance) * speed
+        self.rect = pygame.Rect(0, 0, 20, 8)
+        self.rect.center = (x, y)
+
+    def move(self):
+        self.x += self.dx
+        self.y += self.dy
+        self.rect.center = (int(self.x), int(self.y))
+
+
+class PooledProjectile:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "dx", "dy", "rect", "alive")
+
+    def __init__(self, x, y, target_x, target_y, speed):
+        self.rect = pygame.Rect(0, 0, 20, 8)
+        self.alive = True
+        self.reset(x, y, target_x, target_y, speed)
+
+    def reset(self, x, y, target_x, target_y, speed):
+        self.x, self.y = x, y
+        self.prev_x, self.prev_y = x, y
+        dx, dy = target_x - x, target_y - y
+        distance = math.hypot(dx, dy)
+        self.dx = (dx / distance) * speed
+        self.dy = (dy / distance) * speed
+        self.rect.center = (x, y)
+
+    def move(self):
+        self.x += self.dx
+        self.y += self.dy
+        self.rect.center = (int(self.x), int(self.y))
+
+
+def shots(rng, count):
+    for _ in range(count):
+        angle = rng.uniform(0, math.tau)
+        yield WIDTH / 2, HEIGHT / 2, WIDTH / 2 + math.cos(angle), HEIGHT / 2 + math.sin(angle), rng.uniform(2, 6)
+
+
+def run_old(spawn_per_frame, seed=0):
+    rng = random.Random(seed)
+    projectiles = []
+    OldProjectile.created = 0
+    peak = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for args in shots(rng, spawn_per_frame):
+            projectiles.append(OldProjectile(*args))
+        for p in projectiles[:]:
+            p.move()
+            if not (0 <= p.x <= WIDTH and 0 <= p.y <= HEIGHT):
+                projectiles.remove(p)
+            elif rng.random() < HIT_CHANCE:
+                if p in projectiles: projectiles.remove(p)
+        peak = max(peak, len(projectiles))
+    return (time.perf_counter() - start) / FRAMES * 1000, OldProjectile.created, peak
+
+
+def run_pooled(spawn_per_frame, seed=0):
+    rng = random.Random(seed)
+    pool = ObjectPool(PooledProjectile)
+    projectiles = []
+    peak = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for args in shots(rng, spawn_per_frame):
+            projectiles.append(pool.acquire(*args))
+        for p in projectiles:
+            p.move()
+            if not (0 <= p.x <= WIDTH and 0 <= p.y <= HEIGHT):
+                p.alive = False
+            elif rng.random() < HIT_CHANCE:
+                p.alive = False
+        compact(projectiles, pool)
+        peak = max(peak, len(projectiles))
+    return (time.perf_counter() - start) / FRAMES * 1000, pool.created, peak
+
+
+def main():
+    print(f"{FRAMES} framů, střely letí ze středu obrazovky náhodným směrem\n")
+    print(f"{'střel/frame':>11} | {'naživu max':>10} | {'původní ms/frame':>16} | {'pool ms/frame':>13} | "
+          f"{'zrychlení':>9} | {'objektů původně':>15} | {'objektů s poolem':>16}")
+    print("-" * 108)
+    for rate in SPAWN_RATES:
+        gc.collect()
+        old_ms, old_created, peak = run_old(rate)
+        gc.collect()
+        new_ms, new_created, _ = run_pooled(rate)
+        print(f"{rate:>11} | {peak:>10} | {old_ms:>16.2f} | {new_ms:>13.2f} | {old_ms / new_ms:>8.1f}x | "
+              f"{old_created:>15} | {new_created:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Volitelné NumPy úložiště nepřátel (struct of arrays).
+
+Pozice, rychlosti, HP, velikosti a stav animace všech nepřátel leží
+v NumPy polích. Pohyb (přibližování, útěk ranged nepřítele, střelba)
+i vzájemné odstrkování se pak počítá v jednom ticku pro všechny
+nepřátele najednou místo volání follow() a handle_collision() pro
+každého zvlášť. Objekty v seznamu enemies jsou jen tenké pohledy
+(EnemyView) na jeden řádek polí — zbytek hry (kolize se střelami,
+AoE, kreslení) s nimi pracuje stejně jako s obyčejnými Enemy.
+
+Zapíná se přepínačem --numpy; bez NumPy hra běží se skalárními Enemy.
+"""
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je volitelné
+    np = None
+
+HAS_NUMPY = np is not None
+
+MELEE, RANGED, TANK = 0, 1, 2
+WALK_FRAMES = 5    # Enemy.follow přetáčí animaci chůze po 5 snímcích
+SHOOT_DELAY = 60   # ticků mezi výstřely ranged nepřítele
+
+# Sloupce úložiště: jméno -> typ
+FIELDS = {
+    "x": float, "y": float, "prev_x": float, "prev_y": float,
+    "rect_x": int, "rect_y": int, "rect_w": int, "rect_h": int,
+    "speed": float, "size": float, "hp": int, "kind": int, "alive": bool,
+    "facing": bool, "frame": float, "anim_speed": float, "anim_len": int,
+    "shoot_delay": int, "range": float,
+}
+
+
+def _field(name, cast):
+    def get(self):
+        return cast(getattr(self.store, name)[self.index])
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+    return property(get, set)
+
+
+class EnemyView:
+    """Jeden nepřítel = řádek index v polích EnemyStore. Atributy se čtou a zapisují přímo do polí."""
+    __slots__ = ("store", "index", "rect", "color", "animation_list")
+
+    x = _field("x", float)
+    y = _field("y", float)
+    prev_x = _field("prev_x", float)
+    prev_y = _field("prev_y", float)
+    speed = _field("speed", float)
+    size = _field("size", float)
+    hp = _field("hp", int)
+    alive = _field("alive", bool)
+    facing_right = _field("facing", bool)
+    frame_index = _field("frame", float)
+    animation_speed = _field("anim_speed", float)
+    shoot_delay = _field("shoot_delay", int)
+    range = _field("range", float)
+
+    def __init__(self, store, index, rect, color, animation_list):
+        self.store = store
+        self.index = index
+        self.rect = rect
+        self.color = color
+        self.animation_list = animation_list
+
+
+class EnemyStore:
+    def __init__(self, capacity=64):
+        if np is None:
+            raise ImportError("EnemyStore potřebuje NumPy (pip install numpy)")
+        self.count = 0
+        self.capacity = 0
+        self.views = []  # views[i] je pohled na i-tý řádek (stejné pořadí jako v polích)
+        for name in FIELDS:
+            setattr(self, name, None)
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, dtype in FIELDS.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name)
+            if old is not None:
+                arr[:self.count] = old[:self.count]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, kind, size, speed, hp, rect_size, animation_list=None, animation_speed=0.15,
+            attack_range=0.0, color=None, view_cls=EnemyView):
+        """Přidá nepřítele na konec polí a vrátí jeho pohled (ten se přidá i do self.views)."""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        rect = pygame.Rect(x, y, rect_size[0], rect_size[1])
+        values = {
+            "x": x, "y": y, "prev_x": x, "prev_y": y,
+            "rect_x": rect.x, "rect_y": rect.y, "rect_w": rect.w, "rect_h": rect.h,
+            "speed": speed, "size": size, "hp": hp, "kind": kind, "alive": True,
+            "facing": True, "frame": 0.0, "anim_speed": animation_speed,
+            "anim_len": len(animation_list) if animation_list else WALK_FRAMES,
+            "shoot_delay": 0, "range": attack_range,
+        }
+        for name, value in values.items():
+            getattr(self, name)[i] = value
+        view = view_cls(self, i, rect, color, animation_list)
+        self.views.append(view)
+        self.count += 1
+        return view
+
+    def clear(self):
+        self.count = 0
+        self.views.clear()
+
+    def compact(self):
+        """Odstraní nepřátele s alive == False (pořadí zůstane). Vrací počet odstraněných."""
+        n = self.count
+        keep = self.alive[:n].copy()  # pole alive se v cyklu níže samo přepisuje
+        kept = int(keep.sum())
+        if kept == n:
+            return 0
+        for name in FIELDS:
+            arr = getattr(self, name)
+            arr[:kept] = arr[:n][keep]
+        self.views[:] = [v for v, k in zip(self.views, keep.tolist()) if k]
+        for i, view in enumerate(self.views):
+            view.index = i
+        self.count = kept
+        return n - kept
+
+    def snapshot(self):
+        """Uloží pozice z konce ticku (pro interpolaci při kreslení)."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def sync_rects(self):
+        """Přenese pozice do rectů pohledů (mřížka, kolize a kreslení pracují s pygame.Rect)."""
+        n = self.count
+        self.rect_x[:n] = self.x[:n]  # přetypování na int ořízne stejně jako int(x)
+        self.rect_y[:n] = self.y[:n]
+        for view, rx, ry in zip(self.views, self.rect_x[:n].tolist(), self.rect_y[:n].tolist()):
+            view.rect.topleft = (rx, ry)
+
+    def follow(self, target_x, target_y):
+        """Enemy.follow a RangedEnemy.follow pro všechny nepřátele naráz.
+        Vrací seznam (x, y) ranged nepřátel, kteří v tomto ticku vystřelili (v pořadí polí)."""
+        n = self.count
+        if n == 0:
+            return []
+        x, y = self.x[:n], self.y[:n]
+        facing, frame = self.facing[:n], self.frame[:n]
+        anim_speed, attack_range = self.anim_speed[:n], self.range[:n]
+        ranged = self.kind[:n] == RANGED
+
+        dx = target_x - x
+        dy = target_y - y
+        dist = np.hypot(dx, dy)
+        moving = dist != 0
+        safe_dist = np.where(moving, dist, 1.0)
+        step_x = dx / safe_dist * self.speed[:n]
+        step_y = dy / safe_dist * self.speed[:n]
+
+        # Přibližování k hráči (melee, tank a ranged mimo dostřel)
+        approach = moving & (~ranged | (dist > attack_range))
+        facing[approach & (dx > 5)] = True
+        facing[approach & (dx < -5)] = False
+        x[approach] += step_x[approach]
+        y[approach] += step_y[approach]
+        frame[approach] += anim_speed[approach]
+        frame[approach & (frame >= WALK_FRAMES)] = 0.0
+
+        # Ranged nepřítel moc blízko hráče couvá
+        flee = ranged & moving & (dist < attack_range - 100)
+        x[flee] -= step_x[flee]
+        y[flee] -= step_y[flee]
+        facing[flee] = dx[flee] > 0
+
+        # Ranged: vlastní animace a střelba
+        frame[ranged] += anim_speed[ranged]
+        frame[ranged & (frame >= self.anim_len[:n])] = 0.0
+        delay = self.shoot_delay[:n]
+        delay[ranged] += 1
+        shoot = ranged & (delay >= SHOOT_DELAY)
+        delay[shoot] = 0
+
+        self.sync_rects()
+        if not shoot.any():
+            return []
+        half = self.size[:n][shoot] / 2
+        return list(zip((x[shoot] + half).tolist(), (y[shoot] + half).tolist()))
+
+    def overlapping_pairs(self):
+        """Dvojice (i, j), i != j, jejichž recty se překrývají — každá dvojice jednou.
+        Recty se seřadí podle x a každý se porovná jen s těmi, které začínají před jeho pravým okrajem."""
+        n = self.count
+        rx, ry = self.rect_x[:n], self.rect_y[:n]
+        order = np.argsort(rx, kind="stable")
+        sx = rx[order]
+        hi = np.searchsorted(sx, sx + self.rect_w[:n][order], side="left")
+        counts = np.maximum(hi - np.arange(1, n + 1), 0)
+        total = int(counts.sum())
+        if total == 0:
+            return order[:0], order[:0]
+        a = np.repeat(np.arange(n), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        i, j = order[a], order[a + 1 + offsets]
+        overlap_y = (ry[i] < ry[j] + self.rect_h[:n][j]) & (ry[j] < ry[i] + self.rect_h[:n][i])
+        return i[overlap_y], j[overlap_y]
+
+    def separate(self, force=8):
+        """Odstrkování překrývajících se nepřátel — handle_collision pro všechny dvojice naráz.
+        Původní smyčka zpracuje každou dvojici dvakrát (e s other i other s e), proto 2 * force."""
+        n = self.count
+        if n < 2:
+            return
+        i, j = self.overlapping_pairs()
+        if i.size == 0:
+            return
+
+        x, y, size = self.x[:n], self.y[:n], self.size[:n]
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        dist = np.hypot(dx, dy)
+        close = dist < (size[i] + size[j]) / 2
+        i, j, dx, dy, dist = i[close], j[close], dx[close], dy[close], dist[close]
+        dist[dist == 0] = 0.1  # jako v handle_collision (posun je pak nulový)
+        push_x = 2 * force / dist * dx
+        push_y = 2 * force / dist * dy
+        x += np.bincount(i, weights=push_x, minlength=n) - np.bincount(j, weights=push_x, minlength=n)
+        y += np.bincount(i, weights=push_y, minlength=n) - np.bincount(j, weights=push_y, minlength=n)
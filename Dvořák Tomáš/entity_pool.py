@@ -0,0 +1,58 @@
+"""
+Znovupoužívání objektů (pool) a mazání ze seznamů bez list.remove.
+
+Při bullet-hell situaci vznikají a zanikají stovky střel za sekundu.
+Místo nového objektu pro každou střelu se bere "mrtvý" objekt z poolu
+a jen se mu přenastaví hodnoty (metoda reset). Objekty se ze seznamu
+nemažou během procházení — jen se označí alive = False a po průchodu
+je compact() odstraní v jednom průchodu (O(n) místo O(n) za každé
+smazání) a vrátí do poolu. Pořadí živých objektů zůstává stejné.
+"""
+
+
+class ObjectPool:
+    def __init__(self, factory, max_free=4096):
+        self.factory = factory      # třída (nebo funkce) se stejnými argumenty jako reset()
+        self.max_free = max_free    # víc volných objektů se nedrží, zbytek uklidí GC
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        """Vrátí živý objekt — znovu použitý z poolu, nebo nový."""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        obj.alive = True
+        return obj
+
+    def release(self, obj):
+        obj.alive = False
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, items):
+        """Vrátí do poolu všechny objekty ze seznamu a seznam vyprázdní (na místě)."""
+        for obj in items:
+            self.release(obj)
+        items.clear()
+
+
+def compact(items, pool=None):
+    """Odstraní ze seznamu objekty s alive == False (na místě, pořadí zůstane).
+    Odstraněné vrátí do poolu, pokud je zadaný. Vrací počet odstraněných."""
+    write = 0
+    for obj in items:
+        if obj.alive:
+            items[write] = obj
+            write += 1
+        elif pool is not None:
+            pool.release(obj)
+    removed = len(items) - write
+    if removed:
+        del items[write:]
+    return removed
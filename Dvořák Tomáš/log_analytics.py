@@ -0,0 +1,295 @@
+"""
+Analýza herních logů ze složky logs/.
+
+Projde všechny logs/session_*.log (včetně rotovaných .log.1, .log.2 ...),
+řádek po řádku — soubor se nikdy nenačítá celý. Umí nový JSON formát
+i starší textové logy. Výsledek každého souboru se uloží do cache podle
+mtime a velikosti, takže opakované spuštění zpracuje jen nové soubory.
+Hra může přes rotaci pokračovat do dalšího souboru; první vyčištění
+v něm se dopočítá až podle předchozího souboru stejné session.
+
+Spustit:  python log_analytics.py [--logs logs] [--jobs 4] [--json]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+from collections import Counter
+from multiprocessing import Pool
+
+CACHE_NAME = ".analytics_cache.json"
+CACHE_VERSION = 2
+DEATH_CELL = 100  # velikost buňky mapy smrtí v pixelech
+CLEAR_BUCKET_MS = 5000  # histogram časů vyčištění místnosti po 5 s
+
+# Starší textový formát: "[12:00:01] [INFO] MÍSTNOST VYČIŠTĚNA | místnost=1 | čas=41:234"
+TEXT_ROOM_CLEARED = re.compile(r"MÍSTNOST VYČIŠTĚNA \| místnost=(\d+) \| čas=(\d+):(\d+)")
+TEXT_AOE = re.compile(r"AOE SCHOPNOST \| zabito nepřátel=(\d+)")
+TEXT_DEATH = re.compile(r"HRÁČ ZEMŘEL \| místnost=(\d+)")
+TEXT_GAME_OVER = re.compile(r"KONEC HRY \[(\w+)\]")
+
+
+def empty_summary():
+    return {
+        "files": 0,
+        "lines": 0,
+        "games": 0,
+        "victories": 0,
+        "room_clears": {},   # místnost -> {"count", "total_ms", "min_ms", "max_ms", "hist"}
+        "aoe_kills": {},     # počet zabitých jednou AoE -> kolikrát
+        "deaths_by_room": {},
+        "death_cells": {},   # "x,y" (buňka DEATH_CELL px) -> počet smrtí
+    }
+
+
+def _add_clear(summary, room, duration_ms):
+    stats = summary["room_clears"].setdefault(str(room), {
+        "count": 0, "total_ms": 0, "min_ms": None, "max_ms": None, "hist": {},
+    })
+    stats["count"] += 1
+    stats["total_ms"] += duration_ms
+    stats["min_ms"] = duration_ms if stats["min_ms"] is None else min(stats["min_ms"], duration_ms)
+    stats["max_ms"] = duration_ms if stats["max_ms"] is None else max(stats["max_ms"], duration_ms)
+    bucket = str(duration_ms // CLEAR_BUCKET_MS * CLEAR_BUCKET_MS)
+    stats["hist"][bucket] = stats["hist"].get(bucket, 0) + 1
+
+
+def _inc(counter, key, amount=1):
+    key = str(key)
+    counter[key] = counter.get(key, 0) + amount
+
+
+def parse_line(line):
+    """Vrátí (událost, data) nebo None. Zvládá JSON i starý textový řádek."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return None  # useknutý řádek
+        event = data.get("ev")
+        return (event, data) if event else None
+
+    m = TEXT_ROOM_CLEARED.search(line)
+    if m:
+        return "room_cleared", {"room": int(m.group(1)), "time_ms": int(m.group(2)) * 1000 + int(m.group(3))}
+    m = TEXT_AOE.search(line)
+    if m:
+        return "aoe", {"killed": int(m.group(1))}
+    m = TEXT_DEATH.search(line)
+    if m:
+        return "player_death", {"room": int(m.group(1))}
+    m = TEXT_GAME_OVER.search(line)
+    if m:
+        return "game_over", {"victory": m.group(1) == "VÝHRA"}
+    return None
+
+
+def analyze_file(path):
+    """Zpracuje jeden soubor (streamovaně) a vrátí jeho souhrn.
+
+    Soubor po rotaci může začínat uprostřed hry — čas předchozího vyčištění
+    pak není známý. Takové první vyčištění se nezapočítá hned, ale uloží do
+    summary["carry"]["first"] a dopočítá se v analyze_logs podle
+    summary["carry"]["last"] předchozího souboru (None = soubor stav nezměnil).
+    """
+    summary = empty_summary()
+    summary["files"] = 1
+    prev_clear_ms = None  # čas (kumulativní) předchozího vyčištění ve stejné hře, None = neznámý
+    first_clear = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            summary["lines"] += 1
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            event, data = parsed
+            if event == "room_cleared":
+                if data["room"] == 1:
+                    prev_clear_ms = 0
+                if prev_clear_ms is None:
+                    first_clear = [data["room"], data["time_ms"]]
+                else:
+                    _add_clear(summary, data["room"], max(0, data["time_ms"] - prev_clear_ms))
+                prev_clear_ms = data["time_ms"]
+            elif event == "aoe":
+                _inc(summary["aoe_kills"], data["killed"])
+            elif event == "player_death":
+                _inc(summary["deaths_by_room"], data["room"])
+                if data.get("x") is not None and data.get("y") is not None:
+                    cell = f"{int(data['x']) // DEATH_CELL},{int(data['y']) // DEATH_CELL}"
+                    _inc(summary["death_cells"], cell)
+            elif event == "game_over":
+                summary["games"] += 1
+                if data.get("victory"):
+                    summary["victories"] += 1
+                prev_clear_ms = 0
+    summary["carry"] = {"first": first_clear, "last": prev_clear_ms}
+    return summary
+
+
+def segment_order(name):
+    """(session, pořadí) souboru — rotace přejmenuje .log na .log.1, .log.1 na .log.2 atd.,
+    takže nejstarší je nejvyšší číslo a aktuální .log je poslední."""
+    base, _, suffix = name.partition(".log")
+    number = int(suffix[1:]) if suffix[1:].isdigit() else 0
+    return base, -number
+
+
+def add_carried_clears(total, entries):
+    """Dopočítá první vyčištění souborů, které začínají uprostřed hry, podle
+    posledního vyčištění předchozího souboru stejné session. Když předchozí
+    soubor chybí (smazaný rotací), vyčištění se nezapočítá."""
+    prev_session, last = None, None
+    for name in sorted(entries, key=segment_order):
+        session = segment_order(name)[0]
+        if session != prev_session:
+            prev_session, last = session, None
+        carry = entries[name]["summary"]["carry"]
+        if carry["first"] is not None and last is not None:
+            room, time_ms = carry["first"]
+            _add_clear(total, room, max(0, time_ms - last))
+        if carry["last"] is not None:
+            last = carry["last"]
+
+
+def merge(total, part):
+    for key in ("files", "lines", "games", "victories"):
+        total[key] += part[key]
+    for room, stats in part["room_clears"].items():
+        t = total["room_clears"].get(room)
+        if t is None:
+            total["room_clears"][room] = json.loads(json.dumps(stats))
+            continue
+        t["count"] += stats["count"]
+        t["total_ms"] += stats["total_ms"]
+        t["min_ms"] = min(t["min_ms"], stats["min_ms"])
+        t["max_ms"] = max(t["max_ms"], stats["max_ms"])
+        for bucket, n in stats["hist"].items():
+            _inc(t["hist"], bucket, n)
+    for key in ("aoe_kills", "deaths_by_room", "death_cells"):
+        for k, n in part[key].items():
+            _inc(total[key], k, n)
+    return total
+
+
+def find_log_files(log_dir):
+    return sorted(glob.glob(os.path.join(log_dir, "session_*.log")) +
+                  glob.glob(os.path.join(log_dir, "session_*.log.*")))
+
+
+def load_cache(log_dir):
+    try:
+        with open(os.path.join(log_dir, CACHE_NAME), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(log_dir, files):
+    path = os.path.join(log_dir, CACHE_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def analyze_logs(log_dir="logs", jobs=1):
+    """Vrátí (souhrn všech logů, počet souborů zpracovaných znovu)."""
+    cache = load_cache(log_dir)
+    new_cache = {}
+    todo = []
+    for path in find_log_files(log_dir):
+        st = os.stat(path)
+        name = os.path.basename(path)
+        entry = cache.get(name)
+        if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+            new_cache[name] = entry
+        else:
+            todo.append((path, name, st.st_mtime, st.st_size))
+
+    paths = [t[0] for t in todo]
+    if jobs > 1 and len(paths) > 1:
+        with Pool(jobs) as pool:
+            summaries = pool.map(analyze_file, paths, chunksize=max(1, len(paths) // (jobs * 4)))
+    else:
+        summaries = [analyze_file(p) for p in paths]
+    for (path, name, mtime, size), summary in zip(todo, summaries):
+        new_cache[name] = {"mtime": mtime, "size": size, "summary": summary}
+
+    if todo or len(new_cache) != len(cache):
+        save_cache(log_dir, new_cache)
+
+    total = empty_summary()
+    for entry in new_cache.values():
+        merge(total, entry["summary"])
+    add_carried_clears(total, new_cache)
+    return total, len(todo)
+
+
+def hist_median(hist):
+    """Medián z histogramu (dolní hranice koše, ve kterém leží)."""
+    items = sorted((int(k), n) for k, n in hist.items())
+    half = sum(n for _, n in items) / 2
+    seen = 0
+    for bucket, n in items:
+        seen += n
+        if seen >= half:
+            return bucket
+    return 0
+
+
+def format_ms(ms):
+    return f"{ms // 1000}:{ms % 1000:03d}"
+
+
+def print_report(total, reprocessed):
+    print(f"Souborů: {total['files']} (znovu zpracováno {reprocessed}), řádků: {total['lines']}")
+    print(f"Her: {total['games']}, výher: {total['victories']}")
+
+    print("\nČasy vyčištění místností:")
+    for room in sorted(total["room_clears"], key=int):
+        s = total["room_clears"][room]
+        avg = s["total_ms"] // s["count"]
+        print(f"  místnost {room}: {s['count']}× | průměr {format_ms(avg)} | min {format_ms(s['min_ms'])}"
+              f" | max {format_ms(s['max_ms'])} | medián ~{hist_median(s['hist']) // 1000} s")
+
+    print("\nZabití jednou AoE:")
+    aoe = total["aoe_kills"]
+    uses = sum(aoe.values())
+    for kills in sorted(aoe, key=int):
+        print(f"  {kills} nepřátel: {aoe[kills]}× ({aoe[kills] / uses * 100:.1f} %)")
+
+    print("\nSmrti podle místnosti:")
+    for room in sorted(total["deaths_by_room"], key=int):
+        print(f"  místnost {room}: {total['deaths_by_room'][room]}×")
+
+    if total["death_cells"]:
+        print(f"\nNejčastější místa smrti (buňky {DEATH_CELL} px):")
+        for cell, n in Counter(total["death_cells"]).most_common(5):
+            cx, cy = (int(v) for v in cell.split(","))
+            print(f"  x {cx * DEATH_CELL}-{(cx + 1) * DEATH_CELL}, y {cy * DEATH_CELL}-{(cy + 1) * DEATH_CELL}: {n}×")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiky ze session logů Speed Hell")
+    parser.add_argument("--logs", default="logs", help="složka s logy")
+    parser.add_argument("--jobs", type=int, default=1, help="počet procesů pro zpracování souborů")
+    parser.add_argument("--json", action="store_true", help="vypsat souhrn jako JSON")
+    args = parser.parse_args()
+
+    total, reprocessed = analyze_logs(args.logs, jobs=args.jobs)
+    if args.json:
+        print(json.dumps(total, ensure_ascii=False, indent=2))
+    else:
+        print_report(total, reprocessed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import time
 from datetime import datetime
 
 # --- Vytvoření složky pro logy ---
@@ -9,64 +14,217 @@ os.makedirs(LOG_DIR, exist_ok=True)
 # Název souboru podle aktuálního data a času
 log_filename = os.path.join(LOG_DIR, f"session_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
 
+# Rotace souboru — po 5 MB nebo po hodině, ponechá se 5 starších souborů
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_MAX_AGE_S = 60 * 60
+LOG_BACKUP_COUNT = 5
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Jeden záznam = jeden kompaktní JSON řádek, např.
+    {"ts":1712345678.123,"lvl":"INFO","ev":"room_cleared","room":1,"time_ms":41234}
+    """
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "lvl": record.levelname}
+        event = getattr(record, "event", None)
+        if event is not None:
+            data["ev"] = event
+            data.update(record.fields)
+        else:
+            data["msg"] = record.getMessage()
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Zapisuje do bufferu a na disk ho posílá nejvýš jednou za flush_interval
+    (varování a chyby hned). Když další záznam nepřijde, buffer zapíše
+    EventQueueListener přes flush_pending(). Rotuje podle velikosti i stáří souboru."""
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, max_age_s=LOG_MAX_AGE_S,
+                 backup_count=LOG_BACKUP_COUNT, flush_interval=1.0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding="utf-8", delay=True)
+        self.max_age_s = max_age_s
+        self.flush_interval = flush_interval
+        self.opened_at = time.monotonic()
+        self.last_flush = time.monotonic()
+        self.pending = False  # v bufferu jsou záznamy, které ještě nejsou na disku
+
+    def shouldRollover(self, record):
+        # Velikost se bere z pozice v souboru — záznam se kvůli tomu neformátuje dvakrát
+        if self.stream is None:
+            return False
+        if self.maxBytes > 0 and self.stream.tell() >= self.maxBytes:
+            return True
+        return self.max_age_s > 0 and time.monotonic() - self.opened_at >= self.max_age_s
+
+    def doRollover(self):
+        super().doRollover()
+        self.opened_at = time.monotonic()
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+                self.opened_at = time.monotonic()
+            self.stream.write(self.format(record) + self.terminator)
+            self.pending = True
+            if record.levelno >= logging.WARNING or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        super().flush()
+        self.pending = False
+        self.last_flush = time.monotonic()
+
+    def flush_pending(self):
+        """Zapíše buffer, pokud v něm něco čeká (hra je v pauze/menu a nic dalšího nelogne)."""
+        if self.pending:
+            self.flush()
+
+
+class EventQueueListener(logging.handlers.QueueListener):
+    """Z fronty bere buď hotové LogRecordy (běžné logger.info...), nebo lehké n-tice
+    herních událostí, ze kterých LogRecord vyrobí až tady — ve vlákně na pozadí.
+    Když je fronta flush_interval prázdná, zapíše buffery handlerů na disk."""
+    def __init__(self, queue, *handlers, respect_handler_level=False, flush_interval=1.0):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        # Druhé stop() by čekalo na vlákno, které už neběží
+        if self.running:
+            self.running = False
+            super().stop()
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    if isinstance(handler, BufferedRotatingFileHandler):
+                        handler.flush_pending()
+
+    def prepare(self, item):
+        if isinstance(item, tuple):
+            created, level, event, template, args, fields = item
+            record = logger.makeRecord(logger.name, level, "(game)", 0, template, args, None,
+                                       extra={"event": event, "fields": fields})
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            return record
+        return item
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler, který zprávu neformátuje ve vlákně hry — to udělá až zapisovací vlákno.
+    Argumenty herních událostí jsou jen čísla a řetězce, takže je lze poslat dál beze změny."""
+    def prepare(self, record):
+        return record
+
+
 # --- Konfigurace loggeru ---
 logger = logging.getLogger("SpeedHell")
 logger.setLevel(logging.DEBUG)
+logger.propagate = False
 
-# Formát zpráv
+# Formát zpráv pro konzoli
 formatter = logging.Formatter(
     fmt="[%(asctime)s] [%(levelname)s] %(message)s",
     datefmt="%H:%M:%S"
 )
 
-# Handler pro soubor
-file_handler = logging.FileHandler(log_filename, encoding="utf-8")
+# Handler pro soubor (JSON lines, zapisuje vlákno listeneru)
+file_handler = BufferedRotatingFileHandler(log_filename)
 file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
+file_handler.setFormatter(JsonLinesFormatter())
 
 # Handler pro konzoli (jen INFO a výše)
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# Hra jen vloží záznam do fronty, zápis na disk i do konzole dělá vlákno na pozadí
+log_queue = queue.SimpleQueue()
+queue_handler = LazyQueueHandler(log_queue)
+logger.addHandler(queue_handler)
+
+listener = EventQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True,
+                              flush_interval=file_handler.flush_interval)
+listener.start()
+
+
+def shutdown_logging():
+    """Vyprázdní frontu a zavře soubor (volá se automaticky při ukončení)."""
+    if listener.running:
+        listener.stop()
+    file_handler.close()
+
+atexit.register(shutdown_logging)
+
+
+def mute_console():
+    """Vypne výpis do konzole (headless simulace tisíců her)."""
+    console_handler.setLevel(logging.CRITICAL + 1)
+
+
+def _event(level, event, template, args, **fields):
+    # Ve vlákně hry jen n-tice do fronty — LogRecord i text zprávy (lazy %-formát)
+    # vyrobí až zapisovací vlákno
+    if logger.isEnabledFor(level):
+        log_queue.put((time.time(), level, event, template, args, fields))
 
 
 # --- Herní události ---
 
-def log_player_death(room: int, score: int, time_ms: int):
-    logger.warning(
-        f"HRÁČ ZEMŘEL | místnost={room} | skóre={score} | čas={time_ms // 1000}:{time_ms % 1000:03d}"
-    )
+def log_player_death(room: int, score: int, time_ms: int, x: int = None, y: int = None):
+    # x, y = pozice hráče v okamžiku smrti (pro mapu smrtí v log_analytics.py)
+    _event(logging.WARNING, "player_death",
+           "HRÁČ ZEMŘEL | místnost=%d | skóre=%d | čas=%d:%03d",
+           (room, score, time_ms // 1000, time_ms % 1000),
+           room=room, score=score, time_ms=time_ms, x=x, y=y)
 
 def log_room_cleared(room: int, time_ms: int):
-    logger.info(
-        f"MÍSTNOST VYČIŠTĚNA | místnost={room} | čas={time_ms // 1000}:{time_ms % 1000:03d}"
-    )
+    _event(logging.INFO, "room_cleared",
+           "MÍSTNOST VYČIŠTĚNA | místnost=%d | čas=%d:%03d",
+           (room, time_ms // 1000, time_ms % 1000),
+           room=room, time_ms=time_ms)
 
 def log_room_entered(room: int):
-    logger.info(f"VSTUP DO MÍSTNOSTI | místnost={room}")
+    _event(logging.INFO, "room_entered", "VSTUP DO MÍSTNOSTI | místnost=%d", (room,), room=room)
 
 def log_game_over(victory: bool, score: int, time_ms: int):
-    result = "VÝHRA" if victory else "PROHRA"
-    logger.info(
-        f"KONEC HRY [{result}] | skóre={score} | celkový čas={time_ms // 1000}:{time_ms % 1000:03d}"
-    )
+    _event(logging.INFO, "game_over",
+           "KONEC HRY [%s] | skóre=%d | celkový čas=%d:%03d",
+           ("VÝHRA" if victory else "PROHRA", score, time_ms // 1000, time_ms % 1000),
+           victory=victory, score=score, time_ms=time_ms)
 
 
 # --- Hráčovy akce ---
 
 def log_shot_fired(ammo_left: int):
-    logger.debug(f"STŘELBA | zbývá nábojů={ammo_left}")
+    _event(logging.DEBUG, "shot", "STŘELBA | zbývá nábojů=%d", (ammo_left,), ammo_left=ammo_left)
 
 def log_reload(ammo: int):
-    logger.debug(f"PŘEBITÍ | náboje obnoveny na {ammo}")
+    _event(logging.DEBUG, "reload", "PŘEBITÍ | náboje obnoveny na %d", (ammo,), ammo=ammo)
 
 def log_dash():
-    logger.debug("DASH | hráč použil dash")
+    _event(logging.DEBUG, "dash", "DASH | hráč použil dash", ())
 
 def log_aoe_used(enemies_killed: int, time_ms: int):
-    logger.info(
-        f"AOE SCHOPNOST | zabito nepřátel={enemies_killed} | čas={time_ms // 1000}:{time_ms % 1000:03d}"
-    )
+    _event(logging.INFO, "aoe",
+           "AOE SCHOPNOST | zabito nepřátel=%d | čas=%d:%03d",
+           (enemies_killed, time_ms // 1000, time_ms % 1000),
+           killed=enemies_killed, time_ms=time_ms)
@@ -1,13 +1,39 @@
-import pygame
+import argparse
+import os
 import sys
+
+# --- Parametry příkazové řádky ---
+# python main.py --headless --runs 500   -> simulace bez okna pro testování balancu
+arg_parser = argparse.ArgumentParser(description="Speed Hell")
+arg_parser.add_argument("--headless", action="store_true", help="simulace bez okna a bez vykreslování")
+arg_parser.add_argument("--runs", type=int, default=100, help="počet odsimulovaných her v headless režimu")
+arg_parser.add_argument("--seed", type=int, default=None, help="seed náhody pro opakovatelné běhy")
+arg_parser.add_argument("--max-minutes", type=float, default=10, help="limit herního času jednoho běhu")
+arg_parser.add_argument("--numpy", action="store_true", help="nepřátelé v NumPy polích (rychlejší při stovkách nepřátel)")
+ARGS, _ = arg_parser.parse_known_args()
+HEADLESS = ARGS.headless
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
 import math
 import random
-import requests
+import time
+from collections import defaultdict
 from logger import (
+    mute_console,
     log_shot_fired, log_reload, log_dash, log_aoe_used,
     log_player_death, log_room_cleared, log_room_entered,
     log_game_over
 )
+from spatial_grid import SpatialGrid
+from entity_pool import ObjectPool, compact
+from enemy_soa import EnemyStore, EnemyView, HAS_NUMPY, MELEE, RANGED, TANK
+from transform_cache import TransformCache
+from asset_manager import AssetManager
+from timestep import FixedTimestep, FIXED_DT_MS, interp_offset
+from score_uploader import ScoreUploader
 
 # --- Inicializace ---
 pygame.init()
@@ -15,6 +41,9 @@ SCREEN = pygame.display.set_mode((1920, 1080))
 WIDTH, HEIGHT = 1920, 1080
 pygame.display.set_caption("Speed Hell - Pygame Edition")
 CLOCK = pygame.time.Clock()
+SIM_CLOCK = FixedTimestep()  # Herní čas — simulace běží pevně 60 ticků za sekundu
+score_uploader = ScoreUploader()  # Komunikace se serverem na pozadí (login, výsledky)
+SPRITE_CACHE = TransformCache()  # Sdílená cache otočených/zrcadlených spritů
 
 # --- Barvy ---
 WHITE = (255, 255, 255)
@@ -47,6 +76,7 @@ show_login = False
 user_name = ""
 user_pass = ""
 active_field = "name"
+login_future = None  # Běžící ověření přihlášení na pozadí
 MAX_ENEMIES = 15
 spawn_cooldown = 500
 last_spawn_time = 0
@@ -57,23 +87,72 @@ accumulated_time = 0
 total_spawned = 0
 arena_start_time = 0
 elapsed_ms = 0
+total_elapsed_ms = 0
 game_start_time = 0
 starter_timer = 0
 room_cleared = False
 time_str = "TIME: 0:000"
+show_debug = False  # F3 — ladicí overlay s počítadly vykreslování
+USE_ARENA_CACHE = True  # False = staré vykreslování dlaždic každý frame (pro porovnání)
+
+# --- Instrumentace vykreslování ---
+render_stats = {"bg_blits": 0, "last_bg_blits": 0}
+
+# --- Obrázky ---
+# Soubory se dekódují ve vláknech na pozadí; animace se čtou líně až při prvním použití
+# a po prvním spuštění se všechno načítá z atlasu v cache/ (viz asset_manager.py)
+ASSETS = AssetManager()
+ASSETS.add("wall_top", ["assets/map/walls/tile033.png"])
+ASSETS.add("wall_bottom", ["assets/map/walls/tile026.png"])
+ASSETS.add("wall_left", ["assets/map/walls/tile013.png"])
+ASSETS.add("wall_right", ["assets/map/walls/tile016.png"])
+ASSETS.add("floor", ["assets/map/walls/tile017.png"])
+ASSETS.add("bullet", ["assets/player/attack/tile000.png"], size=(30, 30))
+PLAYER_WALK_IMAGES = ASSETS.add("player_walk", [f"assets/player/tile{i:03d}.png" for i in range(6)], size=(160, 160))
+PLAYER_HURT_IMAGES = ASSETS.add("player_hurt", [f"assets/player/hurt/tile{i:03d}.png" for i in range(4)], size=(160, 160))
+PLAYER_DEATH_IMAGES = ASSETS.add("player_death", [f"assets/player/death/tile{i:03d}.png" for i in range(8)], size=(160, 160))
+# Animace AoE schopnosti (frame0000.png až frame0015.png)
+AOE_FRAMES = ASSETS.add("aoe", [f"assets/player/attack/ability/frame{i:04d}.png" for i in range(16)])
+ENEMY_RED_WALK = ASSETS.add("enemy_melee", [f"assets/enemies/melee/tile{i:03d}.png" for i in range(18, 24)],
+                            size=(120, 120), optional=True)
+ENEMY_YELLOW_WALK = ASSETS.add("enemy_range", [f"assets/enemies/range/tile{i:03d}.png" for i in range(18, 24)],
+                               size=(120, 120), optional=True)
+ENEMY_TANK_WALK = ASSETS.add("enemy_tank", [f"assets/enemies/tank/tile{i:03d}.png" for i in range(18, 24)],
+                             size=(140, 140), optional=True)
+# Animace střely ranged nepřítele (tile000 až tile047)
+ENEMY_RANGE_ATTACK_FRAMES = ASSETS.add("enemy_range_attack", [f"assets/enemies/range/attack/tile{i:03d}.png" for i in range(48)],
+                                       size=(40, 40), optional=True)
+ASSETS.start()
 
-# Načtení surových obrázků
-WALL_TOP_RAW = pygame.image.load("assets/map/walls/tile033.png").convert_alpha()
-WALL_BOTTOM_RAW = pygame.image.load("assets/map/walls/tile026.png").convert_alpha()
-WALL_LEFT_RAW = pygame.image.load("assets/map/walls/tile013.png").convert_alpha()
-WALL_RIGHT_RAW = pygame.image.load("assets/map/walls/tile016.png").convert_alpha()
-FLOOR_RAW = pygame.image.load("assets/map/walls/tile017.png").convert_alpha()
+font = pygame.font.SysFont("arial", 28)
+title_font = pygame.font.SysFont("arial", 80, bold=True)
 
-# Animace AoE schopnosti (frame0000.png až frame0015.png)
-AOE_FRAMES = []
-for _i in range(16):
-    _img = pygame.image.load(f"assets/player/attack/ability/frame{_i:04d}.png").convert_alpha()
-    AOE_FRAMES.append(_img)
+def show_loading_screen(names):
+    """Dokud nejsou hotové obrázky potřebné pro první snímek, kreslí ukazatel načítání (okno reaguje)."""
+    if HEADLESS:
+        return
+    while not ASSETS.ready(names):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        done, total = ASSETS.poll()
+        SCREEN.fill(GRAY)
+        txt = font.render("Načítání...", True, WHITE)
+        SCREEN.blit(txt, (WIDTH // 2 - txt.get_width() // 2, HEIGHT // 2 - 60))
+        pygame.draw.rect(SCREEN, DARK_RED, (WIDTH // 2 - 200, HEIGHT // 2, 400, 20), 2)
+        pygame.draw.rect(SCREEN, HOVER_RED, (WIDTH // 2 - 198, HEIGHT // 2 + 2, 396 * done // total, 16))
+        pygame.display.flip()
+        CLOCK.tick(60)
+
+# Zdi, podlahu a střelu potřebuje hned první snímek, zbytek se dočte na pozadí
+show_loading_screen(["wall_top", "wall_bottom", "wall_left", "wall_right", "floor", "bullet"])
+WALL_TOP_RAW = ASSETS.image("wall_top")
+WALL_BOTTOM_RAW = ASSETS.image("wall_bottom")
+WALL_LEFT_RAW = ASSETS.image("wall_left")
+WALL_RIGHT_RAW = ASSETS.image("wall_right")
+FLOOR_RAW = ASSETS.image("floor")
+BULLET_IMG = ASSETS.image("bullet")
 
 FLOOR_TILE_SIZE = 64  # Velikost jedné dlaždice podlahy v pixelech — uprav dle libosti
 
@@ -82,6 +161,7 @@ floor_tile = None
 def update_floor_texture():
     global floor_tile
     floor_tile = pygame.transform.scale(FLOOR_RAW, (FLOOR_TILE_SIZE, FLOOR_TILE_SIZE))
+    invalidate_arena_cache()
 
 def draw_floor(surface):
     """Vykreslí podlahu dlaždicováním uvnitř arény (bez borderu)."""
@@ -97,6 +177,7 @@ def draw_floor(surface):
     for row in range(rows):
         for col in range(cols):
             surface.blit(floor_tile, (x0 + col * FLOOR_TILE_SIZE, y0 + row * FLOOR_TILE_SIZE))
+    render_stats["bg_blits"] += rows * cols
     surface.set_clip(old_clip)
 
 wall_top, wall_bottom, wall_left, wall_right = None, None, None, None
@@ -115,6 +196,7 @@ def update_wall_textures():
     tile_h = max(1, int(orig_h2 * scale_w * TILE_SCALE))
     wall_left  = pygame.transform.scale(WALL_LEFT_RAW,  (BORDER_THICKNESS, tile_h))
     wall_right = pygame.transform.scale(WALL_RIGHT_RAW, (BORDER_THICKNESS, tile_h))
+    invalidate_arena_cache()
 
 def draw_tiled_wall(surface, tile, x, y, total_w, total_h):
     """Vykreslí dlaždice opakováním tile po celé ploše (x, y, total_w, total_h)."""
@@ -128,54 +210,50 @@ def draw_tiled_wall(surface, tile, x, y, total_w, total_h):
     for row in range(rows):
         for col in range(cols):
             surface.blit(tile, (x + col * tw, y + row * th))
+    render_stats["bg_blits"] += rows * cols
     surface.set_clip(old_clip)
 
-update_wall_textures()
-update_floor_texture()
+# --- Cache pozadí arény ---
+# Podlaha a zdi se mění jen při otevření dveří nebo změně rozlišení,
+# proto se složí do jednoho surface a každý frame se blitne jen ten.
+arena_cache = {}  # (WIDTH, HEIGHT, FLOOR_TILE_SIZE, TILE_SCALE, door_open) -> Surface
 
-def load_player_animations(path_prefix, count, size):
-    images = []
-    for i in range(count):
-        img = pygame.image.load(f"{path_prefix}{i:03d}.png").convert_alpha()
-        img = pygame.transform.scale(img, size)
-        images.append(img)
-    return images
-
-PLAYER_WALK_IMAGES = load_player_animations("assets/player/tile", 6, (160, 160))
-PLAYER_HURT_IMAGES = load_player_animations("assets/player/hurt/tile", 4, (160, 160))
-PLAYER_DEATH_IMAGES = load_player_animations("assets/player/death/tile", 8, (160, 160))
-BULLET_IMG = pygame.image.load("assets/player/attack/tile000.png").convert_alpha()
-BULLET_IMG = pygame.transform.scale(BULLET_IMG, (30, 30))
-
-def load_enemy_animations(path_prefix, start_idx, count, size):
-    images = []
-    for i in range(start_idx, start_idx + count):
-        full_path = f"{path_prefix}tile{i:03d}.png"
-        try:
-            img = pygame.image.load(full_path).convert_alpha()
-            img = pygame.transform.scale(img, size)
-            images.append(img)
-        except pygame.error:
-            print(f"Varování: Soubor {full_path} nebyl nalezen!")
-    return images
-
-ENEMY_RED_WALK = load_enemy_animations("assets/enemies/melee/", 18, 6, (120, 120))
-ENEMY_YELLOW_WALK = load_enemy_animations("assets/enemies/range/", 18, 6, (120, 120))
-ENEMY_TANK_WALK = load_enemy_animations("assets/enemies/tank/", 18, 6, (140, 140))
+def invalidate_arena_cache():
+    arena_cache.clear()
 
-# Animace střely ranged nepřítele (tile000 až tile047)
-ENEMY_RANGE_ATTACK_FRAMES = []
-for _i in range(48):
-    _path = f"assets/enemies/range/attack/tile{_i:03d}.png"
-    try:
-        _img = pygame.image.load(_path).convert_alpha()
-        _img = pygame.transform.scale(_img, (40, 40))
-        ENEMY_RANGE_ATTACK_FRAMES.append(_img)
-    except pygame.error:
-        print(f"Varování: {_path} nebyl nalezen!")
+def draw_arena_tiles(surface, door_open):
+    """Vykreslí podlahu a všechny čtyři zdi (pravá s dveřmi, pokud jsou otevřené)."""
+    d_h = HEIGHT // 4
+    draw_floor(surface)
+    draw_tiled_wall(surface, wall_top,    0, 0,                         WIDTH,            BORDER_THICKNESS)
+    draw_tiled_wall(surface, wall_bottom, 0, HEIGHT - BORDER_THICKNESS, WIDTH,            BORDER_THICKNESS)
+    draw_tiled_wall(surface, wall_left,   0, 0,                         BORDER_THICKNESS, HEIGHT)
 
-font = pygame.font.SysFont("arial", 28)
-title_font = pygame.font.SysFont("arial", 80, bold=True)
+    if not door_open:
+        draw_tiled_wall(surface, wall_right, WIDTH - BORDER_THICKNESS, 0, BORDER_THICKNESS, HEIGHT)
+    else:
+        door_top = HEIGHT // 2 - d_h // 2
+        door_bottom = HEIGHT // 2 + d_h // 2
+        draw_tiled_wall(surface, wall_right, WIDTH - BORDER_THICKNESS, 0,           BORDER_THICKNESS, door_top)
+        draw_tiled_wall(surface, wall_right, WIDTH - BORDER_THICKNESS, door_bottom, BORDER_THICKNESS, HEIGHT - door_bottom)
+
+def draw_arena(surface, door_open):
+    """Vykreslí pozadí arény — z cache jedním blitem, nebo po dlaždicích."""
+    if not USE_ARENA_CACHE:
+        draw_arena_tiles(surface, door_open)
+        return
+    key = (WIDTH, HEIGHT, FLOOR_TILE_SIZE, TILE_SCALE, door_open)
+    arena = arena_cache.get(key)
+    if arena is None:
+        arena = pygame.Surface((WIDTH, HEIGHT)).convert()
+        arena.fill(GRAY)
+        draw_arena_tiles(arena, door_open)
+        arena_cache[key] = arena
+    surface.blit(arena, (0, 0))
+    render_stats["bg_blits"] += 1
+
+update_wall_textures()
+update_floor_texture()
 
 def handle_collision(obj1, obj2, force=10):
     dx = obj1.x - obj2.x
@@ -191,13 +269,18 @@ def handle_collision(obj1, obj2, force=10):
         obj2.y -= push_y
 
 class Entity:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "size", "color", "speed", "alive")
+
     def __init__(self, x, y, size, color, speed):
         self.x, self.y = x, y
+        self.prev_x, self.prev_y = x, y  # pozice z minulého ticku (pro interpolaci)
         self.size, self.color = size, color
         self.speed = speed
+        self.alive = True  # False = během ticku zabit, na konci ticku ho compact() odstraní
 
-    def draw(self):
-        pygame.draw.rect(SCREEN, self.color, (int(self.x), int(self.y), self.size, self.size))
+    def draw(self, alpha=1.0):
+        ox, oy = interp_offset(self, alpha)
+        pygame.draw.rect(SCREEN, self.color, (int(self.x) + ox, int(self.y) + oy, self.size, self.size))
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.size, self.size)
@@ -274,7 +357,7 @@ class Player(Entity):
                 self.hp = 0
                 self.is_dead = True
                 self.death_timer = 300
-                log_player_death(room_count, score, accumulated_time)
+                log_player_death(room_count, score, accumulated_time, int(self.x), int(self.y))
             else:
                 self.inv_timer = 60
 
@@ -286,7 +369,7 @@ class Player(Entity):
             return
         
         win_w, win_h = SCREEN.get_size()
-        keys = pygame.key.get_pressed()
+        keys = read_keys()
         self.is_moving = False
 
         if self.inv_timer > 0: self.inv_timer -= 1
@@ -351,19 +434,22 @@ class Player(Entity):
 
         self.update_animation()
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         if self.inv_timer > 0 and (self.inv_timer // 5) % 2 == 0: return
         
         display_img = self.image
         
         if not self.facing_right:
-            display_img = pygame.transform.flip(display_img, True, False)
+            display_img = SPRITE_CACHE.get(display_img, flip_x=True)
 
         img_rect = display_img.get_rect(center=self.rect.center)
         img_rect.y += 15 
+        img_rect.move_ip(interp_offset(self, alpha))
         SCREEN.blit(display_img, img_rect)
 
 class Enemy(Entity):
+    __slots__ = ("hp", "rect", "animation_list", "frame_index", "animation_speed", "facing_right")
+
     def __init__(self, x, y, size, color, speed, hp=1, anim_list=None):
         super().__init__(x, y, size, color, speed)
         self.hp = hp
@@ -393,15 +479,23 @@ class Enemy(Entity):
                 if self.frame_index >= 5:
                     self.frame_index = 0
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         if self.animation_list:
             img = self.animation_list[int(self.frame_index)]
             if not self.facing_right:
-                img = pygame.transform.flip(img, True, False)
+                img = SPRITE_CACHE.get(img, flip_x=True)
             img_rect = img.get_rect(center=self.rect.center)
+            img_rect.move_ip(interp_offset(self, alpha))
             SCREEN.blit(img, img_rect)
 
+class ArrayEnemy(EnemyView):
+    """Nepřítel uložený v ENEMY_STORE (režim --numpy) — kreslí se stejně jako Enemy."""
+    __slots__ = ()
+    draw = Enemy.draw
+
 class RangedEnemy(Enemy):
+    __slots__ = ("shoot_delay", "range")
+
     def __init__(self, x, y):
         super().__init__(x, y, 40, YELLOW, 2, hp=1, anim_list=ENEMY_YELLOW_WALK)
         self.shoot_delay = 0
@@ -425,7 +519,7 @@ class RangedEnemy(Enemy):
         
         self.shoot_delay += 1
         if self.shoot_delay >= 60:
-            enemy_projectiles.append(EnemyProjectile(
+            enemy_projectiles.append(ENEMY_PROJECTILE_POOL.acquire(
                 self.x + self.size/2, self.y + self.size/2,
                 player.x + player.size/2, player.y + player.size/2,
                 speed=6
@@ -435,6 +529,8 @@ class RangedEnemy(Enemy):
 
 
 class TankEnemy(Enemy):
+    __slots__ = ()
+
     def __init__(self, x, y):
         super().__init__(x, y, 70, PURPLE, 1.2, hp=4, anim_list=ENEMY_TANK_WALK)
 
@@ -443,9 +539,18 @@ class TankEnemy(Enemy):
         self.animation_speed = 0.1
 
 class Projectile:
+    """Hráčova střela. Objekty se recyklují přes PROJECTILE_POOL (viz entity_pool.py)."""
+    __slots__ = ("x", "y", "prev_x", "prev_y", "speed", "dx", "dy", "image", "rect", "alive")
+
     def __init__(self, x, y, target_x, target_y, speed, color=None):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.alive = True
+        self.reset(x, y, target_x, target_y, speed, color)
+
+    def reset(self, x, y, target_x, target_y, speed, color=None):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.speed = speed
         dx = target_x - x
         dy = target_y - y
@@ -453,25 +558,35 @@ class Projectile:
         self.dx = (dx / distance) * speed
         self.dy = (dy / distance) * speed
         angle = math.degrees(math.atan2(-dy, dx)) 
-        self.image = pygame.transform.rotate(BULLET_IMG, angle)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = SPRITE_CACHE.get(BULLET_IMG, angle)
+        self.rect.size = self.image.get_size()
+        self.rect.center = (x, y)
 
     def move(self):
         self.x += self.dx
         self.y += self.dy
         self.rect.center = (int(self.x), int(self.y))
 
-    def draw(self):
-        SCREEN.blit(self.image, self.rect)
+    def draw(self, alpha=1.0):
+        SCREEN.blit(self.image, self.rect.move(interp_offset(self, alpha)))
 
     def collides_with(self, entity):
         return self.rect.colliderect(entity.rect)
 
 class EnemyProjectile:
-    """Animovaná střela ranged nepřítele."""
+    """Animovaná střela ranged nepřítele (recyklují se přes ENEMY_PROJECTILE_POOL)."""
+    __slots__ = ("x", "y", "prev_x", "prev_y", "speed", "dx", "dy", "angle",
+                 "frame_index", "animation_speed", "rect", "alive")
+
     def __init__(self, x, y, target_x, target_y, speed=6):
+        self.rect = pygame.Rect(0, 0, 40, 40)
+        self.alive = True
+        self.reset(x, y, target_x, target_y, speed)
+
+    def reset(self, x, y, target_x, target_y, speed=6):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.speed = speed
         dx = target_x - x
         dy = target_y - y
@@ -482,7 +597,7 @@ class EnemyProjectile:
         self.angle = math.degrees(math.atan2(-dy, dx))
         self.frame_index = 0.0
         self.animation_speed = 0.6
-        self.rect = pygame.Rect(x - 20, y - 20, 40, 40)
+        self.rect.topleft = (x - 20, y - 20)
 
     def move(self):
         self.x += self.dx
@@ -493,13 +608,14 @@ class EnemyProjectile:
         if self.frame_index >= len(ENEMY_RANGE_ATTACK_FRAMES):
             self.frame_index = 0.0
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        ox, oy = interp_offset(self, alpha)
         if not ENEMY_RANGE_ATTACK_FRAMES:
-            pygame.draw.circle(SCREEN, YELLOW, (int(self.x), int(self.y)), 8)
+            pygame.draw.circle(SCREEN, YELLOW, (int(self.x) + ox, int(self.y) + oy), 8)
             return
         frame = ENEMY_RANGE_ATTACK_FRAMES[int(self.frame_index)]
-        rotated = pygame.transform.rotate(frame, self.angle)
-        r = rotated.get_rect(center=(int(self.x), int(self.y)))
+        rotated = SPRITE_CACHE.get(frame, self.angle)
+        r = rotated.get_rect(center=(int(self.x) + ox, int(self.y) + oy))
         SCREEN.blit(rotated, r)
 
     def collides_with(self, entity):
@@ -531,25 +647,30 @@ def spawn_enemy():
         y = random.randint(safe_min_y, safe_max_y)
 
     etype = random.random()
+    if ENEMY_STORE is not None:
+        # Režim --numpy: nepřítel se rovnou přidá do polí (a tím i do enemies)
+        if etype < 0.6:
+            return ENEMY_STORE.add(x, y, MELEE, 50, 3.5, 1, (50, 50), ENEMY_RED_WALK,
+                                   color=RED, view_cls=ArrayEnemy)
+        elif etype < 0.85:
+            return ENEMY_STORE.add(x, y, RANGED, 40, 2, 1, (50, 50), ENEMY_YELLOW_WALK,
+                                   attack_range=400, color=YELLOW, view_cls=ArrayEnemy)
+        else:
+            return ENEMY_STORE.add(x, y, TANK, 70, 1.2, 4, (70, 70), ENEMY_TANK_WALK,
+                                   animation_speed=0.1, color=PURPLE, view_cls=ArrayEnemy)
+
     if etype < 0.6: 
-        return Enemy(x, y, 50, RED, 3.5, anim_list=ENEMY_RED_WALK)
+        enemy = Enemy(x, y, 50, RED, 3.5, anim_list=ENEMY_RED_WALK)
     elif etype < 0.85: 
-        return RangedEnemy(x, y)
+        enemy = RangedEnemy(x, y)
     else: 
-        return TankEnemy(x, y)
+        enemy = TankEnemy(x, y)
+    enemies.append(enemy)
+    return enemy
 
 def verify_login_with_django(username, password):
-    url = "http://127.0.0.1:8000/api/login/"
-    payload = {"username": username, "password": password}
-    try:
-        response = requests.post(url, json=payload, timeout=5)
-        if response.status_code == 200:
-            global user_name
-            user_name = username 
-            return True
-        return False
-    except:
-        return False
+    """Spustí ověření na pozadí a vrátí Future — menu se nezasekne ani při pomalém serveru."""
+    return score_uploader.login(username, password)
     
 def resolution_menu(screen):
     menu_running = True
@@ -598,26 +719,465 @@ def resolution_menu(screen):
 
 # --- Inicializace objektů ---
 player = Player(WIDTH // 2, HEIGHT // 2, 40, GREEN, 6)
-enemies, projectiles, enemy_projectiles = [], [], []
+if ARGS.numpy and not HAS_NUMPY:
+    print("Varování: NumPy není nainstalované, nepřátelé poběží bez --numpy.")
+# V režimu --numpy je seznam enemies přímo ENEMY_STORE.views (pohledy do polí)
+ENEMY_STORE = EnemyStore() if ARGS.numpy and HAS_NUMPY else None
+enemies = ENEMY_STORE.views if ENEMY_STORE is not None else []
+projectiles, enemy_projectiles = [], []
+PROJECTILE_POOL = ObjectPool(Projectile)
+ENEMY_PROJECTILE_POOL = ObjectPool(EnemyProjectile)
+enemy_grid = SpatialGrid(cell_size=128)  # Prostorový index nepřátel, přestaví se každý tick
 
 
 def send_time_to_django(username, time_ms):
-    url = "http://127.0.0.1:8000/api/update_playtime/"
-    payload = {"username": username, "play_time": time_ms}
-    try:
-        response = requests.post(url, json=payload, timeout=3)
-        if response.status_code == 200:
-            print(f"ÚSPĚCH: Čas {time_ms}ms uložen pro {username}")
+    # Neblokuje — výsledek se uloží do spoolu a odešle se na pozadí (i později, když server neběží)
+    score_uploader.submit(username, time_ms)
+    print(f"Čas {time_ms}ms zařazen k odeslání pro {username}")
+
+
+# --- Vstup ---
+bot_keys = None  # V headless režimu klávesy "mačká" bot místo hráče
+
+def read_keys():
+    return bot_keys if HEADLESS else pygame.key.get_pressed()
+
+def fire_projectile(target_x, target_y):
+    if player.current_ammo > 0 and not player.is_reloading:
+        projectiles.append(PROJECTILE_POOL.acquire(
+            player.rect.centerx, 
+            player.rect.centery, 
+            target_x, 
+            target_y, 
+            speed=15, 
+        ))
+        player.current_ammo -= 1
+        log_shot_fired(player.current_ammo)
+        if player.current_ammo == 0:
+            player.reload()
+            log_reload(player.max_ammo)
+
+def use_aoe(current_time):
+    global score, room_cleared
+    if current_time - player.last_aoe_time >= 10000:
+        player.last_aoe_time = current_time
+        player.aoe_visual_timer = 15
+        player.aoe_playing = True
+        player.aoe_frame_index = 0.0
+        killed = 0
+        enemy_grid.rebuild(enemies)
+        for e in enemy_grid.query_radius(player.x, player.y, player.aoe_radius):
+            dist = math.hypot(e.x - player.x, e.y - player.y)
+            if dist <= player.aoe_radius:
+                e.alive = False
+                score += 100
+                killed += 1
+                if killed >= 5:
+                    break
+        remove_dead_enemies()
+        log_aoe_used(killed, current_time)
+        if total_spawned >= MAX_ENEMIES and len(enemies) == 0:
+            room_cleared = True
+
+
+# --- Simulace (jeden tick = FIXED_DT_MS) ---
+
+def snapshot_positions():
+    """Uloží pozice z konce minulého ticku, aby se dalo kreslit mezi ticky."""
+    player.prev_x, player.prev_y = player.x, player.y
+    if ENEMY_STORE is not None:
+        ENEMY_STORE.snapshot()
+    groups = (projectiles, enemy_projectiles) if ENEMY_STORE is not None else (enemies, projectiles, enemy_projectiles)
+    for group in groups:
+        for obj in group:
+            obj.prev_x, obj.prev_y = obj.x, obj.y
+
+def clear_enemies():
+    if ENEMY_STORE is not None:
+        ENEMY_STORE.clear()  # vyprázdní i enemies (je to ENEMY_STORE.views)
+    else:
+        enemies.clear()
+
+def remove_dead_enemies():
+    """Odstraní nepřátele označené alive = False. Vrací jejich počet."""
+    if ENEMY_STORE is not None:
+        return ENEMY_STORE.compact()
+    return compact(enemies)
+
+def teleport_player(x):
+    player.x = x
+    player.rect.x = int(player.x)
+    player.prev_x = player.x  # bez interpolace přes celou obrazovku
+
+def update_aoe_animation():
+    if player.aoe_playing:
+        player.aoe_frame_index += 0.4
+        if player.aoe_frame_index >= len(AOE_FRAMES):
+            player.aoe_frame_index = 0.0
+            player.aoe_playing = False
+
+def update_starter_room(current_time):
+    global in_starter_room, game_start_time, arena_start_time
+    d_h = HEIGHT // 4
+    door_open = (current_time - starter_timer) > 2000
+    player.move(allow_exit=door_open)
+    update_aoe_animation()
+
+    # Detekce průchodu
+    door_top = HEIGHT // 2 - d_h // 2
+    door_bottom = HEIGHT // 2 + d_h // 2
+
+    if door_open and player.rect.right > WIDTH - BORDER_THICKNESS:
+        if door_top < player.rect.centery < door_bottom:
+            in_starter_room = False
+            game_start_time = current_time
+            arena_start_time = current_time
+            teleport_player(BORDER_THICKNESS + 20)
+
+def update_arena(current_time):
+    global game_over, total_elapsed_ms, time_str, accumulated_time, room_cleared, total_spawned
+    global enemies, projectiles, enemy_projectiles, room_count, MAX_ENEMIES, spawn_cooldown
+    global arena_start_time, last_spawn_time, score
+
+    if not paused:
+        player.move(allow_exit=room_cleared)
+        player.update_reload()
+    update_aoe_animation()
+
+    if player.is_dead and player.death_timer <= 0:
+        log_game_over(victory=False, score=score, time_ms=accumulated_time + (current_time - arena_start_time))
+        game_over = True
+
+    # Časovač
+    total_elapsed_ms = accumulated_time + (current_time - arena_start_time)
+    seconds = total_elapsed_ms // 1000
+    milis = total_elapsed_ms % 1000
+    time_str = f"TIME: {seconds}:{milis:03d}"
+
+    # Přechod do další místnosti
+    if room_cleared and player.rect.right > WIDTH - BORDER_THICKNESS:
+        if room_count < MAX_ROOMS:
+            accumulated_time += (current_time - arena_start_time)
+            log_room_cleared(room_count, accumulated_time)
+            room_cleared = False
+            total_spawned = 0
+            clear_enemies()
+            PROJECTILE_POOL.release_all(projectiles)
+            ENEMY_PROJECTILE_POOL.release_all(enemy_projectiles)
+            teleport_player(80)
+            room_count += 1
+            MAX_ENEMIES += 6
+            spawn_cooldown = max(500, spawn_cooldown - 200)
+            arena_start_time = current_time
+            log_room_entered(room_count)
+        else:
+            final_total_time = accumulated_time + (current_time - arena_start_time)
+            log_room_cleared(room_count, final_total_time)
+            log_game_over(victory=True, score=score, time_ms=final_total_time)
+            if not HEADLESS:
+                send_time_to_django(user_name, final_total_time)
+            game_over = True
+
+    # Spawnování nepřátel
+    if current_time - arena_start_time > 2000:
+        if total_spawned < MAX_ENEMIES and current_time - last_spawn_time > spawn_cooldown:
+            spawn_enemy()
+            total_spawned += 1
+            last_spawn_time = current_time
+
+    # Logika projektilů (hráčovy střely)
+    # (zasažené se jen označí alive = False, ze seznamů je odstraní compact() po průchodu)
+    enemy_grid.rebuild(enemies)
+    for p in projectiles:
+        p.move()
+        if not (0 <= p.x <= WIDTH and 0 <= p.y <= HEIGHT): 
+            p.alive = False
+        else:
+            for e in enemy_grid.query_rect(p.rect):
+                if p.collides_with(e):
+                    e.hp -= 1
+                    p.alive = False
+                    if e.hp <= 0: 
+                        e.alive = False
+                        enemy_grid.remove(e)
+                        score += 100
+                    break
+    compact(projectiles, PROJECTILE_POOL)
+    if remove_dead_enemies() and total_spawned >= MAX_ENEMIES and len(enemies) == 0:
+        room_cleared = True
+
+    # Logika nepřátelských střel
+    for ep in enemy_projectiles:
+        ep.move()
+        if ep.collides_with(player): 
+            player.take_damage()
+            ep.alive = False
+        elif not (0 <= ep.x <= WIDTH and 0 <= ep.y <= HEIGHT): 
+            ep.alive = False
+    compact(enemy_projectiles, ENEMY_PROJECTILE_POOL)
+
+    # Logika nepřátel a kolize
+    if ENEMY_STORE is not None:
+        update_enemies_numpy()
+    else:
+        update_enemies()
+
+def update_enemies():
+    for e in enemies:
+        if not player.is_dead:
+            e.follow(player)
+            if player.rect.colliderect(e.rect):
+                hit_player(e)
+
+    # Kolize nepřátel mezi sebou — jen se sousedy z mřížky místo všech se všemi
+    enemy_grid.rebuild(enemies)
+    for e in enemies:
+        for other_e in enemy_grid.query_rect(e.rect):
+            if e != other_e and e.rect.colliderect(other_e.rect):
+                handle_collision(e, other_e, force=8)
+
+def hit_player(e):
+    player.take_damage()
+    handle_collision(player, e, force=20)
+    player.x = max(BORDER_THICKNESS, min(WIDTH - BORDER_THICKNESS - player.rect.width, player.x))
+    player.y = max(BORDER_THICKNESS, min(HEIGHT - BORDER_THICKNESS - player.rect.height, player.y))
+    player.rect.x, player.rect.y = int(player.x), int(player.y)
+
+def update_enemies_numpy():
+    """Pohyb, střelba a odstrkování všech nepřátel naráz nad poli ENEMY_STORE.
+    Na rozdíl od smyčky výše se všichni pohnou vůči pozici hráče ze začátku ticku."""
+    if not player.is_dead:
+        target_x, target_y = player.x + player.size / 2, player.y + player.size / 2
+        for sx, sy in ENEMY_STORE.follow(player.x, player.y):
+            enemy_projectiles.append(ENEMY_PROJECTILE_POOL.acquire(sx, sy, target_x, target_y, speed=6))
+        for e in enemies:
+            if player.rect.colliderect(e.rect):
+                hit_player(e)
+    ENEMY_STORE.separate(force=8)
+
+
+# --- Vykreslování (alpha = poloha mezi posledními dvěma ticky) ---
+
+def draw_aoe(alpha):
+    if player.aoe_playing:
+        frame = AOE_FRAMES[int(player.aoe_frame_index)]
+        frame_scaled = SPRITE_CACHE.get(frame, size=(player.aoe_radius * 2, player.aoe_radius * 2))
+        frame_rect = frame_scaled.get_rect(center=player.rect.center)
+        frame_rect.move_ip(interp_offset(player, alpha))
+        SCREEN.blit(frame_scaled, frame_rect)
+
+def draw_starter_room(current_time, alpha):
+    d_h = HEIGHT // 4
+    door_open = (current_time - starter_timer) > 2000
+
+    # Vykreslení podlahy a textur stěn (z cache pozadí)
+    draw_arena(SCREEN, door_open)
+
+    if door_open:
+        if (current_time // 250) % 2 == 0:
+            pygame.draw.rect(SCREEN, GREEN, (WIDTH - BORDER_THICKNESS, HEIGHT // 2 - d_h // 2, BORDER_THICKNESS, d_h))
+
+    # Vykreslení hráče
+    player.draw(alpha)
+    draw_aoe(alpha)
+
+def draw_arena_scene(current_time, alpha):
+    global paused, running
+    d_h = HEIGHT // 4
+
+    # --- VYKRESLOVÁNÍ ARÉNY ---
+    draw_arena(SCREEN, room_cleared)
+
+    if room_cleared:
+        door_top = HEIGHT // 2 - d_h // 2
+        if (current_time // 250) % 2 == 0:
+            pygame.draw.rect(SCREEN, GREEN, (WIDTH - BORDER_THICKNESS, door_top, BORDER_THICKNESS, d_h))
+
+    # Entity
+    for p in projectiles: p.draw(alpha)
+    for ep in enemy_projectiles: ep.draw(alpha)
+    for e in enemies: e.draw(alpha)
+    player.draw(alpha)
+
+    # AoE animace
+    draw_aoe(alpha)
+
+    # HUD
+    hud_width, hud_height = 280, 100
+    hud_x = WIDTH - hud_width - 10
+    hud_y = HEIGHT - hud_height - 10
+
+    hud_rect = pygame.Rect(hud_x, hud_y, hud_width, hud_height)
+    pygame.draw.rect(SCREEN, BLACK, hud_rect)
+    pygame.draw.rect(SCREEN, BLOOD_RED, hud_rect, 0, border_radius=8)
+    pygame.draw.rect(SCREEN, HELL_ORANGE, hud_rect, 3, border_radius=8)
+
+    life_text = font.render(f"HP:", True, WHITE)
+    SCREEN.blit(life_text, (hud_x + 15, hud_y + 15))
+    
+    for i in range(3):
+        heart_rect = pygame.Rect(hud_x + 60 + (i * 35), hud_y + 18, 25, 25)
+        if i < player.hp:
+            pygame.draw.rect(SCREEN, RED, heart_rect, 0, border_radius=4)
         else:
-            print(f"CHYBA DJANGA (Kód {response.status_code}): {response.text}")
-    except Exception as e:
-        print(f"Nepodařilo se spojit se serverem: {e}")
+            pygame.draw.rect(SCREEN, GRAY, heart_rect, 2, border_radius=4)
+
+    ammo_color = WHITE if not player.is_reloading else YELLOW
+    ammo_label = "RELOADING..." if player.is_reloading else f"AMMO: {player.current_ammo}/{player.max_ammo}"
+    ammo_render = font.render(ammo_label, True, ammo_color)
+    SCREEN.blit(ammo_render, (hud_x + 15, hud_y + 55))
+
+    if player.is_reloading:
+        reload_bar_width = (player.reload_timer / player.reload_duration) * (hud_width - 30)
+        pygame.draw.rect(SCREEN, YELLOW, (hud_x + 15, hud_y + 85, reload_bar_width, 5))
+
+    SCREEN.blit(font.render(f"Místnost: {room_count} / {MAX_ROOMS}", True, YELLOW), (20, 50))
+    SCREEN.blit(font.render(f"Skóre: {score}", True, WHITE), (20, 90))
+
+    time_render = font.render(time_str, True, WHITE)
+    SCREEN.blit(time_render, (20, 20))
+
+    # Dash cooldown ukazatel
+    dash_color = GREEN if player.dash_cooldown <= 0 else RED
+    pygame.draw.rect(SCREEN, GRAY, (20, 130, 100, 10))
+    if player.dash_cooldown > 0:
+        charge_w = 100 - (player.dash_cooldown * 2)
+        pygame.draw.rect(SCREEN, dash_color, (20, 130, max(0, charge_w), 10))
+    else:
+        pygame.draw.rect(SCREEN, dash_color, (20, 130, 100, 10))
+
+    # AoE cooldown ukazatel
+    aoe_time_passed = current_time - player.last_aoe_time
+    aoe_color = (0, 255, 255) if aoe_time_passed >= 10000 else RED
+    pygame.draw.rect(SCREEN, GRAY, (20, 150, 100, 10))
+    if aoe_time_passed < 10000:
+        aoe_charge_w = (aoe_time_passed / 10000) * 100
+        pygame.draw.rect(SCREEN, aoe_color, (20, 150, max(0, aoe_charge_w), 10))
+    else:
+        pygame.draw.rect(SCREEN, aoe_color, (20, 150, 100, 10))
+
+    # Pauza overlay
+    if paused:
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        SCREEN.blit(overlay, (0, 0))
+        txt = title_font.render("PAUZA", True, WHITE)
+        SCREEN.blit(txt, (WIDTH//2 - txt.get_width()//2, 200))
+        if draw_button("ZPĚT DO HRY", WIDTH//2 - 125, 350, 250, 60): paused = False
+        if draw_button("UKONČIT", WIDTH//2 - 125, 450, 250, 60): running = False
+
+
+# --- Headless režim (bot + rychlá simulace pro testování balancu) ---
+
+def reset_run():
+    """Vrátí herní stav na začátek první místnosti (bez menu a starter room)."""
+    global player, enemies, projectiles, enemy_projectiles, score, room_count, accumulated_time
+    global total_spawned, MAX_ENEMIES, spawn_cooldown, last_spawn_time, room_cleared, game_over
+    global arena_start_time, game_start_time, main_menu, in_starter_room, paused, total_elapsed_ms
+    player = Player(WIDTH // 2, HEIGHT // 2, 40, GREEN, 6)
+    clear_enemies()
+    PROJECTILE_POOL.release_all(projectiles)
+    ENEMY_PROJECTILE_POOL.release_all(enemy_projectiles)
+    score = 0
+    room_count = 1
+    accumulated_time = 0
+    total_elapsed_ms = 0
+    total_spawned = 0
+    MAX_ENEMIES = 15
+    spawn_cooldown = 500
+    last_spawn_time = 0
+    room_cleared = game_over = paused = False
+    main_menu = in_starter_room = False
+    arena_start_time = game_start_time = SIM_CLOCK.now
+
+def bot_think(current_time):
+    """Jednoduchý bot: utíká od blízkých nepřátel, střílí po nejbližším a po vyčištění jde do dveří."""
+    global bot_keys
+    bot_keys = defaultdict(bool)
+    cx, cy = player.rect.center
+
+    nearest, nearest_dist, in_aoe_range = None, float("inf"), 0
+    for e in enemies:
+        dist = math.hypot(e.rect.centerx - cx, e.rect.centery - cy)
+        if dist < nearest_dist:
+            nearest, nearest_dist = e, dist
+        if dist <= player.aoe_radius:
+            in_aoe_range += 1
+
+    if room_cleared:
+        vx, vy = WIDTH - cx, HEIGHT // 2 - cy
+    else:
+        # Tah ke středu arény, aby bot nezůstal zaseknutý v rohu
+        vx, vy = (WIDTH // 2 - cx) / WIDTH, (HEIGHT // 2 - cy) / HEIGHT
+        if nearest is not None and nearest_dist < 250:
+            vx += (cx - nearest.rect.centerx) / max(nearest_dist, 1)
+            vy += (cy - nearest.rect.centery) / max(nearest_dist, 1)
+            if nearest_dist < 120:
+                bot_keys[pygame.K_SPACE] = True
+
+    length = math.hypot(vx, vy) or 1
+    bot_keys[pygame.K_a] = vx / length < -0.3
+    bot_keys[pygame.K_d] = vx / length > 0.3
+    bot_keys[pygame.K_w] = vy / length < -0.3
+    bot_keys[pygame.K_s] = vy / length > 0.3
+
+    if nearest is not None and not player.is_dead:
+        if random.random() < 0.15:
+            fire_projectile(nearest.rect.centerx, nearest.rect.centery)
+        if in_aoe_range >= 3:
+            use_aoe(current_time)
+
+def run_headless(runs, max_minutes):
+    """Odsimuluje zadaný počet her bez okna a vypíše souhrn pro balancování."""
+    max_ticks = int(max_minutes * 60 * 1000 / FIXED_DT_MS)
+    results = []
+    started = time.perf_counter()
+    for _ in range(runs):
+        reset_run()
+        ticks = 0
+        while not game_over and ticks < max_ticks:
+            current_time = SIM_CLOCK.step()
+            bot_think(current_time)
+            update_arena(current_time)
+            ticks += 1
+        results.append({
+            "victory": game_over and player.hp > 0,
+            "timeout": not game_over,
+            "room": room_count,
+            "score": score,
+            "time_ms": total_elapsed_ms,
+        })
+    wall_s = time.perf_counter() - started
+
+    wins = [r for r in results if r["victory"]]
+    print(f"Odsimulováno her: {len(results)} za {wall_s:.1f} s ({len(results) / wall_s * 60:.0f} her/min)")
+    print(f"Výhry: {len(wins)} ({len(wins) / len(results) * 100:.1f} %), vypršel limit: {sum(r['timeout'] for r in results)}")
+    print(f"Průměrná dosažená místnost: {sum(r['room'] for r in results) / len(results):.2f} / {MAX_ROOMS}")
+    print(f"Průměrné skóre: {sum(r['score'] for r in results) / len(results):.0f}")
+    if wins:
+        avg_ms = sum(r["time_ms"] for r in wins) // len(wins)
+        print(f"Průměrný čas výhry: {avg_ms // 1000}:{avg_ms % 1000:03d}")
+    return results
+
+if HEADLESS:
+    if ARGS.seed is not None:
+        random.seed(ARGS.seed)
+    mute_console()  # tisíce her by zahltily konzoli
+    run_headless(ARGS.runs, ARGS.max_minutes)
+    pygame.quit()
+    sys.exit()
 
 
 # --- Hlavní smyčka ---
 running = True
+last_frame_ms = pygame.time.get_ticks()
 while running:
-    current_time = pygame.time.get_ticks()
+    now_ms = pygame.time.get_ticks()
+    frame_ms = now_ms - last_frame_ms
+    last_frame_ms = now_ms
+    current_time = SIM_CLOCK.now
+    if ASSETS.futures:
+        ASSETS.poll()  # převezme animace dočtené na pozadí (a po dočtení uloží atlas)
 
     events = pygame.event.get() 
     for event in events:
@@ -626,26 +1186,17 @@ while running:
   
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if not main_menu and not game_over and not paused and not player.is_dead:
-                if player.current_ammo > 0 and not player.is_reloading:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    projectiles.append(Projectile(
-                        player.rect.centerx, 
-                        player.rect.centery, 
-                        mouse_x, 
-                        mouse_y, 
-                        speed=15, 
-                    ))
-                    player.current_ammo -= 1
-                    log_shot_fired(player.current_ammo)
-                    if player.current_ammo == 0:
-                        player.reload()
-                        log_reload(player.max_ammo)
+                fire_projectile(*pygame.mouse.get_pos())
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:
                 player.reload()
                 log_reload(player.max_ammo)
 
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                show_debug = not show_debug
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 if not main_menu and not game_over:
@@ -655,23 +1206,7 @@ while running:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_e:
                 if not main_menu and not game_over and not paused:
-                    if current_time - player.last_aoe_time >= 10000:
-                        player.last_aoe_time = current_time
-                        player.aoe_visual_timer = 15
-                        player.aoe_playing = True
-                        player.aoe_frame_index = 0.0
-                        killed = 0
-                        for e in enemies[:]:
-                            dist = math.hypot(e.x - player.x, e.y - player.y)
-                            if dist <= player.aoe_radius:
-                                enemies.remove(e)
-                                score += 100
-                                killed += 1
-                                if killed >= 5:
-                                    break
-                        log_aoe_used(killed, current_time)
-                        if total_spawned >= MAX_ENEMIES and len(enemies) == 0:
-                            room_cleared = True
+                    use_aoe(current_time)
 
         if main_menu and show_login:
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -699,9 +1234,22 @@ while running:
                         elif active_field == "pass" and len(user_pass) < 15:
                             user_pass += event.unicode
 
+    # --- SIMULACE (pevný krok 60 ticků/s nezávisle na FPS) ---
+    for current_time in SIM_CLOCK.ticks(frame_ms):
+        if main_menu or game_over:
+            continue
+        snapshot_positions()
+        if in_starter_room:
+            update_starter_room(current_time)
+        else:
+            update_arena(current_time)
+    current_time = SIM_CLOCK.now
+    alpha = SIM_CLOCK.alpha
+
     # --- VYKRESLOVÁNÍ ---
     SCREEN.fill(GRAY)
 
+
     # 1. HLAVNÍ MENU
     if main_menu:
         if show_login:
@@ -723,9 +1271,14 @@ while running:
             hidden_pass = "*" * len(user_pass)
             SCREEN.blit(font.render(hidden_pass, True, WHITE), (pass_rect.x + 10, pass_rect.y + 7))
 
-            if draw_button("VSTOUPIT", WIDTH//2 - 125, 460, 250, 60):
-                if user_name.strip() != "" and user_pass.strip() != "":
-                    if verify_login_with_django(user_name, user_pass): 
+            if login_future is not None:
+                # Přihlášení běží na pozadí, menu se mezitím dál vykresluje
+                wait_txt = font.render("Přihlašuji...", True, YELLOW)
+                SCREEN.blit(wait_txt, (WIDTH//2 - wait_txt.get_width()//2, 420))
+                if login_future.done():
+                    login_ok = login_future.result()
+                    login_future = None
+                    if login_ok:
                         chosen_res = resolution_menu(SCREEN)
                         
                         if chosen_res == (1920, 1080):
@@ -742,11 +1295,15 @@ while running:
                         show_login = False
                         main_menu = False
                         in_starter_room = True
-                        starter_timer = pygame.time.get_ticks()
+                        starter_timer = SIM_CLOCK.now
                     else:
                         user_pass = ""
                         print("Chybné údaje!")
 
+            elif draw_button("VSTOUPIT", WIDTH//2 - 125, 460, 250, 60):
+                if user_name.strip() != "" and user_pass.strip() != "":
+                    login_future = verify_login_with_django(user_name, user_pass)
+
             if draw_button("ZPĚT", WIDTH//2 - 125, 540, 250, 60):
                 show_login = False
                 pygame.time.delay(150)
@@ -778,240 +1335,11 @@ while running:
 
     # 2. STARTER ROOM
     elif in_starter_room:
-        d_h = HEIGHT // 4
-        door_open = (current_time - starter_timer) > 2000
-        player.move(allow_exit=door_open)
-
-        # Vykreslení podlahy a textur stěn (dlaždicování)
-        draw_floor(SCREEN)
-        draw_tiled_wall(SCREEN, wall_top,    0, 0,                         WIDTH,            BORDER_THICKNESS)
-        draw_tiled_wall(SCREEN, wall_bottom, 0, HEIGHT - BORDER_THICKNESS, WIDTH,            BORDER_THICKNESS)
-        draw_tiled_wall(SCREEN, wall_left,   0, 0,                         BORDER_THICKNESS, HEIGHT)
-
-        if not door_open:
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, 0, BORDER_THICKNESS, HEIGHT)
-        else:
-            door_top_px    = HEIGHT // 2 - d_h // 2
-            door_bottom_px = HEIGHT // 2 + d_h // 2
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, 0,              BORDER_THICKNESS, door_top_px)
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, door_bottom_px, BORDER_THICKNESS, HEIGHT - door_bottom_px)
-            
-            if (current_time // 250) % 2 == 0:
-                pygame.draw.rect(SCREEN, GREEN, (WIDTH - BORDER_THICKNESS, HEIGHT // 2 - d_h // 2, BORDER_THICKNESS, d_h))
-
-        # Vykreslení hráče
-        player.draw()
-
-        if player.aoe_playing:
-            frame = AOE_FRAMES[int(player.aoe_frame_index)]
-            frame_scaled = pygame.transform.scale(frame, (player.aoe_radius * 2, player.aoe_radius * 2))
-            frame_rect = frame_scaled.get_rect(center=player.rect.center)
-            SCREEN.blit(frame_scaled, frame_rect)
-            player.aoe_frame_index += 0.4
-            if player.aoe_frame_index >= len(AOE_FRAMES):
-                player.aoe_frame_index = 0.0
-                player.aoe_playing = False
-
-        # Detekce průchodu
-        door_top = HEIGHT // 2 - d_h // 2
-        door_bottom = HEIGHT // 2 + d_h // 2
-    
-        if door_open and player.rect.right > WIDTH - BORDER_THICKNESS:
-            if door_top < player.rect.centery < door_bottom:
-                in_starter_room = False
-                game_start_time = current_time
-                arena_start_time = pygame.time.get_ticks()
-                player.x = BORDER_THICKNESS + 20 
-                player.rect.x = int(player.x)
-                pygame.time.delay(100)
+        draw_starter_room(current_time, alpha)
 
     # 3. SAMOTNÁ HRA (ARÉNA)
     elif not game_over:
-        d_h = HEIGHT // 4
-        
-        if not paused:
-            player.move(allow_exit=room_cleared)
-            player.update_reload()
-
-        if player.is_dead and player.death_timer <= 0:
-            log_game_over(victory=False, score=score, time_ms=accumulated_time + (current_time - arena_start_time))
-            game_over = True
-
-        # Časovač
-        total_elapsed_ms = accumulated_time + (current_time - arena_start_time)
-        seconds = total_elapsed_ms // 1000
-        milis = total_elapsed_ms % 1000
-        time_str = f"TIME: {seconds}:{milis:03d}"
-
-        # Přechod do další místnosti
-        if room_cleared and player.rect.right > WIDTH - BORDER_THICKNESS:
-            if room_count < MAX_ROOMS:
-                accumulated_time += (pygame.time.get_ticks() - arena_start_time)
-                log_room_cleared(room_count, accumulated_time)
-                room_cleared = False
-                total_spawned = 0
-                enemies = []
-                projectiles = []
-                enemy_projectiles = []
-                player.x = 80 
-                player.rect.x = int(player.x)
-                room_count += 1
-                MAX_ENEMIES += 6
-                spawn_cooldown = max(500, spawn_cooldown - 200)
-                arena_start_time = pygame.time.get_ticks()
-                log_room_entered(room_count)
-                pygame.time.delay(100)
-            else:
-                final_total_time = accumulated_time + (pygame.time.get_ticks() - arena_start_time)
-                log_room_cleared(room_count, final_total_time)
-                log_game_over(victory=True, score=score, time_ms=final_total_time)
-                send_time_to_django(user_name, final_total_time)
-                game_over = True
-
-        # Spawnování nepřátel
-        if current_time - arena_start_time > 2000:
-            if total_spawned < MAX_ENEMIES and current_time - last_spawn_time > spawn_cooldown:
-                enemies.append(spawn_enemy())
-                total_spawned += 1
-                last_spawn_time = current_time
-
-        # Logika projektilů (hráčovy střely)
-        for p in projectiles[:]:
-            p.move()
-            if not (0 <= p.x <= WIDTH and 0 <= p.y <= HEIGHT): 
-                projectiles.remove(p)
-            else:
-                for e in enemies[:]:
-                    if p.collides_with(e):
-                        e.hp -= 1
-                        if p in projectiles: projectiles.remove(p)
-                        if e.hp <= 0: 
-                            enemies.remove(e)
-                            score += 100
-                            if total_spawned >= MAX_ENEMIES and len(enemies) == 0:
-                                room_cleared = True
-                        break
-
-        # Logika nepřátelských střel
-        for ep in enemy_projectiles[:]:
-            ep.move()
-            if ep.collides_with(player): 
-                player.take_damage()
-                enemy_projectiles.remove(ep)
-            elif not (0 <= ep.x <= WIDTH and 0 <= ep.y <= HEIGHT): 
-                enemy_projectiles.remove(ep)
-
-        # Logika nepřátel a kolize
-        for e in enemies:
-            if not player.is_dead:
-                e.follow(player)
-                if player.rect.colliderect(e.rect):
-                    player.take_damage()
-                    handle_collision(player, e, force=20)
-                    player.x = max(BORDER_THICKNESS, min(WIDTH - BORDER_THICKNESS - player.rect.width, player.x))
-                    player.y = max(BORDER_THICKNESS, min(HEIGHT - BORDER_THICKNESS - player.rect.height, player.y))
-                    player.rect.x, player.rect.y = int(player.x), int(player.y)
-            
-            for other_e in enemies:
-                if e != other_e and e.rect.colliderect(other_e.rect):
-                    handle_collision(e, other_e, force=8)
-
-        # --- VYKRESLOVÁNÍ ARÉNY ---
-        draw_floor(SCREEN)
-        draw_tiled_wall(SCREEN, wall_top,    0, 0,                         WIDTH,            BORDER_THICKNESS)
-        draw_tiled_wall(SCREEN, wall_bottom, 0, HEIGHT - BORDER_THICKNESS, WIDTH,            BORDER_THICKNESS)
-        draw_tiled_wall(SCREEN, wall_left,   0, 0,                         BORDER_THICKNESS, HEIGHT)
-
-        if not room_cleared:
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, 0, BORDER_THICKNESS, HEIGHT)
-        else:
-            door_top = HEIGHT // 2 - d_h // 2
-            door_bottom = HEIGHT // 2 + d_h // 2
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, 0,           BORDER_THICKNESS, door_top)
-            draw_tiled_wall(SCREEN, wall_right, WIDTH - BORDER_THICKNESS, door_bottom, BORDER_THICKNESS, HEIGHT - door_bottom)
-            if (current_time // 250) % 2 == 0:
-                pygame.draw.rect(SCREEN, GREEN, (WIDTH - BORDER_THICKNESS, door_top, BORDER_THICKNESS, d_h))
-
-        # Entity
-        for p in projectiles: p.draw()
-        for ep in enemy_projectiles: ep.draw()
-        for e in enemies: e.draw()
-        player.draw()
-
-        # AoE animace
-        if player.aoe_playing:
-            frame = AOE_FRAMES[int(player.aoe_frame_index)]
-            frame_scaled = pygame.transform.scale(frame, (player.aoe_radius * 2, player.aoe_radius * 2))
-            frame_rect = frame_scaled.get_rect(center=player.rect.center)
-            SCREEN.blit(frame_scaled, frame_rect)
-            player.aoe_frame_index += 0.4
-            if player.aoe_frame_index >= len(AOE_FRAMES):
-                player.aoe_frame_index = 0.0
-                player.aoe_playing = False
-
-        # HUD
-        hud_width, hud_height = 280, 100
-        hud_x = WIDTH - hud_width - 10
-        hud_y = HEIGHT - hud_height - 10
-
-        hud_rect = pygame.Rect(hud_x, hud_y, hud_width, hud_height)
-        pygame.draw.rect(SCREEN, BLACK, hud_rect)
-        pygame.draw.rect(SCREEN, BLOOD_RED, hud_rect, 0, border_radius=8)
-        pygame.draw.rect(SCREEN, HELL_ORANGE, hud_rect, 3, border_radius=8)
-
-        life_text = font.render(f"HP:", True, WHITE)
-        SCREEN.blit(life_text, (hud_x + 15, hud_y + 15))
-        
-        for i in range(3):
-            heart_rect = pygame.Rect(hud_x + 60 + (i * 35), hud_y + 18, 25, 25)
-            if i < player.hp:
-                pygame.draw.rect(SCREEN, RED, heart_rect, 0, border_radius=4)
-            else:
-                pygame.draw.rect(SCREEN, GRAY, heart_rect, 2, border_radius=4)
-
-        ammo_color = WHITE if not player.is_reloading else YELLOW
-        ammo_label = "RELOADING..." if player.is_reloading else f"AMMO: {player.current_ammo}/{player.max_ammo}"
-        ammo_render = font.render(ammo_label, True, ammo_color)
-        SCREEN.blit(ammo_render, (hud_x + 15, hud_y + 55))
-
-        if player.is_reloading:
-            reload_bar_width = (player.reload_timer / player.reload_duration) * (hud_width - 30)
-            pygame.draw.rect(SCREEN, YELLOW, (hud_x + 15, hud_y + 85, reload_bar_width, 5))
-
-        SCREEN.blit(font.render(f"Místnost: {room_count} / {MAX_ROOMS}", True, YELLOW), (20, 50))
-        SCREEN.blit(font.render(f"Skóre: {score}", True, WHITE), (20, 90))
-
-        time_render = font.render(time_str, True, WHITE)
-        SCREEN.blit(time_render, (20, 20))
-
-        # Dash cooldown ukazatel
-        dash_color = GREEN if player.dash_cooldown <= 0 else RED
-        pygame.draw.rect(SCREEN, GRAY, (20, 130, 100, 10))
-        if player.dash_cooldown > 0:
-            charge_w = 100 - (player.dash_cooldown * 2)
-            pygame.draw.rect(SCREEN, dash_color, (20, 130, max(0, charge_w), 10))
-        else:
-            pygame.draw.rect(SCREEN, dash_color, (20, 130, 100, 10))
-
-        # AoE cooldown ukazatel
-        aoe_time_passed = current_time - player.last_aoe_time
-        aoe_color = (0, 255, 255) if aoe_time_passed >= 10000 else RED
-        pygame.draw.rect(SCREEN, GRAY, (20, 150, 100, 10))
-        if aoe_time_passed < 10000:
-            aoe_charge_w = (aoe_time_passed / 10000) * 100
-            pygame.draw.rect(SCREEN, aoe_color, (20, 150, max(0, aoe_charge_w), 10))
-        else:
-            pygame.draw.rect(SCREEN, aoe_color, (20, 150, 100, 10))
-
-        # Pauza overlay
-        if paused:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            SCREEN.blit(overlay, (0, 0))
-            txt = title_font.render("PAUZA", True, WHITE)
-            SCREEN.blit(txt, (WIDTH//2 - txt.get_width()//2, 200))
-            if draw_button("ZPĚT DO HRY", WIDTH//2 - 125, 350, 250, 60): paused = False
-            if draw_button("UKONČIT", WIDTH//2 - 125, 450, 250, 60): running = False
+        draw_arena_scene(current_time, alpha)
 
     # 4. GAME OVER
     else:
@@ -1038,8 +1366,24 @@ while running:
         if draw_button("UKONČIT", WIDTH//2 - 100, HEIGHT//2 + 80, 200, 60): 
             running = False
 
+    # Ladicí overlay (F3)
+    render_stats["last_bg_blits"] = render_stats["bg_blits"]
+    render_stats["bg_blits"] = 0
+    if show_debug:
+        debug_lines = [
+            f"FPS: {CLOCK.get_fps():.0f}",
+            f"BG blity/frame: {render_stats['last_bg_blits']}",
+            f"Sprite cache: {SPRITE_CACHE.hit_rate * 100:.1f} % hit | {len(SPRITE_CACHE)} ks"
+            f" | {SPRITE_CACHE.memory_bytes / (1024 * 1024):.1f} MB",
+            f"Obrázky: {ASSETS.source}" + (f" za {ASSETS.load_ms:.0f} ms" if ASSETS.load_ms is not None else " (načítá se)"),
+        ]
+        for i, line in enumerate(debug_lines):
+            SCREEN.blit(font.render(line, True, YELLOW), (WIDTH - 620, 20 + i * 32))
+
     pygame.display.flip()
     CLOCK.tick(60)
 
+score_uploader.flush(timeout=1)
+score_uploader.stop()
 pygame.quit()
 sys.exit()
\ No newline at end of file
@@ -1,3 +1,84 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
 from django.test import TestCase
+from django.urls import reverse
+
+
+class UpdatePlaytimeBulkTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="heslo123")
+        self.bob = User.objects.create_user(username="bob", password="heslo123")
+        self.bob.profile.best_time = 40000
+        self.bob.profile.save()
+
+    def post(self, results):
+        return self.client.post(
+            reverse("update_playtime_bulk"),
+            data=json.dumps({"results": results}),
+            content_type="application/json",
+        )
+
+    def test_keeps_best_time_per_user(self):
+        response = self.post([
+            {"username": "alice", "play_time": 52000},
+            {"username": "alice", "play_time": 48000},
+            {"username": "bob", "play_time": 45000},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.alice.profile.refresh_from_db()
+        self.bob.profile.refresh_from_db()
+        self.assertEqual(self.alice.profile.best_time, 48000)
+        self.assertEqual(self.bob.profile.best_time, 40000)  # horší čas rekord nepřepíše
+        self.assertEqual(response.json()["records"], 1)
+
+    def test_unknown_user_does_not_fail_batch(self):
+        response = self.post([
+            {"username": "nikdo", "play_time": 1000},
+            {"username": "bob", "play_time": 30000},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["unknown_users"], ["nikdo"])
+        self.bob.profile.refresh_from_db()
+        self.assertEqual(self.bob.profile.best_time, 30000)
+
+    def test_bad_rows_do_not_fail_batch(self):
+        response = self.post([
+            {"username": "alice", "play_time": "abc"},
+            {"username": "alice", "play_time": 47000},
+            {"username": "bob", "play_time": None},
+            "neni objekt",
+            {"play_time": 1000},
+            {"username": "bob", "play_time": -5},
+            {"username": "bob", "play_time": 35000},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["received"], 7)
+        self.assertEqual(data["records"], 2)
+        self.assertEqual([r["index"] for r in data["rejected"]], [0, 2, 3, 4, 5])
+        self.alice.profile.refresh_from_db()
+        self.bob.profile.refresh_from_db()
+        self.assertEqual(self.alice.profile.best_time, 47000)
+        self.assertEqual(self.bob.profile.best_time, 35000)
+
+    def test_invalid_body_is_400(self):
+        for body in ("{nejde", json.dumps({"vysledky": []}), json.dumps([1, 2])):
+            response = self.client.post(reverse("update_playtime_bulk"), data=body,
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_database_error_is_503(self):
+        # Zamčená DB se nesmí tvářit jako neplatná dávka — uploader ji musí poslat znovu
+        with mock.patch("mydatabase.views.Profile.objects.select_for_update",
+                        side_effect=OperationalError("database is locked")):
+            response = self.post([{"username": "bob", "play_time": 30000}])
+        self.assertEqual(response.status_code, 503)
+        self.bob.profile.refresh_from_db()
+        self.assertEqual(self.bob.profile.best_time, 40000)
 
-# Create your tests here.
+    def test_only_post_allowed(self):
+        response = self.client.get(reverse("update_playtime_bulk"))
+        self.assertEqual(response.status_code, 405)
@@ -14,6 +14,7 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('api/login/', views.api_login, name='api_login'),
     path('api/update_playtime/', views.update_playtime, name='update_playtime'),
+    path('api/update_playtime_bulk/', views.update_playtime_bulk, name='update_playtime_bulk'),
     path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('api/update_playtime/', views.update_playtime, name='update_playtime'),
     path("diagramy/", views.diagramy, name="diagramy"),
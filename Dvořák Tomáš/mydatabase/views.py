@@ -9,6 +9,7 @@ from django.contrib import messages
 # --- PŘIDANÉ IMPORTY PRO PYGAME ---
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.db import DatabaseError, transaction
 import json
 # ---------------------------------
 
@@ -154,6 +155,70 @@ def update_playtime(request):
             
     return JsonResponse({"status": "error", "message": "Povolen pouze POST"}, status=405)
 
+@csrf_exempt
+def update_playtime_bulk(request):
+    """Uloží víc výsledků najednou (dávky z uploaderu ve hře) v jedné transakci.
+
+    Vadný řádek se přeskočí a vrátí v "rejected", ostatní se uloží. 400 je jen pro
+    tělo, které není JSON se seznamem "results" (opakování nepomůže, uploader dávku
+    zahodí). Chyba databáze (např. zamčená SQLite) vrací 503, uploader to zkusí znovu.
+    """
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "Povolen pouze POST"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"status": "error", "message": "Neplatný JSON"}, status=400)
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        return JsonResponse({"status": "error", "message": "Chybí seznam results"}, status=400)
+
+    # Pro každého hráče stačí jeho nejlepší (nejmenší) čas z dávky
+    best_in_batch = {}
+    rejected = []
+    for index, item in enumerate(results):
+        if not isinstance(item, dict):
+            rejected.append({"index": index, "message": "Položka není objekt"})
+            continue
+        username = item.get("username")
+        try:
+            new_time_ms = int(item.get("play_time"))
+        except (TypeError, ValueError):
+            new_time_ms = None
+        if not isinstance(username, str) or not username:
+            rejected.append({"index": index, "message": "Chybí username"})
+            continue
+        if new_time_ms is None or new_time_ms <= 0:
+            rejected.append({"index": index, "message": "Neplatný play_time"})
+            continue
+        if username not in best_in_batch or new_time_ms < best_in_batch[username]:
+            best_in_batch[username] = new_time_ms
+
+    try:
+        with transaction.atomic():
+            profiles = list(Profile.objects.select_for_update()
+                            .select_related("user")
+                            .filter(user__username__in=best_in_batch.keys()))
+            improved = []
+            for profile in profiles:
+                new_time_ms = best_in_batch[profile.user.username]
+                if profile.best_time == 0 or new_time_ms < profile.best_time:
+                    profile.best_time = new_time_ms
+                    improved.append(profile)
+            Profile.objects.bulk_update(improved, ["best_time"])
+    except DatabaseError as e:
+        return JsonResponse({"status": "error", "message": f"Databáze je nedostupná: {e}"}, status=503)
+
+    unknown = sorted(set(best_in_batch) - {p.user.username for p in profiles})
+    return JsonResponse({
+        "status": "success",
+        "received": len(results),
+        "records": len(improved),
+        "unknown_users": unknown,
+        "rejected": rejected,
+    }, status=200)
+
 def leaderboard(request):
     # Seřadíme od nejmenšího času (nejrychlejší)
     top_profiles = Profile.objects.exclude(best_time=0).order_by('best_time')[:10]
@@ -0,0 +1,182 @@
+"""
+Odesílání výsledků na Django server na pozadí.
+
+Hra nesmí čekat na server — výsledek se jen vloží do fronty a o zbytek
+se stará vlákno uploaderu:
+  * každý výsledek se už v submit() zapíše do spool souboru na disku
+    (přežije pád hry, zaseknuté odesílání i server, který neběží),
+  * čekající výsledky posílá po dávkách na /api/update_playtime_bulk/,
+  * při chybě to zkouší znovu s exponenciálně rostoucí pauzou,
+  * používá requests.Session, takže se spojení znovu využívá. Session není
+    bezpečná pro víc vláken — přihlášení má vlastní (login_session).
+"""
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_SPOOL_PATH = os.path.join("spool", "scores.jsonl")
+
+
+class ScoreUploader:
+    def __init__(self, base_url=DEFAULT_BASE_URL, spool_path=DEFAULT_SPOOL_PATH,
+                 batch_size=50, min_backoff=1.0, max_backoff=60.0, session=None, login_session=None):
+        self.base_url = base_url.rstrip("/")
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.session = session or requests.Session()  # jen vlákno uploaderu
+        self.login_session = login_session or requests.Session()  # jen vlákno přihlášení
+
+        self.queue = queue.Queue()  # jen probouzí vlákno uploaderu, výsledky jsou už v pending
+        self.pending = []  # výsledky, které ještě server nepotvrdil (zrcadlo spool souboru)
+        self._lock = threading.Lock()  # pending a spool soubor mění hra (submit) i vlákno uploaderu
+        self.sent_count = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._login_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="login")
+
+        self._load_spool()
+        self._thread = threading.Thread(target=self._run, name="score-uploader", daemon=True)
+        self._thread.start()
+
+    # --- API pro hru (nikdy neblokuje) ---
+
+    def submit(self, username, time_ms):
+        """Zapíše výsledek do spoolu a zařadí ho k odeslání (jeden krátký zápis na disk)."""
+        item = {"username": username, "play_time": int(time_ms)}
+        with self._lock:
+            self.pending.append(item)
+            try:
+                self._append_spool([item])
+            except OSError as e:
+                self.last_error = f"Spool nejde zapsat: {e}"
+        self.queue.put(item)
+
+    def login(self, username, password):
+        """Ověří přihlášení na pozadí. Vrací Future s výsledkem True/False."""
+        return self._login_executor.submit(self._login, username, password)
+
+    def flush(self, timeout=None):
+        """Počká, dokud nejsou všechny výsledky odeslané (nebo nevyprší timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.queue.unfinished_tasks or self.pending:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
+    def stop(self, timeout=2.0):
+        """Ukončí vlákno. Neodeslané výsledky zůstanou ve spoolu pro příští spuštění."""
+        self._stop.set()
+        self.queue.put(None)
+        self._thread.join(timeout)
+        self._login_executor.shutdown(wait=False)
+
+    # --- Práce na pozadí ---
+
+    def _login(self, username, password):
+        try:
+            response = self.login_session.post(
+                f"{self.base_url}/api/login/",
+                json={"username": username, "password": password},
+                timeout=5,
+            )
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def _run(self):
+        backoff = self.min_backoff
+        while not self._stop.is_set():
+            wait = backoff if self.pending else None
+            try:
+                item = self.queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+            self._drain(item)
+            if self._stop.is_set():
+                break
+            if self.pending:
+                if self._send_batch():
+                    backoff = self.min_backoff
+                else:
+                    backoff = min(backoff * 2, self.max_backoff)
+
+    def _drain(self, first):
+        """Vyprázdní frontu probuzení (výsledky už jsou v pending i ve spoolu)."""
+        taken = 1 if first is not None else 0
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+            taken += 1
+        for _ in range(taken):
+            self.queue.task_done()
+
+    def _send_batch(self):
+        with self._lock:
+            batch = self.pending[:self.batch_size]
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/update_playtime_bulk/",
+                json={"results": batch},
+                timeout=5,
+            )
+        except requests.RequestException as e:
+            self.last_error = str(e)
+            return False
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.last_error = f"HTTP {response.status_code}"
+            return False
+        # 2xx = uloženo (vadné řádky server přeskočí a vrátí v "rejected");
+        # 4xx = celé tělo je neplatné, opakováním se to nezlepší, dávka se zahodí
+        if response.status_code >= 400:
+            self.last_error = f"HTTP {response.status_code}: dávka zahozena"
+        else:
+            self.sent_count += len(batch)
+        with self._lock:
+            # submit() přidává jen na konec, odeslaná dávka je pořád na začátku
+            del self.pending[:len(batch)]
+            self._rewrite_spool()
+        return True
+
+    # --- Spool na disku (JSON lines) ---
+
+    def _load_spool(self):
+        if not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.pending.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # useknutý poslední řádek po pádu hry
+
+    def _append_spool(self, items):
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item) + "\n")
+
+    def _rewrite_spool(self):
+        if not self.pending:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in self.pending:
+                f.write(json.dumps(item) + "\n")
+        os.replace(tmp_path, self.spool_path)
@@ -0,0 +1,89 @@
+"""
+Prostorová mřížka (spatial hash) pro rychlé hledání kolizí.
+
+Místo porovnávání každého nepřítele s každým (O(n²)) se objekty rozdělí
+do čtvercových buněk podle levého horního rohu svého rectu. Dotaz pak
+prochází jen buňky v okolí hledané oblasti.
+"""
+import math
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}       # (cx, cy) -> seznam (pořadí, objekt)
+        self.keys = {}        # id(objekt) -> (cx, cy)
+        self.max_w = 0        # největší vložený objekt — určuje, kolik buněk okolo je třeba projít
+        self.max_h = 0
+        self._counter = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.keys.clear()
+        self.max_w = 0
+        self.max_h = 0
+        self._counter = 0
+
+    def rebuild(self, objects):
+        """Vyprázdní mřížku a vloží všechny objekty (volá se jednou za tick)."""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def insert(self, obj):
+        rect = obj.rect
+        key = (rect.left // self.cell_size, rect.top // self.cell_size)
+        self.cells.setdefault(key, []).append((self._counter, obj))
+        self.keys[id(obj)] = key
+        self._counter += 1
+        if rect.width > self.max_w: self.max_w = rect.width
+        if rect.height > self.max_h: self.max_h = rect.height
+
+    def remove(self, obj):
+        key = self.keys.pop(id(obj), None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        for i, (_, other) in enumerate(bucket):
+            if other is obj:
+                bucket[i] = bucket[-1]
+                bucket.pop()
+                break
+        if not bucket:
+            del self.cells[key]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _collect(self, cx0, cy0, cx1, cy1):
+        found = []
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        # Výsledky ve stejném pořadí, v jakém byly objekty vloženy
+        # (= pořadí v seznamu enemies), aby se hra chovala jako dřív.
+        found.sort(key=lambda item: item[0])
+        return [obj for _, obj in found]
+
+    def query_rect(self, rect):
+        """Vrátí kandidáty, jejichž rect se může překrývat s daným rectem."""
+        cs = self.cell_size
+        return self._collect(
+            (rect.left - self.max_w) // cs, (rect.top - self.max_h) // cs,
+            rect.right // cs, rect.bottom // cs,
+        )
+
+    def query_radius(self, x, y, radius):
+        """Vrátí kandidáty v okolí bodu (x, y). Přesnou vzdálenost si ověří volající.
+
+        Přidává se jedna buňka navíc, protože x/y entity se po odstrčení
+        (handle_collision) může od jejího rectu o pár pixelů lišit.
+        """
+        cs = self.cell_size
+        return self._collect(
+            math.floor((x - radius) / cs) - 1, math.floor((y - radius) / cs) - 1,
+            math.floor((x + radius) / cs) + 1, math.floor((y + radius) / cs) + 1,
+        )
@@ -0,0 +1,107 @@
+"""
+Testy načítání obrázků a atlasu
+Spustit: python -m pytest test_asset_manager.py -v
+"""
+import os
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from asset_manager import AssetManager, Frames, pack
+
+
+def make_png(path, size, color):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(color)
+    surf.set_at((0, 0), (color[0], color[1], color[2], 100))  # poloprůhledný pixel
+    pygame.image.save(surf, str(path))
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = []
+    for i, color in enumerate([(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255)]):
+        path = tmp_path / f"tile{i:03d}.png"
+        make_png(path, (32, 24), color)
+        paths.append(str(path))
+    return paths
+
+
+def make_manager(tmp_path, sources, extra=()):
+    manager = AssetManager(atlas_dir=str(tmp_path / "cache"), workers=2)
+    walk = manager.add("walk", sources + list(extra), size=(16, 16), optional=True)
+    single = manager.add("single", sources[:1])
+    return manager, walk, single
+
+
+def wait_for_atlas(manager):
+    writer = getattr(manager, "_writer", None)
+    if writer is not None:
+        writer.join()
+
+
+class TestAssetManager:
+
+    def test_cold_start_decodes_files(self, tmp_path, sources):
+        manager, walk, single = make_manager(tmp_path, sources)
+        manager.start()
+        assert manager.source == "soubory"
+        assert isinstance(walk, Frames)
+        assert len(walk) == 3
+        assert walk[0].get_size() == (16, 16)
+        assert manager.image("single").get_size() == (32, 24)
+
+    def test_missing_optional_file_is_skipped(self, tmp_path, sources):
+        manager, walk, _ = make_manager(tmp_path, sources, extra=[str(tmp_path / "chybi.png")])
+        manager.start()
+        assert len(walk) == 3
+
+    def test_warm_start_uses_atlas_with_same_pixels(self, tmp_path, sources):
+        cold, _, _ = make_manager(tmp_path, sources)
+        cold.start()
+        cold.wait_all()
+        wait_for_atlas(cold)
+        assert cold.atlas_saved
+
+        warm, walk, single = make_manager(tmp_path, sources)
+        warm.start()
+        assert warm.source == "atlas"
+        assert not warm.futures
+        for name in ("walk", "single"):
+            for a, b in zip(cold.frames(name), warm.frames(name)):
+                assert a.get_size() == b.get_size()
+                assert a.get_at((0, 0)) == b.get_at((0, 0))
+                assert a.get_at((5, 5)) == b.get_at((5, 5))
+
+    def test_changed_source_invalidates_atlas(self, tmp_path, sources):
+        cold, _, _ = make_manager(tmp_path, sources)
+        cold.start()
+        cold.wait_all()
+        wait_for_atlas(cold)
+
+        st = os.stat(sources[1])
+        os.utime(sources[1], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        again, walk, _ = make_manager(tmp_path, sources)
+        again.start()
+        assert again.source == "soubory"
+        assert len(walk) == 3
+
+    def test_poll_reports_progress(self, tmp_path, sources):
+        manager, _, _ = make_manager(tmp_path, sources)
+        manager.start()
+        for future in list(manager.futures.values()):
+            future.result()
+        assert manager.poll() == (2, 2)
+        assert manager.ready()
+
+
+class TestPack:
+
+    def test_rects_do_not_overlap_and_fit_width(self):
+        sizes = [(160, 160)] * 7 + [(40, 40)] * 30 + [(72, 72)] * 5
+        positions, height = pack(sizes, width=512)
+        rects = [pygame.Rect(pos, size) for pos, size in zip(positions, sizes)]
+        for i, r in enumerate(rects):
+            assert r.right <= 512 and r.bottom <= height
+            assert r.collidelist(rects[i + 1:]) == -1
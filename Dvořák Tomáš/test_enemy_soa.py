@@ -0,0 +1,130 @@
+"""
+Testy NumPy úložiště nepřátel
+Spustit: python -m pytest test_enemy_soa.py -v
+"""
+import math
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+from enemy_soa import EnemyStore, MELEE, RANGED, TANK
+
+
+def make_store(count, seed=0):
+    rng = random.Random(seed)
+    store = EnemyStore(capacity=4)  # schválně malá kapacita, ať se pole musí zvětšovat
+    for _ in range(count):
+        kind = rng.choice([MELEE, RANGED, TANK])
+        size = {MELEE: 50, RANGED: 40, TANK: 70}[kind]
+        side = 70 if kind == TANK else 50
+        store.add(rng.randint(100, 1800), rng.randint(100, 1000), kind, size,
+                  rng.choice([3.5, 2, 1.2]), 1, (side, side), [None] * 6,
+                  attack_range=400 if kind == RANGED else 0.0)
+    return store
+
+
+def reference_follow(e, px, py, shots):
+    """Kopie logiky Enemy.follow / RangedEnemy.follow nad jedním pohledem."""
+    dx, dy = px - e.x, py - e.y
+    dist = math.hypot(dx, dy)
+    ranged = e.store.kind[e.index] == RANGED
+
+    def approach():
+        if dx > 5: e.facing_right = True
+        elif dx < -5: e.facing_right = False
+        e.x += (dx / dist) * e.speed
+        e.y += (dy / dist) * e.speed
+        e.frame_index += e.animation_speed
+        if e.frame_index >= 5:
+            e.frame_index = 0
+
+    if not ranged:
+        if dist != 0:
+            approach()
+        return
+    if dist > e.range:
+        if dist != 0:
+            approach()
+    elif dist < e.range - 100 and dist != 0:
+        e.x -= (dx / dist) * e.speed
+        e.y -= (dy / dist) * e.speed
+        e.facing_right = dx > 0
+    e.frame_index += e.animation_speed
+    if e.frame_index >= len(e.animation_list):
+        e.frame_index = 0
+    e.shoot_delay += 1
+    if e.shoot_delay >= 60:
+        shots.append((e.x + e.size / 2, e.y + e.size / 2))
+        e.shoot_delay = 0
+
+
+class TestEnemyStore:
+
+    def test_follow_matches_scalar_logic(self):
+        vector, scalar = make_store(200), make_store(200)
+        for tick in range(90):
+            px, py = 960 + 300 * math.sin(tick / 10), 540
+            shots = vector.follow(px, py)
+            expected_shots = []
+            for e in scalar.views:
+                reference_follow(e, px, py, expected_shots)
+            assert shots == pytest.approx(expected_shots)
+        for name in ("x", "y", "frame", "facing", "shoot_delay"):
+            assert np.allclose(getattr(vector, name)[:200], getattr(scalar, name)[:200]), name
+
+    def test_rects_follow_positions(self):
+        store = make_store(20)
+        store.follow(960, 540)
+        for e in store.views:
+            assert e.rect.topleft == (int(e.x), int(e.y))
+
+    def test_overlapping_pairs_match_brute_force(self):
+        store = make_store(300, seed=3)
+        i, j = store.overlapping_pairs()
+        found = {tuple(sorted(p)) for p in zip(i.tolist(), j.tolist())}
+        assert len(found) == len(i)  # každá dvojice jen jednou
+        views = store.views
+        expected = {(a, b) for a in range(len(views)) for b in range(a + 1, len(views))
+                    if views[a].rect.colliderect(views[b].rect)}
+        assert found == expected
+
+    def test_separate_matches_pairwise_push(self):
+        store = make_store(150, seed=5)
+        views = store.views
+        before = [(e.x, e.y) for e in views]
+        expected = [list(p) for p in before]
+        for a, ea in enumerate(views):
+            for b, eb in enumerate(views):
+                if a == b or not ea.rect.colliderect(eb.rect):
+                    continue
+                dx, dy = before[a][0] - before[b][0], before[a][1] - before[b][1]
+                dist = math.hypot(dx, dy)
+                if dist < (ea.size + eb.size) / 2:
+                    dist = dist or 0.1
+                    expected[a][0] += 2 * 8 * dx / dist
+                    expected[a][1] += 2 * 8 * dy / dist
+        store.separate(force=8)
+        assert np.allclose([[e.x, e.y] for e in views], expected)
+
+    def test_compact_keeps_order_and_updates_views(self):
+        store = make_store(10)
+        views = list(store.views)
+        xs = [e.x for e in views]
+        views[2].alive = False
+        views[7].alive = False
+        assert store.compact() == 2
+        assert len(store) == 8
+        assert store.views == [v for k, v in enumerate(views) if k not in (2, 7)]
+        assert [e.x for e in store.views] == [x for k, x in enumerate(xs) if k not in (2, 7)]
+        assert [e.index for e in store.views] == list(range(8))
+
+    def test_view_writes_go_to_arrays(self):
+        store = make_store(3)
+        e = store.views[1]
+        e.hp -= 1
+        e.x = 123.5
+        assert store.hp[1] == 0 and store.x[1] == 123.5
+        assert isinstance(e.hp, int) and isinstance(e.alive, bool)
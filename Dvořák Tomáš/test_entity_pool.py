@@ -0,0 +1,62 @@
+"""
+Testy poolu objektů a compact()
+Spustit: python -m pytest test_entity_pool.py -v
+"""
+from entity_pool import ObjectPool, compact
+
+
+class Bullet:
+    __slots__ = ("x", "y", "alive")
+
+    def __init__(self, x, y):
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.x, self.y = x, y
+
+
+class TestObjectPool:
+
+    def test_released_objects_are_reused(self):
+        pool = ObjectPool(Bullet)
+        a = pool.acquire(1, 2)
+        pool.release(a)
+        b = pool.acquire(5, 6)
+        assert b is a
+        assert (b.x, b.y) == (5, 6) and b.alive
+        assert pool.created == 1 and pool.reused == 1
+
+    def test_max_free_limits_kept_objects(self):
+        pool = ObjectPool(Bullet, max_free=2)
+        items = [pool.acquire(i, i) for i in range(5)]
+        pool.release_all(items)
+        assert items == []
+        assert len(pool.free) == 2
+
+
+class TestCompact:
+
+    def test_removes_dead_and_keeps_order(self):
+        items = [Bullet(i, 0) for i in range(6)]
+        for b in items:
+            b.alive = b.x % 2 == 0
+        removed = compact(items)
+        assert removed == 3
+        assert [b.x for b in items] == [0, 2, 4]
+
+    def test_dead_objects_go_back_to_pool(self):
+        pool = ObjectPool(Bullet)
+        items = [pool.acquire(i, 0) for i in range(4)]
+        items[0].alive = False
+        items[3].alive = False
+        dead = {id(items[0]), id(items[3])}
+        compact(items, pool)
+        assert [b.x for b in items] == [1, 2]
+        assert {id(b) for b in pool.free} == dead
+
+    def test_nothing_dead(self):
+        items = [Bullet(i, 0) for i in range(3)]
+        for b in items:
+            b.alive = True
+        assert compact(items) == 0
+        assert len(items) == 3
@@ -0,0 +1,161 @@
+"""
+Testy analýzy logů
+Spustit: python -m pytest test_log_analytics.py -v
+"""
+import json
+import os
+
+import log_analytics
+from log_analytics import analyze_file, analyze_logs, parse_line
+
+JSON_SESSION = [
+    {"ts": 1.0, "lvl": "INFO", "ev": "room_entered", "room": 1},
+    {"ts": 2.0, "lvl": "INFO", "ev": "aoe", "killed": 3, "time_ms": 5000},
+    {"ts": 3.0, "lvl": "INFO", "ev": "room_cleared", "room": 1, "time_ms": 20000},
+    {"ts": 4.0, "lvl": "INFO", "ev": "aoe", "killed": 0, "time_ms": 25000},
+    {"ts": 5.0, "lvl": "INFO", "ev": "room_cleared", "room": 2, "time_ms": 32000},
+    {"ts": 6.0, "lvl": "WARNING", "ev": "player_death", "room": 3, "score": 900,
+     "time_ms": 40000, "x": 250, "y": 420},
+    {"ts": 7.0, "lvl": "INFO", "ev": "game_over", "victory": False, "score": 900, "time_ms": 40000},
+]
+
+TEXT_SESSION = [
+    "[12:00:00] [INFO] VSTUP DO MÍSTNOSTI | místnost=1",
+    "[12:00:05] [INFO] AOE SCHOPNOST | zabito nepřátel=3 | čas=5:000",
+    "[12:00:30] [INFO] MÍSTNOST VYČIŠTĚNA | místnost=1 | čas=30:500",
+    "[12:00:40] [WARNING] HRÁČ ZEMŘEL | místnost=2 | skóre=300 | čas=40:000",
+    "[12:00:40] [INFO] KONEC HRY [PROHRA] | skóre=300 | celkový čas=40:000",
+]
+
+
+def write_json_log(path, events):
+    with open(path, "w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+
+
+def write_text_log(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class TestParseLine:
+
+    def test_json_line(self):
+        event, data = parse_line('{"ts":1.0,"lvl":"INFO","ev":"aoe","killed":4,"time_ms":1}')
+        assert event == "aoe" and data["killed"] == 4
+
+    def test_legacy_text_line(self):
+        assert parse_line("[12:00:30] [INFO] MÍSTNOST VYČIŠTĚNA | místnost=2 | čas=41:234") == \
+            ("room_cleared", {"room": 2, "time_ms": 41234})
+        assert parse_line("[12:00:40] [INFO] KONEC HRY [VÝHRA] | skóre=1 | celkový čas=1:000") == \
+            ("game_over", {"victory": True})
+
+    def test_truncated_and_unknown_lines_are_skipped(self):
+        assert parse_line('{"ts":1.0,"lvl":"IN') is None
+        assert parse_line("[12:00:00] [DEBUG] DASH | hráč použil dash") is None
+        assert parse_line("") is None
+
+
+class TestAnalyzeFile:
+
+    def test_room_times_are_per_room_not_cumulative(self, tmp_path):
+        path = tmp_path / "session_a.log"
+        write_json_log(path, JSON_SESSION)
+        summary = analyze_file(str(path))
+        assert summary["room_clears"]["1"]["total_ms"] == 20000
+        assert summary["room_clears"]["2"]["total_ms"] == 12000
+        assert summary["aoe_kills"] == {"3": 1, "0": 1}
+        assert summary["deaths_by_room"] == {"3": 1}
+        assert summary["death_cells"] == {"2,4": 1}
+        assert summary["games"] == 1 and summary["victories"] == 0
+
+    def test_legacy_format(self, tmp_path):
+        path = tmp_path / "session_old.log"
+        write_text_log(path, TEXT_SESSION)
+        summary = analyze_file(str(path))
+        assert summary["room_clears"]["1"]["total_ms"] == 30500
+        assert summary["aoe_kills"] == {"3": 1}
+        assert summary["deaths_by_room"] == {"2": 1}
+        assert summary["death_cells"] == {}  # starý formát pozici nemá
+
+
+class TestAnalyzeLogs:
+
+    def test_merges_files_including_rotated(self, tmp_path):
+        write_json_log(tmp_path / "session_a.log", JSON_SESSION)
+        write_json_log(tmp_path / "session_a.log.1", JSON_SESSION)
+        write_text_log(tmp_path / "session_old.log", TEXT_SESSION)
+        total, reprocessed = analyze_logs(str(tmp_path))
+        assert reprocessed == 3
+        assert total["files"] == 3
+        assert total["games"] == 3
+        room1 = total["room_clears"]["1"]
+        assert room1["count"] == 3
+        assert room1["min_ms"] == 20000 and room1["max_ms"] == 30500
+        assert total["aoe_kills"] == {"3": 3, "0": 2}
+
+    def test_game_spanning_rotation(self, tmp_path):
+        # Hra začala v session_x.log.1 a po rotaci pokračuje v session_x.log
+        write_json_log(tmp_path / "session_x.log.1", JSON_SESSION[:5])
+        write_json_log(tmp_path / "session_x.log", [
+            {"ts": 8.0, "lvl": "INFO", "ev": "room_cleared", "room": 3, "time_ms": 50000},
+            {"ts": 9.0, "lvl": "INFO", "ev": "game_over", "victory": True, "score": 1, "time_ms": 51000},
+        ])
+        total, _ = analyze_logs(str(tmp_path))
+        assert total["room_clears"]["3"]["total_ms"] == 18000  # ne kumulativních 50 s
+        assert total["room_clears"]["2"]["total_ms"] == 12000
+
+        # Další rotace: soubory se přejmenují, vyčištění z obou se spočítají stejně
+        os.rename(tmp_path / "session_x.log.1", tmp_path / "session_x.log.2")
+        os.rename(tmp_path / "session_x.log", tmp_path / "session_x.log.1")
+        write_json_log(tmp_path / "session_x.log", JSON_SESSION)
+        rotated, _ = analyze_logs(str(tmp_path))
+        assert rotated["room_clears"]["3"] == total["room_clears"]["3"]
+        assert rotated["room_clears"]["2"]["count"] == 2
+        assert analyze_logs(str(tmp_path)) == (rotated, 0)
+
+    def test_clear_without_known_predecessor_is_dropped(self, tmp_path):
+        # Starší část hry už rotace smazala — čas vyčištění nejde spočítat
+        write_json_log(tmp_path / "session_x.log", [
+            {"ts": 8.0, "lvl": "INFO", "ev": "room_cleared", "room": 3, "time_ms": 50000},
+            {"ts": 9.0, "lvl": "INFO", "ev": "room_cleared", "room": 4, "time_ms": 61000},
+        ])
+        write_json_log(tmp_path / "session_y.log", JSON_SESSION[:5])  # jiná session se nepočítá
+        total, _ = analyze_logs(str(tmp_path))
+        assert "3" not in total["room_clears"]
+        assert total["room_clears"]["4"]["total_ms"] == 11000
+
+    def test_cache_skips_unchanged_files(self, tmp_path):
+        write_json_log(tmp_path / "session_a.log", JSON_SESSION)
+        write_text_log(tmp_path / "session_b.log", TEXT_SESSION)
+        first, _ = analyze_logs(str(tmp_path))
+
+        second, reprocessed = analyze_logs(str(tmp_path))
+        assert reprocessed == 0
+        assert second == first
+
+        # Změněný soubor se zpracuje znovu, smazaný z výsledku zmizí
+        write_json_log(tmp_path / "session_a.log", JSON_SESSION * 2)
+        os.remove(tmp_path / "session_b.log")
+        third, reprocessed = analyze_logs(str(tmp_path))
+        assert reprocessed == 1
+        assert third["files"] == 1
+        assert third["games"] == 2
+
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        write_json_log(tmp_path / "session_a.log", JSON_SESSION)
+        (tmp_path / log_analytics.CACHE_NAME).write_text("{nesmysl", encoding="utf-8")
+        total, reprocessed = analyze_logs(str(tmp_path))
+        assert reprocessed == 1 and total["games"] == 1
+
+    def test_parallel_matches_serial(self, tmp_path):
+        serial_dir = tmp_path / "serial"
+        parallel_dir = tmp_path / "parallel"
+        for d in (serial_dir, parallel_dir):
+            d.mkdir()
+            for i in range(4):
+                write_json_log(d / f"session_{i}.log", JSON_SESSION)
+        serial, _ = analyze_logs(str(serial_dir), jobs=1)
+        parallel, _ = analyze_logs(str(parallel_dir), jobs=2)
+        assert serial == parallel
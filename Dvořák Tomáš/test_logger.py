@@ -0,0 +1,98 @@
+"""
+Testy strukturovaného loggeru
+Spustit: python -m pytest test_logger.py -v
+"""
+import json
+import logging
+import time
+
+import logger as game_logger
+from logger import BufferedRotatingFileHandler, JsonLinesFormatter
+
+
+def make_record(item):
+    return game_logger.listener.prepare(item)
+
+
+class TestStructuredLogger:
+
+    def test_event_tuple_becomes_json_line(self):
+        record = make_record((1700000000.5, logging.INFO, "room_cleared",
+                              "MÍSTNOST VYČIŠTĚNA | místnost=%d", (2,), {"room": 2, "time_ms": 41234}))
+        line = JsonLinesFormatter().format(record)
+        assert json.loads(line) == {"ts": 1700000000.5, "lvl": "INFO", "ev": "room_cleared",
+                                    "room": 2, "time_ms": 41234}
+        assert record.getMessage() == "MÍSTNOST VYČIŠTĚNA | místnost=2"
+
+    def test_plain_record_keeps_message(self):
+        record = logging.LogRecord("SpeedHell", logging.INFO, "", 0, "ahoj %s", ("světe",), None)
+        assert json.loads(JsonLinesFormatter().format(record))["msg"] == "ahoj světe"
+
+    def test_log_functions_do_not_format_in_game_thread(self, monkeypatch):
+        class Capture:
+            def __init__(self):
+                self.items = []
+            def put(self, item):
+                self.items.append(item)
+
+        capture = Capture()
+        monkeypatch.setattr(game_logger, "log_queue", capture)
+        game_logger.log_shot_fired(7)
+        assert len(capture.items) == 1
+        _, level, event, template, args, fields = capture.items[0]
+        assert (level, event, args, fields) == (logging.DEBUG, "shot", (7,), {"ammo_left": 7})
+
+    def test_rotates_by_size(self, tmp_path):
+        handler = BufferedRotatingFileHandler(str(tmp_path / "session.log"), max_bytes=200,
+                                              max_age_s=0, backup_count=3)
+        handler.setFormatter(JsonLinesFormatter())
+        for i in range(20):
+            handler.emit(logging.LogRecord("SpeedHell", logging.DEBUG, "", 0, "zpráva %d", (i,), None))
+        handler.close()
+        assert (tmp_path / "session.log.1").exists()
+        assert (tmp_path / "session.log").stat().st_size < 300
+
+    def test_rotates_by_age(self, tmp_path):
+        handler = BufferedRotatingFileHandler(str(tmp_path / "session.log"), max_bytes=0, max_age_s=60)
+        handler.setFormatter(JsonLinesFormatter())
+        handler.emit(logging.LogRecord("SpeedHell", logging.INFO, "", 0, "první", (), None))
+        handler.opened_at = time.monotonic() - 61
+        handler.emit(logging.LogRecord("SpeedHell", logging.INFO, "", 0, "druhá", (), None))
+        handler.close()
+        assert "první" in (tmp_path / "session.log.1").read_text(encoding="utf-8")
+        assert "druhá" in (tmp_path / "session.log").read_text(encoding="utf-8")
+
+    def test_idle_buffer_reaches_disk(self, tmp_path):
+        # Hra po posledním záznamu nic nelogne (pauza, menu) — INFO musí na disk i tak
+        path = tmp_path / "session.log"
+        handler = BufferedRotatingFileHandler(str(path), flush_interval=1.0)
+        handler.setFormatter(JsonLinesFormatter())
+        log_queue = game_logger.queue.SimpleQueue()
+        listener = game_logger.EventQueueListener(log_queue, handler, flush_interval=handler.flush_interval)
+        listener.start()
+        try:
+            handler.last_flush = time.monotonic()  # záznam přijde těsně po zápisu bufferu
+            log_queue.put((time.time(), logging.INFO, "room_entered", "VSTUP DO MÍSTNOSTI | místnost=%d",
+                           (3,), {"room": 3}))
+            deadline = time.monotonic() + 1.5
+            text = ""
+            while time.monotonic() < deadline and "room_entered" not in text:
+                time.sleep(0.05)
+                text = path.read_text(encoding="utf-8") if path.exists() else ""
+            assert "room_entered" in text
+            assert not handler.pending
+        finally:
+            listener.stop()
+            handler.close()
+
+    def test_listener_stop_is_idempotent(self, tmp_path):
+        handler = BufferedRotatingFileHandler(str(tmp_path / "session.log"))
+        listener = game_logger.EventQueueListener(game_logger.queue.SimpleQueue(), handler)
+        listener.stop()  # nikdy nespuštěný
+        assert not listener.running
+        listener.start()
+        assert listener.running
+        listener.stop()
+        listener.stop()  # např. shutdown_logging z atexit po ručním ukončení
+        assert not listener.running
+        handler.close()
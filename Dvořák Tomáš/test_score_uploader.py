@@ -0,0 +1,115 @@
+"""
+Testy uploaderu výsledků (bez skutečného serveru)
+Spustit: python -m pytest test_score_uploader.py -v
+"""
+import json
+import threading
+import time
+
+import requests
+
+from score_uploader import ScoreUploader
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Místo serveru — zaznamená dávky a vrací předem dané odpovědi."""
+    def __init__(self, statuses=None):
+        self.statuses = list(statuses or [])
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            status = self.statuses.pop(0) if self.statuses else 200
+            if status is None:
+                raise requests.ConnectionError("server neběží")
+            if url.endswith("/api/update_playtime_bulk/"):
+                self.batches.append(json["results"])
+            return FakeResponse(status)
+
+
+def read_spool(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestScoreUploader:
+
+    def test_results_are_sent_in_one_batch(self, tmp_path):
+        session = FakeSession()
+        spool = tmp_path / "scores.jsonl"
+        uploader = ScoreUploader(spool_path=str(spool), session=session, min_backoff=0.01)
+        uploader.submit("alice", 50000)
+        uploader.submit("bob", 60000)
+        assert uploader.flush(timeout=2)
+        uploader.stop()
+        assert sum(len(b) for b in session.batches) == 2
+        assert not spool.exists()
+
+    def test_failed_upload_is_retried(self, tmp_path):
+        session = FakeSession(statuses=[None, 503])
+        uploader = ScoreUploader(spool_path=str(tmp_path / "scores.jsonl"), session=session,
+                                 min_backoff=0.01, max_backoff=0.05)
+        uploader.submit("alice", 50000)
+        assert uploader.flush(timeout=2)
+        uploader.stop()
+        assert session.batches[-1] == [{"username": "alice", "play_time": 50000}]
+        assert uploader.sent_count == 1
+
+    def test_offline_results_stay_in_spool(self, tmp_path):
+        spool = tmp_path / "scores.jsonl"
+        session = FakeSession(statuses=[None] * 1000)
+        uploader = ScoreUploader(spool_path=str(spool), session=session, min_backoff=10)
+        uploader.submit("alice", 50000)
+        assert not uploader.flush(timeout=0.3)
+        uploader.stop()
+        assert read_spool(spool) == [{"username": "alice", "play_time": 50000}]
+
+    def test_spool_is_sent_after_restart(self, tmp_path):
+        spool = tmp_path / "scores.jsonl"
+        spool.write_text('{"username": "alice", "play_time": 50000}\n{"userna', encoding="utf-8")
+        session = FakeSession()
+        uploader = ScoreUploader(spool_path=str(spool), session=session, min_backoff=0.01)
+        assert uploader.flush(timeout=2)
+        uploader.stop()
+        assert session.batches == [[{"username": "alice", "play_time": 50000}]]
+
+    def test_login_runs_in_background(self, tmp_path):
+        session = FakeSession(statuses=[200, 401])
+        uploader = ScoreUploader(spool_path=str(tmp_path / "scores.jsonl"), session=FakeSession(),
+                                 login_session=session)
+        assert uploader.login("alice", "heslo").result(timeout=2) is True
+        assert uploader.login("alice", "spatne").result(timeout=2) is False
+        uploader.stop()
+
+    def test_result_is_in_spool_while_upload_hangs(self, tmp_path):
+        # Odesílání visí (pomalý server) a hra se ukončí — výsledek se nesmí ztratit
+        spool = tmp_path / "scores.jsonl"
+        release = threading.Event()
+
+        class HangingSession(FakeSession):
+            def post(self, url, json=None, timeout=None):
+                release.wait(5)
+                return super().post(url, json, timeout)
+
+        session = HangingSession()
+        uploader = ScoreUploader(spool_path=str(spool), session=session, min_backoff=0.01)
+        uploader.submit("alice", 50000)
+        time.sleep(0.1)  # první dávka už se posílá
+        uploader.submit("bob", 60000)
+        assert not uploader.flush(timeout=0.2)
+        uploader.stop(timeout=0.1)
+        assert read_spool(spool) == [{"username": "alice", "play_time": 50000},
+                                     {"username": "bob", "play_time": 60000}]
+        release.set()
+
+    def test_login_does_not_share_upload_session(self, tmp_path):
+        uploader = ScoreUploader(spool_path=str(tmp_path / "scores.jsonl"), session=FakeSession())
+        assert uploader.login_session is not uploader.session
+        uploader.stop()
@@ -0,0 +1,66 @@
+"""
+Testy prostorové mřížky
+Spustit: python -m pytest test_spatial_grid.py -v
+"""
+import math
+import random
+
+from spatial_grid import SpatialGrid
+from test_game import FakeRect, SimpleEnemy
+
+
+class Shot:
+    def __init__(self, x, y, size=30):
+        self.x, self.y = x, y
+        self.rect = FakeRect(x, y, size, size)
+
+
+def brute_force(enemies, rect):
+    return [e for e in enemies if rect.colliderect(e.rect)]
+
+
+class TestSpatialGrid:
+
+    def test_query_rect_matches_brute_force(self):
+        random.seed(1)
+        enemies = [SimpleEnemy(random.randint(60, 1800), random.randint(60, 1000),
+                               size=random.choice([50, 70])) for _ in range(300)]
+        grid = SpatialGrid(cell_size=128)
+        grid.rebuild(enemies)
+        for _ in range(100):
+            shot = Shot(random.randint(0, 1900), random.randint(0, 1060))
+            hits = [e for e in grid.query_rect(shot.rect) if shot.rect.colliderect(e.rect)]
+            assert hits == brute_force(enemies, shot.rect)
+
+    def test_query_keeps_insertion_order(self):
+        enemies = [SimpleEnemy(300 - i * 10, 300) for i in range(10)]
+        grid = SpatialGrid(cell_size=64)
+        grid.rebuild(enemies)
+        assert grid.query_rect(FakeRect(150, 280, 200, 100)) == enemies
+
+    def test_removed_enemy_is_not_returned(self):
+        a, b = SimpleEnemy(100, 100), SimpleEnemy(120, 100)
+        grid = SpatialGrid()
+        grid.rebuild([a, b])
+        grid.remove(a)
+        assert grid.query_rect(FakeRect(100, 100, 40, 40)) == [b]
+        assert len(grid) == 1
+
+    def test_query_radius_finds_all_in_range(self):
+        random.seed(2)
+        enemies = [SimpleEnemy(random.randint(60, 1800), random.randint(60, 1000)) for _ in range(200)]
+        grid = SpatialGrid(cell_size=128)
+        grid.rebuild(enemies)
+        px, py, radius = 900, 500, 250
+        expected = [e for e in enemies if math.hypot(e.x - px, e.y - py) <= radius]
+        found = [e for e in grid.query_radius(px, py, radius) if math.hypot(e.x - px, e.y - py) <= radius]
+        assert found == expected
+
+    def test_rebuild_clears_old_positions(self):
+        e = SimpleEnemy(100, 100)
+        grid = SpatialGrid()
+        grid.rebuild([e])
+        e.rect.x, e.rect.y = 1500, 900
+        grid.rebuild([e])
+        assert grid.query_rect(FakeRect(100, 100, 10, 10)) == []
+        assert grid.query_rect(FakeRect(1500, 900, 10, 10)) == [e]
@@ -0,0 +1,56 @@
+"""
+Testy pevného časového kroku
+Spustit: python -m pytest test_timestep.py -v
+"""
+import pytest
+
+from timestep import FixedTimestep, interp_offset
+
+
+class Obj:
+    def __init__(self, prev_x, prev_y, x, y):
+        self.prev_x, self.prev_y, self.x, self.y = prev_x, prev_y, x, y
+
+
+class TestFixedTimestep:
+
+    def test_one_tick_per_60fps_frame(self):
+        clock = FixedTimestep(dt_ms=1000 / 60)
+        ticks = [t for _ in range(60) for t in clock.ticks(1000 / 60)]
+        assert len(ticks) == 60
+        assert clock.now == 1000
+
+    def test_slow_frames_run_more_ticks(self):
+        """Na 30 FPS musí simulace dohnat dva ticky za snímek."""
+        clock = FixedTimestep(dt_ms=1000 / 60)
+        ticks = [t for _ in range(30) for t in clock.ticks(1000 / 30)]
+        assert len(ticks) == 60
+
+    def test_fast_frames_keep_remainder_as_alpha(self):
+        clock = FixedTimestep(dt_ms=10)
+        assert list(clock.ticks(4)) == []
+        assert clock.alpha == pytest.approx(0.4)
+        assert list(clock.ticks(7)) == [10]
+        assert clock.alpha == pytest.approx(0.1)
+
+    def test_huge_frame_is_clamped(self):
+        clock = FixedTimestep(dt_ms=10, max_frame_ms=250)
+        assert len(list(clock.ticks(5000))) == 25
+
+    def test_step_advances_without_accumulator(self):
+        clock = FixedTimestep(dt_ms=10)
+        assert clock.step() == 10
+        assert clock.step() == 20
+        assert clock.alpha == 0
+
+
+class TestInterpolation:
+
+    def test_alpha_zero_draws_previous_position(self):
+        assert interp_offset(Obj(100, 50, 110, 40), 0.0) == (-10, 10)
+
+    def test_alpha_one_draws_current_position(self):
+        assert interp_offset(Obj(100, 50, 110, 40), 1.0) == (0, 0)
+
+    def test_half_way(self):
+        assert interp_offset(Obj(100, 100, 120, 100), 0.5) == (-10, 0)
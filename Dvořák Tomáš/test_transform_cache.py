@@ -0,0 +1,63 @@
+"""
+Testy cache transformací spritů
+Spustit: python -m pytest test_transform_cache.py -v
+"""
+import pytest
+
+pygame = pytest.importorskip("pygame")  # Surface funguje i bez okna
+
+from transform_cache import TransformCache
+
+
+def make_surface(w=30, h=30):
+    return pygame.Surface((w, h), pygame.SRCALPHA)
+
+
+class TestTransformCache:
+
+    def test_same_request_is_a_hit(self):
+        cache = TransformCache()
+        img = make_surface()
+        first = cache.get(img, 45)
+        second = cache.get(img, 45)
+        assert first is second
+        assert cache.hits == 1 and cache.misses == 1
+        assert cache.hit_rate == 0.5
+
+    def test_angle_is_quantized(self):
+        cache = TransformCache(angle_step=5)
+        img = make_surface()
+        assert cache.get(img, 44.2) is cache.get(img, 45.9)
+        assert cache.quantize(-90) == 270
+
+    def test_flip_and_scale_are_separate_entries(self):
+        cache = TransformCache()
+        img = make_surface()
+        flipped = cache.get(img, flip_x=True)
+        scaled = cache.get(img, size=(60, 60))
+        assert flipped is not scaled
+        assert scaled.get_size() == (60, 60)
+        assert len(cache) == 2
+
+    def test_lru_evicts_when_over_memory_limit(self):
+        img = make_surface(10, 10)
+        one_entry = 10 * 10 * img.get_bytesize()
+        cache = TransformCache(max_bytes=one_entry * 2)
+        a = cache.get(img, flip_x=True)
+        cache.get(img, 90)
+        cache.get(img, 180)
+        assert len(cache) == 2
+        assert cache.memory_bytes <= cache.max_bytes
+        assert cache.get(img, flip_x=True) is not a  # nejstarší položka byla zahozena
+
+    def test_untransformed_surface_is_not_cached(self):
+        img = make_surface(10, 10)
+        one_entry = 10 * 10 * img.get_bytesize()
+        cache = TransformCache(max_bytes=one_entry * 2)
+        a = cache.get(img, flip_x=True)
+        b = cache.get(img, 90)
+        # Bez transformace se vrací sám zdroj a nic z cache nevytlačí
+        assert cache.get(img, size=(10, 10)) is img
+        assert cache.get(img, 359) is img  # zaokrouhlí se na 0°
+        assert len(cache) == 2 and cache.memory_bytes == 2 * one_entry
+        assert cache.get(img, flip_x=True) is a and cache.get(img, 90) is b
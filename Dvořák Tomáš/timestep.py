@@ -0,0 +1,53 @@
+"""
+Pevný časový krok simulace.
+
+Hra počítá časovače v ticích (inv_timer, dash_timer, reload_timer...),
+proto musí simulace běžet vždy 60× za sekundu bez ohledu na to, kolik
+snímků stihne vykreslit. Reálný čas se sčítá do akumulátoru a z něj se
+odebírají celé ticky; zbytek (alpha) slouží k interpolaci při kreslení.
+"""
+
+TICK_RATE = 60
+FIXED_DT_MS = 1000 / TICK_RATE
+
+
+class FixedTimestep:
+    def __init__(self, dt_ms=FIXED_DT_MS, max_frame_ms=250):
+        self.dt_ms = dt_ms
+        self.max_frame_ms = max_frame_ms  # ochrana proti "spirále smrti" po zaseknutí okna
+        self.accumulator = 0.0
+        self.tick_count = 0
+
+    @property
+    def time_ms(self):
+        """Herní (simulovaný) čas — počítá se z počtu ticků, aby se nesčítaly chyby floatů."""
+        return self.tick_count * self.dt_ms
+
+    def step(self):
+        """Posune simulovaný čas o jeden tick a vrátí ho v celých ms."""
+        self.tick_count += 1
+        return self.now
+
+    def ticks(self, frame_ms):
+        """Přičte uplynulý reálný čas a vrátí (generuje) čas každého ticku, který se má odsimulovat."""
+        self.accumulator += min(frame_ms, self.max_frame_ms)
+        while self.accumulator >= self.dt_ms:
+            self.accumulator -= self.dt_ms
+            yield self.step()
+
+    @property
+    def now(self):
+        return int(round(self.time_ms))
+
+    @property
+    def alpha(self):
+        """Jak daleko (0..1) je vykreslovaný snímek mezi posledními dvěma ticky."""
+        return self.accumulator / self.dt_ms
+
+
+def interp_offset(obj, alpha):
+    """Posun pro vykreslení objektu mezi jeho předchozí (prev_x/prev_y) a aktuální pozicí."""
+    return (
+        int((obj.prev_x - obj.x) * (1 - alpha)),
+        int((obj.prev_y - obj.y) * (1 - alpha)),
+    )
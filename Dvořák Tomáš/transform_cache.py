@@ -0,0 +1,66 @@
+"""
+LRU cache pro otočené / zrcadlené / zvětšené sprity.
+
+pygame.transform.* vytváří při každém volání nový Surface. Při hodně
+střelách to znamená tisíce alokací za sekundu, proto se výsledky
+ukládají podle (zdrojový snímek, zaokrouhlený úhel, flip, velikost)
+a nejdéle nepoužité položky se zahazují, když cache přeroste limit.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TransformCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, angle_step=5):
+        self.max_bytes = max_bytes
+        self.angle_step = angle_step  # úhel se zaokrouhluje na násobky (ve stupních)
+        self.entries = OrderedDict()  # klíč -> (zdroj, výsledek, velikost v bajtech)
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, angle):
+        return int(round(angle / self.angle_step) * self.angle_step) % 360
+
+    def get(self, surface, angle=0, flip_x=False, size=None):
+        """Vrátí surface zvětšený na size, zrcadlený a otočený o angle stupňů."""
+        angle = self.quantize(angle)
+        if not angle and not flip_x and (size is None or size == surface.get_size()):
+            return surface  # není co transformovat — do cache (ani do limitu paměti) nepatří
+        key = (id(surface), angle, flip_x, size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = surface
+        if size is not None and size != surface.get_size():
+            result = pygame.transform.scale(result, size)
+        if flip_x:
+            result = pygame.transform.flip(result, True, False)
+        if angle:
+            result = pygame.transform.rotate(result, angle)
+
+        nbytes = result.get_width() * result.get_height() * result.get_bytesize()
+        # Zdroj se drží v položce, aby jeho id() nemohl dostat jiný surface
+        self.entries[key] = (surface, result, nbytes)
+        self.memory_bytes += nbytes
+        while self.memory_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, old_bytes) = self.entries.popitem(last=False)
+            self.memory_bytes -= old_bytes
+        return result
+
+    def clear(self):
+        self.entries.clear()
+        self.memory_bytes = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self.entries)
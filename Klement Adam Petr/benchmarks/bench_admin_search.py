@@ -0,0 +1,84 @@
+"""
+Benchmark hledání v administraci — původní _render_lists (clear_widgets() a nový
+Button/BoxLayout řádek pro každou položku při každém stisku klávesy, filtr přes
+celý seznam) vs. SearchIndex + data pro RecycleView.
+
+  filtr      jen vyhledání (původně `q in name.lower()` přes všechny položky)
+  stisk      celé zpracování jednoho stisku klávesy (původně i stavba widgetů)
+
+Psaní "user0042" znak po znaku nad 10 000 uživateli. Původní verze se měří
+jen na prvních 3 stiscích (každý staví tisíce widgetů).
+
+Spuštění z kořene projektu (bez displeje přes SDL offscreen):
+  SDL_VIDEODRIVER=offscreen python benchmarks/bench_admin_search.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+
+from search_index import SearchIndex
+
+USERS = [{"username": f"user{i:05d}", "is_banned": i % 7 == 0} for i in range(10_000)]
+QUERY = "user0042"
+OLD_KEYSTROKES = 3
+
+
+# --- Původní verze (kopie logiky z main.py, jen seznam uživatelů) ---
+
+def old_filter(users, query):
+    q = query.strip().lower()
+    return [u for u in sorted(users, key=lambda x: x["username"]) if not q or q in u["username"].lower()]
+
+
+def old_render(usr_container, users, query):
+    usr_container.clear_widgets()
+    q = query.strip().lower()
+    for u in sorted(users, key=lambda x: x["username"]):
+        if q and q not in u["username"].lower(): continue
+        row = BoxLayout(orientation="horizontal", size_hint_y=None, height=40, spacing=8)
+        row.add_widget(Label(text=f'{u["username"]} {"(BAN)" if u.get("is_banned") else ""}'))
+        ban_btn = Button(text="Ban" if not u.get("is_banned") else "Unban", background_color=(1,0.5,0,1))
+        del_btn = Button(text="Delete", background_color=(0.8,0.2,0.2,1))
+        row.add_widget(ban_btn)
+        row.add_widget(del_btn)
+        usr_container.add_widget(row)
+
+
+def per_keystroke(fn, keystrokes):
+    start = time.perf_counter()
+    for n in range(1, keystrokes + 1):
+        fn(QUERY[:n])
+    return (time.perf_counter() - start) / keystrokes * 1000
+
+
+def main():
+    # Nová verze: řádky a index se připraví jednou v on_enter
+    start = time.perf_counter()
+    users = sorted(USERS, key=lambda x: x["username"])
+    rows = [{"username": u["username"], "is_banned": bool(u["is_banned"])} for u in users]
+    index = SearchIndex([u["username"] for u in users])
+    build_ms = (time.perf_counter() - start) * 1000
+
+    new_filter = per_keystroke(index.search, len(QUERY))
+    new_key = per_keystroke(lambda q: [rows[i] for i in index.search(q)], len(QUERY))
+    old_filter_ms = per_keystroke(lambda q: old_filter(USERS, q), len(QUERY))
+    container = BoxLayout(orientation="vertical", size_hint_y=None)
+    old_key = per_keystroke(lambda q: old_render(container, USERS, q), OLD_KEYSTROKES)
+
+    print(f"{len(USERS)} uživatelů, dotaz '{QUERY}', ms na stisk klávesy\n")
+    print(f"{'operace':<10} | {'původní':>9} | {'index':>9}")
+    print("-" * 34)
+    print(f"{'filtr':<10} | {old_filter_ms:>9.2f} | {new_filter:>9.3f}")
+    print(f"{'stisk':<10} | {old_key:>9.0f} | {new_key:>9.3f}")
+    print(f"\nsestavení indexu v on_enter: {build_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
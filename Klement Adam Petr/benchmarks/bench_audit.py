@@ -0,0 +1,123 @@
+"""
+Benchmark auditního logu — původní audit.log (otevření souboru při každé akci,
+export načte celý soubor do seznamu) vs. tabulka audit_log s dávkovým zápisem
+a indexy podle času a aktéra (export řádek po řádku).
+
+  zápis      jedna administrátorská akce (µs)
+  export     CSV celé historie / jednoho aktéra / jednoho týdne (ms) a špička paměti (MB)
+
+Historie: 200 000 záznamů od 20 aktérů za zhruba dva roky.
+
+Spuštění z kořene projektu: python benchmarks/bench_audit.py
+"""
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager, audit_buffer
+
+ENTRIES = 200_000
+ACTORS = [f"admin{i}" for i in range(20)]
+WRITES = 5_000
+WEEK = ("2025-03-01", "2025-03-08")
+
+
+def history():
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    for i in range(ENTRIES):
+        yield ((start + timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S"), rng.choice(ACTORS),
+               rng.choice(["ban_user", "unban_user", "add_exercise", "delete_user"]), f"cil{i % 997}", {})
+
+
+# --- Původní verze (kopie logiky z data_manager.py) ---
+
+def old_audit(audit_file, actor, action, target, details):
+    entry = {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "actor": actor, "action": action, "target": target, "details": details}
+    try:
+        with open(audit_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except: pass
+
+
+def old_export(audit_file, out_path):
+    rows = []
+    if os.path.exists(audit_file):
+        with open(audit_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try: rows.append(json.loads(line.strip()))
+                except: continue
+    headers = ["timestamp", "actor", "action", "target", "details"]
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: (json.dumps(r.get(k, {}), ensure_ascii=False) if k == "details" else r.get(k, "")) for k in headers})
+    return True, out_path
+
+
+def measure(fn):
+    """Vrátí (ms, špička paměti v MB); paměť se měří v druhém běhu, tracemalloc běh zpomaluje."""
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.csv")
+        old_file = os.path.join(tmp, "old", "audit.log")
+        os.makedirs(os.path.dirname(old_file))
+        with open(old_file, "w", encoding="utf-8") as f:
+            for ts, actor, action, target, details in history():
+                f.write(json.dumps({"timestamp": ts, "actor": actor, "action": action, "target": target, "details": details},
+                                   ensure_ascii=False) + "\n")
+
+        dm = DataManager(db_file=os.path.join(tmp, "new", "fitness.db"))
+        conn = dm._get_connection()
+        with conn:
+            conn.executemany("INSERT INTO audit_log (timestamp, actor, action, target, details) VALUES (?, ?, ?, ?, ?)",
+                             ((ts, a, ac, t, json.dumps(d)) for ts, a, ac, t, d in history()))
+
+        # Zápis: nová verze včetně závěrečného zápisu dávky
+        start = time.perf_counter()
+        for i in range(WRITES):
+            old_audit(old_file + ".bench", "admin", "ban_user", f"u{i}", {})
+        old_write = (time.perf_counter() - start) / WRITES * 1e6
+        start = time.perf_counter()
+        for i in range(WRITES):
+            dm._audit("admin", "ban_user", f"u{i}", {})
+        audit_buffer.flush()
+        new_write = (time.perf_counter() - start) / WRITES * 1e6
+
+        # Původní export umí jen celou historii; filtr by se dělal až nad načteným seznamem
+        old_all = measure(lambda: old_export(old_file, out))
+        new_all = measure(lambda: dm.export_audit_csv(out))
+        new_actor = measure(lambda: dm.export_audit_csv(out, actor="admin7"))
+        new_week = measure(lambda: dm.export_audit_csv(out, since=WEEK[0], until=WEEK[1]))
+
+    print(f"{ENTRIES} záznamů v historii, {WRITES} zápisů\n")
+    print(f"{'operace':<18} | {'původní':>10} | {'audit_log':>10}")
+    print("-" * 44)
+    print(f"{'zápis (µs)':<18} | {old_write:>10.1f} | {new_write:>10.1f}")
+    print(f"{'export vše (ms)':<18} | {old_all[0]:>10.0f} | {new_all[0]:>10.0f}")
+    print(f"{'  paměť (MB)':<18} | {old_all[1]:>10.1f} | {new_all[1]:>10.1f}")
+    print(f"{'export aktér (ms)':<18} | {old_all[0]:>10.0f} | {new_actor[0]:>10.0f}")
+    print(f"{'export týden (ms)':<18} | {old_all[0]:>10.0f} | {new_week[0]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark hromadného importu a exportu tréninků — save_workout pro každý trénink
+(jak by import dělala aplikace) vs. import_workouts (dávky po IMPORT_CHUNK_SIZE
+tréninků v jedné transakci), a export do CSV vs. sloupcový ZIP z export_workouts.
+
+  import     tréninků za sekundu
+  export     čas (ms) a velikost souboru (MB)
+
+Historie: 200 000 tréninků po 5 cvicích (1 000 000 položek) od 50 uživatelů.
+Přes save_workout se měří jen prvních 2 000 tréninků.
+
+Spuštění z kořene projektu: python benchmarks/bench_bulk_import.py
+"""
+import csv
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager, audit_buffer, connections
+
+WORKOUTS = 200_000
+ITEMS_PER_WORKOUT = 5
+USERS = [f"user{i}" for i in range(50)]
+EXERCISES = ["Dřepy", "Bench press", "Mrtvý tah", "Shyby", "Kliky", "Tlaky nad hlavu", "Výpady", "Veslování"]
+OLD_WORKOUTS = 2_000
+
+
+def history():
+    rng = random.Random(0)
+    start = datetime(2022, 1, 1)
+    for i in range(WORKOUTS):
+        date = (start + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        items = [(rng.choice(EXERCISES), rng.randint(1, 5), rng.randint(3, 12), rng.choice(range(20, 160, 5)))
+                 for _ in range(ITEMS_PER_WORKOUT)]
+        yield i, rng.choice(USERS), date, "", items
+
+
+def write_csv(path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["workout", "username", "date", "note", "exercise", "sets", "reps", "weight"])
+        for i, username, date, note, items in history():
+            for name, sets, reps, weight in items:
+                writer.writerow([i, username, date, note, name, sets, reps, weight])
+
+
+def csv_export(dm, out_path):
+    """Export stejných dat jako CSV (jeden řádek na položku) pro srovnání velikosti."""
+    rows = dm._get_connection().execute("""
+        SELECT w.id, u.username, w.date, w.note, e.name, wi.sets, wi.reps, wi.weight
+        FROM workouts w
+        JOIN users u ON w.user_id = u.id
+        JOIN workout_items wi ON wi.workout_id = w.id
+        JOIN exercises e ON wi.exercise_id = e.id
+        ORDER BY w.id, wi.id
+    """)
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["workout", "username", "date", "note", "exercise", "sets", "reps", "weight"])
+        writer.writerows(tuple(r) for r in rows)
+
+
+def new_dm(tmp, name):
+    dm = DataManager(db_file=os.path.join(tmp, name, "fitness.db"))
+    for username in USERS:
+        dm.add_user(username, "heslo", f"{username}@test.cz")
+    return dm
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "history.csv")
+        write_csv(src)
+
+        old_dm = new_dm(tmp, "old")
+        old_s, _ = timed(lambda: [old_dm.save_workout(username, items, note, "")
+                                  for _, username, _, note, items in itertools.islice(history(), OLD_WORKOUTS)])
+
+        dm = new_dm(tmp, "new")
+        new_s, counts = timed(lambda: dm.import_workouts(src))
+
+        csv_out, zip_out = os.path.join(tmp, "export.csv"), os.path.join(tmp, "export.zip")
+        csv_s, _ = timed(lambda: csv_export(dm, csv_out))
+        zip_s, _ = timed(lambda: dm.export_workouts(zip_out))
+
+        back = new_dm(tmp, "back")
+        back_s, back_counts = timed(lambda: back.import_workouts(zip_out))
+        assert back_counts == counts, (back_counts, counts)
+
+        sizes = {p: os.path.getsize(p) / 1e6 for p in (src, csv_out, zip_out)}
+        audit_buffer.flush()
+        connections.close_all()
+
+    print(f"{counts['workouts']} tréninků, {counts['items']} položek, {len(USERS)} uživatelů\n")
+    print(f"{'import':<24} | {'tréninků/s':>10}")
+    print("-" * 37)
+    print(f"{'save_workout po jednom':<24} | {OLD_WORKOUTS / old_s:>10.0f}")
+    print(f"{'import_workouts (CSV)':<24} | {counts['workouts'] / new_s:>10.0f}")
+    print(f"{'import_workouts (ZIP)':<24} | {counts['workouts'] / back_s:>10.0f}")
+    print(f"\n{'export':<24} | {'ms':>10} | {'MB':>8}")
+    print("-" * 48)
+    print(f"{'CSV':<24} | {csv_s * 1000:>10.0f} | {sizes[csv_out]:>8.1f}")
+    print(f"{'sloupcový ZIP':<24} | {zip_s * 1000:>10.0f} | {sizes[zip_out]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
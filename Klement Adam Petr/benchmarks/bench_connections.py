@@ -0,0 +1,135 @@
+"""
+Benchmark připojení k DB — původní DataManager (nové sqlite3.connect v každé
+metodě, DDL schématu při každém DataManager(), SELECT na každý cvik při
+ukládání) vs. sdílené připojení z ConnectionManageru (WAL, synchronous=NORMAL,
+cache dotazů, schéma jednou, executemany).
+
+  obrazovka  DataManager() + validate_login + get_user_role, jako LoginScreen.login
+             a ostatní obsluhy v main.py
+  trénink    uložení tréninku s 8 cviky (bez následného načtení historie)
+
+Každá verze má vlastní soubor DB v dočasné složce (WAL se do souboru zapíše natrvalo).
+
+Spuštění z kořene projektu: python benchmarks/bench_connections.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+
+SCREENS = 300
+WORKOUTS = 300
+WORKOUT = [(f"Cvik {i}", 3, 10, 40 + i * 5) for i in range(8)]
+
+
+# --- Původní verze (kopie logiky z data_manager.py) ---
+
+class OldDataManager:
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._init_db()
+
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL, password TEXT NOT NULL, email TEXT, role TEXT DEFAULT 'user',
+            is_banned INTEGER DEFAULT 0, bodyweight REAL DEFAULT 0);""")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS exercises (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP);""")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS workouts (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL, date TIMESTAMP DEFAULT CURRENT_TIMESTAMP, note TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE);""")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS workout_items (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            workout_id INTEGER NOT NULL, exercise_id INTEGER NOT NULL, sets INTEGER NOT NULL,
+            reps INTEGER NOT NULL, weight REAL NOT NULL,
+            FOREIGN KEY (workout_id) REFERENCES workouts (id) ON DELETE CASCADE,
+            FOREIGN KEY (exercise_id) REFERENCES exercises (id) ON DELETE CASCADE);""")
+        cursor.execute("""CREATE TABLE IF NOT EXISTS bodyweight_history (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL, weight REAL NOT NULL, date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE);""")
+        conn.commit()
+        conn.close()
+
+    def add_user(self, username, password, email):
+        conn = self._get_connection()
+        conn.execute("INSERT INTO users (username, password, email) VALUES (?, ?, ?)", (username, password, email))
+        conn.commit()
+        conn.close()
+
+    def validate_login(self, username, password):
+        conn = self._get_connection()
+        user = conn.execute("SELECT * FROM users WHERE username = ? AND password = ? AND is_banned = 0",
+                            (username, password)).fetchone()
+        conn.close()
+        return user is not None
+
+    def get_user_role(self, username):
+        conn = self._get_connection()
+        user = conn.execute("SELECT role FROM users WHERE username = ?", (username,)).fetchone()
+        conn.close()
+        return user['role'] if user else 'user'
+
+    def add_workout(self, username, workout_data, note):
+        conn = self._get_connection()
+        user = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO workouts (user_id, note) VALUES (?, ?)", (user['id'], note))
+        workout_id = cursor.lastrowid
+        for exercise_name, sets, reps, weight in workout_data:
+            ex = conn.execute("SELECT id FROM exercises WHERE name = ?", (exercise_name,)).fetchone()
+            if not ex:
+                cursor.execute("INSERT INTO exercises (name) VALUES (?)", (exercise_name,))
+                ex_id = cursor.lastrowid
+            else:
+                ex_id = ex['id']
+            cursor.execute("INSERT INTO workout_items (workout_id, exercise_id, sets, reps, weight) VALUES (?, ?, ?, ?, ?)",
+                           (workout_id, ex_id, sets, reps, weight))
+        conn.commit()
+        conn.close()
+        return workout_id
+
+
+def measure(cls, db_file):
+    cls(db_file).add_user("alex", "1234", "alex@seznam.cz")
+
+    start = time.perf_counter()
+    for _ in range(SCREENS):
+        dm = cls(db_file)
+        dm.validate_login("alex", "1234")
+        dm.get_user_role("alex")
+    screen_ms = (time.perf_counter() - start) / SCREENS * 1000
+
+    dm = cls(db_file)
+    start = time.perf_counter()
+    for i in range(WORKOUTS):
+        dm.add_workout("alex", WORKOUT, f"Trénink {i}")
+    workout_ms = (time.perf_counter() - start) / WORKOUTS * 1000
+    return screen_ms, workout_ms
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        old = measure(OldDataManager, os.path.join(tmp, "old.db"))
+        new = measure(DataManager, os.path.join(tmp, "new.db"))
+
+    print(f"{SCREENS} obrazovek, {WORKOUTS} tréninků po {len(WORKOUT)} cvicích, ms na operaci\n")
+    print(f"{'operace':<12} | {'původní':>8} | {'sdílené připojení':>17}")
+    print("-" * 44)
+    print(f"{'obrazovka':<12} | {old[0]:>8.3f} | {new[0]:>17.3f}")
+    print(f"{'trénink':<12} | {old[1]:>8.3f} | {new[1]:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark statistik cviků — původní StatsScreen (get_user_data při každém
+on_enter + metriky cviku v Pythonu přes celou jeho historii, nejlepší zvednutí
+přes všechny položky) vs. tabulky agregací exercise_stats / exercise_daily.
+
+  obrazovka  on_enter statistik + metriky jednoho cviku (bez grafu, ten načítají obě verze stejně)
+  statistiky get_user_stats pro /get_user_stats (počty tréninků + nejlepší zvednutí)
+  uložení    save_workout bez agregací vs. s jejich průběžnou aktualizací
+
+Databáze se naplní do dočasné složky stejně jako v bench_user_data.py:
+jeden uživatel, 20 000 tréninků po 5 cvicích = 100 000 položek.
+
+Spuštění z kořene projektu: python benchmarks/bench_exercise_stats.py
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+
+USERNAME = "bench"
+WORKOUTS = 20_000
+ITEMS_PER_WORKOUT = 5
+EXERCISES = [f"Cvik {i}" for i in range(30)]
+WORKOUT = [(f"Cvik {i}", 3, 10, 40 + i * 5) for i in range(8)]
+REPEAT = 3
+SAVES = 200
+
+
+def seed(dm):
+    """Naplní DB jedním uživatelem s dlouhou historií a dopočítá agregace."""
+    rng = random.Random(0)
+    dm.add_user(USERNAME, "heslo", "bench@test.cz")
+    conn = sqlite3.connect(dm.db_file)
+    user_id = conn.execute("SELECT id FROM users WHERE username = ?", (USERNAME,)).fetchone()[0]
+    conn.executemany("INSERT INTO exercises (name) VALUES (?)", [(n,) for n in EXERCISES])
+    exercise_ids = [r[0] for r in conn.execute("SELECT id FROM exercises")]
+
+    # Historie končí dnes, ať okno posledních 30 dní není prázdné
+    start = datetime.now() - timedelta(hours=2 * WORKOUTS)
+    workouts = [(user_id, (start + timedelta(hours=2 * i)).strftime("%Y-%m-%d %H:%M:%S"), f"Trénink {i}")
+                for i in range(WORKOUTS)]
+    conn.executemany("INSERT INTO workouts (user_id, date, note) VALUES (?, ?, ?)", workouts)
+    workout_ids = [r[0] for r in conn.execute("SELECT id FROM workouts WHERE user_id = ?", (user_id,))]
+    conn.executemany(
+        "INSERT INTO workout_items (workout_id, exercise_id, sets, reps, weight) VALUES (?, ?, ?, ?, ?)",
+        ((w_id, rng.choice(exercise_ids), rng.randint(1, 5), rng.randint(1, 12), rng.randint(20, 200))
+         for w_id in workout_ids for _ in range(ITEMS_PER_WORKOUT)),
+    )
+    conn.commit()
+    conn.close()
+
+    conn = dm._get_connection()
+    with conn:
+        dm._rebuild_exercise_stats(conn)
+
+
+# --- Původní verze (kopie logiky z main.py a data_manager.py) ---
+
+def old_stats_screen(dm, exercise_name):
+    user_data = dm.get_user_data(USERNAME)
+    personal_records = user_data.get("personal_records", {})
+    progress_data = user_data.get("progress_data", {})
+    exercises = set()
+    for workout in user_data.get("workouts", []):
+        for ex, _, _, _ in workout.get("exercises", []):
+            exercises.add(ex)
+    stat_exercises = sorted(list(exercises))
+
+    history = list(progress_data.get(exercise_name, []))
+    pr = personal_records.get(exercise_name, 0)
+    month_ago = datetime.now() - timedelta(days=30)
+    total_volume, total_reps = 0.0, 0
+    exercise_weights = []
+    for entry in history:
+        weight = float(entry.get('weight', 0))
+        exercise_weights.append(weight)
+        dt = datetime.strptime(entry.get('date', '')[:10], "%Y-%m-%d")
+        if dt >= month_ago:
+            s, r = int(entry.get('sets', 1)), int(entry.get('reps', 1))
+            total_volume += weight * s * r
+            total_reps += s * r
+    return stat_exercises, pr, round(total_volume / total_reps, 1), max(exercise_weights), min(exercise_weights)
+
+
+def new_stats_screen(dm, exercise_name):
+    stats = dm.get_exercise_stats(USERNAME)
+    s = stats[exercise_name]
+    return sorted(stats), s['pr'], round(s['volume_30d'] / s['reps_30d'], 1), s['pr'], s['low']
+
+
+def old_user_stats(dm):
+    conn = dm._get_connection()
+    user = conn.execute("SELECT id, bodyweight FROM users WHERE username = ?", (USERNAME,)).fetchone()
+    totals = conn.execute("""
+        SELECT COUNT(*) AS total_workouts, COUNT(DISTINCT substr(date, 1, 10)) AS days_active
+        FROM workouts
+        WHERE user_id = ?
+    """, (user['id'],)).fetchone()
+    best = conn.execute("""
+        SELECT e.name, wi.weight
+        FROM workout_items wi
+        JOIN exercises e ON wi.exercise_id = e.id
+        JOIN workouts w ON wi.workout_id = w.id
+        WHERE w.user_id = ?
+        ORDER BY wi.weight DESC, e.name ASC
+        LIMIT 1
+    """, (user['id'],)).fetchone()
+    return {
+        "total_workouts": totals['total_workouts'],
+        "days_active": totals['days_active'],
+        "bodyweight": user['bodyweight'],
+        "best_lift": (best['name'], best['weight']) if best else None
+    }
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def save_ms(dm, with_stats):
+    update = dm._update_exercise_stats
+    if not with_stats:
+        dm._update_exercise_stats = lambda *args: None
+    start = time.perf_counter()
+    for i in range(SAVES):
+        dm.add_workout(USERNAME, WORKOUT, f"Uložení {i}")
+    dm._update_exercise_stats = update
+    return (time.perf_counter() - start) / SAVES * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(db_file=os.path.join(tmp, "bench.db"))
+        seed(dm)
+
+        old_ms, old = best_of(lambda: old_stats_screen(dm, "Cvik 7"))
+        new_ms, new = best_of(lambda: new_stats_screen(dm, "Cvik 7"))
+        assert old == new, (old, new)
+
+        old_user_ms, old_user = best_of(lambda: old_user_stats(dm))
+        new_user_ms, new_user = best_of(lambda: dm.get_user_stats(USERNAME))
+        assert old_user == new_user
+
+        plain_save = save_ms(dm, with_stats=False)
+        stats_save = save_ms(dm, with_stats=True)
+
+        items = WORKOUTS * ITEMS_PER_WORKOUT
+        print(f"{WORKOUTS} tréninků, {items} položek, nejlepší z {REPEAT} běhů, ms\n")
+        print(f"{'operace':<12} | {'původní':>8} | {'agregace':>8}")
+        print("-" * 34)
+        print(f"{'obrazovka':<12} | {old_ms:>8.1f} | {new_ms:>8.2f}")
+        print(f"{'statistiky':<12} | {old_user_ms:>8.1f} | {new_user_ms:>8.2f}")
+        print(f"{'uložení':<12} | {plain_save:>8.2f} | {stats_save:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
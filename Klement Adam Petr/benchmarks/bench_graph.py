@@ -0,0 +1,234 @@
+"""
+Benchmark překreslení GraphWidget — původní verze (canvas.clear(), nová textura
+pro každý popisek, dvě Ellipse na každý bod) vs. znovupoužité instrukce,
+cache textur popisků a LTTB zmenšení čáry na šířku grafu v pixelech.
+
+Graf s 50 000 body (několik let denní váhy): první vykreslení a změna velikosti
+okna (5 různých šířek, jako při tažení okrajem).
+
+Spuštění z kořene projektu (bez displeje přes SDL offscreen):
+  SDL_VIDEODRIVER=offscreen python benchmarks/bench_graph.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Line, Ellipse, Rectangle
+from kivy.core.text import Label as CoreLabel
+from kivy.properties import ListProperty
+
+from main import GraphWidget
+
+POINTS = 50_000
+WIDTHS = [900 - 20 * i for i in range(6)]
+
+
+# --- Původní verze (kopie z main.py) ---
+
+class OldGraphWidget(Widget):
+    """
+    Vlastní widget pro vykreslování spojnicového grafu progresu.
+    """
+    data_points = ListProperty([])  # Seznam bodů (hodnota, "popisek")
+    line_color = ListProperty([0, 0.78, 0.32, 1])
+    
+    def on_data_points(self, instance, value):
+        self.draw_graph()
+        
+    def on_size(self, *args):
+        self.draw_graph()
+        
+    def _render_text(self, text, font_size=11):
+        """Vykreslí text na texturu pro použití v Canvasu."""
+        cl = CoreLabel(text=text, font_size=font_size)
+        cl.refresh()
+        return cl.texture
+
+    def draw_graph(self):
+        """Hlavní logika vykreslování grafu na Canvas."""
+        self.canvas.clear()
+        
+        if not self.data_points:
+            return
+            
+        values = [p[0] for p in self.data_points]
+        if not values:
+            return
+            
+        # Výpočet rozsahu osy Y
+        min_val = min(values) * 0.95
+        max_val = max(values) * 1.05
+        if min_val == max_val:
+            min_val -= 5
+            max_val += 5
+        val_range = max_val - min_val
+        
+        # Odsazení grafu
+        padding_left = 60
+        padding_bottom = 40
+        padding_top = 20
+        padding_right = 20
+        
+        w = self.width - padding_left - padding_right
+        h = self.height - padding_bottom - padding_top
+        
+        num_points = len(self.data_points)
+        
+        with self.canvas:
+            # Vykreslení os
+            Color(0.4, 0.4, 0.4, 1)
+            Line(points=[self.x + padding_left, self.y + padding_bottom, 
+                         self.x + padding_left, self.y + self.height - padding_top], width=1.2)
+            Line(points=[self.x + padding_left, self.y + padding_bottom, 
+                         self.x + self.width - padding_right, self.y + padding_bottom], width=1.2)
+            
+            # --- Dynamické popisky osy Y (Váha) ---
+            min_y_label_spacing = 35
+            num_y_labels = max(2, min(10, int(h / min_y_label_spacing) + 1))
+            
+            raw_step = val_range / max(1, num_y_labels - 1)
+            magnitude = 10 ** math.floor(math.log10(max(raw_step, 0.001)))
+            nice_steps = [1, 2, 2.5, 5, 10]
+            nice_step = magnitude
+            for ns in nice_steps:
+                candidate = ns * magnitude
+                if candidate >= raw_step:
+                    nice_step = candidate
+                    break
+            
+            y_start = math.floor(min_val / nice_step) * nice_step
+            y_tick = y_start
+            while y_tick <= max_val + 0.01:
+                if y_tick >= min_val - 0.01:
+                    y_pos = self.y + padding_bottom + ((y_tick - min_val) / val_range) * h
+                    
+                    # Pomocné mřížky
+                    Color(0.4, 0.4, 0.4, 0.5)
+                    Line(points=[self.x + padding_left - 5, y_pos,
+                                 self.x + padding_left + w, y_pos], width=0.8)
+                    
+                    fmt = f"{y_tick:.0f}" if nice_step >= 1 else f"{y_tick:.1f}"
+                    tex = self._render_text(fmt, font_size=11)
+                    Color(0.8, 0.8, 0.8, 1)
+                    Rectangle(
+                        pos=(self.x + padding_left - 10 - tex.width,
+                             y_pos - tex.height / 2),
+                        size=tex.size, texture=tex)
+                y_tick += nice_step
+
+            # --- Dynamické popisky osy X (Datum) ---
+            if num_points > 0:
+                max_label_width = 45
+                min_spacing = 15
+                max_labels = max(2, int(w / (max_label_width + min_spacing)))
+                
+                if num_points <= max_labels:
+                    indices = list(range(num_points))
+                else:
+                    indices = [0]
+                    step = (num_points - 1) / (max_labels - 1)
+                    for i in range(1, max_labels - 1):
+                        indices.append(int(round(i * step)))
+                    indices.append(num_points - 1)
+                    indices = sorted(list(set(indices)))
+                
+                for i in indices:
+                    val, date_str = self.data_points[i]
+                    x_pos = self.x + padding_left + (i / (num_points - 1 if num_points > 1 else 1)) * w
+                    
+                    Color(0.4, 0.4, 0.4, 0.5)
+                    Line(points=[x_pos, self.y + padding_bottom,
+                                 x_pos, self.y + padding_bottom - 5], width=1)
+                    
+                    display_date = date_str[:10] if len(date_str) > 10 else date_str
+                    try:
+                        if "-" in display_date:
+                            dt = datetime.strptime(display_date, "%Y-%m-%d")
+                            display_date = f"{dt.day}.{dt.month}."
+                    except (ValueError, TypeError):
+                        pass
+                    
+                    tex = self._render_text(display_date, font_size=10)
+                    Color(0.8, 0.8, 0.8, 1)
+                    Rectangle(
+                        pos=(x_pos - tex.width / 2, self.y + 15),
+                        size=tex.size, texture=tex)
+                    
+            # --- Vykreslení čáry a bodů ---
+            points = []
+            for i, (val, label) in enumerate(self.data_points):
+                x_pos = self.x + padding_left + (i / (num_points - 1 if num_points > 1 else 1)) * w
+                y_pos = self.y + padding_bottom + ((val - min_val) / val_range) * h
+                points.extend([x_pos, y_pos])
+                
+                Color(*self.line_color)
+                Ellipse(pos=(x_pos - 4, y_pos - 4), size=(8, 8))
+                Color(1, 1, 1, 0.8)
+                Ellipse(pos=(x_pos - 2, y_pos - 2), size=(4, 4))
+
+            if len(points) >= 4:
+                Color(*self.line_color)
+                Line(points=points, width=2.5, joint='round')
+
+
+def make_points():
+    rng = random.Random(0)
+    start = datetime(2010, 1, 1)
+    weight = 80.0
+    points = []
+    for i in range(POINTS):
+        weight += rng.uniform(-0.3, 0.3)
+        points.append((round(weight, 1), (start + timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M:%S")))
+    return points
+
+
+def redraw(widget):
+    """Nová verze překresluje až v dalším snímku (Clock trigger), tady hned. Původní už překreslila."""
+    if isinstance(widget, GraphWidget):
+        widget._trigger_draw.cancel()
+        widget.draw_graph()
+
+
+def measure(widget, points):
+    widget.size = (WIDTHS[0], 500)
+    start = time.perf_counter()
+    widget.data_points = points
+    redraw(widget)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for width in WIDTHS[1:]:
+        widget.size = (width, 500)
+        redraw(widget)
+    resize_ms = (time.perf_counter() - start) / (len(WIDTHS) - 1) * 1000
+    return first_ms, resize_ms, count_instructions(widget.canvas)
+
+
+def count_instructions(canvas):
+    total = 0
+    for child in canvas.children:
+        total += 1 + (count_instructions(child) if hasattr(child, "children") else 0)
+    return total
+
+
+def main():
+    points = make_points()
+    old_first, old_resize, old_count = measure(OldGraphWidget(), points)
+    new_first, new_resize, new_count = measure(GraphWidget(), points)
+
+    print(f"{POINTS} bodů, ms na překreslení\n")
+    print(f"{'verze':<22} | {'první':>8} | {'resize':>8} | {'instrukcí':>9}")
+    print("-" * 56)
+    print(f"{'původní':<22} | {old_first:>8.1f} | {old_resize:>8.1f} | {old_count:>9}")
+    print(f"{'LTTB + cache + reuse':<22} | {new_first:>8.1f} | {new_resize:>8.1f} | {new_count:>9}")
+
+
+if __name__ == "__main__":
+    main()
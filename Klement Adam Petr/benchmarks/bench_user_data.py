@@ -0,0 +1,134 @@
+"""
+Benchmark DataManager.get_user_data — původní načítání (jeden dotaz na každý
+trénink + dva další průchody pro PR a progres) vs. jeden seřazený dotaz.
+
+Databáze se naplní do dočasné složky: jeden uživatel, 20 000 tréninků
+po 5 cvicích = 100 000 položek. Obě verze běží nad stejnou DB i se
+stejnými indexy (bez indexu na workout_items.workout_id by původní verze
+procházela celou tabulku položek pro každý trénink zvlášť).
+
+Spuštění z kořene projektu: python benchmarks/bench_user_data.py
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+
+USERNAME = "bench"
+WORKOUTS = 20_000
+ITEMS_PER_WORKOUT = 5
+EXERCISES = [f"Cvik {i}" for i in range(30)]
+REPEAT = 3
+
+
+def seed(dm):
+    """Naplní DB jedním uživatelem s dlouhou historií."""
+    rng = random.Random(0)
+    dm.add_user(USERNAME, "heslo", "bench@test.cz")
+    conn = sqlite3.connect(dm.db_file)
+    user_id = conn.execute("SELECT id FROM users WHERE username = ?", (USERNAME,)).fetchone()[0]
+    conn.executemany("INSERT INTO exercises (name) VALUES (?)", [(n,) for n in EXERCISES])
+    exercise_ids = [r[0] for r in conn.execute("SELECT id FROM exercises")]
+
+    start = datetime(2019, 1, 1, 7, 0, 0)
+    workouts = [(user_id, (start + timedelta(hours=2 * i)).strftime("%Y-%m-%d %H:%M:%S"), f"Trénink {i}")
+                for i in range(WORKOUTS)]
+    rng.shuffle(workouts)  # id neodpovídá pořadí podle data, jako po importu
+    conn.executemany("INSERT INTO workouts (user_id, date, note) VALUES (?, ?, ?)", workouts)
+    workout_ids = [r[0] for r in conn.execute("SELECT id FROM workouts WHERE user_id = ?", (user_id,))]
+    conn.executemany(
+        "INSERT INTO workout_items (workout_id, exercise_id, sets, reps, weight) VALUES (?, ?, ?, ?, ?)",
+        ((w_id, rng.choice(exercise_ids), rng.randint(1, 5), rng.randint(1, 12), rng.randint(20, 200))
+         for w_id in workout_ids for _ in range(ITEMS_PER_WORKOUT)),
+    )
+    conn.commit()
+    conn.close()
+
+
+# --- Původní verze (kopie logiky z data_manager.py) ---
+
+def old_get_user_data(dm, username):
+    conn = sqlite3.connect(dm.db_file)
+    conn.row_factory = sqlite3.Row
+    user = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+    user_id = user['id']
+    workouts_rows = conn.execute("SELECT * FROM workouts WHERE user_id = ? ORDER BY date DESC", (user_id,)).fetchall()
+    workouts = []
+    for w in workouts_rows:
+        items = conn.execute("""
+            SELECT e.name, wi.sets, wi.reps, wi.weight
+            FROM workout_items wi
+            JOIN exercises e ON wi.exercise_id = e.id
+            WHERE wi.workout_id = ?
+        """, (w['id'],)).fetchall()
+        ex_list = [[i['name'], i['sets'], i['reps'], i['weight']] for i in items]
+        summary = "\n".join([f"{i[0]} - {i[1]}x{i[2]}, {i[3]}kg" for i in ex_list])
+        workouts.append({"id": w['id'], "date": w['date'], "note": w['note'], "exercises": ex_list, "summary": summary})
+
+    pr_rows = conn.execute("""
+        SELECT e.name, MAX(wi.weight) as max_weight
+        FROM workout_items wi
+        JOIN exercises e ON wi.exercise_id = e.id
+        JOIN workouts w ON wi.workout_id = w.id
+        WHERE w.user_id = ?
+        GROUP BY e.name
+    """, (user_id,)).fetchall()
+    personal_records = {r['name']: r['max_weight'] for r in pr_rows}
+
+    progress_rows = conn.execute("""
+        SELECT e.name, w.date, wi.sets, wi.reps, wi.weight, (wi.sets * wi.reps * wi.weight) as volume
+        FROM workout_items wi
+        JOIN exercises e ON wi.exercise_id = e.id
+        JOIN workouts w ON wi.workout_id = w.id
+        WHERE w.user_id = ?
+        ORDER BY w.date ASC
+    """, (user_id,)).fetchall()
+    progress_data = {}
+    for r in progress_rows:
+        progress_data.setdefault(r['name'], []).append(
+            {'date': r['date'], 'sets': r['sets'], 'reps': r['reps'], 'weight': r['weight'], 'volume': r['volume']})
+    bw_rows = conn.execute("SELECT weight, date FROM bodyweight_history WHERE user_id = ? ORDER BY date ASC", (user_id,)).fetchall()
+    bodyweight_history = [{'weight': r['weight'], 'date': r['date']} for r in bw_rows]
+    conn.close()
+    return workouts, personal_records, progress_data, bodyweight_history
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(db_file=os.path.join(tmp, "bench.db"))
+        seed(dm)
+
+        old_ms, (workouts, prs, progress, _) = best_of(lambda: old_get_user_data(dm, USERNAME))
+        new_ms, data = best_of(lambda: dm.get_user_data(USERNAME))
+
+        # Stejný výsledek (pořadí tréninků se stejným datem tu nehraje roli, data jsou unikátní)
+        assert data["workouts"] == workouts
+        assert data["personal_records"] == prs
+        assert data["progress_data"].keys() == progress.keys()
+
+        items = WORKOUTS * ITEMS_PER_WORKOUT
+        print(f"{WORKOUTS} tréninků, {items} položek, nejlepší z {REPEAT} běhů\n")
+        print(f"{'verze':<22} | {'dotazů':>7} | {'ms':>8}")
+        print("-" * 44)
+        print(f"{'původní (N+1)':<22} | {WORKOUTS + 5:>7} | {old_ms:>8.0f}")
+        print(f"{'jeden průchod':<22} | {3:>7} | {new_ms:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,163 @@
+import atexit
+import csv
 import sqlite3
 import os
 import json
-from datetime import datetime
+import sys
+import threading
+import zipfile
+from array import array
+from datetime import datetime, timedelta
 
 # Cesty k datovým souborům
 DB_FILE = os.path.join("data", "fitness.db")
 CONFIG_FILE = os.path.join("data", "config.json")
 
+# Nastavení každého připojení: WAL (čtení neblokuje zápis), bez fsync při každém commitu,
+# cizí klíče (ON DELETE CASCADE) platí pro všechna připojení, ne jen pro inicializaci
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA foreign_keys = ON;",
+)
+
+
+class ConnectionManager:
+    """
+    Sdílená připojení k SQLite pro celý proces.
+    Každé vlákno má na každý soubor DB jedno trvalé připojení (Flask obsluhuje
+    požadavky ve vláknech, sqlite3 připojení mezi vlákny sdílet nejde).
+    Schéma se inicializuje jen jednou pro každý soubor. Když soubor zmizí nebo
+    je nahrazen (testy mažou DB), připojení se otevře znovu.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._initialized = {}  # cesta -> inode souboru, nad kterým proběhlo _init_db
+        atexit.register(self.close_all)  # zavřením se WAL zapíše do DB a soubory -wal/-shm zmizí
+
+    @staticmethod
+    def _inode(path):
+        try:
+            return os.stat(path).st_ino
+        except OSError:
+            return None
+
+    def get(self, db_file, init_schema):
+        path = os.path.abspath(db_file)
+        conns = self._local.__dict__.setdefault("conns", {})
+        conn, inode = conns.get(path, (None, None))
+        current = self._inode(path)
+        if conn is None or current is None or current != inode:
+            # Staré připojení ukazuje na smazaný/nahrazený soubor; nový soubor může dostat
+            # stejné číslo inode, takže schéma se v tom případě vytvoří vždy znovu
+            replaced = conn is not None
+            if replaced:
+                conn.close()
+            conn = sqlite3.connect(path, timeout=5, cached_statements=256)
+            conn.row_factory = sqlite3.Row  # Umožňuje přístup k výsledkům přes názvy sloupců
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            inode = self._inode(path)
+            conns[path] = (conn, inode)
+            with self._lock:
+                if replaced or self._initialized.get(path) != inode:
+                    init_schema(conn)
+                    self._initialized[path] = inode
+        return conn
+
+    def close_all(self):
+        """Zavře připojení aktuálního vlákna (další připojení znovu ověří schéma)."""
+        conns = self._local.__dict__.get("conns", {})
+        with self._lock:
+            for path, (conn, _) in conns.items():
+                conn.close()
+                self._initialized.pop(path, None)
+        conns.clear()
+
+
+connections = ConnectionManager()
+
+
+# Hromadný import: tolik tréninků na jednu transakci
+IMPORT_CHUNK_SIZE = 5000
+
+# Sloupcový export tréninků: ZIP, v něm meta.json a každý sloupec jako binární pole (little-endian)
+EXPORT_FORMAT = "fitness-columns"
+EXPORT_COLUMNS = (
+    ("workout_user", "i"),      # index do meta["users"]
+    ("workout_date", "q"),      # sekundy od 1970-01-01 (čas tak, jak je v DB)
+    ("workout_note_end", "q"),  # konec poznámky v workout_note.utf8
+    ("workout_items", "i"),     # počet položek tréninku
+    ("item_exercise", "i"),     # index do meta["exercises"]
+    ("item_sets", "i"),
+    ("item_reps", "i"),
+    ("item_weight", "d"),
+)
+EPOCH = datetime(1970, 1, 1)
+
+# Auditní záznamy se ukládají po dávkách: nejvýše tolik záznamů nebo po tolika sekundách
+AUDIT_BATCH_SIZE = 50
+AUDIT_FLUSH_SECONDS = 2.0
+
+
+class AuditBuffer:
+    """
+    Vyrovnávací paměť auditních záznamů pro celý proces (sdílí ji Kivy i Flask vlákna).
+    Záznamy se zapisují do tabulky audit_log jedním INSERTem a commitem na dávku:
+    při zaplnění dávky, nejpozději po AUDIT_FLUSH_SECONDS, před exportem a při ukončení.
+    """
+    def __init__(self, batch_size=AUDIT_BATCH_SIZE, flush_seconds=AUDIT_FLUSH_SECONDS):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending = {}  # cesta k DB -> (funkce vracející připojení, [řádky])
+        self._timer = None
+        atexit.register(self.flush)  # registrováno po ConnectionManageru, takže proběhne před zavřením připojení
+
+    def add(self, db_file, get_connection, row):
+        path = os.path.abspath(db_file)
+        with self._lock:
+            rows = self._pending.setdefault(path, (get_connection, []))[1]
+            rows.append(row)
+            full = len(rows) >= self.batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush(db_file)
+
+    def flush(self, db_file=None):
+        """Zapíše čekající záznamy (jen pro jednu DB, nebo všechny)."""
+        with self._lock:
+            if db_file is None:
+                batches = self._pending
+                self._pending = {}
+            else:
+                path = os.path.abspath(db_file)
+                batches = {path: self._pending.pop(path)} if path in self._pending else {}
+            if not self._pending and self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        for path, (get_connection, rows) in batches.items():
+            try:
+                conn = get_connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO audit_log (timestamp, actor, action, target, details) VALUES (?, ?, ?, ?, ?)", rows
+                    )
+            except sqlite3.Error:
+                # DB je zamčená nebo nedostupná: záznamy se vrátí do fronty a zkusí se při dalším zápisu
+                with self._lock:
+                    pending = self._pending.setdefault(path, (get_connection, []))[1]
+                    pending[:0] = rows
+
+
+audit_buffer = AuditBuffer()
+
+
 class DataManager:
     """
     Třída pro správu všech dat aplikace pomocí SQLite databáze.
@@ -14,9 +165,9 @@ class DataManager:
     """
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
+        self.audit_file = os.path.join(os.path.dirname(self.db_file), "audit.log")  # starý JSON-lines log
         self._ensure_data_dir()
-        self._init_db()
-        self.audit_file = os.path.join(os.path.dirname(self.db_file), "audit.log")
+        self._get_connection()  # schéma se vytvoří jen při prvním připojení k souboru
 
     def _ensure_data_dir(self):
         """Zajistí existenci složek pro data."""
@@ -24,18 +175,12 @@ class DataManager:
         os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
 
     def _get_connection(self):
-        """Vytvoří a vrátí připojení k SQLite databázi."""
-        conn = sqlite3.connect(self.db_file)
-        conn.row_factory = sqlite3.Row  # Umožňuje přístup k výsledkům přes názvy sloupců
-        return conn
+        """Vrátí sdílené připojení k SQLite databázi (nezavírat, drží ho ConnectionManager)."""
+        return connections.get(self.db_file, self._init_db)
 
-    def _init_db(self):
+    def _init_db(self, conn):
         """Inicializuje schéma databáze, pokud neexistuje."""
-        conn = self._get_connection()
         cursor = conn.cursor()
-        
-        # Povolení cizích klíčů (Foreign Keys)
-        cursor.execute("PRAGMA foreign_keys = ON;")
 
         # Tabulka UŽIVATELŮ
         cursor.execute("""
@@ -95,8 +240,116 @@ class DataManager:
             );
         """)
 
+        # Tabulky AGREGACÍ po cvicích (udržují se průběžně při ukládání tréninku).
+        # Souhrn za celou historii + denní součty pro okno posledních 30 dní.
+        # Při smazání uživatele nebo cviku je odstraní ON DELETE CASCADE.
+        has_stats = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'exercise_stats'"
+        ).fetchone()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exercise_stats (
+                user_id INTEGER NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                pr REAL NOT NULL,
+                low REAL NOT NULL,
+                total_volume REAL NOT NULL,
+                total_reps INTEGER NOT NULL,
+                entries INTEGER NOT NULL,
+                first_date TIMESTAMP,
+                last_date TIMESTAMP,
+                PRIMARY KEY (user_id, exercise_id),
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+                FOREIGN KEY (exercise_id) REFERENCES exercises (id) ON DELETE CASCADE
+            );
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exercise_daily (
+                user_id INTEGER NOT NULL,
+                exercise_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                volume REAL NOT NULL,
+                reps INTEGER NOT NULL,
+                PRIMARY KEY (user_id, exercise_id, day),
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+                FOREIGN KEY (exercise_id) REFERENCES exercises (id) ON DELETE CASCADE
+            );
+        """)
+
+        # Tabulka AUDITU (jen přidávání, export podle času nebo podle aktéra)
+        has_audit = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'audit_log'"
+        ).fetchone()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audit_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                actor TEXT NOT NULL,
+                action TEXT NOT NULL,
+                target TEXT,
+                details TEXT
+            );
+        """)
+
+        # Indexy pro načítání historie uživatele (bez nich každý dotaz prochází celé tabulky)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_workouts_user_date ON workouts (user_id, date);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_workout_items_workout ON workout_items (workout_id);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_workout_items_exercise ON workout_items (exercise_id);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bodyweight_user_date ON bodyweight_history (user_id, date);")
+        # Kaskádové mazání cviku hledá agregace podle exercise_id
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_exercise_stats_exercise ON exercise_stats (exercise_id);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_exercise_daily_exercise ON exercise_daily (exercise_id);")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log (timestamp);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_actor_timestamp ON audit_log (actor, timestamp);")
+
+        # Starší DB bez agregací: dopočítají se jednou z existujících tréninků
+        if not has_stats:
+            self._rebuild_exercise_stats(conn)
+        # Starší DB s auditem v audit.log: záznamy se jednou převezmou do tabulky (soubor zůstane)
+        if not has_audit:
+            self._import_audit_file(conn)
+
         conn.commit()
-        conn.close()
+
+    def _import_audit_file(self, conn):
+        """Převezme záznamy ze starého audit.log (JSON na řádek) do tabulky audit_log."""
+        if not os.path.exists(self.audit_file):
+            return
+        with open(self.audit_file, "r", encoding="utf-8") as f:
+            rows = []
+            for line in f:
+                try: r = json.loads(line.strip())
+                except: continue
+                rows.append((r.get("timestamp", ""), r.get("actor", ""), r.get("action", ""), r.get("target", ""),
+                             json.dumps(r.get("details", {}), ensure_ascii=False)))
+                if len(rows) >= 1000:
+                    conn.executemany("INSERT INTO audit_log (timestamp, actor, action, target, details) VALUES (?, ?, ?, ?, ?)", rows)
+                    rows = []
+            conn.executemany("INSERT INTO audit_log (timestamp, actor, action, target, details) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _rebuild_exercise_stats(self, conn):
+        """Přepočítá tabulky agregací z celé historie (jen migrace, běžně se udržují průběžně)."""
+        conn.execute("DELETE FROM exercise_stats")
+        conn.execute("DELETE FROM exercise_daily")
+        # JOIN na exercises vynechá položky cviků smazaných dřív bez kaskády
+        conn.execute("""
+            INSERT INTO exercise_stats (user_id, exercise_id, pr, low, total_volume, total_reps, entries, first_date, last_date)
+            SELECT w.user_id, wi.exercise_id, MAX(wi.weight), MIN(wi.weight),
+                   SUM(wi.sets * wi.reps * wi.weight), SUM(wi.sets * wi.reps), COUNT(*), MIN(w.date), MAX(w.date)
+            FROM workout_items wi
+            JOIN workouts w ON wi.workout_id = w.id
+            JOIN exercises e ON wi.exercise_id = e.id
+            GROUP BY w.user_id, wi.exercise_id
+        """)
+        conn.execute("""
+            INSERT INTO exercise_daily (user_id, exercise_id, day, volume, reps)
+            SELECT w.user_id, wi.exercise_id, substr(w.date, 1, 10),
+                   SUM(wi.sets * wi.reps * wi.weight), SUM(wi.sets * wi.reps)
+            FROM workout_items wi
+            JOIN workouts w ON wi.workout_id = w.id
+            JOIN exercises e ON wi.exercise_id = e.id
+            GROUP BY w.user_id, wi.exercise_id, substr(w.date, 1, 10)
+        """)
 
     # --- Správa uživatelů ---
 
@@ -104,16 +357,15 @@ class DataManager:
         """Zaregistruje nového uživatele do SQL databáze."""
         conn = self._get_connection()
         try:
-            conn.execute(
-                "INSERT INTO users (username, password, email) VALUES (?, ?, ?)",
-                (username, password, email)
-            )
-            conn.commit()
+            # with conn: commit, při chybě rollback (připojení zůstává otevřené pro další volání)
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (username, password, email) VALUES (?, ?, ?)",
+                    (username, password, email)
+                )
             return True, "Registrace úspěšná"
         except sqlite3.IntegrityError:
             return False, "Uživatel již existuje"
-        finally:
-            conn.close()
 
     def validate_login(self, username, password):
         """Ověří přihlašovací údaje pomocí SQL SELECT."""
@@ -122,14 +374,12 @@ class DataManager:
             "SELECT * FROM users WHERE username = ? AND password = ? AND is_banned = 0",
             (username, password)
         ).fetchone()
-        conn.close()
         return user is not None
 
     def get_user_role(self, username):
         """Vrátí roli uživatele."""
         conn = self._get_connection()
         user = conn.execute("SELECT role FROM users WHERE username = ?", (username,)).fetchone()
-        conn.close()
         return user['role'] if user else 'user'
 
     def get_user_data(self, username):
@@ -140,68 +390,53 @@ class DataManager:
         conn = self._get_connection()
         user = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
         if not user:
-            conn.close()
             return None
         
         user_id = user['id']
-        
-        # Načtení tréninků (1:N)
-        workouts_rows = conn.execute("SELECT * FROM workouts WHERE user_id = ? ORDER BY date DESC", (user_id,)).fetchall()
-        workouts = []
-        for w in workouts_rows:
-            # Načtení položek tréninku přes JOIN s tabulkou cviků (M:N)
-            items = conn.execute("""
-                SELECT e.name, wi.sets, wi.reps, wi.weight 
-                FROM workout_items wi
-                JOIN exercises e ON wi.exercise_id = e.id
-                WHERE wi.workout_id = ?
-            """, (w['id'],)).fetchall()
-            
-            ex_list = [[i['name'], i['sets'], i['reps'], i['weight']] for i in items]
-            summary = "\n".join([f"{i[0]} - {i[1]}x{i[2]}, {i[3]}kg" for i in ex_list])
-            
-            workouts.append({
-                "id": w['id'],
-                "date": w['date'],
-                "note": w['note'],
-                "exercises": ex_list,
-                "summary": summary
-            })
 
-        # Osobní rekordy (Výpočet přes MAX a GROUP BY)
-        pr_rows = conn.execute("""
-            SELECT e.name, MAX(wi.weight) as max_weight
-            FROM workout_items wi
-            JOIN exercises e ON wi.exercise_id = e.id
-            JOIN workouts w ON wi.workout_id = w.id
+        # Tréninky, jejich položky, PR i data pro grafy jedním dotazem a jedním průchodem.
+        # LEFT JOIN nechá i tréninky bez cviků; řádky jdou od nejstaršího tréninku,
+        # takže progres je rovnou seřazený podle data a tréninky se nakonec jen otočí.
+        cursor = conn.cursor()
+        cursor.row_factory = None  # obyčejné tuple, sqlite3.Row je na 100k řádků zbytečně drahý
+        rows = cursor.execute("""
+            SELECT w.id, w.date, w.note, e.name, wi.sets, wi.reps, wi.weight
+            FROM workouts w
+            LEFT JOIN workout_items wi ON wi.workout_id = w.id
+            LEFT JOIN exercises e ON wi.exercise_id = e.id
             WHERE w.user_id = ?
-            GROUP BY e.name
-        """, (user_id,)).fetchall()
-        personal_records = {r['name']: r['max_weight'] for r in pr_rows}
+            ORDER BY w.date ASC, w.id ASC, wi.id ASC
+        """, (user_id,))
 
-        # Data pro grafy (Progres)
-        progress_rows = conn.execute("""
-            SELECT e.name, w.date, wi.sets, wi.reps, wi.weight, (wi.sets * wi.reps * wi.weight) as volume
-            FROM workout_items wi
-            JOIN exercises e ON wi.exercise_id = e.id
-            JOIN workouts w ON wi.workout_id = w.id
-            WHERE w.user_id = ?
-            ORDER BY w.date ASC
-        """, (user_id,)).fetchall()
-        
+        workouts = []
+        personal_records = {}
         progress_data = {}
-        for r in progress_rows:
-            if r['name'] not in progress_data:
-                progress_data[r['name']] = []
-            progress_data[r['name']].append({
-                'date': r['date'], 'sets': r['sets'], 'reps': r['reps'], 'weight': r['weight'], 'volume': r['volume']
+        workout = None
+        for w_id, date, note, name, sets, reps, weight in rows:
+            if workout is None or workout["id"] != w_id:
+                workout = {"id": w_id, "date": date, "note": note, "exercises": [], "summary": ""}
+                workouts.append(workout)
+            if name is None:
+                continue  # trénink bez cviků (nebo položka smazaného cviku)
+
+            workout["exercises"].append([name, sets, reps, weight])
+
+            # Osobní rekordy (MAX váhy podle cviku)
+            if name not in personal_records or weight > personal_records[name]:
+                personal_records[name] = weight
+
+            # Data pro grafy (Progres)
+            progress_data.setdefault(name, []).append({
+                'date': date, 'sets': sets, 'reps': reps, 'weight': weight, 'volume': sets * reps * weight
             })
 
+        workouts.reverse()  # nejnovější trénink první
+        for workout in workouts:
+            workout["summary"] = "\n".join([f"{i[0]} - {i[1]}x{i[2]}, {i[3]}kg" for i in workout["exercises"]])
+
         # Historie váhy
-        bw_rows = conn.execute("SELECT weight, date FROM bodyweight_history WHERE user_id = ? ORDER BY date ASC", (user_id,)).fetchall()
-        bodyweight_history = [{'weight': r['weight'], 'date': r['date']} for r in bw_rows]
+        bodyweight_history = self._bodyweight_history(conn, user_id)
 
-        conn.close()
         return {
             "username": user['username'],
             "email": user['email'],
@@ -214,43 +449,259 @@ class DataManager:
             "bodyweight_history": bodyweight_history
         }
 
+    def _bodyweight_history(self, conn, user_id):
+        rows = conn.execute("SELECT weight, date FROM bodyweight_history WHERE user_id = ? ORDER BY date ASC", (user_id,)).fetchall()
+        return [{'weight': r['weight'], 'date': r['date']} for r in rows]
+
+    # --- Statistiky (z tabulek agregací, bez procházení celé historie) ---
+
+    def get_exercise_stats(self, username):
+        """
+        Vrátí {cvik: agregace} pro všechny cviky uživatele, nebo None pro neznámého uživatele.
+        Agregace: pr, low, total_volume, total_reps, entries, first_date, last_date
+        a volume_30d / reps_30d za posledních 30 dní.
+        """
+        conn = self._get_connection()
+        user_id = self._get_user_id(conn, username)
+        if user_id is None:
+            return None
+
+        # Den D patří do okna, pokud jeho půlnoc není starší než 30 dní
+        cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        rows = conn.execute("""
+            SELECT e.name, s.pr, s.low, s.total_volume, s.total_reps, s.entries, s.first_date, s.last_date,
+                   COALESCE(SUM(d.volume), 0) AS volume_30d, COALESCE(SUM(d.reps), 0) AS reps_30d
+            FROM exercise_stats s
+            JOIN exercises e ON s.exercise_id = e.id
+            LEFT JOIN exercise_daily d
+                ON d.user_id = s.user_id AND d.exercise_id = s.exercise_id AND d.day > ?
+            WHERE s.user_id = ?
+            GROUP BY s.exercise_id
+        """, (cutoff, user_id)).fetchall()
+
+        stats = {}
+        for r in rows:
+            row = dict(r)
+            stats[row.pop('name')] = row
+        return stats
+
+    def get_exercise_progress(self, username, exercise_name):
+        """Vrátí data pro graf jednoho cviku (od nejstaršího záznamu)."""
+        conn = self._get_connection()
+        rows = conn.execute("""
+            SELECT w.date, wi.sets, wi.reps, wi.weight
+            FROM workout_items wi
+            JOIN exercises e ON wi.exercise_id = e.id
+            JOIN workouts w ON wi.workout_id = w.id
+            JOIN users u ON w.user_id = u.id
+            WHERE e.name = ? AND u.username = ?
+            ORDER BY w.date ASC, w.id ASC, wi.id ASC
+        """, (exercise_name, username)).fetchall()
+        return [{'date': r['date'], 'sets': r['sets'], 'reps': r['reps'], 'weight': r['weight'],
+                 'volume': r['sets'] * r['reps'] * r['weight']} for r in rows]
+
+    def get_bodyweight(self, username):
+        """Vrátí aktuální váhu a její historii, nebo None."""
+        conn = self._get_connection()
+        user = conn.execute("SELECT id, bodyweight FROM users WHERE username = ?", (username,)).fetchone()
+        if not user:
+            return None
+        return {"bodyweight": user['bodyweight'], "history": self._bodyweight_history(conn, user['id'])}
+
+    # --- Dotazy pro web (jen potřebné sloupce, stránkování) ---
+
+    def _get_user_id(self, conn, username):
+        user = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+        return user['id'] if user else None
+
+    def list_workouts(self, username, limit=20, before=None):
+        """
+        Vrátí stránku tréninků od nejnovějšího (keyset stránkování).
+        before je (date, id) posledního tréninku předchozí stránky.
+        Vrací (seznam tréninků, kurzor další stránky nebo None), None pro neznámého uživatele.
+        """
+        conn = self._get_connection()
+        user_id = self._get_user_id(conn, username)
+        if user_id is None:
+            return None
+
+        params = [user_id]
+        where = "w.user_id = ?"
+        if before is not None:
+            where += " AND (w.date, w.id) < (?, ?)"  # rozsah v indexu (user_id, date), žádný OFFSET
+            params += [before[0], before[1]]
+        # O jeden řádek víc, ať je poznat, jestli existuje další stránka
+        rows = conn.execute(f"""
+            SELECT w.id, w.date, w.note,
+                (SELECT COUNT(*) FROM workout_items wi JOIN exercises e ON wi.exercise_id = e.id
+                 WHERE wi.workout_id = w.id) AS exercise_count,
+                (SELECT e.name FROM workout_items wi JOIN exercises e ON wi.exercise_id = e.id
+                 WHERE wi.workout_id = w.id ORDER BY wi.id LIMIT 1) AS first_exercise
+            FROM workouts w
+            WHERE {where}
+            ORDER BY w.date DESC, w.id DESC
+            LIMIT ?
+        """, params + [limit + 1]).fetchall()
+
+        workouts = [dict(r) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (workouts[-1]['date'], workouts[-1]['id'])
+        return workouts, next_cursor
+
+    def get_workout(self, username, workout_id):
+        """Vrátí jeden trénink uživatele i s cviky, nebo None."""
+        conn = self._get_connection()
+        workout = conn.execute("""
+            SELECT w.id, w.date, w.note
+            FROM workouts w
+            JOIN users u ON w.user_id = u.id
+            WHERE w.id = ? AND u.username = ?
+        """, (workout_id, username)).fetchone()
+        if not workout:
+            return None
+
+        items = conn.execute("""
+            SELECT e.name, wi.sets, wi.reps, wi.weight
+            FROM workout_items wi
+            JOIN exercises e ON wi.exercise_id = e.id
+            WHERE wi.workout_id = ?
+            ORDER BY wi.id
+        """, (workout_id,)).fetchall()
+
+        ex_list = [[i['name'], i['sets'], i['reps'], i['weight']] for i in items]
+        return {
+            "id": workout['id'],
+            "date": workout['date'],
+            "note": workout['note'],
+            "exercises": ex_list,
+            "summary": "\n".join([f"{i[0]} - {i[1]}x{i[2]}, {i[3]}kg" for i in ex_list])
+        }
+
+    def get_user_stats(self, username):
+        """Souhrnné statistiky přes SQL agregace (počet tréninků, aktivní dny, nejlepší zvednutí)."""
+        conn = self._get_connection()
+        user = conn.execute("SELECT id, bodyweight FROM users WHERE username = ?", (username,)).fetchone()
+        if not user:
+            return None
+
+        totals = conn.execute("""
+            SELECT COUNT(*) AS total_workouts, COUNT(DISTINCT substr(date, 1, 10)) AS days_active
+            FROM workouts
+            WHERE user_id = ?
+        """, (user['id'],)).fetchone()
+
+        # Nejvyšší PR z agregací, řádek na cvik (při shodě abecedně první cvik)
+        best = conn.execute("""
+            SELECT e.name, s.pr
+            FROM exercise_stats s
+            JOIN exercises e ON s.exercise_id = e.id
+            WHERE s.user_id = ?
+            ORDER BY s.pr DESC, e.name ASC
+            LIMIT 1
+        """, (user['id'],)).fetchone()
+
+        return {
+            "total_workouts": totals['total_workouts'],
+            "days_active": totals['days_active'],
+            "bodyweight": user['bodyweight'],
+            "best_lift": (best['name'], best['pr']) if best else None
+        }
+
     # --- Záznamy tréninků a váhy ---
 
-    def save_workout(self, username, workout_data, note, summary):
-        """Uloží trénink do SQL tabulek (workouts a workout_items)."""
+    def _exercise_ids(self, conn, names):
+        """Vrátí {název: id} a chybějící cviky založí (dávkově, bez SELECTu na každý cvik)."""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        conn.executemany("INSERT OR IGNORE INTO exercises (name) VALUES (?)", [(n,) for n in names])
+        ids = {}
+        for i in range(0, len(names), 500):  # limit počtu parametrů v jednom dotazu
+            chunk = names[i:i + 500]
+            rows = conn.execute(
+                f"SELECT name, id FROM exercises WHERE name IN ({','.join('?' * len(chunk))})", chunk
+            )
+            ids.update((r['name'], r['id']) for r in rows)
+        return ids
+
+    def add_workout(self, username, workout_data, note):
+        """Zapíše trénink do tabulek workouts a workout_items jednou transakcí. Vrací ID tréninku."""
         conn = self._get_connection()
         user = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
         if not user:
-            conn.close()
             return None
-        
-        user_id = user['id']
-        cursor = conn.cursor()
-        
-        # 1. Vytvoření záznamu tréninku
-        cursor.execute(
-            "INSERT INTO workouts (user_id, note) VALUES (?, ?)",
-            (user_id, note)
-        )
-        workout_id = cursor.lastrowid
-        
-        # 2. Vložení jednotlivých cviků (položek)
-        for exercise_name, sets, reps, weight in workout_data:
-            # Získání nebo vytvoření ID cviku
-            ex = conn.execute("SELECT id FROM exercises WHERE name = ?", (exercise_name,)).fetchone()
-            if not ex:
-                cursor.execute("INSERT INTO exercises (name) VALUES (?)", (exercise_name,))
-                ex_id = cursor.lastrowid
-            else:
-                ex_id = ex['id']
-            
-            cursor.execute(
+
+        with conn:
+            # 1. Vytvoření záznamu tréninku
+            cursor = conn.execute(
+                "INSERT INTO workouts (user_id, note) VALUES (?, ?)",
+                (user['id'], note)
+            )
+            workout_id = cursor.lastrowid
+
+            # 2. Vložení jednotlivých cviků (položek), ID cviků se zjistí najednou
+            ex_ids = self._exercise_ids(conn, [item[0] for item in workout_data])
+            conn.executemany(
                 "INSERT INTO workout_items (workout_id, exercise_id, sets, reps, weight) VALUES (?, ?, ?, ?, ?)",
-                (workout_id, ex_id, sets, reps, weight)
+                [(workout_id, ex_ids[name], sets, reps, weight) for name, sets, reps, weight in workout_data]
             )
-            
-        conn.commit()
-        conn.close()
+
+            # 3. Průběžná aktualizace agregací ve stejné transakci
+            date = conn.execute("SELECT date FROM workouts WHERE id = ?", (workout_id,)).fetchone()['date']
+            self._update_exercise_stats(conn, [
+                (user['id'], ex_ids[name], date, sets, reps, weight) for name, sets, reps, weight in workout_data
+            ])
+        return workout_id
+
+    def _update_exercise_stats(self, conn, items):
+        """Přičte položky (user_id, exercise_id, date, sets, reps, weight) k agregacím.
+        Položky se nejdřív sečtou v Pythonu, do DB jde jeden upsert na (uživatel, cvik) a den."""
+        stats, daily = {}, {}
+        for user_id, ex_id, date, sets, reps, weight in items:
+            volume, total_reps = sets * reps * weight, sets * reps
+            s = stats.get((user_id, ex_id))
+            if s is None:
+                stats[(user_id, ex_id)] = [weight, weight, volume, total_reps, 1, date, date]
+            else:
+                s[0] = max(s[0], weight)
+                s[1] = min(s[1], weight)
+                s[2] += volume
+                s[3] += total_reps
+                s[4] += 1
+                s[5] = min(s[5], date)
+                s[6] = max(s[6], date)
+            d = daily.get((user_id, ex_id, date[:10]))
+            if d is None:
+                daily[(user_id, ex_id, date[:10])] = [volume, total_reps]
+            else:
+                d[0] += volume
+                d[1] += total_reps
+
+        conn.executemany("""
+            INSERT INTO exercise_stats (user_id, exercise_id, pr, low, total_volume, total_reps, entries, first_date, last_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, exercise_id) DO UPDATE SET
+                pr = MAX(pr, excluded.pr),
+                low = MIN(low, excluded.low),
+                total_volume = total_volume + excluded.total_volume,
+                total_reps = total_reps + excluded.total_reps,
+                entries = entries + excluded.entries,
+                first_date = MIN(first_date, excluded.first_date),
+                last_date = MAX(last_date, excluded.last_date)
+        """, [key + tuple(values) for key, values in stats.items()])
+        conn.executemany("""
+            INSERT INTO exercise_daily (user_id, exercise_id, day, volume, reps)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, exercise_id, day) DO UPDATE SET
+                volume = volume + excluded.volume,
+                reps = reps + excluded.reps
+        """, [key + tuple(values) for key, values in daily.items()])
+
+    def save_workout(self, username, workout_data, note, summary):
+        """Uloží trénink do SQL tabulek (workouts a workout_items) a vrátí aktuální data uživatele."""
+        if self.add_workout(username, workout_data, note) is None:
+            return None
         return self.get_user_data(username)
 
     def log_bodyweight(self, username, weight):
@@ -258,23 +709,217 @@ class DataManager:
         conn = self._get_connection()
         user = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
         if not user:
-            conn.close()
             return False, "Uživatel nenalezen"
         
         user_id = user['id']
-        conn.execute("INSERT INTO bodyweight_history (user_id, weight) VALUES (?, ?)", (user_id, weight))
-        conn.execute("UPDATE users SET bodyweight = ? WHERE id = ?", (weight, user_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("INSERT INTO bodyweight_history (user_id, weight) VALUES (?, ?)", (user_id, weight))
+            conn.execute("UPDATE users SET bodyweight = ? WHERE id = ?", (weight, user_id))
         return True, "Váha uložena"
 
+    # --- Hromadný import a export tréninků ---
+
+    def import_workouts(self, path, chunk_size=IMPORT_CHUNK_SIZE):
+        """
+        Naimportuje tréninky ze souboru po dávkách (jedna transakce na chunk_size tréninků).
+        Formáty:
+          - CSV s hlavičkou workout,username,date,note,exercise,sets,reps,weight (řádek = položka,
+            sousední řádky se stejným workout tvoří jeden trénink; bez sloupce workout
+            rozhoduje username+date+note; prázdné exercise = trénink bez cviků)
+          - JSON lines: {"username", "date", "note", "exercises": [[cvik, série, opakování, váha], ...]}
+          - sloupcový ZIP z export_workouts
+        Uživatelé musí existovat, cviky se založí. Tréninky neznámých uživatelů a neplatné
+        záznamy se přeskočí. Vrací {"workouts": ..., "items": ..., "skipped": ...}.
+        """
+        conn = self._get_connection()
+        user_ids = {r['username']: r['id'] for r in conn.execute("SELECT username, id FROM users")}
+        exercise_ids = {}  # název -> id, přes všechny dávky (každý cvik se v DB hledá jen jednou)
+        counts = {"workouts": 0, "items": 0, "skipped": 0}
+
+        chunk = []
+        for workout in self._read_workout_dump(path):
+            if workout is None or workout[0] not in user_ids:
+                counts["skipped"] += 1
+                continue
+            chunk.append(workout)
+            if len(chunk) >= chunk_size:
+                self._import_chunk(conn, chunk, user_ids, exercise_ids, counts)
+                chunk = []
+        if chunk:
+            self._import_chunk(conn, chunk, user_ids, exercise_ids, counts)
+        return counts
+
+    def _import_chunk(self, conn, chunk, user_ids, exercise_ids, counts):
+        """Zapíše dávku tréninků jednou transakcí (ID tréninků se přidělí předem, bez lastrowid)."""
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")  # do konce dávky nikdo jiný nezapisuje, přidělená ID platí
+            new_names = {item[0] for w in chunk for item in w[3] if item[0] not in exercise_ids}
+            if new_names:
+                exercise_ids.update(self._exercise_ids(conn, new_names))
+
+            # AUTOINCREMENT: pokračovat za nejvyšším kdy použitým ID, i když už byl smazán
+            seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'workouts'").fetchone()
+            max_id = conn.execute("SELECT MAX(id) FROM workouts").fetchone()[0]
+            workout_id = max(seq[0] if seq else 0, max_id or 0)
+
+            workouts, items, stats = [], [], []
+            for username, date, note, exercises in chunk:
+                workout_id += 1
+                user_id = user_ids[username]
+                workouts.append((workout_id, user_id, date, note))
+                for name, sets, reps, weight in exercises:
+                    ex_id = exercise_ids[name]
+                    items.append((workout_id, ex_id, sets, reps, weight))
+                    stats.append((user_id, ex_id, date, sets, reps, weight))
+
+            conn.executemany("INSERT INTO workouts (id, user_id, date, note) VALUES (?, ?, ?, ?)", workouts)
+            conn.executemany(
+                "INSERT INTO workout_items (workout_id, exercise_id, sets, reps, weight) VALUES (?, ?, ?, ?, ?)", items
+            )
+            self._update_exercise_stats(conn, stats)
+        counts["workouts"] += len(workouts)
+        counts["items"] += len(items)
+
+    def _read_workout_dump(self, path):
+        """Prochází soubor po trénincích: (username, date, note, [(cvik, série, opakování, váha)]) nebo None."""
+        if zipfile.is_zipfile(path):
+            records = self._read_columnar_dump(path)
+        elif path.lower().endswith(".csv"):
+            records = self._read_csv_dump(path)
+        else:
+            records = self._read_jsonl_dump(path)
+        for record in records:
+            yield self._parse_workout(*record) if record is not None else None
+
+    def _parse_workout(self, username, date, note, exercises):
+        try:
+            # Datum ve tvaru jako CURRENT_TIMESTAMP, chybějící = čas importu (UTC jako v DB)
+            date = datetime.fromisoformat(date) if date else datetime.utcnow()
+            # Názvy cviků se opakují milionkrát, sys.intern drží jednu kopii každého řetězce
+            items = [(sys.intern(name.strip()), int(sets), int(reps), float(weight))
+                     for name, sets, reps, weight in exercises]
+        except (TypeError, ValueError, AttributeError):
+            return None
+        if not username or any(not item[0] for item in items):
+            return None
+        return username, date.strftime("%Y-%m-%d %H:%M:%S"), note or "", items
+
+    def _read_csv_dump(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            key, record = None, None
+            for row in reader:
+                row_key = row.get("workout") or (row.get("username"), row.get("date"), row.get("note"))
+                if record is None or row_key != key:
+                    if record is not None:
+                        yield record
+                    key, record = row_key, (row.get("username"), row.get("date"), row.get("note"), [])
+                if row.get("exercise"):
+                    record[3].append((row["exercise"], row.get("sets"), row.get("reps"), row.get("weight")))
+            if record is not None:
+                yield record
+
+    def _read_jsonl_dump(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    w = json.loads(line)
+                    yield w.get("username"), w.get("date"), w.get("note"), w.get("exercises") or []
+                except (ValueError, AttributeError):
+                    yield None
+
+    def _read_columnar_dump(self, path):
+        with zipfile.ZipFile(path) as zf:
+            meta = json.loads(zf.read("meta.json"))
+            if meta.get("format") != EXPORT_FORMAT:
+                raise ValueError(f"Neznámý formát exportu: {meta.get('format')}")
+            cols = {}
+            for name, code in meta["columns"].items():
+                cols[name] = array(code)
+                cols[name].frombytes(zf.read(f"{name}.bin"))
+                if sys.byteorder == "big":
+                    cols[name].byteswap()
+            notes = zf.read("workout_note.utf8")
+
+        users, exercises = meta["users"], meta["exercises"]
+        ex_col, sets_col, reps_col, weight_col = (cols[c] for c in ("item_exercise", "item_sets", "item_reps", "item_weight"))
+        item, note_start = 0, 0
+        for k in range(meta["workouts"]):
+            end = item + cols["workout_items"][k]
+            note_end = cols["workout_note_end"][k]
+            yield (users[cols["workout_user"][k]],
+                   (EPOCH + timedelta(seconds=cols["workout_date"][k])).strftime("%Y-%m-%d %H:%M:%S"),
+                   notes[note_start:note_end].decode("utf-8"),
+                   [(exercises[ex_col[j]], sets_col[j], reps_col[j], weight_col[j]) for j in range(item, end)])
+            item, note_start = end, note_end
+
+    def export_workouts(self, out_path=os.path.join("data", "workouts.zip"), usernames=None):
+        """
+        Exportuje tréninky (všech nebo vybraných uživatelů) do kompaktního sloupcového souboru:
+        ZIP s meta.json (slovníky uživatelů a cviků) a sloupci jako binární pole.
+        Položka zabere 20 bajtů před kompresí, export jde zpět načíst přes import_workouts.
+        """
+        params = list(usernames) if usernames is not None else []
+        where = f"WHERE u.username IN ({','.join('?' * len(params))})" if usernames is not None else ""
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(f"""
+            SELECT w.id, u.username, w.date, w.note, e.name, wi.sets, wi.reps, wi.weight
+            FROM workouts w
+            JOIN users u ON w.user_id = u.id
+            LEFT JOIN workout_items wi ON wi.workout_id = w.id
+            LEFT JOIN exercises e ON wi.exercise_id = e.id
+            {where}
+            ORDER BY w.id ASC, wi.id ASC
+        """, params)
+
+        cols = {name: array(code) for name, code in EXPORT_COLUMNS}
+        workout_user, workout_date, workout_note_end, workout_items = (
+            cols[c] for c in ("workout_user", "workout_date", "workout_note_end", "workout_items"))
+        item_exercise, item_sets, item_reps, item_weight = (
+            cols[c] for c in ("item_exercise", "item_sets", "item_reps", "item_weight"))
+        users, exercises = {}, {}  # název -> index ve slovníku
+        notes = bytearray()
+        last_id = None
+        for w_id, username, date, note, name, sets, reps, weight in rows:
+            if w_id != last_id:
+                last_id = w_id
+                workout_user.append(users.setdefault(username, len(users)))
+                workout_date.append(int((datetime.fromisoformat(date) - EPOCH).total_seconds()))
+                notes += (note or "").encode("utf-8")
+                workout_note_end.append(len(notes))
+                workout_items.append(0)
+            if name is None:
+                continue  # trénink bez cviků (nebo položka smazaného cviku)
+            workout_items[-1] += 1
+            item_exercise.append(exercises.setdefault(name, len(exercises)))
+            item_sets.append(sets)
+            item_reps.append(reps)
+            item_weight.append(weight)
+
+        meta = {
+            "format": EXPORT_FORMAT, "version": 1,
+            "workouts": len(workout_user), "items": len(item_exercise),
+            "users": list(users), "exercises": list(exercises),
+            "columns": {name: code for name, code in EXPORT_COLUMNS},
+        }
+        with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("meta.json", json.dumps(meta, ensure_ascii=False))
+            for name, col in cols.items():
+                if sys.byteorder == "big":
+                    col.byteswap()
+                zf.writestr(f"{name}.bin", col.tobytes())
+            zf.writestr("workout_note.utf8", bytes(notes))
+        return True, out_path
+
     # --- Správa centrálního seznamu cviků ---
 
     def get_central_exercises(self):
         """Vrátí seznam všech cviků z SQL tabulky exercises."""
         conn = self._get_connection()
         rows = conn.execute("SELECT name FROM exercises ORDER BY name ASC").fetchall()
-        conn.close()
         return [r['name'] for r in rows]
 
     def add_central_exercise(self, exercise_name, created_by):
@@ -284,22 +929,19 @@ class DataManager:
         
         conn = self._get_connection()
         try:
-            conn.execute("INSERT INTO exercises (name) VALUES (?)", (name,))
-            conn.commit()
-            self._audit(created_by, "add_exercise", name, {})
-            return True, "Cvik přidán"
+            with conn:
+                conn.execute("INSERT INTO exercises (name) VALUES (?)", (name,))
         except sqlite3.IntegrityError:
             return False, "Cvik již existuje"
-        finally:
-            conn.close()
+        self._audit(created_by, "add_exercise", name, {})
+        return True, "Cvik přidán"
 
     def delete_central_exercise(self, exercise_name, actor):
-        """Smaže cvik z globálního seznamu (díky ON DELETE CASCADE smaže i položky v trénincích)."""
+        """Smaže cvik z globálního seznamu (díky ON DELETE CASCADE smaže i položky v trénincích a agregace)."""
         conn = self._get_connection()
-        res = conn.execute("DELETE FROM exercises WHERE name = ?", (exercise_name,))
-        conn.commit()
+        with conn:
+            res = conn.execute("DELETE FROM exercises WHERE name = ?", (exercise_name,))
         success = res.rowcount > 0
-        conn.close()
         if success:
             self._audit(actor, "delete_exercise_sql", exercise_name, {})
             return True, "Cvik smazán z celé databáze"
@@ -316,35 +958,31 @@ class DataManager:
             LEFT JOIN workouts w ON u.id = w.user_id
             GROUP BY u.id
         """).fetchall()
-        conn.close()
         return [dict(r) for r in rows]
 
     def ban_user(self, target_username, actor):
         """Zablokuje uživatele v DB."""
         if target_username == "admin": return False, "Nelze zabanovat admina"
         conn = self._get_connection()
-        conn.execute("UPDATE users SET is_banned = 1 WHERE username = ?", (target_username,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("UPDATE users SET is_banned = 1 WHERE username = ?", (target_username,))
         self._audit(actor, "ban_user", target_username, {})
         return True, "Uživatel zabanován"
 
     def unban_user(self, target_username, actor):
         """Odblokuje uživatele v DB."""
         conn = self._get_connection()
-        conn.execute("UPDATE users SET is_banned = 0 WHERE username = ?", (target_username,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("UPDATE users SET is_banned = 0 WHERE username = ?", (target_username,))
         self._audit(actor, "unban_user", target_username, {})
         return True, "Ban zrušen"
 
     def delete_user(self, target_username, actor):
-        """Smaže uživatele (díky ON DELETE CASCADE se smaže i celá jeho historie)."""
+        """Smaže uživatele (díky ON DELETE CASCADE se smaže i celá jeho historie a agregace)."""
         if target_username == "admin": return False, "Nelze smazat admina"
         conn = self._get_connection()
-        conn.execute("DELETE FROM users WHERE username = ?", (target_username,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("DELETE FROM users WHERE username = ?", (target_username,))
         self._audit(actor, "delete_user", target_username, {})
         return True, "Uživatel i jeho historie smazána"
 
@@ -355,11 +993,8 @@ class DataManager:
         except: return name
 
     def _audit(self, actor, action, target, details):
-        entry = {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "actor": actor, "action": action, "target": target, "details": details}
-        try:
-            with open(self.audit_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        except: pass
+        row = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), actor, action, target, json.dumps(details, ensure_ascii=False))
+        audit_buffer.add(self.db_file, self._get_connection, row)
 
     def get_config(self):
         if os.path.exists(CONFIG_FILE):
@@ -377,40 +1012,58 @@ class DataManager:
         if al.get("enabled"): return al.get("username", ""), al.get("password", "")
         return None
 
-    def export_audit_csv(self, out_path=os.path.join("data", "audit.csv")):
-        import csv
-        rows = []
-        if os.path.exists(self.audit_file):
-            with open(self.audit_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try: rows.append(json.loads(line.strip()))
-                    except: continue
+    def iter_audit(self, since=None, until=None, actor=None):
+        """
+        Prochází auditní záznamy od nejstaršího jako dict, bez načtení všech do paměti.
+        since/until jsou časy ve tvaru "YYYY-MM-DD[ HH:MM:SS]", since včetně, until bez něj.
+        """
+        audit_buffer.flush(self.db_file)  # i záznamy, které ještě čekají v dávce
+        where, params = [], []
+        if actor is not None:
+            where.append("actor = ?")
+            params.append(actor)
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("timestamp < ?")
+            params.append(until)
+        conn = self._get_connection()
+        # Index (actor, timestamp) nebo (timestamp) vrací řádky rovnou seřazené
+        cursor = conn.execute(f"""
+            SELECT timestamp, actor, action, target, details
+            FROM audit_log
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY timestamp ASC, id ASC
+        """, params)
+        for r in cursor:
+            yield dict(r)
+
+    def export_audit_csv(self, out_path=os.path.join("data", "audit.csv"), since=None, until=None, actor=None):
+        """Exportuje audit do CSV (volitelně jen časový rozsah nebo jeden aktér), řádek po řádku."""
         headers = ["timestamp", "actor", "action", "target", "details"]
         with open(out_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
-            for r in rows:
-                writer.writerow({k: (json.dumps(r.get(k, {}), ensure_ascii=False) if k == "details" else r.get(k, "")) for k in headers})
+            writer.writerows(self.iter_audit(since, until, actor))
         return True, out_path
 
     def clear_central_exercises_and_cleanup(self, actor):
         """Vymaže všechny cviky a tréninky (SQL TRUNCATE simulace)."""
         conn = self._get_connection()
-        conn.execute("DELETE FROM exercises")
-        conn.execute("DELETE FROM workouts")
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("DELETE FROM exercises")
+            conn.execute("DELETE FROM workouts")
         self._audit(actor, "clear_all_sql", "all", {})
         return True, "Celá databáze byla vyčištěna."
 
     def update_user_profile(self, username, new_password=None, new_email=None):
         conn = self._get_connection()
-        if new_password and new_email:
-            conn.execute("UPDATE users SET password = ?, email = ? WHERE username = ?", (new_password, new_email, username))
-        elif new_password:
-            conn.execute("UPDATE users SET password = ? WHERE username = ?", (new_password, username))
-        elif new_email:
-            conn.execute("UPDATE users SET email = ? WHERE username = ?", (new_email, username))
-        conn.commit()
-        conn.close()
+        with conn:
+            if new_password and new_email:
+                conn.execute("UPDATE users SET password = ?, email = ? WHERE username = ?", (new_password, new_email, username))
+            elif new_password:
+                conn.execute("UPDATE users SET password = ? WHERE username = ?", (new_password, username))
+            elif new_email:
+                conn.execute("UPDATE users SET email = ? WHERE username = ?", (new_email, username))
         return True, "Profil aktualizován"
@@ -0,0 +1,98 @@
+"""
+Výpočty pro GraphWidget bez závislosti na Kivy (osy, popisky, zmenšení počtu bodů).
+"""
+import math
+from datetime import datetime
+
+
+def value_range(values):
+    """Rozsah osy Y s okrajem 5 % nad a pod hodnotami."""
+    min_val = min(values) * 0.95
+    max_val = max(values) * 1.05
+    if min_val == max_val:
+        min_val -= 5
+        max_val += 5
+    return min_val, max_val
+
+
+def y_ticks(min_val, max_val, height, min_spacing=35):
+    """Vrátí [(hodnota, popisek)] pro osu Y s "hezkým" krokem (1, 2, 2.5, 5, 10 * 10^n)."""
+    num_labels = max(2, min(10, int(height / min_spacing) + 1))
+
+    raw_step = (max_val - min_val) / max(1, num_labels - 1)
+    magnitude = 10 ** math.floor(math.log10(max(raw_step, 0.001)))
+    nice_step = magnitude
+    for ns in [1, 2, 2.5, 5, 10]:
+        candidate = ns * magnitude
+        if candidate >= raw_step:
+            nice_step = candidate
+            break
+
+    ticks = []
+    tick = math.floor(min_val / nice_step) * nice_step
+    while tick <= max_val + 0.01:
+        if tick >= min_val - 0.01:
+            ticks.append((tick, f"{tick:.0f}" if nice_step >= 1 else f"{tick:.1f}"))
+        tick += nice_step
+    return ticks
+
+
+def x_tick_indices(num_points, width, label_width=45, min_spacing=15):
+    """Vrátí indexy bodů, pod které se vejde popisek osy X (vždy první a poslední)."""
+    max_labels = max(2, int(width / (label_width + min_spacing)))
+    if num_points <= max_labels:
+        return list(range(num_points))
+
+    indices = [0]
+    step = (num_points - 1) / (max_labels - 1)
+    for i in range(1, max_labels - 1):
+        indices.append(int(round(i * step)))
+    indices.append(num_points - 1)
+    return sorted(set(indices))
+
+
+def date_label(date_str):
+    """Zkrátí "YYYY-MM-DD HH:MM:SS" na "D.M." pro popisek osy X."""
+    display_date = date_str[:10] if len(date_str) > 10 else date_str
+    try:
+        if "-" in display_date:
+            dt = datetime.strptime(display_date, "%Y-%m-%d")
+            display_date = f"{dt.day}.{dt.month}."
+    except (ValueError, TypeError):
+        pass
+    return display_date
+
+
+def lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets: vybere nejvýše threshold indexů bodů tak,
+    aby čára zachovala tvar (vrcholy a propady). Osa X je pořadí bodu.
+    První a poslední bod zůstávají vždy.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        # Průměr následujícího koše (u posledního koše je to poslední bod)
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        # Plocha trojúhelníku (a, j, průměr) = |c1 * y_j + c2 * j + c0| / 2
+        ax, ay = a, values[a]
+        c1 = ax - avg_x
+        c2 = avg_y - ay
+        c0 = -c1 * ay - c2 * ax
+        a = max(range(start, end), key=lambda j: abs(c1 * values[j] + c2 * j + c0))
+        indices.append(a)
+
+    indices.append(n - 1)
+    return indices
@@ -4,161 +4,172 @@ from kivy.properties import StringProperty, DictProperty, ListProperty, NumericP
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Line, Ellipse, Rectangle
+from kivy.graphics import Color, Line, Ellipse, Rectangle, InstructionGroup
 from kivy.graphics.texture import Texture
 from kivy.core.text import Label as CoreLabel
 from kivy.uix.button import Button
 from kivy.uix.boxlayout import BoxLayout
-from datetime import datetime, timedelta
-import math
+from graph_utils import value_range, y_ticks, x_tick_indices, date_label, lttb
+from search_index import SearchIndex
+
+_data_manager = None
+
+def get_data_manager():
+    """Jeden DataManager pro celou aplikaci (připojení k DB a schéma se připraví jen jednou)."""
+    global _data_manager
+    if _data_manager is None:
+        from data_manager import DataManager
+        _data_manager = DataManager()
+    return _data_manager
 
 # --- Komponenty Grafu ---
 
+# Odsazení grafu
+PADDING_LEFT = 60
+PADDING_BOTTOM = 40
+PADDING_TOP = 20
+PADDING_RIGHT = 20
+MARKER_MIN_SPACING = 8  # body se kreslí jen pokud se kolečka (průměr 8 px) nepřekrývají
+
 class GraphWidget(Widget):
     """
     Vlastní widget pro vykreslování spojnicového grafu progresu.
+    Instrukce na Canvasu se vytvoří jednou a při překreslení se jim jen mění body,
+    čára má nejvýše tolik bodů, kolik má graf pixelů na šířku (LTTB).
     """
     data_points = ListProperty([])  # Seznam bodů (hodnota, "popisek")
     line_color = ListProperty([0, 0.78, 0.32, 1])
-    
+
+    _label_cache = {}  # (text, velikost) -> textura, sdílené všemi grafy
+    LABEL_CACHE_SIZE = 512
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._values = []
+        # Změna velikosti, pozice i dat ve stejném snímku = jedno překreslení
+        self._trigger_draw = Clock.create_trigger(self.draw_graph)
+
+        self._axis_y = Line(width=1.2)
+        self._axis_x = Line(width=1.2)
+        self._grid = InstructionGroup()
+        self._labels = InstructionGroup()
+        self._outer_markers = InstructionGroup()
+        self._inner_markers = InstructionGroup()
+        self._line_color = Color(*self.line_color)
+        self._marker_color = Color(*self.line_color)
+        self._line = Line(width=2.5, joint='round')
+        self._pools = {self._grid: [], self._labels: [], self._outer_markers: [], self._inner_markers: []}
+
+        self._grid.add(Color(0.4, 0.4, 0.4, 0.5))
+        self._labels.add(Color(0.8, 0.8, 0.8, 1))
+        self._outer_markers.add(self._marker_color)
+        self._inner_markers.add(Color(1, 1, 1, 0.8))
+        for instruction in (Color(0.4, 0.4, 0.4, 1), self._axis_y, self._axis_x, self._grid, self._labels,
+                            self._outer_markers, self._inner_markers, self._line_color, self._line):
+            self.canvas.add(instruction)
+
     def on_data_points(self, instance, value):
-        self.draw_graph()
-        
+        self._values = [p[0] for p in value]
+        self._trigger_draw()
+
+    def on_line_color(self, instance, value):
+        self._line_color.rgba = value
+        self._marker_color.rgba = value
+
     def on_size(self, *args):
-        self.draw_graph()
-        
-    def _render_text(self, text, font_size=11):
-        """Vykreslí text na texturu pro použití v Canvasu."""
-        cl = CoreLabel(text=text, font_size=font_size)
-        cl.refresh()
-        return cl.texture
+        self._trigger_draw()
+
+    def on_pos(self, *args):
+        self._trigger_draw()
 
-    def draw_graph(self):
+    def _render_text(self, text, font_size=11):
+        """Vykreslí text na texturu pro použití v Canvasu (stejné popisky se vykreslují jen jednou)."""
+        key = (text, font_size)
+        tex = self._label_cache.get(key)
+        if tex is None:
+            if len(self._label_cache) >= self.LABEL_CACHE_SIZE:
+                self._label_cache.clear()
+            cl = CoreLabel(text=text, font_size=font_size)
+            cl.refresh()
+            tex = self._label_cache[key] = cl.texture
+        return tex
+
+    def _resize_pool(self, group, count, factory):
+        """Přidá/odebere instrukce ve skupině, aby jich bylo přesně count, a vrátí je."""
+        pool = self._pools[group]
+        while len(pool) < count:
+            pool.append(factory())
+            group.add(pool[-1])
+        while len(pool) > count:
+            group.remove(pool.pop())
+        return pool
+
+    def draw_graph(self, *args):
         """Hlavní logika vykreslování grafu na Canvas."""
-        self.canvas.clear()
-        
-        if not self.data_points:
-            return
-            
-        values = [p[0] for p in self.data_points]
+        values = self._values
         if not values:
+            self._axis_y.points = self._axis_x.points = self._line.points = []
+            for group in self._pools:
+                self._resize_pool(group, 0, None)
             return
-            
+
         # Výpočet rozsahu osy Y
-        min_val = min(values) * 0.95
-        max_val = max(values) * 1.05
-        if min_val == max_val:
-            min_val -= 5
-            max_val += 5
+        min_val, max_val = value_range(values)
         val_range = max_val - min_val
-        
-        # Odsazení grafu
-        padding_left = 60
-        padding_bottom = 40
-        padding_top = 20
-        padding_right = 20
-        
-        w = self.width - padding_left - padding_right
-        h = self.height - padding_bottom - padding_top
-        
-        num_points = len(self.data_points)
-        
-        with self.canvas:
-            # Vykreslení os
-            Color(0.4, 0.4, 0.4, 1)
-            Line(points=[self.x + padding_left, self.y + padding_bottom, 
-                         self.x + padding_left, self.y + self.height - padding_top], width=1.2)
-            Line(points=[self.x + padding_left, self.y + padding_bottom, 
-                         self.x + self.width - padding_right, self.y + padding_bottom], width=1.2)
-            
-            # --- Dynamické popisky osy Y (Váha) ---
-            min_y_label_spacing = 35
-            num_y_labels = max(2, min(10, int(h / min_y_label_spacing) + 1))
-            
-            raw_step = val_range / max(1, num_y_labels - 1)
-            magnitude = 10 ** math.floor(math.log10(max(raw_step, 0.001)))
-            nice_steps = [1, 2, 2.5, 5, 10]
-            nice_step = magnitude
-            for ns in nice_steps:
-                candidate = ns * magnitude
-                if candidate >= raw_step:
-                    nice_step = candidate
-                    break
-            
-            y_start = math.floor(min_val / nice_step) * nice_step
-            y_tick = y_start
-            while y_tick <= max_val + 0.01:
-                if y_tick >= min_val - 0.01:
-                    y_pos = self.y + padding_bottom + ((y_tick - min_val) / val_range) * h
-                    
-                    # Pomocné mřížky
-                    Color(0.4, 0.4, 0.4, 0.5)
-                    Line(points=[self.x + padding_left - 5, y_pos,
-                                 self.x + padding_left + w, y_pos], width=0.8)
-                    
-                    fmt = f"{y_tick:.0f}" if nice_step >= 1 else f"{y_tick:.1f}"
-                    tex = self._render_text(fmt, font_size=11)
-                    Color(0.8, 0.8, 0.8, 1)
-                    Rectangle(
-                        pos=(self.x + padding_left - 10 - tex.width,
-                             y_pos - tex.height / 2),
-                        size=tex.size, texture=tex)
-                y_tick += nice_step
-
-            # --- Dynamické popisky osy X (Datum) ---
-            if num_points > 0:
-                max_label_width = 45
-                min_spacing = 15
-                max_labels = max(2, int(w / (max_label_width + min_spacing)))
-                
-                if num_points <= max_labels:
-                    indices = list(range(num_points))
-                else:
-                    indices = [0]
-                    step = (num_points - 1) / (max_labels - 1)
-                    for i in range(1, max_labels - 1):
-                        indices.append(int(round(i * step)))
-                    indices.append(num_points - 1)
-                    indices = sorted(list(set(indices)))
-                
-                for i in indices:
-                    val, date_str = self.data_points[i]
-                    x_pos = self.x + padding_left + (i / (num_points - 1 if num_points > 1 else 1)) * w
-                    
-                    Color(0.4, 0.4, 0.4, 0.5)
-                    Line(points=[x_pos, self.y + padding_bottom,
-                                 x_pos, self.y + padding_bottom - 5], width=1)
-                    
-                    display_date = date_str[:10] if len(date_str) > 10 else date_str
-                    try:
-                        if "-" in display_date:
-                            dt = datetime.strptime(display_date, "%Y-%m-%d")
-                            display_date = f"{dt.day}.{dt.month}."
-                    except (ValueError, TypeError):
-                        pass
-                    
-                    tex = self._render_text(display_date, font_size=10)
-                    Color(0.8, 0.8, 0.8, 1)
-                    Rectangle(
-                        pos=(x_pos - tex.width / 2, self.y + 15),
-                        size=tex.size, texture=tex)
-                    
-            # --- Vykreslení čáry a bodů ---
-            points = []
-            for i, (val, label) in enumerate(self.data_points):
-                x_pos = self.x + padding_left + (i / (num_points - 1 if num_points > 1 else 1)) * w
-                y_pos = self.y + padding_bottom + ((val - min_val) / val_range) * h
-                points.extend([x_pos, y_pos])
-                
-                Color(*self.line_color)
-                Ellipse(pos=(x_pos - 4, y_pos - 4), size=(8, 8))
-                Color(1, 1, 1, 0.8)
-                Ellipse(pos=(x_pos - 2, y_pos - 2), size=(4, 4))
-
-            if len(points) >= 4:
-                Color(*self.line_color)
-                Line(points=points, width=2.5, joint='round')
+
+        w = self.width - PADDING_LEFT - PADDING_RIGHT
+        h = self.height - PADDING_BOTTOM - PADDING_TOP
+        left = self.x + PADDING_LEFT
+        bottom = self.y + PADDING_BOTTOM
+
+        num_points = len(values)
+        x_scale = w / (num_points - 1 if num_points > 1 else 1)
+        y_scale = h / val_range
+
+        # Vykreslení os
+        self._axis_y.points = [left, bottom, left, self.top - PADDING_TOP]
+        self._axis_x.points = [left, bottom, self.right - PADDING_RIGHT, bottom]
+
+        # Pomocné mřížky a popisky: osa Y (váha) a osa X (datum)
+        grid, labels = [], []
+        for tick, text in y_ticks(min_val, max_val, h):
+            y_pos = bottom + (tick - min_val) * y_scale
+            grid.append(([left - 5, y_pos, left + w, y_pos], 0.8))
+            tex = self._render_text(text, font_size=11)
+            labels.append(((left - 10 - tex.width, y_pos - tex.height / 2), tex))
+
+        for i in x_tick_indices(num_points, w):
+            x_pos = left + i * x_scale
+            grid.append(([x_pos, bottom, x_pos, bottom - 5], 1))
+            tex = self._render_text(date_label(self.data_points[i][1]), font_size=10)
+            labels.append(((x_pos - tex.width / 2, self.y + 15), tex))
+
+        for line, (points, width) in zip(self._resize_pool(self._grid, len(grid), Line), grid):
+            line.points = points
+            line.width = width
+        for rect, (pos, tex) in zip(self._resize_pool(self._labels, len(labels), Rectangle), labels):
+            rect.texture = tex
+            rect.pos = pos
+            rect.size = tex.size
+
+        # Čára: tisíce bodů by se stejně slily do pixelů, LTTB zachová vrcholy a propady
+        indices = lttb(values, max(3, int(w)))
+        points = []
+        for i in indices:
+            points += [left + i * x_scale, bottom + (values[i] - min_val) * y_scale]
+        self._line.points = points if len(points) >= 4 else []
+
+        # Body jen pokud se vejdou vedle sebe (a nejsou zmenšené)
+        markers = points if len(indices) == num_points and (num_points == 1 or x_scale >= MARKER_MIN_SPACING) else []
+        count = len(markers) // 2
+        outer = self._resize_pool(self._outer_markers, count, lambda: Ellipse(size=(8, 8)))
+        inner = self._resize_pool(self._inner_markers, count, lambda: Ellipse(size=(4, 4)))
+        for k in range(count):
+            x_pos, y_pos = markers[2 * k], markers[2 * k + 1]
+            outer[k].pos = (x_pos - 4, y_pos - 4)
+            inner[k].pos = (x_pos - 2, y_pos - 2)
 
 class GradientBackground(Widget):
     """Widget pro vytvoření přechodového pozadí aplikace."""
@@ -230,8 +241,7 @@ class LoginScreen(Screen):
     def on_kv_post(self, *args):
         """Kontrola automatického přihlášení při startu."""
         try:
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             creds = dm.get_autologin()
             if creds:
                 u, p = creds
@@ -246,8 +256,7 @@ class LoginScreen(Screen):
         username = self.ids.username.text
         password = self.ids.password.text
 
-        from data_manager import DataManager
-        dm = DataManager()
+        dm = get_data_manager()
         
         if dm.validate_login(username, password) or (username == "admin" and password == "1234"):
             try:
@@ -283,8 +292,7 @@ class WorkoutsScreen(Screen):
 
     def load_user_data(self, username):
         """Načte data uživatele a centrální seznam cviků."""
-        from data_manager import DataManager
-        dm = DataManager()
+        dm = get_data_manager()
         user_data = dm.get_user_data(username)
         
         self.personal_records.update(user_data.get("personal_records", {}))
@@ -321,8 +329,7 @@ class WorkoutsScreen(Screen):
         if not name:
             Popup(title="Chyba", content=Label(text="Název cviku je prázdný."), size_hint=(0.5, 0.3)).open()
             return
-        from data_manager import DataManager
-        dm = DataManager()
+        dm = get_data_manager()
         username = App.get_running_app().root.get_screen("main").username
         success, msg = dm.add_central_exercise(name, username)
         if success:
@@ -375,8 +382,7 @@ class WorkoutsScreen(Screen):
         note = self.ids.note.text
         summary = "\n".join([f"{ex} - {s}x{r}, {w}kg" for ex, s, r, w in self.workout_data])
 
-        from data_manager import DataManager
-        dm = DataManager()
+        dm = get_data_manager()
         username = App.get_running_app().root.get_screen("main").username
         
         updated_data = dm.save_workout(username, self.workout_data, note, summary)
@@ -407,7 +413,8 @@ class StatsScreen(Screen):
     """
     user_weight = NumericProperty(0)
     personal_records = DictProperty()
-    progress_data = DictProperty()
+    progress_data = DictProperty()  # historie pro grafy, načítá se až po výběru cviku
+    exercise_stats = DictProperty()
     bodyweight_history = ListProperty()
     show_stat_exercises = BooleanProperty(False)
     
@@ -428,20 +435,18 @@ class StatsScreen(Screen):
         main_screen = App.get_running_app().root.get_screen('main')
         username = main_screen.username
         
-        from data_manager import DataManager
-        dm = DataManager()
-        user_data = dm.get_user_data(username)
+        dm = get_data_manager()
+        # Řádek agregací na cvik místo načítání celé historie tréninků
+        stats = dm.get_exercise_stats(username) or {}
+        bodyweight = dm.get_bodyweight(username) or {}
         
-        self.personal_records = user_data.get("personal_records", {})
-        self.progress_data = user_data.get("progress_data", {})
-        self.user_weight = user_data.get("bodyweight", 0)
-        self.bodyweight_history = user_data.get("bodyweight_history", [])
+        self.exercise_stats = stats
+        self.personal_records = {name: s['pr'] for name, s in stats.items()}
+        self.progress_data = {}
+        self.user_weight = bodyweight.get("bodyweight", 0)
+        self.bodyweight_history = bodyweight.get("history", [])
         
-        exercises = set()
-        for workout in user_data.get("workouts", []):
-            for ex, _, _, _ in workout.get("exercises", []):
-                exercises.add(ex)
-        self.stat_exercises = sorted(list(exercises))
+        self.stat_exercises = sorted(stats)
 
     def on_stat_exercises(self, instance, value):
         """Vykreslí seznam cviků pro výběr grafu."""
@@ -463,8 +468,7 @@ class StatsScreen(Screen):
         """Uloží novou tělesnou váhu uživatele."""
         try:
             new_weight = float(self.ids.weight_input.text)
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             username = App.get_running_app().root.get_screen('main').username
             dm.log_bodyweight(username, new_weight)
             
@@ -484,6 +488,9 @@ class StatsScreen(Screen):
         self.selected_stat_item = exercise_name
         self.show_stat_exercises = False
         
+        if exercise_name not in self.progress_data:
+            username = App.get_running_app().root.get_screen('main').username
+            self.progress_data[exercise_name] = get_data_manager().get_exercise_progress(username, exercise_name)
         history = list(self.progress_data.get(exercise_name, []))
         graph_points = []
         for entry in history:
@@ -496,32 +503,17 @@ class StatsScreen(Screen):
         self.ids.graph.data_points = graph_points
         self.ids.graph.line_color = [0, 0.78, 0.32, 1]
         
-        # Výpočet metrik (PR, průměr, atd.)
+        # Metriky (PR, průměr za poslední měsíc, atd.) přímo z agregací
+        stats = self.exercise_stats.get(exercise_name)
         pr = self.personal_records.get(exercise_name, 0)
         self.metric_pr = f"{pr} kg"
         
-        now = datetime.now()
-        month_ago = now - timedelta(days=30)
-        total_volume, total_reps = 0.0, 0
-        exercise_weights = []
-        
-        for entry in history:
-            try:
-                weight = float(entry.get('weight', 0))
-                date_str = entry.get('date', '')
-                exercise_weights.append(weight)
-                
-                # Průměr za poslední měsíc
-                dt = datetime.strptime(date_str[:10], "%Y-%m-%d")
-                if dt >= month_ago:
-                    s, r = int(entry.get('sets', 1)), int(entry.get('reps', 1))
-                    total_volume += weight * s * r
-                    total_reps += s * r
-            except: continue
-            
-        self.metric_avg = f"{total_volume/total_reps:.1f} kg" if total_reps > 0 else "-"
-        self.metric_peak = f"{max(exercise_weights)} kg" if exercise_weights else "-"
-        self.metric_low = f"{min(exercise_weights)} kg" if exercise_weights else "-"
+        if not stats:
+            self.metric_avg = self.metric_peak = self.metric_low = "-"
+            return
+        self.metric_avg = f"{stats['volume_30d']/stats['reps_30d']:.1f} kg" if stats['reps_30d'] > 0 else "-"
+        self.metric_peak = f"{stats['pr']} kg"
+        self.metric_low = f"{stats['low']} kg"
 
     def show_bodyweight_stats(self):
         """Zobrazí graf tělesné váhy."""
@@ -546,58 +538,71 @@ class StatsScreen(Screen):
             self.metric_avg = f"{sum(weights)/len(weights):.1f} kg"
         self.metric_pr = "-"
 
+SEARCH_DEBOUNCE = 0.15  # s, filtr se použije až po pauze v psaní
+
+class AdminExerciseRow(Button):
+    """Řádek seznamu cviků v RecycleView (widgety se recyklují, mění se jen data)."""
+    admin = ObjectProperty(None)
+
+class AdminUserRow(BoxLayout):
+    """Řádek seznamu uživatelů v RecycleView."""
+    admin = ObjectProperty(None)
+    username = StringProperty("")
+    is_banned = BooleanProperty(False)
+
 class AdminScreen(Screen):
     """
     Administrátorské rozhraní. Správa uživatelů a centrálního seznamu cviků.
+    Seznamy jsou RecycleView (vykreslí se jen viditelné řádky), hledání používá
+    index sestavený v on_enter.
     """
     search_exercise = StringProperty("")
     search_user = StringProperty("")
     all_exercises = ListProperty([])
     users = ListProperty([])
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._exercise_rows, self._user_rows = [], []
+        self._exercise_index = self._user_index = SearchIndex([])
+        self._search_event = Clock.create_trigger(lambda dt: self._render_lists(), SEARCH_DEBOUNCE)
+
     def on_enter(self):
-        from data_manager import DataManager
-        dm = DataManager()
+        dm = get_data_manager()
         self.all_exercises = dm.get_central_exercises()
         self.users = dm.list_users()
+
+        # Řádky pro RecycleView a index pro hledání se připraví jednou, ne při každém stisku klávesy
+        exercises = sorted(self.all_exercises)
+        users = sorted(self.users, key=lambda x: x["username"])
+        self._exercise_rows = [{"text": ex, "admin": self} for ex in exercises]
+        self._user_rows = [{"username": u["username"], "is_banned": bool(u.get("is_banned")), "admin": self} for u in users]
+        self._exercise_index = SearchIndex(exercises)
+        self._user_index = SearchIndex([u["username"] for u in users])
         self._render_lists()
 
     def _render_lists(self):
         """Vykreslí seznamy cviků a uživatelů s možností filtrování."""
         ex_container = self.ids.get("admin_exercise_list")
         usr_container = self.ids.get("admin_user_list")
-        
+
         if ex_container is not None:
-            ex_container.clear_widgets()
-            q = self.search_exercise.strip().lower()
-            for ex in sorted(self.all_exercises):
-                if q and q not in ex.lower(): continue
-                btn = Button(text=ex, size_hint_y=None, height=40, background_color=(0.2,0.2,0.2,1))
-                btn.bind(on_release=lambda b: self._confirm_delete_exercise(b.text))
-                ex_container.add_widget(btn)
-                
+            rows = self._exercise_rows
+            ex_container.data = [rows[i] for i in self._exercise_index.search(self.search_exercise)]
+
         if usr_container is not None:
-            usr_container.clear_widgets()
-            q = self.search_user.strip().lower()
-            for u in sorted(self.users, key=lambda x: x["username"]):
-                if q and q not in u["username"].lower(): continue
-                row = BoxLayout(orientation="horizontal", size_hint_y=None, height=40, spacing=8)
-                row.add_widget(Label(text=f'{u["username"]} {"(BAN)" if u.get("is_banned") else ""}'))
-                ban_btn = Button(text="Ban" if not u.get("is_banned") else "Unban", background_color=(1,0.5,0,1))
-                del_btn = Button(text="Delete", background_color=(0.8,0.2,0.2,1))
-                ban_btn.bind(on_release=lambda b, uname=u["username"], banned=u.get("is_banned"): self._confirm_ban_toggle(uname, banned))
-                del_btn.bind(on_release=lambda b, uname=u["username"]: self._confirm_delete_user(uname))
-                row.add_widget(ban_btn)
-                row.add_widget(del_btn)
-                usr_container.add_widget(row)
+            rows = self._user_rows
+            usr_container.data = [rows[i] for i in self._user_index.search(self.search_user)]
 
     def on_search_exercise(self, instance, value):
         self.search_exercise = value
-        self._render_lists()
+        self._search_event.cancel()  # každý stisk odloží filtrování (debounce)
+        self._search_event()
 
     def on_search_user(self, instance, value):
         self.search_user = value
-        self._render_lists()
+        self._search_event.cancel()
+        self._search_event()
 
     # --- Potvrzovací dialogy pro Admin akce ---
 
@@ -612,8 +617,7 @@ class AdminScreen(Screen):
         popup = Popup(title="Potvrzení", content=box, size_hint=(0.5, 0.3))
         
         def do_delete(*_):
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             actor = App.get_running_app().root.get_screen("main").username
             ok, msg = dm.delete_central_exercise(ex_name, actor)
             Popup(title="Info", content=Label(text=msg), size_hint=(0.5,0.3)).open()
@@ -634,8 +638,7 @@ class AdminScreen(Screen):
         popup = Popup(title="Potvrzení", content=box, size_hint=(0.5, 0.3))
         
         def do_action(*_):
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             actor = App.get_running_app().root.get_screen("main").username
             if currently_banned: dm.unban_user(username, actor)
             else: dm.ban_user(username, actor)
@@ -654,8 +657,7 @@ class AdminScreen(Screen):
         popup = Popup(title="Potvrzení", content=box, size_hint=(0.5, 0.3))
         
         def do_delete(*_):
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             actor = App.get_running_app().root.get_screen("main").username
             dm.delete_user(username, actor)
             self.on_enter(); popup.dismiss()
@@ -666,8 +668,7 @@ class AdminScreen(Screen):
     def export_audit(self):
         """Exportuje auditní log do CSV."""
         try:
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             ok, path = dm.export_audit_csv()
             Popup(title="Export", content=Label(text=f"Audit exportován: {path}"), size_hint=(0.5,0.3)).open()
         except:
@@ -685,8 +686,7 @@ class AdminScreen(Screen):
         popup = Popup(title="KRITICKÁ AKCE", content=box, size_hint=(0.6, 0.4))
         
         def do_clear(*_):
-            from data_manager import DataManager
-            dm = DataManager()
+            dm = get_data_manager()
             actor = App.get_running_app().root.get_screen("main").username
             dm.clear_central_exercises_and_cleanup(actor)
             self.on_enter(); popup.dismiss()
@@ -0,0 +1,37 @@
+"""
+Index pro filtrování seznamů v administraci (uživatelé, cviky) bez závislosti na Kivy.
+"""
+
+
+class SearchIndex:
+    """
+    Hledání podřetězce bez ohledu na velikost písmen, stejně jako `q in name.lower()`.
+    Pro každý n-gram délky 1 až 3 se při sestavení uloží seznam pozic položek, které ho
+    obsahují. Pozice jsou vzestupně, takže výsledek zůstává v pořadí vstupního seznamu.
+      - dotaz do 3 znaků = jeden hotový seznam ze slovníku
+      - delší dotaz = nejkratší seznam z jeho trigramů a ověření podřetězce jen u těchto položek
+    """
+    GRAM_SIZES = (1, 2, 3)
+
+    def __init__(self, names):
+        self._names = [name.lower() for name in names]
+        self._all = list(range(len(self._names)))
+        self._postings = {}
+        for i, name in enumerate(self._names):
+            grams = {name[j:j + n] for n in self.GRAM_SIZES for j in range(len(name) - n + 1)}
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def __len__(self):
+        return len(self._names)
+
+    def search(self, query):
+        """Vrátí pozice položek obsahujících query (vzestupně). Vrácený seznam neměnit."""
+        q = query.strip().lower()
+        if not q:
+            return self._all
+        if len(q) <= self.GRAM_SIZES[-1]:
+            return self._postings.get(q, [])
+        candidates = min((self._postings.get(q[j:j + 3], []) for j in range(len(q) - 2)), key=len)
+        names = self._names
+        return [i for i in candidates if q in names[i]]
@@ -51,3 +51,52 @@ CREATE TABLE IF NOT EXISTS bodyweight_history (
     date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
+
+-- Agregace po cvicích (PK: user_id + exercise_id), udržuje je DataManager při ukládání tréninku
+-- Osobní rekord, nejnižší váha, celkový objem a opakování, první a poslední záznam
+CREATE TABLE IF NOT EXISTS exercise_stats (
+    user_id INTEGER NOT NULL,
+    exercise_id INTEGER NOT NULL,
+    pr REAL NOT NULL,
+    low REAL NOT NULL,
+    total_volume REAL NOT NULL,
+    total_reps INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    first_date TIMESTAMP,
+    last_date TIMESTAMP,
+    PRIMARY KEY (user_id, exercise_id),
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (exercise_id) REFERENCES exercises (id) ON DELETE CASCADE
+);
+
+-- Denní součty objemu a opakování po cvicích (pro okno posledních 30 dní)
+CREATE TABLE IF NOT EXISTS exercise_daily (
+    user_id INTEGER NOT NULL,
+    exercise_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    volume REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    PRIMARY KEY (user_id, exercise_id, day),
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (exercise_id) REFERENCES exercises (id) ON DELETE CASCADE
+);
+
+-- Auditní log administrátorských akcí (jen přidávání, details jako JSON)
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    action TEXT NOT NULL,
+    target TEXT,
+    details TEXT
+);
+
+-- Indexy pro načítání historie uživatele (tréninky podle data, položky podle tréninku a cviku)
+CREATE INDEX IF NOT EXISTS idx_workouts_user_date ON workouts (user_id, date);
+CREATE INDEX IF NOT EXISTS idx_workout_items_workout ON workout_items (workout_id);
+CREATE INDEX IF NOT EXISTS idx_workout_items_exercise ON workout_items (exercise_id);
+CREATE INDEX IF NOT EXISTS idx_bodyweight_user_date ON bodyweight_history (user_id, date);
+CREATE INDEX IF NOT EXISTS idx_exercise_stats_exercise ON exercise_stats (exercise_id);
+CREATE INDEX IF NOT EXISTS idx_exercise_daily_exercise ON exercise_daily (exercise_id);
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log (timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_actor_timestamp ON audit_log (actor, timestamp);
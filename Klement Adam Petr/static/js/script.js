@@ -192,7 +192,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const token = localStorage.getItem('amp_token');
     if (!token) return;
     try {
-      const res = await fetch(`/get_workouts`, {
+      // Dashboard ukazuje jen posledních 5 tréninků, víc si nenačítáme
+      const res = await fetch(`/get_workouts?limit=5`, {
         method: 'GET',
         headers: { 'Authorization': token }
       });
@@ -1,7 +1,8 @@
 import unittest
 import os
 import sqlite3
-from data_manager import DataManager
+import csv
+from data_manager import DataManager, connections, audit_buffer
 
 TEST_DB_FILE = "tests/test_fitness.db"
 
@@ -13,9 +14,12 @@ class TestDataManager(unittest.TestCase):
         self.dm = DataManager(db_file=TEST_DB_FILE)
 
     def tearDown(self):
-        # Úklid po testech
-        if os.path.exists(TEST_DB_FILE):
-            os.remove(TEST_DB_FILE)
+        # Úklid po testech (zapsat čekající audit a zavřít sdílené připojení, ať po WAL nezůstanou soubory -wal/-shm)
+        audit_buffer.flush()
+        connections.close_all()
+        for path in (TEST_DB_FILE, self.dm.audit_file):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_add_user_and_login(self):
         """Testuje registraci a následné přihlášení uživatele."""
@@ -77,5 +81,179 @@ class TestDataManager(unittest.TestCase):
         # Ověření PR v načtených datech
         self.assertEqual(user_data["personal_records"]["Dřepy"], 80)
 
+    def test_user_data_order_and_progress(self):
+        """Testuje pořadí tréninků, prázdný trénink a data pro grafy z jednoho dotazu."""
+        username = "history"
+        self.dm.add_user(username, "pass", "h@h.cz")
+        self.dm.save_workout(username, [("Dřepy", 3, 5, 100), ("Bench press", 3, 8, 60)], "starý", "")
+        self.dm.save_workout(username, [], "prázdný", "")
+        self.dm.save_workout(username, [("Dřepy", 5, 5, 90)], "nový", "")
+
+        # Data tréninků přímo v DB, ať pořadí nezávisí na CURRENT_TIMESTAMP
+        conn = sqlite3.connect(TEST_DB_FILE)
+        for note, date in [("starý", "2024-01-01 10:00:00"), ("prázdný", "2024-01-02 10:00:00"), ("nový", "2024-01-03 10:00:00")]:
+            conn.execute("UPDATE workouts SET date = ? WHERE note = ?", (date, note))
+        conn.commit()
+        conn.close()
+
+        user_data = self.dm.get_user_data(username)
+
+        # Nejnovější trénink první, trénink bez cviků zůstává v seznamu
+        self.assertEqual([w["note"] for w in user_data["workouts"]], ["nový", "prázdný", "starý"])
+        self.assertEqual(user_data["workouts"][1]["exercises"], [])
+        self.assertEqual(user_data["workouts"][2]["summary"], "Dřepy - 3x5, 100.0kg\nBench press - 3x8, 60.0kg")
+
+        # Progres od nejstaršího, objem = série * opakování * váha
+        squats = user_data["progress_data"]["Dřepy"]
+        self.assertEqual([p["date"] for p in squats], ["2024-01-01 10:00:00", "2024-01-03 10:00:00"])
+        self.assertEqual(squats[1]["volume"], 5 * 5 * 90)
+        self.assertEqual(user_data["personal_records"], {"Dřepy": 100, "Bench press": 60})
+
+    def test_workout_pages_and_stats(self):
+        """Testuje stránkování tréninků přes kurzor a SQL statistiky."""
+        username = "pager"
+        self.dm.add_user(username, "pass", "p@p.cz")
+        for i in range(7):
+            self.dm.save_workout(username, [("Dřepy", 3, 5, 50 + i), ("Kliky", 3, 20, 0)], f"t{i}", "")
+        # Dva tréninky ve stejný den — pořadí pak rozhoduje id
+        conn = sqlite3.connect(TEST_DB_FILE)
+        conn.execute("UPDATE workouts SET date = '2024-02-0' || (id % 3 + 1) || ' 08:00:00'")
+        conn.commit()
+        conn.close()
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = self.dm.list_workouts(username, limit=3, before=cursor)
+            self.assertLessEqual(len(page), 3)
+            seen += [(w["date"], w["id"]) for w in page]
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(page[-1]["exercise_count"], 2)
+        self.assertEqual(page[-1]["first_exercise"], "Dřepy")
+
+        detail = self.dm.get_workout(username, seen[0][1])
+        self.assertEqual(detail["exercises"][1], ["Kliky", 3, 20, 0])
+        self.assertIsNone(self.dm.get_workout("nikdo", seen[0][1]))
+
+        stats = self.dm.get_user_stats(username)
+        self.assertEqual(stats["total_workouts"], 7)
+        self.assertEqual(stats["days_active"], 3)
+        self.assertEqual(stats["best_lift"], ("Dřepy", 56))
+
+    def test_exercise_stats_aggregates(self):
+        """Testuje průběžné agregace po cvicích, okno 30 dní a jejich úklid při mazání."""
+        username = "stats"
+        self.dm.add_user(username, "pass", "s@s.cz")
+        self.dm.add_user("jiny", "pass", "j@j.cz")
+        self.dm.save_workout(username, [("Dřepy", 3, 5, 100), ("Dřepy", 2, 10, 60)], "", "")
+        self.dm.save_workout(username, [("Dřepy", 5, 5, 110), ("Shyby", 3, 8, 0)], "", "")
+        self.dm.save_workout("jiny", [("Dřepy", 1, 1, 200)], "", "")
+
+        squats = self.dm.get_exercise_stats(username)["Dřepy"]
+        self.assertEqual((squats["pr"], squats["low"], squats["entries"]), (110, 60, 3))
+        self.assertEqual(squats["total_volume"], 3 * 5 * 100 + 2 * 10 * 60 + 5 * 5 * 110)
+        self.assertEqual(squats["total_reps"], 15 + 20 + 25)
+        self.assertEqual((squats["volume_30d"], squats["reps_30d"]), (squats["total_volume"], 60))
+        self.assertEqual(self.dm.get_user_stats(username)["best_lift"], ("Dřepy", 110))
+        self.assertEqual(len(self.dm.get_exercise_progress(username, "Dřepy")), 3)
+
+        # Průběžné agregace musí odpovídat přepočtu z celé historie
+        conn = self.dm._get_connection()
+        before = self.dm.get_exercise_stats(username)
+        with conn:
+            self.dm._rebuild_exercise_stats(conn)
+        self.assertEqual(self.dm.get_exercise_stats(username), before)
+
+        # Starý trénink vypadne z okna posledních 30 dní, ale zůstane v celkovém souhrnu
+        with conn:
+            conn.execute("UPDATE workouts SET date = '2020-01-01 10:00:00' WHERE id = 1")
+            self.dm._rebuild_exercise_stats(conn)
+        squats = self.dm.get_exercise_stats(username)["Dřepy"]
+        self.assertEqual((squats["volume_30d"], squats["reps_30d"]), (5 * 5 * 110, 25))
+        self.assertEqual(squats["first_date"], "2020-01-01 10:00:00")
+
+        # Smazání cviku a uživatele odstraní i jejich agregace
+        self.dm.delete_central_exercise("Shyby", "admin")
+        self.assertEqual(list(self.dm.get_exercise_stats(username)), ["Dřepy"])
+        self.dm.delete_user(username, "admin")
+        self.assertIsNone(self.dm.get_exercise_stats(username))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM exercise_stats").fetchone()[0], 1)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM exercise_daily").fetchone()[0], 1)
+
+    def test_audit_log(self):
+        """Testuje auditní log v DB: převzetí starého audit.log, dávkový zápis a export s filtry."""
+        # Starý JSON-lines log se převezme při vytvoření tabulky
+        connections.close_all()
+        os.remove(TEST_DB_FILE)
+        with open(self.dm.audit_file, "w", encoding="utf-8") as f:
+            f.write('{"timestamp": "2024-01-01 10:00:00", "actor": "admin", "action": "ban_user", "target": "alex", "details": {}}\n')
+            f.write("poškozený řádek\n")
+        self.dm = DataManager(db_file=TEST_DB_FILE)
+
+        self.dm.add_user("alex", "1234", "a@a.cz")
+        self.dm.unban_user("alex", "admin")
+        self.dm.add_central_exercise("kliky", "trener")
+        entries = list(self.dm.iter_audit())  # čekající dávka se zapíše před čtením
+        self.assertEqual([(e["actor"], e["action"], e["target"]) for e in entries],
+                         [("admin", "ban_user", "alex"), ("admin", "unban_user", "alex"), ("trener", "add_exercise", "Kliky")])
+
+        self.assertEqual(len(list(self.dm.iter_audit(actor="admin"))), 2)
+        self.assertEqual(len(list(self.dm.iter_audit(until="2024-01-02"))), 1)
+        self.assertEqual(len(list(self.dm.iter_audit(since="2024-01-02"))), 2)
+
+        out_path = "tests/audit_test.csv"
+        try:
+            ok, path = self.dm.export_audit_csv(out_path, actor="trener")
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        finally:
+            os.remove(out_path)
+        self.assertEqual([(r["action"], r["target"], r["details"]) for r in rows], [("add_exercise", "Kliky", "{}")])
+
+    def test_bulk_import_export(self):
+        """Testuje hromadný import z CSV a JSON lines a zpětné načtení sloupcového exportu."""
+        self.dm.add_user("alex", "1234", "a@a.cz")
+        self.dm.add_user("bara", "1234", "b@b.cz")
+        csv_path, jsonl_path, zip_path = "tests/import.csv", "tests/import.jsonl", "tests/export.zip"
+        try:
+            with open(csv_path, "w", newline="", encoding="utf-8") as f:
+                f.write("workout,username,date,note,exercise,sets,reps,weight\n")
+                f.write("1,alex,2024-01-01 10:00:00,nohy,Dřepy,3,5,100\n")
+                f.write("1,alex,2024-01-01 10:00:00,nohy,Dřepy,2,10,60.5\n")
+                f.write("2,alex,2024-01-03,,,,,\n")  # trénink bez cviků
+                f.write("3,nikdo,2024-01-04,,Dřepy,1,1,1\n")  # neznámý uživatel
+                f.write("4,bara,2024-01-05,,Shyby,tři,8,0\n")  # neplatný počet sérií
+            with open(jsonl_path, "w", encoding="utf-8") as f:
+                f.write('{"username": "bara", "date": "2024-02-01T07:30:00", "note": "záda", "exercises": [["Shyby", 3, 8, 0], ["Dřepy", 1, 1, 120]]}\n')
+                f.write("poškozený řádek\n")
+
+            self.assertEqual(self.dm.import_workouts(csv_path, chunk_size=1), {"workouts": 2, "items": 2, "skipped": 2})
+            self.assertEqual(self.dm.import_workouts(jsonl_path), {"workouts": 1, "items": 2, "skipped": 1})
+
+            alex = self.dm.get_exercise_stats("alex")["Dřepy"]
+            self.assertEqual((alex["pr"], alex["entries"], alex["total_reps"]), (100, 2, 35))
+            self.assertEqual(self.dm.get_workout("alex", 2)["date"], "2024-01-03 00:00:00")
+            self.assertEqual(self.dm.get_workout("bara", 3)["exercises"], [["Shyby", 3, 8, 0], ["Dřepy", 1, 1, 120]])
+
+            # Export a import do čisté DB musí dát stejné tréninky i agregace
+            self.assertEqual(self.dm.export_workouts(zip_path), (True, zip_path))
+            before = [self.dm.get_workout(u, i) for u, i in (("alex", 1), ("alex", 2), ("bara", 3))]
+            stats_before = self.dm.get_exercise_stats("bara")
+            self.dm.delete_user("alex", "admin")
+            self.dm.delete_user("bara", "admin")
+            self.dm.add_user("alex", "1234", "a@a.cz")
+            self.dm.add_user("bara", "1234", "b@b.cz")
+            self.assertEqual(self.dm.import_workouts(zip_path), {"workouts": 3, "items": 4, "skipped": 0})
+            after = [self.dm.get_workout(u, i) for u, i in (("alex", 4), ("alex", 5), ("bara", 6))]
+            self.assertEqual([{k: v for k, v in w.items() if k != "id"} for w in after],
+                             [{k: v for k, v in w.items() if k != "id"} for w in before])
+            self.assertEqual(self.dm.get_exercise_stats("bara"), stats_before)
+        finally:
+            for path in (csv_path, jsonl_path, zip_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import random
+from graph_utils import lttb, x_tick_indices, date_label, value_range, y_ticks
+
+
+class TestGraphUtils(unittest.TestCase):
+    def test_lttb_keeps_shape(self):
+        """Testuje zmenšení počtu bodů: krajní body a výrazné vrcholy zůstanou."""
+        rng = random.Random(1)
+        values = [80 + rng.uniform(-1, 1) for _ in range(10_000)]
+        values[4321] = 150  # jednorázový výkyv musí v grafu zůstat
+
+        indices = lttb(values, 500)
+        self.assertEqual(len(indices), 500)
+        self.assertEqual((indices[0], indices[-1]), (0, 9_999))
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertIn(4321, indices)
+
+        # Málo bodů se nezmenšuje
+        self.assertEqual(lttb([1, 2, 3], 500), [0, 1, 2])
+
+    def test_axis_labels(self):
+        """Testuje popisky os (indexy pod osou X, formát data, krok osy Y)."""
+        self.assertEqual(x_tick_indices(5, 720), [0, 1, 2, 3, 4])
+        ticks = x_tick_indices(1000, 720)
+        self.assertEqual((ticks[0], ticks[-1], len(ticks)), (0, 999, 12))
+        self.assertEqual(date_label("2024-03-07 10:00:00"), "7.3.")
+        self.assertEqual(date_label("včera"), "včera")
+
+        self.assertEqual(value_range([0, 0]), (-5, 5))  # konstantní nula by dala prázdný rozsah
+        min_val, max_val = value_range([100, 100])
+        self.assertEqual((min_val, max_val), (95, 105))
+        self.assertEqual(y_ticks(min_val, max_val, 340), [(96, "96"), (98, "98"), (100, "100"), (102, "102"), (104, "104")])
+
+if __name__ == '__main__':
+    unittest.main()
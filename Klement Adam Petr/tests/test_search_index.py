@@ -0,0 +1,23 @@
+import unittest
+import random
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_matches_substring_filter(self):
+        """Testuje, že index vrací totéž co původní filtr `q in name.lower()` a ve stejném pořadí."""
+        rng = random.Random(3)
+        names = sorted("".join(rng.choice("abcdeřŽ ") for _ in range(rng.randint(0, 12))) for _ in range(2000))
+        index = SearchIndex(names)
+        queries = ["", "  ", "a", "Ž", "ab", "abc", "aBcD", " ř", "řž", "eeee", "xyz", "abcdeabcde"]
+        queries += [n[rng.randint(0, max(0, len(n) - 2)):][:5] for n in rng.sample(names, 50)]
+        for q in queries:
+            expected = [i for i, n in enumerate(names) if q.strip().lower() in n.lower()]
+            self.assertEqual(list(index.search(q)), expected, q)
+
+    def test_empty_index(self):
+        self.assertEqual(list(SearchIndex([]).search("abc")), [])
+        self.assertEqual(len(SearchIndex(["Dřepy", "Bench press"])), 2)
+
+if __name__ == '__main__':
+    unittest.main()
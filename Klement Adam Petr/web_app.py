@@ -48,70 +48,71 @@ def login():
 
 # --- API pro Tréninky ---
 
+WORKOUTS_PAGE_SIZE = 20
+WORKOUTS_PAGE_MAX = 100
+
+def _summary_text(first_exercise, ex_count):
+    """Krátké shrnutí tréninku (např. "Bench press + 2 další")."""
+    if ex_count > 1:
+        return f"{first_exercise} + {ex_count - 1} další"
+    if ex_count == 1:
+        return first_exercise
+    return "Žádné cviky"
+
+def _parse_cursor(raw):
+    """Kurzor stránky je "datum|id" posledního tréninku předchozí stránky."""
+    date, _, w_id = raw.rpartition('|')
+    if not date or not w_id.isdigit():
+        raise ValueError(raw)
+    return date, int(w_id)
+
 @app.route('/get_workouts', methods=['GET'])
 def get_workouts():
-    """Vrátí seznam všech tréninků přihlášeného uživatele pro dashboard."""
+    """
+    Vrátí stránku tréninků přihlášeného uživatele (od nejnovějšího).
+    Parametry: limit (výchozí 20, max 100) a cursor z next_cursor předchozí odpovědi.
+    """
     token = request.headers.get('Authorization')
     if not token:
         return jsonify({'error': 'Neautorizovaný přístup'}), 401
     
     username = token
-    user_data = dm.get_user_data(username)
-    
-    if not user_data:
+    try:
+        limit = min(max(int(request.args.get('limit', WORKOUTS_PAGE_SIZE)), 1), WORKOUTS_PAGE_MAX)
+        cursor = request.args.get('cursor')
+        before = _parse_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'Neplatný parametr stránkování'}), 400
+
+    page = dm.list_workouts(username, limit, before)
+    if page is None:
         return jsonify({'error': 'Uživatel nenalezen'}), 404
+    rows, next_cursor = page
         
-    # Transformace dat ze struktury DataManageru pro potřeby frontendu
-    frontend_workouts = []
-    raw_workouts = user_data.get('workouts', [])
-    
-    for idx, w_session in enumerate(raw_workouts):
-        date = w_session.get('date')
-        note = w_session.get('note')
-        exercises = w_session.get('exercises', [])
-        ex_count = len(exercises)
-        
-        # Vytvoření krátkého shrnutí (např. "Bench press + 2 další")
-        summary_text = ""
-        if ex_count > 0:
-            first_ex = exercises[0][0]
-            if ex_count > 1:
-                summary_text = f"{first_ex} + {ex_count - 1} další"
-            else:
-                summary_text = first_ex
-        else:
-            summary_text = "Žádné cviky"
-
-        frontend_workouts.append({
-            'id': idx,
-            'date': date,
-            'note': note,
-            'summary_text': summary_text,
-            'bodyweight': w_session.get('bodyweight', '-')
-        })
-    
-    # Seřazení od nejnovějšího
-    frontend_workouts.sort(key=lambda x: x['date'], reverse=True)
+    # Transformace řádků z DB pro potřeby frontendu
+    frontend_workouts = [{
+        'id': w['id'],
+        'date': w['date'],
+        'note': w['note'],
+        'summary_text': _summary_text(w['first_exercise'], w['exercise_count'])
+    } for w in rows]
     
-    return jsonify({'workouts': frontend_workouts}), 200
+    return jsonify({
+        'workouts': frontend_workouts,
+        'next_cursor': f"{next_cursor[0]}|{next_cursor[1]}" if next_cursor else None
+    }), 200
 
-@app.route('/get_workout_detail/<int:index>', methods=['GET'])
-def get_workout_detail(index):
-    """Vrátí detailní data o konkrétním tréninku podle jeho indexu."""
+@app.route('/get_workout_detail/<int:workout_id>', methods=['GET'])
+def get_workout_detail(workout_id):
+    """Vrátí detailní data o konkrétním tréninku podle jeho ID."""
     token = request.headers.get('Authorization')
     if not token:
         return jsonify({'error': 'Neautorizovaný přístup'}), 401
     
     username = token
-    user_data = dm.get_user_data(username)
-    if not user_data:
-        return jsonify({'error': 'Uživatel nenalezen'}), 404
-        
-    raw_workouts = user_data.get('workouts', [])
-    if index < 0 or index >= len(raw_workouts):
+    workout = dm.get_workout(username, workout_id)
+    if not workout:
         return jsonify({'error': 'Trénink nenalezen'}), 404
-        
-    workout = raw_workouts[index]
     return jsonify(workout), 200
 
 # --- API pro Statistiky a Dashboard ---
@@ -124,20 +125,20 @@ def get_user_stats():
         return jsonify({'error': 'Neautorizovaný přístup'}), 401
     
     username = token
-    user_data = dm.get_user_data(username)
-    if not user_data:
+    stats = dm.get_user_stats(username)
+    if stats is None:
         return jsonify({'error': 'Uživatel nenalezen'}), 404
 
     # 1. Informace o posledním tréninku
-    raw_workouts = user_data.get('workouts', [])
     latest_workout_info = {
         'title': 'Žádný trénink',
         'desc': 'Zatím nic',
         'note': 'Zde se zobrazí poznámka'
     }
     
-    if raw_workouts:
-        last = raw_workouts[-1]
+    latest, _ = dm.list_workouts(username, limit=1)
+    last = dm.get_workout(username, latest[0]['id']) if latest else None
+    if last:
         exercises = last.get('exercises', [])
         ex_count = len(exercises)
         
@@ -171,35 +172,22 @@ def get_user_stats():
         }
 
     # 2. Osobní rekordy (PR)
-    prs = user_data.get('personal_records', {})
     pr_text = "Zatím žádné PR"
-    if prs:
-        try:
-            best_lift = max(prs.items(), key=lambda x: x[1])
-            pr_text = f"PR: {best_lift[0]} {best_lift[1]} kg"
-        except:
-            pass
+    if stats['best_lift']:
+        pr_text = f"PR: {stats['best_lift'][0]} {stats['best_lift'][1]} kg"
 
     # 3. Tělesná váha
-    bw = user_data.get('bodyweight', '-') 
-    bw_text = f"Váha: {bw} kg" if bw != '-' else "Váha: --"
+    bw = stats['bodyweight']
+    bw_text = f"Váha: {bw} kg" if bw is not None else "Váha: --"
     
-    # 4. Celkový počet tréninků a aktivních dní
-    total_workouts = len(raw_workouts)
-    unique_days = set()
-    for w in raw_workouts:
-        d_str = w.get('date', '').split(' ')[0]
-        if d_str:
-            unique_days.add(d_str)
-    days_count = len(unique_days)
-
+    # 4. Celkový počet tréninků a aktivních dní (COUNT a COUNT DISTINCT v SQL)
     return jsonify({
         'latest_workout': latest_workout_info,
         'stats': {
             'pr_text': pr_text,
             'bw_text': bw_text,
-            'total_workouts': total_workouts,
-            'days_active': days_count
+            'total_workouts': stats['total_workouts'],
+            'days_active': stats['days_active']
         }
     }), 200
 
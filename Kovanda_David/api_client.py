@@ -1,10 +1,32 @@
 # -*- coding: utf-8 -*-
-"""HTTP klient pro komunikaci s lokálním Flask backendem."""
+"""HTTP klient pro komunikaci s lokálním Flask backendem.
 
-from typing import Tuple, Any, Dict
+api_get/api_post jsou synchronní (pro skripty). Hra používá ApiWorker:
+požadavky běží ve vláknech přes jednu sdílenou Session (spojení se
+znovu používají) a výsledek přijde jako pygame událost, takže menu ani
+konec hry nečekají na síť.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Any, Dict, Optional
+
+import pygame
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:5000/api"
+TIMEOUT = 5
+WORKERS = 2
+
+# Jedna Session pro celý program — keep-alive spojení se drží v poolu adaptéru
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS))
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS))
+
+# Poslední odpověď GET s ETagem: (cesta, token) -> (etag, data). Server pak na
+# If-None-Match odpoví 304 bez těla a použijí se uložená data.
+_etag_cache: Dict[Tuple[str, str], Tuple[str, Any]] = {}
 
 
 def _headers(token: str = ""):
@@ -14,11 +36,17 @@ def _headers(token: str = ""):
     return h
 
 
-def api_get(path: str, token: str = "") -> Tuple[bool, Any]:
+def _request(method: str, path: str, data: Optional[Dict[str, Any]] = None, token: str = "") -> Tuple[bool, Any]:
+    headers = _headers(token)
+    cached = _etag_cache.get((path, token)) if method == "GET" else None
+    if cached:
+        headers["If-None-Match"] = cached[0]
     try:
-        resp = requests.get(f"{BASE_URL}{path}", headers=_headers(token), timeout=5)
+        resp = _session.request(method, f"{BASE_URL}{path}", json=data, headers=headers, timeout=TIMEOUT)
     except Exception:
         return False, "API není dostupné"
+    if resp.status_code == 304 and cached:
+        return True, cached[1]
     if resp.status_code >= 400:
         try:
             msg = resp.json().get("error", resp.text)
@@ -26,23 +54,69 @@ def api_get(path: str, token: str = "") -> Tuple[bool, Any]:
             msg = resp.text
         return False, msg
     try:
-        return True, resp.json()
+        body = resp.json()
     except Exception:
         return False, "Neplatná odpověď API"
+    etag = resp.headers.get("ETag")
+    if method == "GET" and etag:
+        _etag_cache[(path, token)] = (etag, body)
+    return True, body
+
+
+def api_get(path: str, token: str = "") -> Tuple[bool, Any]:
+    return _request("GET", path, token=token)
 
 
 def api_post(path: str, data: Dict[str, Any], token: str = "") -> Tuple[bool, Any]:
-    try:
-        resp = requests.post(f"{BASE_URL}{path}", json=data, headers=_headers(token), timeout=5)
-    except Exception:
-        return False, "API není dostupné"
-    if resp.status_code >= 400:
-        try:
-            msg = resp.json().get("error", resp.text)
-        except Exception:
-            msg = resp.text
-        return False, msg
-    try:
-        return True, resp.json()
-    except Exception:
-        return False, "Neplatná odpověď API"
+    return _request("POST", path, data, token)
+
+
+class ApiWorker:
+    """Posílá požadavky na pozadí a výsledky vkládá do fronty událostí pygame.
+
+    Událost má typ event_type a atributy kind, ok, data, token a extra.
+    GET požadavky se stejným kind se slučují: běží vždy nejvýš jeden, a když
+    mezitím přijde další, spustí se ještě jednou až po doběhnutí (výsledek
+    tak není starší než poslední žádost). POST se posílá vždy.
+    """
+
+    def __init__(self, event_type: int, workers: int = WORKERS):
+        self.event_type = event_type
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.lock = threading.Lock()
+        self.inflight = set()  # kind GET požadavků, které právě běží
+        self.rerun = {}        # kind -> argumenty GET požadavku, který přišel během běhu
+
+    def request(self, kind: str, method: str, path: str, data: Optional[Dict[str, Any]] = None,
+                token: str = "", extra: Any = None):
+        args = (method, path, data, token, extra)
+        if method == "GET":
+            with self.lock:
+                if kind in self.inflight:
+                    self.rerun[kind] = args
+                    return
+                self.inflight.add(kind)
+        self.executor.submit(self._run, kind, args)
+
+    def get(self, kind: str, path: str, token: str = "", extra: Any = None):
+        self.request(kind, "GET", path, token=token, extra=extra)
+
+    def post(self, kind: str, path: str, data: Dict[str, Any], token: str = "", extra: Any = None):
+        self.request(kind, "POST", path, data, token, extra)
+
+    def _run(self, kind: str, args):
+        while args is not None:
+            method, path, data, token, extra = args
+            ok, result = _request(method, path, data, token)
+            if method != "GET":
+                break
+            with self.lock:
+                # Zastaralý výsledek nemá smysl posílat, když za ním hned běží novější
+                args = self.rerun.pop(kind, None)
+                if args is None:
+                    self.inflight.discard(kind)
+        pygame.event.post(pygame.event.Event(
+            self.event_type, kind=kind, ok=ok, data=result, token=token, extra=extra))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
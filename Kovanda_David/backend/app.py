@@ -7,21 +7,68 @@ Endpointy (prefix /api):
 - GET /me (Auth: Bearer <token>)
 - GET /scores (Auth: Bearer <token>) -> {scores: {mode: [{username, score}]}}
 - POST /scores (Auth: Bearer <token>) {mode, score}
+- GET /scores/public -> {scores: {mode: [{username, score}]}}
+- POST /scores/bulk (Auth: Bearer <token>) [{mode, score}, ...] nebo NDJSON
+  -> {received, applied, rejected, errors}; s tokenem SNAKE_ADMIN_TOKEN
+  může mít každý řádek i username (import turnaje za víc hráčů)
+
+Žebříčky se drží v paměti (LeaderboardCache) a odpovědi mají ETag —
+klient, který pošle If-None-Match, dostane 304 bez těla.
 
 Token je jen jednoduchý řetězec uložený v DB (není to JWT).
 Databáze: sqlite3 soubor vedle app.py (db.sqlite3).
 """
+import bisect
+import json
 import os
+import queue
 import sqlite3
 import secrets
+import threading
 from datetime import datetime
 from typing import Dict, Any
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 
 APP_DIR = os.path.abspath(os.path.dirname(__file__))
-DB_PATH = os.path.join(APP_DIR, "db.sqlite3")
+# SNAKE_DB umožní pustit server nad jinou databází (např. zátěžový test)
+DB_PATH = os.environ.get("SNAKE_DB", os.path.join(APP_DIR, "db.sqlite3"))
+DB_POOL_SIZE = 8
+# Token pro hromadný import za jiné hráče; bez proměnné prostředí je vypnutý
+ADMIN_TOKEN = os.environ.get("SNAKE_ADMIN_TOKEN", "")
+BULK_MAX_ROWS = 100_000
+
+# Nastavení každého nového spojení. WAL: čtení neblokuje zápis a naopak;
+# synchronous=NORMAL stačí s WAL (commit nečeká na fsync, data se neztratí
+# při pádu aplikace, jen při výpadku proudu poslední commity).
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -8000",  # 8 MB stránek v paměti na spojení
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Top N jednoho módu — pokrývá ho index idx_scores_mode_score
+TOP_N = 10
+TOP_SCORES_SQL = f"""
+    SELECT s.id, u.username, s.score, s.created_at
+    FROM scores s
+    JOIN users u ON u.id = s.user_id
+    WHERE s.mode = ?
+    ORDER BY s.score DESC, s.created_at ASC
+    LIMIT {TOP_N}
+"""
+
+# Zápis skóre jedním dotazem: nový řádek, nebo zvýšení dosavadního nejlepšího.
+# Nižší nebo stejné skóre řádek nezmění (WHERE), takže se nepočítá do rowcount.
+UPSERT_SCORE_SQL = """
+    INSERT INTO scores (user_id, mode, score, created_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id, mode) DO UPDATE SET score = excluded.score, created_at = excluded.created_at
+    WHERE excluded.score > scores.score
+"""
 
 # Herni mody dostupne v aplikaci (mapovani kod -> popisek)
 MODE_LABELS = {
@@ -39,14 +86,60 @@ CORS(app)
 # Databáze
 # -----------------------------
 
+class ConnectionPool:
+    """Spojení do SQLite, která se půjčují na jeden požadavek a pak vrací.
+
+    Vývojový server (threaded) pouští každý požadavek v novém vlákně, takže
+    spojení svázané s vláknem by se otevíralo pořád znovu; sdílený pool je
+    přežije. Otevřené spojení si drží i cache připravených dotazů
+    (cached_statements), takže se stejné SQL znovu nepřekládá.
+    """
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE):
+        self.path = path
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()  # nedokončený zápis (např. po výjimce) nesmí přejít do dalšího požadavku
+        try:
+            self.idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+pool = ConnectionPool(DB_PATH)
+
+
 def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Jedno spojení na požadavek, vrací se do poolu v close_db()
+    if "db" not in g:
+        g.db = pool.acquire()
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db(exc):
+    conn = g.pop("db", None)
+    if conn is not None:
+        pool.release(conn)
 
 
 def init_db():
-    conn = get_db()
+    conn = pool.acquire()
     cur = conn.cursor()
     cur.execute(
         """
@@ -72,13 +165,122 @@ def init_db():
         )
         """
     )
+    # Přihlášení podle tokenu, top 10 na mód a nejlepší skóre hráče v módu
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_users_token ON users(token)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scores_mode_score ON scores(mode, score DESC, created_at, user_id)")
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'ux_scores_user_mode'")
+    if cur.fetchone() is None:
+        # Jeden řádek na hráče a mód (potřebuje ON CONFLICT); případné duplicity
+        # ze starší DB se slijí do nejlepšího skóre
+        cur.execute(
+            """
+            DELETE FROM scores WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY user_id, mode ORDER BY score DESC, created_at ASC
+                    ) AS rn
+                    FROM scores
+                ) WHERE rn = 1
+            )
+            """
+        )
+        cur.execute("DROP INDEX IF EXISTS idx_scores_user_mode")
+        cur.execute("CREATE UNIQUE INDEX ux_scores_user_mode ON scores(user_id, mode)")
     conn.commit()
-    conn.close()
+    cur.execute("PRAGMA optimize")
+    pool.release(conn)
 
 
 init_db()
 
 
+# -----------------------------
+# Žebříčky v paměti
+# -----------------------------
+
+class LeaderboardCache:
+    """Top N každého módu v paměti procesu.
+
+    Z DB se načte jen při prvním použití, pak ho udržuje record() při každém
+    zapsaném skóre (write-through) a GET žebříčku SQLite vůbec nečte.
+    Záznam je (-skóre, created_at, id řádku, jméno), takže seřazený seznam
+    má stejné pořadí jako ORDER BY score DESC, created_at ASC.
+    Platí pro jeden proces serveru — víc workerů by mělo každý svou kopii.
+    """
+
+    def __init__(self, size: int = TOP_N):
+        self.size = size
+        self.lock = threading.Lock()
+        self.top = None      # mód -> seřazené záznamy
+        self.version = 0     # mění se s každou změnou žebříčku (ETag)
+        self.bodies = {}     # varianta -> (etag, JSON) pro aktuální verzi
+        self.boot = secrets.token_hex(4)  # ETag z minulého běhu serveru nesmí platit
+
+    def _ensure_loaded(self):
+        if self.top is not None:
+            return
+        cur = get_db().cursor()
+        top = {}
+        cur.execute("SELECT DISTINCT mode FROM scores")
+        for (mode,) in cur.fetchall():
+            cur.execute(TOP_SCORES_SQL, (mode,))
+            top[mode] = [(-r["score"], r["created_at"], r["id"], r["username"]) for r in cur.fetchall()]
+        self.top = top
+
+    def record(self, mode: str, row_id: int, username: str, score: int, created_at: str) -> bool:
+        """Zapsané skóre (nový nebo zvýšený řádek). Vrací True, pokud se žebříček změnil."""
+        entry = (-score, created_at, row_id, username)
+        with self.lock:
+            self._ensure_loaded()
+            entries = self.top.setdefault(mode, [])
+            old = next((e for e in entries if e[2] == row_id), None)
+            if old is not None:
+                if old <= entry:
+                    return False  # souběžný zápis už uložil vyšší skóre
+                entries.remove(old)
+            elif len(entries) >= self.size and entry >= entries[-1]:
+                return False  # na top N nestačí
+            bisect.insort(entries, entry)
+            del entries[self.size:]
+            self.version += 1
+            self.bodies.clear()
+            return True
+
+    def invalidate(self):
+        """Po hromadném zápisu — žebříček se znovu načte z DB při dalším čtení."""
+        with self.lock:
+            self.top = None
+            self.version += 1
+            self.bodies.clear()
+
+    def body(self, public: bool):
+        """(etag, JSON) žebříčku; veřejná varianta má vždy všechny módy z MODE_LABELS."""
+        key = "public" if public else "all"
+        with self.lock:
+            self._ensure_loaded()
+            cached = self.bodies.get(key)
+            if cached is None:
+                modes = MODE_LABELS.keys() if public else self.top.keys()
+                scores_resp = {
+                    m: [dict(username=e[3], score=-e[0]) for e in self.top.get(m, [])]
+                    for m in modes
+                }
+                etag = f"{self.boot}-{self.version}-{key}"
+                cached = self.bodies[key] = (etag, app.json.dumps({"scores": scores_resp}))
+            return cached
+
+
+leaderboard = LeaderboardCache()
+
+
+def leaderboard_response(public: bool = False):
+    etag, body = leaderboard.body(public)
+    resp = app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True  # klient se má vždy zeptat, ale 304 je levná
+    return resp.make_conditional(request)
+
+
 # -----------------------------
 # Pomocné funkce
 # -----------------------------
@@ -95,11 +297,9 @@ def auth_user(req) -> Dict[str, Any]:
         token = None
     if not token:
         return None
-    conn = get_db()
-    cur = conn.cursor()
+    cur = get_db().cursor()
     cur.execute("SELECT * FROM users WHERE token = ?", (token,))
     row = cur.fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
@@ -125,10 +325,8 @@ def register():
         )
         conn.commit()
     except sqlite3.IntegrityError:
-        conn.close()
         return jsonify({"error": "Uživatel už existuje"}), 400
 
-    conn.close()
     return jsonify({"message": "Registrace úspěšná"}), 200
 
 
@@ -148,13 +346,11 @@ def login():
     )
     row = cur.fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Špatné přihlašovací údaje"}), 401
 
     token = make_token()
     cur.execute("UPDATE users SET token = ? WHERE id = ?", (token, row["id"]))
     conn.commit()
-    conn.close()
     return jsonify({"token": token}), 200
 
 
@@ -170,7 +366,6 @@ def me():
         (user["id"],),
     )
     rows = cur.fetchall()
-    conn.close()
 
     best_lookup = {row["mode"]: int(row["best_score"] or 0) for row in rows}
     best_scores = [
@@ -205,71 +400,140 @@ def scores():
         except Exception:
             score = None
         if not mode or score is None:
-            conn.close()
             return jsonify({"error": "Chybí mód nebo skóre"}), 400
-        cur.execute(
-            "SELECT id, score FROM scores WHERE user_id = ? AND mode = ? ORDER BY score DESC LIMIT 1",
-            (user["id"], mode),
-        )
-        best_row = cur.fetchone()
         now = datetime.utcnow().isoformat()
-        if best_row and score <= best_row["score"]:
-            conn.close()
-            return jsonify({"message": "Skóre se nezapsalo, není vyšší než dosavadní."}), 200
-        if best_row:
-            cur.execute(
-                "UPDATE scores SET score = ?, created_at = ? WHERE id = ?",
-                (score, now, best_row["id"]),
-            )
-        else:
-            cur.execute(
-                "INSERT INTO scores (user_id, mode, score, created_at) VALUES (?, ?, ?, ?)",
-                (user["id"], mode, score, now),
-            )
+        cur.execute(UPSERT_SCORE_SQL + " RETURNING id", (user["id"], mode, score, now))
+        row = cur.fetchone()
         conn.commit()
+        if row is None:
+            return jsonify({"message": "Skóre se nezapsalo, není vyšší než dosavadní."}), 200
+        leaderboard.record(mode, row["id"], user["username"], score, now)
 
-    # GET nebo po POST vrátíme top 10 na mód
-    cur.execute("SELECT DISTINCT mode FROM scores")
-    modes = [r[0] for r in cur.fetchall()]
-    scores_resp: Dict[str, Any] = {}
-    for m in modes:
-        cur.execute(
-            """
-            SELECT u.username, s.score
-            FROM scores s
-            JOIN users u ON u.id = s.user_id
-            WHERE s.mode = ?
-            ORDER BY s.score DESC, s.created_at ASC
-            LIMIT 10
-            """,
-            (m,),
-        )
-        scores_resp[m] = [dict(username=r[0], score=r[1]) for r in cur.fetchall()]
+    # GET nebo po POST vrátíme top 10 na mód (z paměti, bez dotazu do DB)
+    return leaderboard_response()
+
+
+def is_admin(req) -> bool:
+    auth = req.headers.get("Authorization", "")
+    token = auth.split(" ", 1)[1] if auth.lower().startswith("bearer ") else ""
+    return bool(ADMIN_TOKEN) and secrets.compare_digest(token, ADMIN_TOKEN)
+
+
+def iter_bulk_rows(req):
+    """Řádky importu: JSON pole (nebo {"scores": [...]}), případně NDJSON čtené po řádcích."""
+    if req.mimetype in ("application/x-ndjson", "application/jsonl"):
+        # NDJSON se čte ze streamu po blocích, celé tělo nemusí být v paměti
+        # (readline nad streamem je u chunked těla řádově pomalejší)
+        rest = b""
+        while True:
+            chunk = req.stream.read(65536)
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop() if chunk else b""
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+            if not chunk:
+                return
+    data = req.get_json(force=True, silent=True)
+    if isinstance(data, dict):
+        data = data.get("scores")
+    if not isinstance(data, list):
+        raise ValueError("Neplatná data")
+    yield from data
+
+
+def parse_score_row(item, admin: bool):
+    """(mód, skóre, username) z jednoho řádku importu; chyba jako ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError("Řádek není platný objekt JSON")
+    mode = str(item.get("mode") or "").strip()
+    try:
+        score = int(item.get("score"))
+    except (TypeError, ValueError):
+        score = None
+    if not mode or score is None:
+        raise ValueError("Chybí mód nebo skóre")
+    username = str(item.get("username") or "").strip()
+    if admin and not username:
+        raise ValueError("Chybí username")
+    return mode, score, username
+
+
+@app.route("/api/scores/bulk", methods=["POST"])
+def scores_bulk():
+    admin = is_admin(request)
+    user = None if admin else auth_user(request)
+    if not admin and not user:
+        return jsonify({"error": "Nejste přihlášen."}), 401
 
-    conn.close()
-    return jsonify({"scores": scores_resp})
+    # Nejlepší skóre na (hráč, mód) — do DB jde každá dvojice jen jednou
+    best: Dict[Any, int] = {}
+    errors = []
+    received = rejected = 0
 
+    def reject(row, msg):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < 20:
+            errors.append({"row": row, "error": msg})
+
+    try:
+        for item in iter_bulk_rows(request):
+            received += 1
+            if received > BULK_MAX_ROWS:
+                return jsonify({"error": f"Najednou jde poslat nejvýš {BULK_MAX_ROWS} řádků"}), 413
+            try:
+                mode, score, username = parse_score_row(item, admin)
+            except ValueError as e:
+                reject(received, str(e))
+                continue
+            if not admin and username and username != user["username"]:
+                # Bez admin tokenu jde importovat jen vlastní skóre
+                reject(received, "Skóre jiného hráče jde importovat jen s admin tokenem")
+                continue
+            key = (username if admin else user["id"], mode)
+            if key not in best or score > best[key]:
+                best[key] = score
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-@app.route("/api/scores/public", methods=["GET"])
-def public_scores():
     conn = get_db()
     cur = conn.cursor()
-    scores_resp: Dict[str, Any] = {}
-    for mode in MODE_LABELS.keys():
-        cur.execute(
-            """
-            SELECT u.username, s.score
-            FROM scores s
-            JOIN users u ON u.id = s.user_id
-            WHERE s.mode = ?
-            ORDER BY s.score DESC, s.created_at ASC
-            LIMIT 10
-            """,
-            (mode,),
-        )
-        scores_resp[mode] = [dict(username=r[0], score=r[1]) for r in cur.fetchall()]
-    conn.close()
-    return jsonify({"scores": scores_resp})
+    if admin:
+        # Jména na id po dávkách (limit počtu parametrů v SQLite)
+        names = sorted({name for name, _ in best})
+        ids = {}
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            cur.execute(f"SELECT id, username FROM users WHERE username IN ({','.join('?' * len(chunk))})", chunk)
+            ids.update((r["username"], r["id"]) for r in cur.fetchall())
+        resolved = {}
+        for (name, mode), score in best.items():
+            if name in ids:
+                resolved[(ids[name], mode)] = score
+            else:
+                reject(None, f"Neznámý hráč {name}")
+        best = resolved
+
+    # Všechno v jedné transakci — import se buď zapíše celý, nebo vůbec
+    now = datetime.utcnow().isoformat()
+    cur.executemany(UPSERT_SCORE_SQL, ((uid, mode, score, now) for (uid, mode), score in best.items()))
+    applied = max(cur.rowcount, 0)
+    conn.commit()
+    if applied:
+        leaderboard.invalidate()
+
+    return jsonify({"received": received, "applied": applied, "rejected": rejected, "errors": errors})
+
+
+@app.route("/api/scores/public", methods=["GET"])
+def public_scores():
+    return leaderboard_response(public=True)
 
 
 if __name__ == "__main__":
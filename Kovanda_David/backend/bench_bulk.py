@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Propustnost zápisu skóre — POST /api/scores v cyklu vs. POST /api/scores/bulk.
+
+Spustí vlastní server (app.py ve vlákně) nad dočasnou databází s hráči
+a měří řádky za sekundu:
+
+  cyklus   jeden POST /api/scores na výsledek (token daného hráče)
+  JSON     jeden POST /api/scores/bulk s polem výsledků (admin token)
+  NDJSON   totéž jako proud řádků (Transfer-Encoding: chunked)
+
+Použití: python backend/bench_bulk.py --players 500 --rows 20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+MODES = ["classic", "poison", "pillars", "hardcore"]
+ADMIN_TOKEN = "bench-admin"
+
+
+def start_server():
+    os.environ["SNAKE_DB"] = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    os.environ["SNAKE_ADMIN_TOKEN"] = ADMIN_TOKEN
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from werkzeug.serving import make_server
+    import app as backend
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def make_players(url, session, count):
+    tokens = {}
+    for i in range(count):
+        name = f"hrac{i}"
+        session.post(f"{url}/api/register", json={"email": f"{name}@test.cz", "username": name, "password": "heslo"})
+        tokens[name] = session.post(f"{url}/api/login", json={"identifier": name, "password": "heslo"}).json()["token"]
+    return tokens
+
+
+def make_rows(names, count, seed):
+    rng = random.Random(seed)
+    # Rostoucí skóre, ať se zápisy opravdu projeví (ne jen "není vyšší")
+    return [{"username": rng.choice(names), "mode": rng.choice(MODES), "score": i} for i in range(count)]
+
+
+def run_loop(url, session, tokens, rows):
+    start = time.perf_counter()
+    for row in rows:
+        session.post(f"{url}/api/scores", json={"mode": row["mode"], "score": row["score"]},
+                     headers={"Authorization": f"Bearer {tokens[row['username']]}"})
+    return time.perf_counter() - start, None
+
+
+def run_bulk_json(url, session, rows):
+    start = time.perf_counter()
+    resp = session.post(f"{url}/api/scores/bulk", json=rows, headers={"Authorization": f"Bearer {ADMIN_TOKEN}"})
+    return time.perf_counter() - start, resp.json()
+
+
+def run_bulk_ndjson(url, session, rows):
+    def body():
+        for row in rows:
+            yield (json.dumps(row) + "\n").encode()
+
+    start = time.perf_counter()
+    resp = session.post(f"{url}/api/scores/bulk", data=body(),
+                        headers={"Authorization": f"Bearer {ADMIN_TOKEN}", "Content-Type": "application/x-ndjson"})
+    return time.perf_counter() - start, resp.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propustnost zápisu skóre")
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=20000, help="řádků pro hromadný import")
+    parser.add_argument("--loop-rows", type=int, default=2000, help="řádků pro cyklus přes /api/scores")
+    args = parser.parse_args()
+
+    url = start_server()
+    session = requests.Session()
+    tokens = make_players(url, session, args.players)
+    names = sorted(tokens)
+
+    print(f"{args.players} hráčů, časy včetně HTTP\n")
+    print(f"{'':<8} | {'řádků':>7} | {'čas s':>7} | {'řádků/s':>9} | {'zapsáno':>7}")
+    print("-" * 50)
+    seconds, _ = run_loop(url, session, tokens, make_rows(names, args.loop_rows, 1))
+    print(f"{'cyklus':<8} | {args.loop_rows:>7} | {seconds:>7.2f} | {args.loop_rows / seconds:>9.0f} | {'':>7}")
+    # Skóre navazují na předchozí běh, ať každý import opravdu něco zapíše
+    for name, runner, seed in (("JSON", run_bulk_json, 2), ("NDJSON", run_bulk_ndjson, 3)):
+        rows = make_rows(names, args.rows, seed)
+        for row in rows:
+            row["score"] += seed * args.rows
+        seconds, result = runner(url, session, rows)
+        print(f"{name:<8} | {args.rows:>7} | {seconds:>7.2f} | {args.rows / seconds:>9.0f} | {result['applied']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Zátěžový test GET /api/scores — latence p50/p99 při souběžných klientech.
+
+Bez --url si spustí vlastní server (app.py ve vlákně) nad dočasnou
+databází, založí v ní hráče se skóre a měří proti ní; skutečná
+db.sqlite3 zůstane netknutá. S --url měří už běžící server a
+přihlásí se jako --user/--password.
+
+Použití:
+    python backend/loadtest.py --clients 1 8 32 --requests 300
+    python backend/loadtest.py --etag   # klienti posílají If-None-Match
+    python backend/loadtest.py --url http://127.0.0.1:5000 --user jmeno --password heslo
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+MODES = ["classic", "poison", "pillars", "hardcore"]
+
+
+def start_server(players: int):
+    """Pustí app.py nad dočasnou DB ve vlákně. Vrací (url, token jednoho hráče)."""
+    db_dir = tempfile.mkdtemp()
+    os.environ["SNAKE_DB"] = os.path.join(db_dir, "loadtest.sqlite3")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from werkzeug.serving import make_server
+    import app as backend
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # bez řádku v logu za každý požadavek
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    # Hráči a jejich skóre přímo přes API, ať test nezávisí na schématu DB
+    rng = random.Random(0)
+    session = requests.Session()
+    token = ""
+    for i in range(players):
+        name = f"hrac{i}"
+        session.post(f"{url}/api/register", json={"email": f"{name}@test.cz", "username": name, "password": "heslo"})
+        token = session.post(f"{url}/api/login", json={"identifier": name, "password": "heslo"}).json()["token"]
+        for mode in MODES:
+            session.post(f"{url}/api/scores", json={"mode": mode, "score": rng.randint(0, 200)},
+                         headers={"Authorization": f"Bearer {token}"})
+    return url, token
+
+
+def login(url: str, user: str, password: str) -> str:
+    resp = requests.post(f"{url}/api/login", json={"identifier": user, "password": password}, timeout=5)
+    resp.raise_for_status()
+    return resp.json()["token"]
+
+
+def client(url: str, token: str, count: int, latencies: list, errors: list, etag: bool = False):
+    session = requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            resp = session.get(f"{url}/api/scores", headers=headers, timeout=10)
+            ok = resp.status_code in (200, 304)
+            if etag and resp.headers.get("ETag"):
+                headers["If-None-Match"] = resp.headers["ETag"]  # jako klient, který žebříček jen obnovuje
+        except requests.RequestException:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors.append(1)
+
+
+def run(url: str, token: str, clients: int, per_client: int, etag: bool = False):
+    latencies, errors = [], []
+    threads = [threading.Thread(target=client, args=(url, token, per_client, latencies, errors, etag))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / elapsed, statistics.median(latencies), p99, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zátěžový test GET /api/scores")
+    parser.add_argument("--url", help="běžící server (jinak se spustí vlastní nad dočasnou DB)")
+    parser.add_argument("--user", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--players", type=int, default=200, help="počet hráčů v dočasné DB")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="požadavků na jednoho klienta")
+    parser.add_argument("--etag", action="store_true", help="posílat If-None-Match (odpovědi 304)")
+    args = parser.parse_args()
+
+    if args.url:
+        url, token = args.url.rstrip("/"), login(args.url.rstrip("/"), args.user, args.password)
+    else:
+        url, token = start_server(args.players)
+
+    run(url, token, 1, 20)  # zahřátí (spojení, cache SQLite)
+    print(f"GET {url}/api/scores\n")
+    print(f"{'klientů':>8} | {'req/s':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'chyb':>5}")
+    print("-" * 46)
+    for clients in args.clients:
+        rps, p50, p99, errors = run(url, token, clients, args.requests, args.etag)
+        print(f"{clients:>8} | {rps:>8.0f} | {p50:>7.2f} | {p99:>7.2f} | {errors:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Testy backendu nad dočasnou databází (žebříčky s ETagem, hromadný import).
+Spustit: python -m pytest backend/test_app.py -v
+"""
+import json
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+# Modul při importu otevře a založí DB — nikdy ne tu v repozitáři
+os.environ["SNAKE_DB"] = os.path.join(tempfile.mkdtemp(prefix="snake-test-"), "import.sqlite3")
+
+import app as backend  # noqa: E402
+
+ADMIN = "admin-token-pro-testy"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Čistá DB, prázdná cache žebříčků a admin token pro každý test."""
+    monkeypatch.setattr(backend, "pool", backend.ConnectionPool(str(tmp_path / "db.sqlite3")))
+    monkeypatch.setattr(backend, "leaderboard", backend.LeaderboardCache())
+    monkeypatch.setattr(backend, "ADMIN_TOKEN", ADMIN)
+    backend.init_db()
+    return backend.app.test_client()
+
+
+def register(client, username):
+    client.post("/api/register", json={"email": f"{username}@test.cz", "username": username, "password": "heslo"})
+    token = client.post("/api/login", json={"identifier": username, "password": "heslo"}).get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def ranking(resp, mode="classic"):
+    return [(r["username"], r["score"]) for r in resp.get_json()["scores"].get(mode, [])]
+
+
+class TestLeaderboard:
+
+    def test_etag_and_304(self, client):
+        auth = register(client, "alex")
+        client.post("/api/scores", json={"mode": "classic", "score": 5}, headers=auth)
+
+        first = client.get("/api/scores", headers=auth)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and etag
+        again = client.get("/api/scores", headers={**auth, "If-None-Match": etag})
+        assert again.status_code == 304 and again.data == b""
+
+        public = client.get("/api/scores/public")
+        assert client.get("/api/scores/public", headers={"If-None-Match": public.headers["ETag"]}).status_code == 304
+
+    def test_top_n_changes_etag_and_order(self, client, monkeypatch):
+        players = [register(client, f"hrac{i}") for i in range(backend.TOP_N + 2)]
+        for i, auth in enumerate(players):
+            client.post("/api/scores", json={"mode": "classic", "score": 10 + i}, headers=auth)
+        before = client.get("/api/scores/public")
+        assert len(ranking(before)) == backend.TOP_N
+        assert ranking(before)[0] == (f"hrac{backend.TOP_N + 1}", backend.TOP_N + 11)
+
+        # Nižší skóre (i pod top N) nemění žebříček ani ETag
+        client.post("/api/scores", json={"mode": "classic", "score": 1}, headers=players[0])
+        newcomer = register(client, "novy")
+        client.post("/api/scores", json={"mode": "classic", "score": 3}, headers=newcomer)
+        same = client.get("/api/scores/public", headers={"If-None-Match": before.headers["ETag"]})
+        assert same.status_code == 304
+
+        # Skóre na první místo: nový ETag a nové pořadí
+        client.post("/api/scores", json={"mode": "classic", "score": 100}, headers=players[0])
+        after = client.get("/api/scores/public", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert after.headers["ETag"] != before.headers["ETag"]
+        assert ranking(after)[0] == ("hrac0", 100)
+        assert len(ranking(after)) == backend.TOP_N
+
+        # Cache musí odpovídat tomu, co je v DB (nová cache se načte z DB)
+        monkeypatch.setattr(backend, "leaderboard", backend.LeaderboardCache())
+        assert ranking(client.get("/api/scores/public")) == ranking(after)
+
+    def test_public_and_auth_variants(self, client):
+        auth = register(client, "alex")
+        client.post("/api/scores", json={"mode": "classic", "score": 5}, headers=auth)
+        public = client.get("/api/scores/public")
+        private = client.get("/api/scores", headers=auth)
+
+        assert set(public.get_json()["scores"]) == set(backend.MODE_LABELS)
+        assert set(private.get_json()["scores"]) == {"classic"}
+        assert public.headers["ETag"] != private.headers["ETag"]
+        # ETag jedné varianty neplatí pro druhou
+        resp = client.get("/api/scores", headers={**auth, "If-None-Match": public.headers["ETag"]})
+        assert resp.status_code == 200 and resp.get_json() == private.get_json()
+
+
+class TestBulk:
+
+    def test_json_array_and_ndjson(self, client):
+        auth = register(client, "alex")
+        resp = client.post("/api/scores/bulk", headers=auth, json=[
+            {"mode": "classic", "score": 4}, {"mode": "classic", "score": 9}, {"mode": "poison", "score": 2},
+        ])
+        assert resp.get_json() == {"received": 3, "applied": 2, "rejected": 0, "errors": []}
+
+        lines = "\n".join(json.dumps({"mode": "pillars", "score": s}) for s in (3, 7)) + "\n\n"
+        resp = client.post("/api/scores/bulk", headers=auth, data=lines, content_type="application/x-ndjson")
+        assert resp.get_json()["applied"] == 1
+        assert ranking(client.get("/api/scores/public"), "pillars") == [("alex", 7)]
+        assert ranking(client.get("/api/scores/public")) == [("alex", 9)]
+
+    def test_bad_rows_rejected_individually(self, client):
+        auth = register(client, "alex")
+        lines = '{"mode": "classic", "score": 4}\nnení json\n{"mode": "", "score": 1}\n[1]\n{"mode": "poison", "score": "x"}\n{"mode": "poison", "score": 6}\n'
+        data = client.post("/api/scores/bulk", headers=auth, data=lines, content_type="application/x-ndjson").get_json()
+        assert (data["received"], data["applied"], data["rejected"]) == (6, 2, 4)
+        assert [e["row"] for e in data["errors"]] == [2, 3, 4, 5]
+
+        # Tělo, které není pole ani NDJSON, se odmítne celé
+        resp = client.post("/api/scores/bulk", headers=auth, data="{}", content_type="application/json")
+        assert resp.status_code == 400
+
+    def test_lower_score_keeps_higher(self, client):
+        auth = register(client, "alex")
+        client.post("/api/scores", json={"mode": "classic", "score": 50}, headers=auth)
+        etag = client.get("/api/scores/public").headers["ETag"]
+        data = client.post("/api/scores/bulk", headers=auth, json=[{"mode": "classic", "score": 10}]).get_json()
+        assert data["applied"] == 0
+        resp = client.get("/api/scores/public", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert ranking(client.get("/api/scores/public")) == [("alex", 50)]
+
+    def test_too_many_rows(self, client, monkeypatch):
+        auth = register(client, "alex")
+        monkeypatch.setattr(backend, "BULK_MAX_ROWS", 5)
+        resp = client.post("/api/scores/bulk", headers=auth, json=[{"mode": "classic", "score": i} for i in range(6)])
+        assert resp.status_code == 413
+        assert ranking(client.get("/api/scores/public")) == []
+        resp = client.post("/api/scores/bulk", headers=auth, json=[{"mode": "classic", "score": i} for i in range(5)])
+        assert resp.status_code == 200
+
+    def test_other_players_need_admin(self, client):
+        alex = register(client, "alex")
+        register(client, "bara")
+        assert client.post("/api/scores/bulk", json=[{"mode": "classic", "score": 1}]).status_code == 401
+
+        data = client.post("/api/scores/bulk", headers=alex, json=[
+            {"mode": "classic", "score": 99, "username": "bara"},
+            {"mode": "classic", "score": 5, "username": "alex"},
+        ]).get_json()
+        assert (data["applied"], data["rejected"]) == (1, 1)
+        assert ranking(client.get("/api/scores/public")) == [("alex", 5)]
+
+        admin = {"Authorization": f"Bearer {ADMIN}"}
+        data = client.post("/api/scores/bulk", headers=admin, json=[
+            {"mode": "classic", "score": 7, "username": "bara"},
+            {"mode": "classic", "score": 8, "username": "nikdo"},
+            {"mode": "classic", "score": 9},
+        ]).get_json()
+        assert (data["received"], data["applied"], data["rejected"]) == (3, 1, 2)
+        assert {e["error"] for e in data["errors"]} == {"Chybí username", "Neznámý hráč nikdo"}
+        assert ranking(client.get("/api/scores/public")) == [("bara", 7), ("alex", 5)]
+
+    def test_init_db_merges_duplicates(self, tmp_path, monkeypatch):
+        # Starší DB bez unikátního indexu s více řádky na (hráč, mód)
+        path = str(tmp_path / "old.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+                     "mode TEXT NOT NULL, score INTEGER NOT NULL, created_at TEXT NOT NULL)")
+        conn.executemany("INSERT INTO scores (user_id, mode, score, created_at) VALUES (?, ?, ?, ?)", [
+            (1, "classic", 5, "2024-01-01"), (1, "classic", 9, "2024-01-03"), (1, "classic", 9, "2024-01-02"),
+            (1, "poison", 2, "2024-01-01"), (2, "classic", 1, "2024-01-01"), (2, "classic", 3, "2024-01-05"),
+        ])
+        conn.commit()
+        conn.close()
+
+        monkeypatch.setattr(backend, "pool", backend.ConnectionPool(path))
+        backend.init_db()
+        backend.init_db()  # podruhé už nic nemaže
+        conn = sqlite3.connect(path)
+        rows = conn.execute("SELECT user_id, mode, score, created_at FROM scores ORDER BY user_id, mode").fetchall()
+        assert rows == [(1, "classic", 9, "2024-01-02"), (1, "poison", 2, "2024-01-01"), (2, "classic", 3, "2024-01-05")]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO scores (user_id, mode, score, created_at) VALUES (1, 'classic', 1, 'x')")
+        conn.close()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark herní plochy — původní seznamy vs. Board (mřížka + deque + volné bloky).
+
+  krok   posun hlavy, odebrání ocasu a test kolize (okraj, tělo, sloupy)
+  spawn  výběr náhodného volného bloku pro jablko
+
+Had leží na ploše "hadovitě" (řádek tam, řádek zpět) a dál jede po stejné
+cestě, takže do ničeho nenarazí a délka zůstává stejná.
+
+Spustit z kořene projektu: python benchmarks/bench_board.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, PILLAR
+
+BLOCK = 20
+CASES = [(10_000, 200), (10_000, 500), (50_000, 500), (100_000, 1000)]  # (délka hada, strana plochy v blocích)
+STEPS = 2000
+PILLARS = 30
+
+
+def serpentine(side):
+    for row in range(side):
+        cols = range(side) if row % 2 == 0 else range(side - 1, -1, -1)
+        for col in cols:
+            yield [col * BLOCK, row * BLOCK]
+
+
+def layout(length, side):
+    path = list(serpentine(side))
+    body = path[:length][::-1]  # hlava je na začátku seznamu
+    moves = path[length:length + STEPS]
+    rng = random.Random(0)
+    pillars = [list(p) for p in rng.sample(path[length + STEPS:], PILLARS)]
+    return body, moves, pillars
+
+
+# --- Původní verze (kopie logiky ze snake_game.py) ---
+
+def old_available_positions(snake, pillars, side):
+    occupied = {tuple(pos) for pos in snake} | {tuple(p) for p in pillars}
+    positions = []
+    for x in range(0, side * BLOCK, BLOCK):
+        for y in range(0, side * BLOCK, BLOCK):
+            if (x, y) not in occupied:
+                positions.append((x, y))
+    return positions
+
+
+def run_old(length, side):
+    snake, moves, pillars = layout(length, side)
+    start = time.perf_counter()
+    for new_head in moves:
+        snake.insert(0, new_head)
+        snake.pop()
+        if (
+            new_head[0] < 0 or new_head[0] >= side * BLOCK
+            or new_head[1] < 0 or new_head[1] >= side * BLOCK
+            or new_head in snake[1:]
+            or new_head in pillars
+        ):
+            raise AssertionError("kolize v benchmarku")
+    step_us = (time.perf_counter() - start) / len(moves) * 1e6
+
+    spawns = 3
+    start = time.perf_counter()
+    for _ in range(spawns):
+        positions = old_available_positions(snake, pillars, side)
+        random.shuffle(positions)
+    spawn_us = (time.perf_counter() - start) / spawns * 1e6
+    return step_us, spawn_us
+
+
+# --- Board ---
+
+def run_board(length, side):
+    body, moves, pillars = layout(length, side)
+    board = Board(0, 0, side, side, BLOCK)
+    for x, y in reversed(body):
+        board.push_head(x, y)
+    for x, y in pillars:
+        board.place(x, y, PILLAR)
+    start = time.perf_counter()
+    for x, y in moves:
+        board.push_head(x, y)
+        board.pop_tail()
+        if board.collides(x, y):
+            raise AssertionError("kolize v benchmarku")
+    step_us = (time.perf_counter() - start) / len(moves) * 1e6
+
+    spawns = 10_000
+    start = time.perf_counter()
+    for _ in range(spawns):
+        board.random_free()
+    spawn_us = (time.perf_counter() - start) / spawns * 1e6
+    return step_us, spawn_us
+
+
+def main():
+    print(f"{STEPS} kroků, časy v mikrosekundách\n")
+    print(f"{'had':>8} | {'plocha':>10} | {'krok původní':>12} | {'krok Board':>10} | {'spawn původní':>13} | {'spawn Board':>11}")
+    print("-" * 80)
+    for length, side in CASES:
+        old_step, old_spawn = run_old(length, side)
+        new_step, new_spawn = run_board(length, side)
+        print(f"{length:>8} | {f'{side}x{side}':>10} | {old_step:>12.1f} | {new_step:>10.2f} | {old_spawn:>13.0f} | {new_spawn:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark kreslení hry — původní celý snímek vs. GameRenderer (dirty rects).
+
+  původní   každý snímek pozadí, panel (font.render), okraje, sloupy, jablka
+            a celý had včetně pygame.transform.rotate hlavy a ocasu
+  renderer  jen bloky změněné krokem hada (+ panel při změně skóre)
+
+Had leží na ploše "hadovitě" a jede dál po stejné cestě. Měří se kreslení
+i pygame.display.update (celé okno vs. seznam obdélníků) na 1920x1080.
+Bez okna přes SDL_VIDEODRIVER=dummy, čísla jsou tedy hlavně CPU.
+
+Spustit z kořene projektu: python benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+pygame.init()
+WIDTH, HEIGHT = 1920, 1080
+WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+
+from assets import load_assets
+from config import BG_COLOR, BLOCK_SIZE, BORDER_COLOR, TEXT_COLOR
+from engine import SnakeGame
+from renderer import GameRenderer, TextCache
+
+BORDER = 5
+CASES = [
+    ("hra 46x22", pygame.Rect(460, 348, 46 * BLOCK_SIZE, 22 * BLOCK_SIZE), 600, 300),
+    ("celá obrazovka 96x54", pygame.Rect(0, 0, 96 * BLOCK_SIZE, 54 * BLOCK_SIZE), 3000, 1000),
+]  # (název, hrací plocha, délka hada, kroků)
+
+assets = load_assets()
+background = pygame.transform.smoothscale(assets["background"], (WIDTH, HEIGHT))
+font = pygame.font.SysFont("Segoe UI", 36)
+
+
+def serpentine(rect):
+    cols, rows = rect.width // BLOCK_SIZE, rect.height // BLOCK_SIZE
+    for row in range(rows):
+        for col in (range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)):
+            yield rect.left + col * BLOCK_SIZE, rect.top + row * BLOCK_SIZE
+
+
+def make_game(rect, length):
+    game = SnakeGame.from_rect("classic", rect, BLOCK_SIZE, seed=0)
+    board = game.board
+    while len(board.snake) > 0:
+        board.pop_tail()
+    path = list(serpentine(rect))
+    for x, y in path[:length]:
+        board.push_head(x, y)  # hlava je poslední bod cesty
+    # Jablka na cestě by hada prodlužovala — benchmark chce stálou délku
+    for pos in list(game.food):
+        board.clear(*pos)
+    game.food.clear()
+    return game, path[length:]
+
+
+def advance(game, target):
+    head = game.snake[0]
+    game.dx, game.dy = target[0] - head[0], target[1] - head[1]
+    game.step()
+
+
+# --- Původní verze (kopie draw_game ze snake_game.py) ---
+
+def draw_old(game, area):
+    WIN.blit(background, (0, 0))
+    score_rect = pygame.Rect(12, 12, 340, 54)
+    pygame.draw.rect(WIN, BORDER_COLOR, score_rect, border_radius=12)
+    inner_rect = score_rect.inflate(-6, -6)
+    pygame.draw.rect(WIN, BG_COLOR, inner_rect, border_radius=10)
+    divider_x = inner_rect.left + 170
+    pygame.draw.line(WIN, BORDER_COLOR, (divider_x, inner_rect.top + 8), (divider_x, inner_rect.bottom - 8), 3)
+    for text, x in ((f"Skóre: {game.score}", 82), (game.cfg["label"], 255)):
+        label = font.render(text, True, TEXT_COLOR)
+        WIN.blit(label, label.get_rect(center=(inner_rect.left + x, inner_rect.centery)))
+
+    pygame.draw.rect(WIN, BORDER_COLOR, (area.left - BORDER, area.top - BORDER, area.width + BORDER * 2, BORDER))
+    pygame.draw.rect(WIN, BORDER_COLOR, (area.left - BORDER, area.bottom, area.width + BORDER * 2, BORDER))
+    pygame.draw.rect(WIN, BORDER_COLOR, (area.left - BORDER, area.top, BORDER, area.height))
+    pygame.draw.rect(WIN, BORDER_COLOR, (area.right, area.top, BORDER, area.height))
+
+    for p in game.pillars:
+        WIN.blit(assets["pillar"], p)
+    for pos, ftype in game.food.items():
+        WIN.blit(assets["apple"] if ftype == "normal" else assets["poisoned"], pos)
+
+    snake = game.snake
+    for i, segment in enumerate(snake):
+        if i == 0:
+            if game.dx == BLOCK_SIZE:
+                image = pygame.transform.rotate(assets["head"], -90)
+            elif game.dx == -BLOCK_SIZE:
+                image = pygame.transform.rotate(assets["head"], 90)
+            elif game.dy == BLOCK_SIZE:
+                image = pygame.transform.rotate(assets["head"], 180)
+            else:
+                image = assets["head"]
+        elif i == len(snake) - 1:
+            prev = snake[i - 1]
+            if segment[0] < prev[0]:
+                image = pygame.transform.rotate(assets["tail"], 270)
+            elif segment[0] > prev[0]:
+                image = pygame.transform.rotate(assets["tail"], 90)
+            elif segment[1] < prev[1]:
+                image = pygame.transform.rotate(assets["tail"], 180)
+            else:
+                image = assets["tail"]
+        else:
+            image = assets["body"]
+        WIN.blit(image, segment)
+    pygame.display.update()
+
+
+def run_old(area, length, steps):
+    game, path = make_game(area, length)
+    start = time.perf_counter()
+    for target in path[:steps]:
+        advance(game, target)
+        draw_old(game, area)
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def run_renderer(area, length, steps):
+    game, path = make_game(area, length)
+    renderer = GameRenderer(WIN, background, assets, area, BORDER, font, TextCache(),
+                            (BORDER_COLOR, BG_COLOR, TEXT_COLOR))
+    pygame.display.update(renderer.draw(game))  # první snímek je celý
+    start = time.perf_counter()
+    for target in path[:steps]:
+        advance(game, target)
+        pygame.display.update(renderer.draw(game))
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def main():
+    print(f"{WIDTH}x{HEIGHT}, časy v milisekundách na snímek s krokem hada\n")
+    print(f"{'plocha':<22} | {'had':>5} | {'původní':>8} | {'renderer':>8}")
+    print("-" * 54)
+    for name, area, length, steps in CASES:
+        old_ms = run_old(area, length, steps)
+        new_ms = run_renderer(area, length, steps)
+        print(f"{name:<22} | {length:>5} | {old_ms:>8.2f} | {new_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
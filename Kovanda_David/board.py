@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Herní plocha hada: mřížka obsazenosti, tělo v deque a množina volných bloků.
+
+Všechny operace, které hra dělá při jednom kroku (posun hlavy, odebrání ocasu,
+test kolize) a při spawnu jídla (náhodný volný blok), stojí O(1) bez ohledu
+na délku hada a velikost plochy.
+"""
+
+import random
+from array import array
+from collections import deque
+from typing import Optional, Tuple
+
+from config import BLOCK_SIZE
+
+# Co leží na bloku (kromě hada, ten má vlastní počítadlo)
+EMPTY = 0
+PILLAR = 1
+NORMAL = 2
+POISON = 3
+
+
+class Board:
+    def __init__(self, left: int, top: int, cols: int, rows: int, block: int = BLOCK_SIZE):
+        self.left = left
+        self.top = top
+        self.cols = cols
+        self.rows = rows
+        self.block = block
+        size = cols * rows
+        # Kolik článků hada leží na bloku (při růstu může být ocas dvakrát na stejném místě)
+        self.body_count = bytearray(size)
+        self.kind = bytearray(size)
+        self.kind_count = [0, 0, 0, 0]
+        # Volné bloky: seznam + pozice v něm, takže přidání, odebrání i náhodný výběr jsou O(1)
+        self.free = list(range(size))
+        self.slot = array("i", range(size))
+        # Tělo hada, hlava je snake[0]; prvky jsou [x, y] v pixelech jako dřív
+        self.snake = deque()
+
+    @classmethod
+    def from_rect(cls, rect, block: int = BLOCK_SIZE) -> "Board":
+        # Stejné bloky, jaké dřív procházela available_positions()
+        cols = len(range(rect.left, rect.right - block + 1, block))
+        rows = len(range(rect.top, rect.bottom - block + 1, block))
+        return cls(rect.left, rect.top, cols, rows, block)
+
+    # ===============================
+    # Převod souřadnic
+    # ===============================
+    def cell(self, x: int, y: int) -> int:
+        """Index bloku pro pixelovou pozici, -1 mimo plochu."""
+        col = (x - self.left) // self.block
+        row = (y - self.top) // self.block
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def pos(self, cell: int) -> Tuple[int, int]:
+        row, col = divmod(cell, self.cols)
+        return self.left + col * self.block, self.top + row * self.block
+
+    # ===============================
+    # Volné bloky
+    # ===============================
+    def _take(self, cell: int):
+        i = self.slot[cell]
+        if i < 0:
+            return
+        last = self.free.pop()
+        if last != cell:
+            self.free[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+
+    def _release(self, cell: int):
+        if self.slot[cell] >= 0 or self.body_count[cell] or self.kind[cell]:
+            return
+        self.slot[cell] = len(self.free)
+        self.free.append(cell)
+
+    def free_count(self) -> int:
+        return len(self.free)
+
+    def random_free(self, rng=random) -> Optional[Tuple[int, int]]:
+        """Náhodný volný blok (bez hada, sloupu i jídla), None když je plocha plná."""
+        if not self.free:
+            return None
+        return self.pos(self.free[rng.randrange(len(self.free))])
+
+    # ===============================
+    # Předměty (sloupy a jablka)
+    # ===============================
+    def place(self, x: int, y: int, kind: int):
+        cell = self.cell(x, y)
+        if self.kind[cell]:
+            self.kind_count[self.kind[cell]] -= 1
+        self.kind[cell] = kind
+        self.kind_count[kind] += 1
+        self._take(cell)
+
+    def clear(self, x: int, y: int):
+        cell = self.cell(x, y)
+        if cell < 0 or not self.kind[cell]:
+            return
+        self.kind_count[self.kind[cell]] -= 1
+        self.kind[cell] = EMPTY
+        self._release(cell)
+
+    def kind_at(self, x: int, y: int) -> int:
+        cell = self.cell(x, y)
+        return self.kind[cell] if cell >= 0 else EMPTY
+
+    def count(self, kind: int) -> int:
+        return self.kind_count[kind]
+
+    # ===============================
+    # Had
+    # ===============================
+    def push_head(self, x: int, y: int):
+        self.snake.appendleft([x, y])
+        cell = self.cell(x, y)
+        if cell >= 0:
+            self.body_count[cell] += 1
+            self._take(cell)
+
+    def grow_tail(self):
+        # Kopie ocasu — ocas tak jeden krok zůstane na místě a had se prodlouží
+        tail = self.snake[-1][:]
+        self.snake.append(tail)
+        cell = self.cell(*tail)
+        if cell >= 0:
+            self.body_count[cell] += 1
+
+    def pop_tail(self):
+        x, y = self.snake.pop()
+        cell = self.cell(x, y)
+        if cell >= 0:
+            self.body_count[cell] -= 1
+            self._release(cell)
+
+    def collides(self, x: int, y: int) -> bool:
+        """Hlava (už přidaná do těla) je mimo plochu, v těle nebo ve sloupu."""
+        cell = self.cell(x, y)
+        return cell < 0 or self.body_count[cell] > 1 or self.kind[cell] == PILLAR
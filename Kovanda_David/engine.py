@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Pravidla hada bez pygame okna — stav jedné hry a krok simulace.
+
+Hra (snake_game.py) jen kreslí a převádí klávesy na turn(); simulace
+(simulate.py) hraje stejná pravidla bez displeje. Náhoda jde jen přes
+vlastní random.Random(seed), takže stejný seed a stejné tahy dají vždy
+stejnou hru — jde tak přehrát a ověřit i skóre poslané na server.
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+from board import Board, NORMAL, PILLAR, POISON
+from config import mode_config
+
+# Velikost plochy ve hře na 1920x1080 (viz PLAY_AREA ve snake_game.py)
+DEFAULT_COLS = 46
+DEFAULT_ROWS = 22
+
+# Výsledky step()
+MOVE = "move"
+EAT = "eat"
+POISONED = "poison"
+CRASH = "crash"
+
+
+class SnakeGame:
+    def __init__(self, mode: str = "classic", cols: int = DEFAULT_COLS, rows: int = DEFAULT_ROWS,
+                 seed: Optional[int] = None, left: int = 0, top: int = 0, block: int = 1):
+        self.mode = mode
+        self.cfg = mode_config[mode]
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.block = block
+        self.board = Board(left, top, cols, rows, block)
+        self.food = {}  # (x, y) -> "normal"|"poison"
+        self.pillars = []
+        self.score = 0
+        self.steps = 0
+        self.over = None  # None, nebo důvod konce: "wall", "self", "pillar", "poison"
+        self.turns: List[Tuple[int, int, int]] = []  # (krok, dx, dy) — stačí k přehrání hry
+        self.dirty: List[Tuple[int, int]] = []  # bloky změněné od posledního kreslení (renderer.py)
+
+        # Had začíná uprostřed plochy a míří doprava
+        self.board.push_head(left + (cols // 2) * block, top + (rows // 2) * block)
+        self.dx, self.dy = block, 0
+
+        self._spawn_pillars(self.cfg["pillars"])
+        self._spawn_food()
+
+    @classmethod
+    def from_rect(cls, mode: str, rect, block: int, seed: Optional[int] = None) -> "SnakeGame":
+        # Stejné bloky, jaké používá Board.from_rect (pixelové souřadnice pro kreslení)
+        cols = len(range(rect.left, rect.right - block + 1, block))
+        rows = len(range(rect.top, rect.bottom - block + 1, block))
+        return cls(mode, cols, rows, seed, rect.left, rect.top, block)
+
+    @property
+    def snake(self):
+        return self.board.snake
+
+    @property
+    def speed(self) -> int:
+        return self.cfg["speed"]
+
+    # ===============================
+    # Spawn sloupů a jablek
+    # ===============================
+    def _spawn_pillars(self, count: int):
+        for _ in range(count):
+            pos = self.board.random_free(self.rng)
+            if pos is None:
+                break
+            self.board.place(pos[0], pos[1], PILLAR)
+            self.pillars.append([pos[0], pos[1]])
+
+    # Udržuje zásobu normálních a případně jedovatých jablek v oblasti
+    def _spawn_food(self):
+        poison = self.cfg["poison"]
+        # Ve výběru udržuj alespoň jedno normální jablko a podle módu přidej i jedovatá.
+        total_apples = 2 + len(self.snake) // 5 if poison else 1
+        normals = self.board.count(NORMAL)
+        poisons = self.board.count(POISON)
+
+        while len(self.food) < total_apples:
+            pos = self.board.random_free(self.rng)
+            if pos is None:
+                break
+            ftype = "normal"
+            if poison:
+                if normals == 0:
+                    ftype = "normal"
+                elif poisons == 0:
+                    ftype = "poison"
+                else:
+                    ftype = self.rng.choice(["normal", "poison"])
+            if ftype == "normal":
+                normals += 1
+            else:
+                poisons += 1
+            self.board.place(pos[0], pos[1], NORMAL if ftype == "normal" else POISON)
+            self.food[pos] = ftype
+            self.dirty.append(pos)
+
+    # ===============================
+    # Ovládání a krok
+    # ===============================
+    def turn(self, dx: int, dy: int) -> bool:
+        """Změní směr (dx, dy jsou -1/0/1). Jako ve hře: otočit jde jen kolmo k aktuálnímu směru."""
+        if (dx and self.dx == 0) or (dy and self.dy == 0):
+            self.dx, self.dy = dx * self.block, dy * self.block
+            self.turns.append((self.steps, dx, dy))
+            self.dirty.append((self.snake[0][0], self.snake[0][1]))  # hlava se otočí hned
+            return True
+        return False
+
+    def peek(self, dx: int, dy: int) -> str:
+        """Co by udělal krok ve směru (dx, dy) — pro boty, stav hry nemění."""
+        head = self.snake[0]
+        x, y = head[0] + dx * self.block, head[1] + dy * self.block
+        board = self.board
+        cell = board.cell(x, y)
+        if cell < 0 or board.kind[cell] == PILLAR:
+            return CRASH
+        kind = board.kind[cell]
+        if kind == POISON:
+            return POISONED
+        bodies = board.body_count[cell]
+        # Ocas se při kroku bez jídla posune, takže na jeho místo se vlézt dá
+        if kind != NORMAL and board.cell(*self.snake[-1]) == cell:
+            bodies -= 1
+        if bodies > 0:
+            return CRASH
+        return EAT if kind == NORMAL else MOVE
+
+    def step(self) -> str:
+        """Posune hada o jeden blok. Vrací MOVE, EAT, POISONED nebo CRASH."""
+        if self.over:
+            return CRASH if self.over != "poison" else POISONED
+        self.steps += 1
+        board = self.board
+        # Kreslí se po každém kroku, starší změny už jsou na obrazovce (simulace je nepotřebuje vůbec)
+        self.dirty.clear()
+        old_head = self.snake[0]
+        head_x, head_y = old_head[0] + self.dx, old_head[1] + self.dy
+        board.push_head(head_x, head_y)
+        # Z bývalé hlavy je tělo; nová hlava se musí nakreslit
+        dirty = self.dirty
+        dirty.append((head_x, head_y))
+        dirty.append((old_head[0], old_head[1]))
+
+        ftype = self.food.get((head_x, head_y))
+        if ftype == "poison":
+            # jedna se o zelene jablko nebo teda poison, hra končí
+            self.over = "poison"
+            return POISONED
+        if ftype == "normal":
+            # jedna se o cervene jablko nebo teda food
+            self.score += 1
+            del self.food[(head_x, head_y)]
+            board.clear(head_x, head_y)
+            self._spawn_food()
+            board.grow_tail()
+        else:
+            tail = self.snake[-1]
+            dirty.append((tail[0], tail[1]))
+            board.pop_tail()
+        # Ocas se otočí podle nového předposledního článku
+        dirty.append((self.snake[-1][0], self.snake[-1][1]))
+
+        # Okraj, tělo i sloupy se zjistí z mřížky v O(1)
+        if board.collides(head_x, head_y):
+            cell = board.cell(head_x, head_y)
+            if cell < 0:
+                self.over = "wall"
+            elif board.kind[cell] == PILLAR:
+                self.over = "pillar"
+            else:
+                self.over = "self"
+            return CRASH
+        return EAT if ftype == "normal" else MOVE
+
+
+def replay(mode: str, seed: int, turns, max_steps: int, cols: int = DEFAULT_COLS, rows: int = DEFAULT_ROWS) -> SnakeGame:
+    """Přehraje hru ze seedu a seznamu tahů (krok, dx, dy); vrací dohranou hru."""
+    game = SnakeGame(mode, cols, rows, seed)
+    pending = list(turns)
+    i = 0
+    while not game.over and game.steps < max_steps:
+        while i < len(pending) and pending[i][0] <= game.steps:
+            game.turn(pending[i][1], pending[i][2])
+            i += 1
+        game.step()
+    return game
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Kreslení hry po změněných blocích (dirty rects).
+
+Celá obrazovka se kreslí jen na začátku hry (nebo po invalidate()).
+Potom se při každém kroku hada překreslí jen bloky, které engine označil
+v game.dirty (nová hlava, bývalá hlava, ocas, jablka), a panel se skóre,
+když se skóre změní. draw() vrací seznam obdélníků pro
+pygame.display.update(rects) — mezi kroky je prázdný a nic se nekopíruje.
+Otočené hlavy a ocasy se připraví jednou při startu, texty se renderují
+jen při změně.
+"""
+
+import pygame
+
+from board import NORMAL, PILLAR, POISON
+
+
+class TextCache:
+    """Vyrenderované texty podle (font, text, barva); font.render je drahý."""
+
+    def __init__(self, limit: int = 256):
+        self.limit = limit
+        self.surfaces = {}
+
+    def render(self, font, text, color):
+        key = (id(font), text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.limit:
+                self.surfaces.clear()  # menu má textů málo, stačí občas začít znovu
+            surface = self.surfaces[key] = font.render(text, True, color)
+        return surface
+
+
+class GameRenderer:
+    def __init__(self, win, background, images, play_area, border, font, text_cache, colors):
+        self.win = win
+        self.background = background
+        self.block = images["body"].get_width()
+        self.font = font
+        self.text_cache = text_cache
+        self.border_color, self.panel_bg, self.text_color = colors
+        self.pillar = images["pillar"]
+        self.food = {NORMAL: images["apple"], POISON: images["poisoned"]}
+        self.body = images["body"]
+
+        # Otočení hlavy podle směru (dx, dy) a ocasu podle polohy vůči předchozímu článku
+        head, tail = images["head"], images["tail"]
+        self.heads = {
+            (1, 0): pygame.transform.rotate(head, -90),
+            (-1, 0): pygame.transform.rotate(head, 90),
+            (0, -1): head,
+            (0, 1): pygame.transform.rotate(head, 180),
+        }
+        self.tails = {
+            (-1, 0): pygame.transform.rotate(tail, 270),  # ocas vlevo od předchozího článku
+            (1, 0): pygame.transform.rotate(tail, 90),
+            (0, -1): pygame.transform.rotate(tail, 180),
+        }
+        self.tail_default = tail
+
+        self.borders = [
+            pygame.Rect(play_area.left - border, play_area.top - border, play_area.width + border * 2, border),
+            pygame.Rect(play_area.left - border, play_area.bottom, play_area.width + border * 2, border),
+            pygame.Rect(play_area.left - border, play_area.top, border, play_area.height),
+            pygame.Rect(play_area.right, play_area.top, border, play_area.height),
+        ]
+        self.score_rect = pygame.Rect(12, 12, 340, 54)
+        self.full_redraw = True
+        self.shown_score = None
+
+    def invalidate(self):
+        """Příští draw() nakreslí celou obrazovku (nová hra, návrat z jiné obrazovky)."""
+        self.full_redraw = True
+
+    # ===============================
+    # Části obrazovky
+    # ===============================
+    def draw_text(self, text, center, color):
+        label = self.text_cache.render(self.font, text, color)
+        self.win.blit(label, label.get_rect(center=center))
+
+    def draw_panel(self, game):
+        # Výraznější panel se skóre a názvem módu
+        win = self.win
+        win.blit(self.background, self.score_rect, self.score_rect)
+        pygame.draw.rect(win, self.border_color, self.score_rect, border_radius=12)
+        inner_rect = self.score_rect.inflate(-6, -6)
+        pygame.draw.rect(win, self.panel_bg, inner_rect, border_radius=10)
+        divider_x = inner_rect.left + 170
+        pygame.draw.line(win, self.border_color, (divider_x, inner_rect.top + 8), (divider_x, inner_rect.bottom - 8), 3)
+        self.draw_text(f"Skóre: {game.score}", (inner_rect.left + 82, inner_rect.centery), self.text_color)
+        self.draw_text(game.cfg["label"], (inner_rect.left + 255, inner_rect.centery), self.text_color)
+        self.shown_score = game.score
+
+    def head_image(self, game):
+        return self.heads.get((game.dx // game.block, game.dy // game.block), self.heads[(0, -1)])
+
+    def tail_image(self, segment, prev):
+        dx = (segment[0] > prev[0]) - (segment[0] < prev[0])
+        dy = (segment[1] > prev[1]) - (segment[1] < prev[1])
+        if dx:
+            return self.tails[(dx, 0)]
+        if dy < 0:
+            return self.tails[(0, -1)]
+        return self.tail_default
+
+    def draw_cell(self, game, pos):
+        """Překreslí jeden blok podle aktuálního stavu hry. Vrací jeho obdélník."""
+        win = self.win
+        rect = pygame.Rect(pos[0], pos[1], self.block, self.block)
+        win.blit(self.background, rect, rect)
+        # Krajní bloky zasahují do okraje — jeho kousek je potřeba vrátit
+        for border in self.borders:
+            if border.colliderect(rect):
+                pygame.draw.rect(win, self.border_color, border.clip(rect))
+
+        board = game.board
+        cell = board.cell(pos[0], pos[1])
+        if cell < 0:
+            return rect
+        kind = board.kind[cell]
+        if kind == PILLAR:
+            win.blit(self.pillar, rect)
+        elif kind:
+            win.blit(self.food[kind], rect)
+        count = board.body_count[cell]
+        if count:
+            # Stejné pořadí jako draw_full: hlava, tělo, ocas (po snědení jablka
+            # leží ocas dvakrát na stejném bloku a přes průhledný ocas je vidět tělo)
+            snake = game.snake
+            head, tail = snake[0], snake[-1]
+            head_here = pos[0] == head[0] and pos[1] == head[1]
+            tail_here = len(snake) > 1 and pos[0] == tail[0] and pos[1] == tail[1]
+            if head_here:
+                win.blit(self.head_image(game), rect)
+            if count - head_here - tail_here > 0:
+                win.blit(self.body, rect)
+            if tail_here:
+                win.blit(self.tail_image(tail, snake[-2]), rect)
+        return rect
+
+    # ===============================
+    # Snímek
+    # ===============================
+    def draw_full(self, game):
+        win = self.win
+        win.blit(self.background, (0, 0))
+        self.draw_panel(game)
+        for border in self.borders:
+            pygame.draw.rect(win, self.border_color, border)
+        for p in game.pillars:
+            win.blit(self.pillar, p)
+        for pos, ftype in game.food.items():
+            win.blit(self.food[NORMAL if ftype == "normal" else POISON], pos)
+
+        # Hlava, tělo, ocas — pozdější článek překryje dřívější na stejném bloku
+        snake = game.snake
+        win.blit(self.head_image(game), snake[0])
+        if len(snake) > 1:
+            blit = win.blit
+            body = self.body
+            for i in range(1, len(snake) - 1):
+                blit(body, snake[i])
+            win.blit(self.tail_image(snake[-1], snake[-2]), snake[-1])
+        game.dirty.clear()
+        self.full_redraw = False
+        return [win.get_rect()]
+
+    def draw(self, game):
+        """Nakreslí změny od minulého volání. Vrací obdélníky pro display.update()."""
+        if self.full_redraw:
+            return self.draw_full(game)
+        rects = []
+        if game.score != self.shown_score:
+            self.draw_panel(game)
+            rects.append(self.score_rect)
+        for pos in set(game.dirty):
+            rects.append(self.draw_cell(game, pos))
+        game.dirty.clear()
+        return rects
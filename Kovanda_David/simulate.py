@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Hromadná simulace hada bez okna — ladění obtížnosti módů a ověřování skóre.
+
+Každá hra je určená módem a seedem (engine.SnakeGame), hraje ji bot.
+Hry se dělí do dávek po seedech a běží paralelně v multiprocessing.Pool;
+procesy vracejí jen malé souhrny, ne celé hry.
+
+Použití:
+    python simulate.py --games 100000 --bot greedy
+    python simulate.py --mode hardcore --games 1000000 --jobs 8 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # config.py importuje pygame, hlášku nechceme v každém procesu
+
+from config import mode_config
+from engine import CRASH, DEFAULT_COLS, DEFAULT_ROWS, POISONED, SnakeGame
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BATCH = 500  # her na jednu úlohu poslanou do procesu
+
+
+# ===============================
+# Boti
+# ===============================
+def _options(game):
+    # Kolmé směry + rovně (otočka o 180° by byla okamžitá smrt)
+    back = (-game.dx // game.block, -game.dy // game.block)
+    return [d for d in DIRECTIONS if d != back]
+
+
+def random_bot(game, rng):
+    """Jede náhodně, jen se vyhýbá okamžité smrti."""
+    safe = [d for d in _options(game) if game.peek(*d) not in (CRASH, POISONED)]
+    return rng.choice(safe) if safe else None
+
+
+def greedy_bot(game, rng):
+    """Míří k nejbližšímu červenému jablku, vyhýbá se okamžité smrti."""
+    head = game.snake[0]
+    targets = [pos for pos, ftype in game.food.items() if ftype == "normal"]
+    best, best_dist = None, None
+    for d in _options(game):
+        if game.peek(*d) in (CRASH, POISONED):
+            continue
+        x, y = head[0] + d[0] * game.block, head[1] + d[1] * game.block
+        dist = min((abs(x - tx) + abs(y - ty) for tx, ty in targets), default=0)
+        if best is None or dist < best_dist or (dist == best_dist and rng.random() < 0.5):
+            best, best_dist = d, dist
+    return best
+
+
+BOTS = {"random": random_bot, "greedy": greedy_bot}
+
+
+# ===============================
+# Hraní
+# ===============================
+def play(mode, seed, bot="greedy", max_steps=5000, cols=DEFAULT_COLS, rows=DEFAULT_ROWS):
+    """Odehraje jednu hru; bot dostává vlastní rng odvozený ze seedu (hra je tak opakovatelná)."""
+    game = SnakeGame(mode, cols, rows, seed)
+    choose = BOTS[bot]
+    rng = random.Random(seed ^ 0x5EED)
+    while not game.over and game.steps < max_steps:
+        move = choose(game, rng)
+        if move is not None:
+            game.turn(*move)
+        game.step()
+    return game
+
+
+def play_batch(args):
+    mode, seeds, bot, max_steps, cols, rows = args
+    scores, steps, reasons = Counter(), 0, Counter()
+    for seed in seeds:
+        game = play(mode, seed, bot, max_steps, cols, rows)
+        scores[game.score] += 1
+        steps += game.steps
+        reasons[game.over or "limit"] += 1
+    return mode, len(seeds), scores, steps, reasons
+
+
+def percentile(hist, q):
+    """Percentil z histogramu {hodnota: počet}."""
+    total = sum(hist.values())
+    if not total:
+        return 0
+    limit = q * (total - 1)
+    seen = 0
+    for value in sorted(hist):
+        seen += hist[value]
+        if seen > limit:
+            return value
+    return max(hist)
+
+
+def run(modes, games, bot="greedy", jobs=None, seed=0, max_steps=5000, cols=DEFAULT_COLS, rows=DEFAULT_ROWS):
+    """Pustí games her pro každý mód. Vrací {mód: souhrn}."""
+    tasks = []
+    for mode in modes:
+        for start in range(seed, seed + games, BATCH):
+            seeds = range(start, min(start + BATCH, seed + games))
+            tasks.append((mode, seeds, bot, max_steps, cols, rows))
+
+    totals = {mode: {"games": 0, "scores": Counter(), "steps": 0, "reasons": Counter()} for mode in modes}
+    if jobs == 1:
+        results = map(play_batch, tasks)
+        pool = None
+    else:
+        pool = Pool(jobs)
+        results = pool.imap_unordered(play_batch, tasks)
+    try:
+        for mode, count, scores, steps, reasons in results:
+            t = totals[mode]
+            t["games"] += count
+            t["scores"].update(scores)
+            t["steps"] += steps
+            t["reasons"].update(reasons)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    summary = {}
+    for mode, t in totals.items():
+        hist = t["scores"]
+        summary[mode] = {
+            "games": t["games"],
+            "mean_score": sum(s * n for s, n in hist.items()) / max(1, t["games"]),
+            "p50_score": percentile(hist, 0.5),
+            "p99_score": percentile(hist, 0.99),
+            "max_score": max(hist, default=0),
+            "mean_steps": t["steps"] / max(1, t["games"]),
+            "end_reasons": dict(t["reasons"]),
+        }
+    return summary
+
+
+def print_report(summary, elapsed):
+    games = sum(s["games"] for s in summary.values())
+    print(f"{games} her za {elapsed:.1f} s ({games / max(elapsed, 1e-9):.0f} her/s)\n")
+    print(f"{'mód':<10} | {'her':>8} | {'průměr':>7} | {'medián':>6} | {'p99':>5} | {'max':>5} | {'kroků':>7} | konec")
+    print("-" * 90)
+    for mode, s in summary.items():
+        reasons = ", ".join(f"{k} {v / s['games']:.0%}" for k, v in sorted(s["end_reasons"].items()))
+        print(f"{mode_config[mode]['label']:<10} | {s['games']:>8} | {s['mean_score']:>7.2f} | {s['p50_score']:>6} | "
+              f"{s['p99_score']:>5} | {s['max_score']:>5} | {s['mean_steps']:>7.0f} | {reasons}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hromadná simulace hada bez okna")
+    parser.add_argument("--mode", choices=list(mode_config) + ["all"], default="all")
+    parser.add_argument("--games", type=int, default=10000, help="počet her pro každý mód")
+    parser.add_argument("--bot", choices=list(BOTS), default="greedy")
+    parser.add_argument("--jobs", type=int, default=None, help="počet procesů (výchozí: počet jader)")
+    parser.add_argument("--seed", type=int, default=0, help="seed první hry, další hry mají seed +1")
+    parser.add_argument("--max-steps", type=int, default=5000)
+    parser.add_argument("--cols", type=int, default=DEFAULT_COLS)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--json", action="store_true", help="výstup jako JSON")
+    args = parser.parse_args(argv)
+
+    modes = list(mode_config) if args.mode == "all" else [args.mode]
+    start = time.perf_counter()
+    summary = run(modes, args.games, args.bot, args.jobs, args.seed, args.max_steps, args.cols, args.rows)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        json.dump({"elapsed_s": elapsed, "modes": summary}, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(summary, elapsed)
+
+
+if __name__ == "__main__":
+    main()
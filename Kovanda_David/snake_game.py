@@ -1,10 +1,11 @@
-import random
 import sys
 import traceback
 import pygame
 
-from api_client import api_get, api_post
+from api_client import ApiWorker
 from assets import load_assets
+from engine import CRASH, POISONED, SnakeGame
+from renderer import GameRenderer, TextCache
 from config import (
     ACTIVE_BORDER,
     BG_COLOR,
@@ -31,6 +32,10 @@ pygame.init()
 WIN, WIDTH, HEIGHT = init_display_fullscreen()
 CLOCK = pygame.time.Clock()
 
+# Síťové požadavky na pozadí, výsledky přicházejí jako události API_RESULT
+API_RESULT = pygame.event.custom_type()
+api = ApiWorker(API_RESULT)
+
 FONT = pygame.font.SysFont("Segoe UI", 36)
 SMALL_FONT = pygame.font.SysFont("Segoe UI", 26)
 selected_mode = "classic"
@@ -54,8 +59,10 @@ show_password_reg = False
 show_password_reg2 = False
 login_msg = ""
 login_msg_color = TEXT_COLOR
+login_pending = False
 register_msg = ""
 register_msg_color = TEXT_COLOR
+register_pending = False
 auth_token = ""
 account_data = None
 account_msg = ""
@@ -85,13 +92,8 @@ mode_back_rect = pygame.Rect(0, 0, 0, 0)
 # ===============================
 # Herní stav
 # ===============================
-snake = []
-dx, dy = 0, 0
-food = []  # {pos: [x, y], type: "normal"|"poison"}
-pillars = []
-score = 0
+game = None  # SnakeGame — pravidla a stav aktuální hry (engine.py)
 snake_timer = 0
-snake_speed = mode_config[current_mode]["speed"]
 LEFT_PADDING = 220
 RIGHT_PADDING = 220
 TOP_OFFSET = 120
@@ -119,19 +121,18 @@ PLAY_AREA_COLLISION = PLAY_AREA.inflate(COLLISION_MARGIN * 2, COLLISION_MARGIN *
 # Načtení obrázků
 # ===============================
 assets = load_assets()
-snake_head_img = assets["head"]
-snake_body_img = assets["body"]
-snake_tail_img = assets["tail"]
-apple_img = assets["apple"]
-poisoned_apple_img = assets["poisoned"]
-pillar_img = assets["pillar"]
 background_img = pygame.transform.smoothscale(assets["background"], (WIDTH, HEIGHT))
 
+# Texty se renderují jen jednou, hra se kreslí po změněných blocích (renderer.py)
+TEXT_CACHE = TextCache()
+renderer = GameRenderer(WIN, background_img, assets, PLAY_AREA, BORDER_THICKNESS, FONT, TEXT_CACHE,
+                        (BORDER_COLOR, BG_COLOR, TEXT_COLOR))
+
 # ===============================
 # Pomocné funkce
 # ===============================
 def draw_text(surface, text, pos, font, color=TEXT_COLOR):
-    label = font.render(text, True, color)
+    label = TEXT_CACHE.render(font, text, color)
     rect = label.get_rect(center=pos)
     surface.blit(label, rect)
 
@@ -166,6 +167,8 @@ def change_screen(state: str):
     screen_state = state
     active_input = None
     paused = False
+    if state == "game":
+        renderer.invalidate()
     if state in {"menu", "login", "register"}:
         login_msg = ""
         register_msg = ""
@@ -192,85 +195,15 @@ def reset_inputs():
 
 # Inicializuje nový průběh a had se začne pohybovat doprava ze středu
 def start_game():
-    global snake, dx, dy, food, pillars, score, snake_timer, current_mode, snake_speed
+    global game, snake_timer, current_mode
     current_mode = selected_mode
-    cfg = mode_config[current_mode]
-    snake_speed = cfg["speed"]
     fetch_leaderboard()
 
-    # Had začíná uprostřed zorného pole a míří doprava
-    center_x = PLAY_AREA_COLLISION.left + ((PLAY_AREA_COLLISION.width // 2) // BLOCK_SIZE) * BLOCK_SIZE
-    center_y = PLAY_AREA_COLLISION.top + ((PLAY_AREA_COLLISION.height // 2) // BLOCK_SIZE) * BLOCK_SIZE
-    snake = [[center_x, center_y]]
-    dx, dy = BLOCK_SIZE, 0
-
-    score = 0
+    # Pravidla běží v engine.py; pixelové souřadnice bloků odpovídají hrací ploše
+    game = SnakeGame.from_rect(current_mode, PLAY_AREA_COLLISION, BLOCK_SIZE)
     snake_timer = 0
-    food = []
-    pillars = []
-
-    spawn_pillars(cfg["pillars"])
-    spawn_food()
     change_screen("game")
 
-# Vrací všechny volné bloky v bezpečné oblasti pro spawn jídla a sloupů
-def available_positions():
-    occupied = {tuple(pos) for pos in snake} | {tuple(p) for p in pillars}
-    positions = []
-    for x in range(PLAY_AREA_COLLISION.left, PLAY_AREA_COLLISION.right - BLOCK_SIZE + 1, BLOCK_SIZE):
-        for y in range(PLAY_AREA_COLLISION.top, PLAY_AREA_COLLISION.bottom - BLOCK_SIZE + 1, BLOCK_SIZE):
-            if (x, y) not in occupied:
-                positions.append((x, y))
-    return positions
-
-# Naplní herní pole pilíři, které jsou umístěné na volných blocích
-def spawn_pillars(count: int):
-    global pillars
-    pillars = []
-    positions = available_positions()
-    random.shuffle(positions)
-    for pos in positions[:count]:
-        pillars.append([pos[0], pos[1]])
-
-# Udržuje zásobu normálních a případně jedovatých jablek v oblasti
-def spawn_food():
-    global food
-    cfg = mode_config[current_mode]
-    positions = available_positions()
-    random.shuffle(positions)
-
-    # Ve výběru udržuj alespoň jedno normální jablko a podle módu přidej i jedovatá.
-    total_apples = 1
-    ensure_poison = False
-    if cfg["poison"]:
-        total_apples = 2 + max(0, len(snake) // 5)
-        ensure_poison = True
-
-    food = [f for f in food if tuple(f["pos"]) in positions]
-    normals = sum(1 for f in food if f["type"] == "normal")
-    poisons = sum(1 for f in food if f["type"] == "poison")
-
-    for pos in positions:
-        if len(food) >= total_apples:
-            break
-        ftype = "normal"
-        if cfg["poison"]:
-            if normals == 0:
-                ftype = "normal"
-                normals += 1
-            elif poisons == 0 and ensure_poison:
-                ftype = "poison"
-                poisons += 1
-            else:
-                ftype = random.choice(["normal", "poison"])
-                if ftype == "normal":
-                    normals += 1
-                else:
-                    poisons += 1
-        else:
-            normals += 1
-        food.append({"pos": [pos[0], pos[1]], "type": ftype})
-
 
 # ===============================
 # Kreslení obrazovek
@@ -351,7 +284,7 @@ def draw_menu():
                 line = f"{i+1:>2}. {username[:14]:14}  {sc}"
             else:
                 line = f"{i+1:>2}. ---"
-            line_surf = SMALL_FONT.render(line, True, TEXT_COLOR)
+            line_surf = TEXT_CACHE.render(SMALL_FONT, line, TEXT_COLOR)
             WIN.blit(line_surf, (panel_x + 14, list_start_y + i * row_h))
     button(WIN, "Registrace", register_rect, lambda: change_screen("register"))
     button(WIN, "Konec", end_rect, lambda: sys.exit())
@@ -572,154 +505,67 @@ def draw_mode_select():
 
 
 def draw_game(delta_time):
-    global snake, dx, dy, food, score, snake_timer
-    WIN.blit(background_img, (0, 0))
-
-    # Výraznější panel se skóre a názvem módu
-    score_rect = pygame.Rect(12, 12, 340, 54)
-    pygame.draw.rect(WIN, BORDER_COLOR, score_rect, border_radius=12)
-    inner_rect = score_rect.inflate(-6, -6)
-    pygame.draw.rect(WIN, BG_COLOR, inner_rect, border_radius=10)
-    divider_x = inner_rect.left + 170
-    pygame.draw.line(WIN, BORDER_COLOR, (divider_x, inner_rect.top + 8), (divider_x, inner_rect.bottom - 8), 3)
-    draw_text(WIN, f"Skóre: {score}", (inner_rect.left + 82, inner_rect.centery), FONT, TEXT_COLOR)
-    draw_text(WIN, mode_config[current_mode]["label"], (inner_rect.left + 255, inner_rect.centery), FONT, TEXT_COLOR)
-
-    border = BORDER_THICKNESS
-    pygame.draw.rect(WIN, BORDER_COLOR, (PLAY_AREA.left - border, PLAY_AREA.top - border, PLAY_AREA.width + border * 2, border))
-    pygame.draw.rect(WIN, BORDER_COLOR, (PLAY_AREA.left - border, PLAY_AREA.bottom, PLAY_AREA.width + border * 2, border))
-    pygame.draw.rect(WIN, BORDER_COLOR, (PLAY_AREA.left - border, PLAY_AREA.top, border, PLAY_AREA.height))
-    pygame.draw.rect(WIN, BORDER_COLOR, (PLAY_AREA.right, PLAY_AREA.top, border, PLAY_AREA.height))
-
+    """Krok hada a překreslení změněných bloků. Vrací obdélníky pro display.update()."""
+    global snake_timer
     if not paused:
         snake_timer += delta_time
-        if snake_timer >= snake_speed:
+        if snake_timer >= game.speed:
             snake_timer = 0
-            new_head = [snake[0][0] + dx, snake[0][1] + dy]
-            snake.insert(0, new_head)
-
-            ate_normal = False
-            ate_poison = False
-            for f in list(food):
-                if new_head == f["pos"]:
-                    # jedna se o cervene jablko nebo teda food
-                    if f["type"] == "normal":
-                        score += 1
-                        ate_normal = True
-                        food.remove(f)
-                        spawn_food()
-                        snake.append(snake[-1][:])
-                    else:
-                        ate_poison = True
-                        break
-                      # jedna se o zelene jablko nebo teda poison, hra končí
-            if ate_poison:
+            result = game.step()
+            if result == POISONED:
+                # jedna se o zelene jablko nebo teda poison, hra končí
                 submit_score_current()
-                draw_text(WIN, f"Sebral jsi zelené jablko! Skóre: {score}", (WIDTH // 2, HEIGHT // 2), FONT)
+                renderer.draw(game)
+                draw_text(WIN, f"Sebral jsi zelené jablko! Skóre: {game.score}", (WIDTH // 2, HEIGHT // 2), FONT)
                 pygame.display.update()
                 pygame.time.delay(2000)
                 change_screen("menu")
-                return
-
-            if not ate_normal:
-                if snake:
-                    snake.pop()
-
-            if (
-                new_head[0] < PLAY_AREA_COLLISION.left
-                or new_head[0] >= PLAY_AREA_COLLISION.right - BLOCK_SIZE
-                or new_head[1] < PLAY_AREA_COLLISION.top
-                or new_head[1] >= PLAY_AREA_COLLISION.bottom - BLOCK_SIZE
-                or new_head in snake[1:]
-                or new_head in pillars
-            ):
+                return None
+            if result == CRASH:
                 submit_score_current()
-                draw_text(WIN, f"Hra skončila! Skóre: {score}", (WIDTH // 2, HEIGHT // 2), FONT, ERROR_COLOR)
+                renderer.draw(game)
+                draw_text(WIN, f"Hra skončila! Skóre: {game.score}", (WIDTH // 2, HEIGHT // 2), FONT, ERROR_COLOR)
                 pygame.display.update()
                 pygame.time.delay(2000)
                 change_screen("menu")
-                return
+                return None
 
-
-    for p in pillars:
-        WIN.blit(pillar_img, p)
-
-    for f in food:
-        if f["type"] == "normal":
-            WIN.blit(apple_img, f["pos"])
-        else:
-            WIN.blit(poisoned_apple_img, f["pos"])
-
-    for i, segment in enumerate(snake):
-        if i == 0:
-            if dx == BLOCK_SIZE:
-                head_rotated = pygame.transform.rotate(snake_head_img, -90)
-            elif dx == -BLOCK_SIZE:
-                head_rotated = pygame.transform.rotate(snake_head_img, 90)
-            elif dy == -BLOCK_SIZE:
-                head_rotated = snake_head_img
-            elif dy == BLOCK_SIZE:
-                head_rotated = pygame.transform.rotate(snake_head_img, 180)
-            else:
-                head_rotated = snake_head_img
-            WIN.blit(head_rotated, segment)
-        elif i == len(snake) - 1:
-            prev = snake[i - 1]
-            if segment[0] < prev[0]:
-                tail_rotated = pygame.transform.rotate(snake_tail_img, 270)
-            elif segment[0] > prev[0]:
-                tail_rotated = pygame.transform.rotate(snake_tail_img, 90)
-            elif segment[1] < prev[1]:
-                tail_rotated = pygame.transform.rotate(snake_tail_img, 180)
-            else:
-                tail_rotated = snake_tail_img
-            WIN.blit(tail_rotated, segment)
-        else:
-            WIN.blit(snake_body_img, segment)
+    return renderer.draw(game)
 
 
 # ===============================
-# Login/Register akce (stub)
+# Login/Register akce
 # ===============================
+# Síť běží ve vláknech ApiWorkeru, výsledky chodí jako události API_RESULT
+# a zpracuje je handle_api_result() v hlavní smyčce.
 def login_user():
-    global login_msg, login_msg_color, auth_token, leaderboard_fetched, leaderboard_msg
+    global login_msg, login_msg_color, login_pending
     if not username or not password:
         login_msg = "Vyplň všechna pole"
         login_msg_color = ERROR_COLOR
         return
-
-    ok, data = api_post("/login", {"identifier": username, "password": password})
-    if not ok:
-        login_msg = data
-        login_msg_color = ERROR_COLOR
+    if login_pending:
         return
 
-    auth_token = data.get("token", "")
-    login_msg = "Přihlášení úspěšné"
-    login_msg_color = SUCCESS_COLOR
-    leaderboard_fetched = False  # po přihlášení načti čerstvý žebříček
-    leaderboard_msg = "Načítám žebříčky..."
-    change_screen("menu")
-    reset_inputs()
-    fetch_account()
-    fetch_leaderboard()
+    login_pending = True
+    login_msg = "Přihlašuji..."
+    login_msg_color = TEXT_COLOR
+    api.post("login", "/login", {"identifier": username, "password": password})
 
 
 def register_user():
-    global register_msg, register_msg_color
+    global register_msg, register_msg_color, register_pending
     if not reg_email or not reg_username or not reg_password or not reg_password2:
         register_msg = "Vyplň všechna pole"
         register_msg_color = ERROR_COLOR
         return
-
-    ok, data = api_post("/register", {"email": reg_email, "username": reg_username, "password": reg_password})
-    if not ok:
-        register_msg = data
-        register_msg_color = ERROR_COLOR
+    if register_pending:
         return
 
-    register_msg = "Registrace úspěšná"
-    register_msg_color = SUCCESS_COLOR
+    register_pending = True
+    register_msg = "Registruji..."
+    register_msg_color = TEXT_COLOR
+    api.post("register", "/register", {"email": reg_email, "username": reg_username, "password": reg_password})
 
 
 def fetch_account():
@@ -730,16 +576,10 @@ def fetch_account():
         account_msg_color = ERROR_COLOR
         return
 
-    ok, data = api_get("/me", auth_token)
-    if not ok:
-        account_data = None
-        account_msg = data
-        account_msg_color = ERROR_COLOR
-        return
-
-    account_msg = ""
-    account_msg_color = TEXT_COLOR
-    account_data = data
+    if account_data is None:
+        account_msg = "Načítám účet..."
+        account_msg_color = TEXT_COLOR
+    api.get("account", "/me", auth_token)
 
 
 def submit_score_current():
@@ -747,38 +587,100 @@ def submit_score_current():
     if not auth_token:
         leaderboard_msg = "Přihlaš se pro ukládání skóre."
         return
-    ok, err = api_post("/scores", {"mode": current_mode, "score": score}, auth_token)
-    if ok:
-        fetch_leaderboard()
-    else:
-        leaderboard_msg = f"Uložení skóre selhalo: {err}"
-        print("Submit score failed:", err)
+    # Žebříček přijde s odpovědí (v handle_api_result), konec hry na síť nečeká
+    api.post("score", "/scores", {"mode": current_mode, "score": game.score}, auth_token)
 
 
 def logout_user():
-    global auth_token, account_data, account_msg, leaderboard_data, leaderboard_msg, leaderboard_fetched
+    global auth_token, account_data, account_msg, leaderboard_data, leaderboard_msg, leaderboard_fetched, leaderboard_loading
     auth_token = ""
     account_data = None
     account_msg = "Odhlášen."
     leaderboard_data = {}
     leaderboard_msg = "Přihlaš se pro zobrazení žebříčku."
     leaderboard_fetched = False
+    leaderboard_loading = False
     change_screen("menu")
 
 
 def fetch_leaderboard():
-    global leaderboard_data, leaderboard_msg, leaderboard_loading, leaderboard_fetched
+    global leaderboard_msg, leaderboard_loading
     leaderboard_loading = True
-    leaderboard_msg = "Načítám žebříčky..."
-    ok, data = api_get("/scores", auth_token)
-    if not ok:
-        leaderboard_data = {}
-        leaderboard_msg = data
-    else:
-        leaderboard_data = data.get("scores", {})
-        leaderboard_msg = "" if leaderboard_data else "Žádná data."
-    leaderboard_loading = False
-    leaderboard_fetched = True
+    if not leaderboard_data:
+        leaderboard_msg = "Načítám žebříčky..."
+    # Když už jedno načítání běží, ApiWorker nepošle další souběžně
+    api.get("leaderboard", "/scores", auth_token)
+
+
+def handle_api_result(event):
+    global login_msg, login_msg_color, auth_token, leaderboard_fetched, leaderboard_msg, leaderboard_data, leaderboard_loading
+    global register_msg, register_msg_color, account_data, account_msg, account_msg_color
+    global login_pending, register_pending
+    ok, data = event.ok, event.data
+
+    if event.kind == "login":
+        login_pending = False
+        if not ok:
+            login_msg = data
+            login_msg_color = ERROR_COLOR
+            return
+        auth_token = data.get("token", "")
+        login_msg = "Přihlášení úspěšné"
+        login_msg_color = SUCCESS_COLOR
+        leaderboard_fetched = False  # po přihlášení načti čerstvý žebříček
+        leaderboard_msg = "Načítám žebříčky..."
+        if screen_state == "login":
+            change_screen("menu")
+        reset_inputs()
+        fetch_account()
+        fetch_leaderboard()
+        return
+
+    if event.kind == "register":
+        register_pending = False
+        if not ok:
+            register_msg = data
+            register_msg_color = ERROR_COLOR
+        else:
+            register_msg = "Registrace úspěšná"
+            register_msg_color = SUCCESS_COLOR
+        return
+
+    # Odpověď na požadavek s tokenem, který mezitím přestal platit (odhlášení)
+    if event.token != auth_token:
+        return
+
+    if event.kind == "account":
+        if not ok:
+            account_data = None
+            account_msg = data
+            account_msg_color = ERROR_COLOR
+        else:
+            account_msg = ""
+            account_msg_color = TEXT_COLOR
+            account_data = data
+
+    elif event.kind == "score":
+        if ok and "scores" in data:
+            # Backend vrací rovnou aktuální žebříček, další GET není potřeba
+            leaderboard_data = data["scores"]
+            leaderboard_msg = "" if leaderboard_data else "Žádná data."
+            leaderboard_fetched = True
+        elif ok:
+            fetch_leaderboard()
+        else:
+            leaderboard_msg = f"Uložení skóre selhalo: {data}"
+            print("Submit score failed:", data)
+
+    elif event.kind == "leaderboard":
+        if not ok:
+            leaderboard_data = {}
+            leaderboard_msg = data
+        else:
+            leaderboard_data = data.get("scores", {})
+            leaderboard_msg = "" if leaderboard_data else "Žádná data."
+        leaderboard_loading = False
+        leaderboard_fetched = True
 
 
 def ensure_leaderboard_loaded():
@@ -800,7 +702,7 @@ def main_loop():
     # ===============================
     global active_input, show_password_login, show_password_reg, show_password_reg2
     global username, password, reg_email, reg_username, reg_password, reg_password2
-    global selected_mode, leaderboard_mode, paused, dx, dy
+    global selected_mode, leaderboard_mode, paused
     while True:
         delta_time = CLOCK.tick(60)
         for event in pygame.event.get():
@@ -808,6 +710,13 @@ def main_loop():
                 pygame.quit()
                 sys.exit()
 
+            if event.type == API_RESULT:
+                handle_api_result(event)
+                continue
+
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()  # okno bylo zakryté, kreslí se znovu celé
+
             if screen_state == "login":
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if login_show_rect.collidepoint(event.pos):
@@ -893,14 +802,14 @@ def main_loop():
 
             if screen_state == "game" and event.type == pygame.KEYDOWN:
                 if not paused:
-                    if event.key in [pygame.K_UP, pygame.K_w] and dy == 0:
-                        dx, dy = 0, -BLOCK_SIZE
-                    elif event.key in [pygame.K_DOWN, pygame.K_s] and dy == 0:
-                        dx, dy = 0, BLOCK_SIZE
-                    elif event.key in [pygame.K_LEFT, pygame.K_a] and dx == 0:
-                        dx, dy = -BLOCK_SIZE, 0
-                    elif event.key in [pygame.K_RIGHT, pygame.K_d] and dx == 0:
-                        dx, dy = BLOCK_SIZE, 0
+                    if event.key in [pygame.K_UP, pygame.K_w] and game.dy == 0:
+                        game.turn(0, -1)
+                    elif event.key in [pygame.K_DOWN, pygame.K_s] and game.dy == 0:
+                        game.turn(0, 1)
+                    elif event.key in [pygame.K_LEFT, pygame.K_a] and game.dx == 0:
+                        game.turn(-1, 0)
+                    elif event.key in [pygame.K_RIGHT, pygame.K_d] and game.dx == 0:
+                        game.turn(1, 0)
                 if event.key in [pygame.K_SPACE, pygame.K_p]:
                     paused = not paused
                 elif event.key == pygame.K_RETURN:
@@ -920,7 +829,11 @@ def main_loop():
         elif screen_state == "mode_select":
             draw_mode_select()
         elif screen_state == "game":
-            draw_game(delta_time)
+            rects = draw_game(delta_time)
+            if rects is not None:
+                # Jen změněné bloky; mezi kroky hada se nekopíruje nic
+                pygame.display.update(rects)
+                continue
         elif screen_state == "account":
             draw_account()
 
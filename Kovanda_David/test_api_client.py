@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Testy ApiWorkeru se zástupnou Session (bez serveru a bez sítě).
+Spustit: python -m pytest test_api_client.py -v
+"""
+import os
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import api_client
+
+API_RESULT = pygame.event.custom_type()
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """První požadavek čeká na release, aby šly poslat další, dokud běží."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        self.calls.append((method, url, headers.get("Authorization")))
+        if len(self.calls) == 1:
+            self.started.set()
+            assert self.release.wait(5)
+        return FakeResponse({"call": len(self.calls)})
+
+
+@pytest.fixture
+def session(monkeypatch):
+    pygame.display.init()
+    pygame.event.clear()
+    fake = FakeSession()
+    monkeypatch.setattr(api_client, "_session", fake)
+    monkeypatch.setattr(api_client, "_etag_cache", {})
+    yield fake
+    pygame.display.quit()
+
+
+def wait_events(count, timeout=5):
+    events = []
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        events += pygame.event.get(API_RESULT)
+        time.sleep(0.01)
+    time.sleep(0.1)  # případná další (nečekaná) událost
+    return events + pygame.event.get(API_RESULT)
+
+
+class TestApiWorker:
+
+    def test_get_is_coalesced(self, session):
+        worker = api_client.ApiWorker(API_RESULT)
+        try:
+            worker.get("leaderboard", "/scores", token="t1", extra=1)
+            assert session.started.wait(5)
+            # Během běhu prvního GETu přijdou další tři — spustí se jen poslední, jednou
+            for i in (2, 3, 4):
+                worker.get("leaderboard", "/scores", token=f"t{i}", extra=i)
+            assert len(session.calls) == 1
+            session.release.set()
+
+            events = wait_events(1)
+        finally:
+            worker.shutdown()
+        assert [c[2] for c in session.calls] == ["Bearer t1", "Bearer t4"]
+        assert len(events) == 1
+        event = events[0]
+        assert (event.kind, event.token, event.extra, event.ok) == ("leaderboard", "t4", 4, True)
+        assert event.data == {"call": 2}
+        assert not worker.inflight and not worker.rerun
+
+    def test_post_and_other_kinds_not_coalesced(self, session):
+        worker = api_client.ApiWorker(API_RESULT)
+        try:
+            worker.get("leaderboard", "/scores", token="t")
+            assert session.started.wait(5)
+            worker.get("me", "/me", token="t")
+            worker.post("score", "/scores", {"mode": "classic", "score": 3}, token="t")
+            worker.post("score", "/scores", {"mode": "classic", "score": 4}, token="t")
+            session.release.set()
+            events = wait_events(4)
+        finally:
+            worker.shutdown()
+        assert sorted(e.kind for e in events) == ["leaderboard", "me", "score", "score"]
+        assert sorted(c[0] for c in session.calls) == ["GET", "GET", "POST", "POST"]
+
+    def test_unreachable_api(self, session, monkeypatch):
+        def fail(*args, **kwargs):
+            raise ConnectionError("spojení odmítnuto")
+        monkeypatch.setattr(session, "request", fail)
+        worker = api_client.ApiWorker(API_RESULT)
+        try:
+            worker.get("leaderboard", "/scores/public")
+            events = wait_events(1)
+        finally:
+            worker.shutdown()
+        assert [(e.kind, e.ok, e.data) for e in events] == [("leaderboard", False, "API není dostupné")]
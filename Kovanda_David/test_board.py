@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Testy herní plochy (board.py) proti jednoduchému modelu ze seznamů a množin.
+Spustit: python -m pytest test_board.py -v
+"""
+import random
+from collections import Counter
+
+from board import Board, EMPTY, NORMAL, PILLAR, POISON
+
+COLS, ROWS = 12, 9
+
+
+class Model:
+    """Stejná plocha po staru: had jako seznam bloků, předměty ve slovníku."""
+
+    def __init__(self):
+        self.snake = []
+        self.items = {}
+
+    def free(self):
+        body = set(self.snake)
+        return {(x, y) for x in range(COLS) for y in range(ROWS)
+                if (x, y) not in body and (x, y) not in self.items}
+
+    def collides(self, x, y):
+        return (not (0 <= x < COLS and 0 <= y < ROWS)
+                or self.snake.count((x, y)) > 1 or self.items.get((x, y)) == PILLAR)
+
+
+def check(board, model):
+    # Volný seznam a pozice v něm odpovídají kind/body_count i modelu
+    assert sorted(board.free) == sorted(board.cell(x, y) for x, y in model.free())
+    assert len(set(board.free)) == len(board.free) == board.free_count()
+    for cell in range(COLS * ROWS):
+        i = board.slot[cell]
+        is_free = not board.body_count[cell] and not board.kind[cell]
+        assert (i >= 0) == is_free
+        if is_free:
+            assert board.free[i] == cell
+    body = Counter(board.cell(x, y) for x, y in model.snake)
+    assert all(board.body_count[cell] == body[cell] for cell in range(COLS * ROWS))
+    assert [tuple(p) for p in board.snake] == model.snake
+    for kind in (NORMAL, POISON, PILLAR):
+        assert board.count(kind) == sum(1 for k in model.items.values() if k == kind)
+
+
+def new_board():
+    board, model = Board(0, 0, COLS, ROWS, block=1), Model()
+    board.push_head(COLS // 2, ROWS // 2)
+    model.snake.insert(0, (COLS // 2, ROWS // 2))
+    return board, model
+
+
+class TestBoard:
+
+    def test_random_moves_match_model(self):
+        rng = random.Random(7)
+        for _ in range(40):
+            board, model = new_board()
+            for _ in range(5):
+                pos = board.random_free(rng)
+                board.place(*pos, PILLAR)
+                model.items[pos] = PILLAR
+            check(board, model)
+
+            for _ in range(300):
+                # Jídlo a jeho sebrání (place/clear volají _take/_release)
+                if rng.random() < 0.3:
+                    pos = board.random_free(rng)
+                    assert pos in model.free()
+                    kind = rng.choice([NORMAL, POISON])
+                    board.place(*pos, kind)
+                    model.items[pos] = kind
+                hx, hy = model.snake[0]
+                dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+                x, y = hx + dx, hy + dy
+
+                board.push_head(x, y)
+                model.snake.insert(0, (x, y))
+                if model.items.get((x, y)) in (NORMAL, POISON):
+                    board.clear(x, y)
+                    del model.items[(x, y)]
+                    board.grow_tail()
+                    model.snake.append(model.snake[-1])
+                else:
+                    board.pop_tail()
+                    model.snake.pop()
+
+                assert board.collides(x, y) == model.collides(x, y)
+                # Ocas jede za hlavou: stejné bloky jako v modelu
+                assert tuple(board.snake[0]) == (x, y)
+                if board.collides(x, y):
+                    break
+                check(board, model)
+
+    def test_collides_self_only_when_cell_shared(self):
+        board, _ = new_board()
+        x, y = COLS // 2, ROWS // 2
+        # Had délky 4 do čtverce: hlava (x, y+1), ocas (x, y)
+        board.push_head(x + 1, y)
+        board.push_head(x + 1, y + 1)
+        board.push_head(x, y + 1)
+        assert not board.collides(x, y + 1)
+
+        # Hlava na místo ocasu ve stejném kroku, kdy ocas odjede: není kolize
+        board.push_head(x, y)
+        assert board.body_count[board.cell(x, y)] == 2
+        board.pop_tail()
+        assert board.body_count[board.cell(x, y)] == 1
+        assert not board.collides(x, y)
+
+        # Hlava do těla (zpět na krk): dva články na jednom bloku
+        board.push_head(x, y + 1)
+        board.pop_tail()
+        assert board.body_count[board.cell(x, y + 1)] == 2
+        assert board.collides(x, y + 1)
+
+        # Okraj a sloup
+        assert board.collides(-1, 0) and board.collides(COLS, 0)
+        board.place(0, 0, PILLAR)
+        assert board.collides(0, 0)
+
+    def test_grow_tail_keeps_cell_taken(self):
+        board, model = new_board()
+        x, y = COLS // 2, ROWS // 2
+        board.push_head(x + 1, y)
+        board.grow_tail()
+        board.pop_tail()  # jedna kopie ocasu odjela, blok pořád obsazený
+        model.snake = [(x + 1, y), (x, y)]
+        check(board, model)
+        board.pop_tail()
+        model.snake.pop()
+        check(board, model)
+
+    def test_take_and_release_are_idempotent(self):
+        board, model = new_board()
+        cell = board.cell(0, 0)
+        board._take(cell)
+        board._take(cell)
+        assert cell not in board.free
+        board._release(cell)
+        board._release(cell)
+        check(board, model)
+
+        # Blok s hadem ani s předmětem se do volných nevrátí
+        head = board.cell(*model.snake[0])
+        board._release(head)
+        board.place(1, 1, NORMAL)
+        model.items[(1, 1)] = NORMAL
+        board._release(board.cell(1, 1))
+        check(board, model)
+        board.clear(1, 1)
+        board.clear(1, 1)
+        del model.items[(1, 1)]
+        check(board, model)
+        assert board.kind_at(1, 1) == EMPTY
+
+    def test_random_free_fills_board(self):
+        board, model = new_board()
+        rng = random.Random(3)
+        while True:
+            pos = board.random_free(rng)
+            if pos is None:
+                break
+            assert pos in model.free()
+            board.place(*pos, NORMAL)
+            model.items[pos] = NORMAL
+        assert board.free_count() == 0
+        assert len(model.items) == COLS * ROWS - 1
+        check(board, model)
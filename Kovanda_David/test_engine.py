@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Testy pravidel hada (engine.py) a hromadné simulace (simulate.py).
+Spustit: python -m pytest test_engine.py -v
+"""
+import simulate
+from board import NORMAL, PILLAR, POISON
+from config import mode_config
+from engine import CRASH, DEFAULT_COLS, EAT, MOVE, POISONED, SnakeGame, replay
+
+
+def state(game):
+    return game.score, game.steps, game.over, [tuple(p) for p in game.snake], sorted(game.food.items())
+
+
+def put(game, dx, kind):
+    """Dá jablko nebo sloup dx bloků před hlavu (had na začátku míří doprava)."""
+    x, y = game.snake[0][0] + dx, game.snake[0][1]
+    if game.board.kind_at(x, y):
+        game.board.clear(x, y)
+        game.food.pop((x, y), None)
+    game.board.place(x, y, kind)
+    if kind == NORMAL:
+        game.food[(x, y)] = "normal"
+    elif kind == POISON:
+        game.food[(x, y)] = "poison"
+
+
+class TestSnakeGame:
+
+    def test_same_seed_same_game(self):
+        for mode in mode_config:
+            for seed in (1, 42, 1234):
+                a = simulate.play(mode, seed, max_steps=2000)
+                b = simulate.play(mode, seed, max_steps=2000)
+                assert state(a) == state(b)
+                assert a.turns == b.turns and a.pillars == b.pillars
+
+    def test_replay_reproduces_game(self):
+        for mode in mode_config:
+            for seed in range(5):
+                game = simulate.play(mode, seed, max_steps=3000)
+                replayed = replay(mode, seed, game.turns, max_steps=3000)
+                assert state(replayed) == state(game)
+                assert replayed.turns == game.turns
+
+    def test_wall(self):
+        game = SnakeGame("classic", seed=0)
+        while not game.over:
+            result = game.step()
+        assert result == CRASH and game.over == "wall"
+        assert game.step() == CRASH  # po konci se už nic nemění
+        assert game.steps == DEFAULT_COLS - DEFAULT_COLS // 2  # ze středu rovně doprava
+
+    def test_pillar(self):
+        game = SnakeGame("pillars", seed=3)
+        assert len(game.pillars) == mode_config["pillars"]["pillars"]
+        assert game.board.count(PILLAR) == len(game.pillars)
+        put(game, 1, PILLAR)
+        assert game.peek(1, 0) == CRASH
+        assert game.step() == CRASH and game.over == "pillar"
+
+    def test_poison(self):
+        game = SnakeGame("poison", seed=5)
+        assert "poison" in game.food.values()
+        put(game, 1, POISON)
+        assert game.peek(1, 0) == POISONED
+        assert game.step() == POISONED and game.over == "poison"
+        assert game.score == 0
+
+    def test_self(self):
+        game = SnakeGame("classic", seed=7)
+        # Dvě jablka v řadě: had roste o hlavu i kopii ocasu (jako původní hra), délka 5
+        for dx in (1, 2):
+            put(game, dx, NORMAL)
+        for _ in range(2):
+            assert game.step() == EAT
+        assert game.score == 2 and len(game.snake) == 5
+        # Dolů, doleva a nahoru do vlastního těla
+        assert game.turn(0, 1) and game.step() in (MOVE, EAT)
+        assert game.turn(-1, 0) and game.step() in (MOVE, EAT)
+        assert game.turn(0, -1)
+        assert game.peek(0, -1) == CRASH
+        assert game.step() == CRASH and game.over == "self"
+
+    def test_turn_only_perpendicular(self):
+        game = SnakeGame("classic", seed=0)
+        assert not game.turn(-1, 0)  # otočka o 180°
+        assert not game.turn(1, 0)   # stejný směr
+        assert game.turn(0, 1)
+        assert game.turns == [(0, 0, 1)]
+
+
+class TestSimulate:
+    # Malá plocha, ať hry končí rychle
+    SMALL = dict(max_steps=2000, cols=14, rows=10)
+
+    def test_reasons_reached(self):
+        summary = simulate.run(list(mode_config), 100, jobs=1, **self.SMALL)
+        expected = {"classic": {"wall", "self"}, "poison": {"poison"},
+                    "pillars": {"pillar"}, "hardcore": {"pillar", "poison"}}
+        for mode, s in summary.items():
+            assert s["games"] == sum(s["end_reasons"].values()) == 100
+            assert expected[mode] <= set(s["end_reasons"]), (mode, s["end_reasons"])
+            assert set(s["end_reasons"]) <= {"wall", "self", "pillar", "poison", "limit"}
+
+    def test_parallel_matches_serial(self, monkeypatch):
+        # Víc dávek než procesů, výsledky chodí v libovolném pořadí
+        monkeypatch.setattr(simulate, "BATCH", 25)
+        serial = simulate.run(list(mode_config), 100, jobs=1, seed=10, **self.SMALL)
+        parallel = simulate.run(list(mode_config), 100, jobs=2, seed=10, **self.SMALL)
+        assert parallel == serial
+        assert serial["classic"]["games"] == 100
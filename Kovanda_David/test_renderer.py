@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Testy kreslení po změněných blocích (renderer.py): obraz po krocích musí
+být stejný jako celý snímek nakreslený znovu.
+Spustit: python -m pytest test_renderer.py -v
+"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import simulate
+from assets import load_assets
+from config import BG_COLOR, BLOCK_SIZE, BORDER_COLOR, TEXT_COLOR
+from engine import SnakeGame
+from renderer import GameRenderer, TextCache
+
+SIZE = (480, 360)
+PLAY_AREA = pygame.Rect(40, 80, 20 * BLOCK_SIZE, 13 * BLOCK_SIZE)
+BORDER = 5
+
+
+@pytest.fixture(scope="module")
+def parts():
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # convert_alpha v load_assets potřebuje okno
+    assets = load_assets()
+    background = pygame.transform.smoothscale(assets["background"], SIZE)
+    font = pygame.font.Font(None, 36)
+    yield assets, background, font
+    pygame.quit()
+
+
+def make_renderer(parts, surface):
+    assets, background, font = parts
+    return GameRenderer(surface, background, assets, PLAY_AREA, BORDER, font, TextCache(),
+                        (BORDER_COLOR, BG_COLOR, TEXT_COLOR))
+
+
+def full_frame(parts, game):
+    surface = pygame.Surface(SIZE)
+    renderer = make_renderer(parts, surface)
+    dirty = list(game.dirty)
+    renderer.draw(game)
+    game.dirty[:] = dirty  # draw_full změny vymaže, hra je ale ještě nenakreslila
+    return pygame.image.tobytes(surface, "RGB")
+
+
+class TestGameRenderer:
+
+    @pytest.mark.parametrize("mode", ["classic", "hardcore"])
+    def test_dirty_rects_match_full_redraw(self, parts, mode):
+        for seed in range(3):
+            surface = pygame.Surface(SIZE)
+            renderer = make_renderer(parts, surface)
+            game = SnakeGame.from_rect(mode, PLAY_AREA, BLOCK_SIZE, seed=seed)
+            assert renderer.draw(game) == [surface.get_rect()]
+            rng = random.Random(seed)
+            while not game.over and game.steps < 400:
+                move = simulate.greedy_bot(game, rng)
+                if move is not None:
+                    game.turn(*move)
+                game.step()
+                expected = full_frame(parts, game)
+                rects = renderer.draw(game)
+                assert rects and len(rects) <= 8
+                assert pygame.image.tobytes(surface, "RGB") == expected, (seed, game.steps)
+            assert game.score > 0
+
+    def test_nothing_to_draw_between_steps(self, parts):
+        renderer = make_renderer(parts, pygame.Surface(SIZE))
+        game = SnakeGame.from_rect("classic", PLAY_AREA, BLOCK_SIZE, seed=1)
+        renderer.draw(game)
+        assert renderer.draw(game) == []
+        game.step()
+        assert renderer.draw(game)
+        assert renderer.draw(game) == []
+        renderer.invalidate()
+        assert renderer.draw(game) == [renderer.win.get_rect()]
+
+    def test_text_cache(self, parts):
+        font = parts[2]
+        cache = TextCache(limit=2)
+        first = cache.render(font, "Skóre: 1", (255, 255, 255))
+        assert cache.render(font, "Skóre: 1", [255, 255, 255]) is first
+        cache.render(font, "Skóre: 2", (255, 255, 255))
+        cache.render(font, "Skóre: 3", (255, 255, 255))  # přes limit: cache začne znovu
+        assert len(cache.surfaces) == 1
+        assert cache.render(font, "Skóre: 1", (255, 255, 255)) is not first